@@ -0,0 +1,129 @@
+"""
+Keyword and text search over --docs business infos (1M by default).
+
+Seeds a scratch collection with businesses whose keywords are drawn from a
+Zipf-like vocabulary, then times, for --samples random keywords each:
+    regex      the previous `search_by_keyword`: unanchored, case-insensitive
+               $regex on `businessKeyWords` (collection scan)
+    exact      equality on the normalized keywords (multikey `keywords_index`)
+    prefix     anchored regex on the normalized keywords (index range scan)
+    text       ranked `$text` search (`business_text_index`)
+and deep pagination (page --deep-page of 20): skip/limit vs the keyset
+cursor of `search_keywords`. The query plan (docs examined) is printed for
+each form.
+
+Needs a reachable MongoDB (MONGODB_URL from env or src/.env); everything is
+written to the `bench_business_search` database, dropped at the end.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_business_search [--docs 1000000] [--samples 200] [--deep-page 200]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.helpers.config import get_Settings
+from src.models.BuisnessInfoModel import BusinessInfoModel, normalize_keywords, NORMALIZED_KEYWORDS_FIELD
+from src.models.db_schemas.BuisnessInfo import BuisnessInfo
+from src.models.enums.DBEnums import DBEnums
+
+DATABASE = "bench_business_search"
+COLLECTION = DBEnums.COLLECTION_BUSINESS_INFO_NAME.value
+VOCABULARY = [f"{stem}{i}" for i in range(500) for stem in ("Eco", "Coffee", "Fitness", "Fashion")]
+PAGE = 20
+
+
+async def seed(db, n_docs: int):
+    rng = random.Random(3)
+    weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+    await db.client.drop_database(DATABASE)
+    batch = []
+    for i in range(n_docs):
+        keywords = list(dict.fromkeys(rng.choices(VOCABULARY, weights, k=5)))
+        batch.append({
+            "_id": ObjectId(), "user_id": str(ObjectId()), "businessName": f"{keywords[0]} shop {i}",
+            "field": rng.choice(["Retail", "Food", "Sports"]),
+            "description": f"A local business about {' and '.join(keywords)}. " + "x" * 100,
+            "businessKeyWords": keywords, NORMALIZED_KEYWORDS_FIELD: normalize_keywords(keywords),
+        })
+        if len(batch) == 10_000:
+            await db[COLLECTION].insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await db[COLLECTION].insert_many(batch, ordered=False)
+    for index in BuisnessInfo.get_indexes():
+        await db[COLLECTION].create_index(index["key"], name=index["name"], **index.get("options", {}))
+
+
+async def timed(fn, keywords):
+    timings = []
+    for keyword in keywords:
+        started = time.perf_counter()
+        await fn(keyword)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return statistics.median(timings) * 1000, timings[int(0.99 * len(timings))] * 1000
+
+
+async def examined(collection, query) -> int:
+    plan = await collection.find(query).limit(PAGE).explain()
+    return plan["executionStats"]["totalDocsExamined"]
+
+
+async def main(args):
+    settings = get_Settings()
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[DATABASE]
+    collection = db[COLLECTION]
+    model = BusinessInfoModel(db)
+    rng = random.Random(1)
+    keywords = [rng.choice(VOCABULARY[:200]) for _ in range(args.samples)]
+    try:
+        print(f"seeding {args.docs:,} business infos ...")
+        started = time.perf_counter()
+        await seed(db, args.docs)
+        print(f"seeded in {time.perf_counter() - started:.0f} s")
+
+        forms = {
+            "regex": lambda k: {"businessKeyWords": {"$regex": k, "$options": "i"}},
+            "exact": lambda k: {NORMALIZED_KEYWORDS_FIELD: k.lower()},
+            "prefix": lambda k: {NORMALIZED_KEYWORDS_FIELD: {"$regex": "^" + k.lower()[:4]}},
+        }
+        for name, query in forms.items():
+            sample = keywords if name != "regex" else keywords[:max(5, args.samples // 20)]
+            p50, p99 = await timed(lambda k: collection.find(query(k)).limit(PAGE).to_list(PAGE), sample)
+            print(f"{name:>8}: p50 {p50:8.2f} ms  p99 {p99:8.2f} ms  docs examined {await examined(collection, query(keywords[0])):,}")
+        p50, p99 = await timed(lambda k: model.search_text(k, limit=PAGE), keywords)
+        print(f"{'text':>8}: p50 {p50:8.2f} ms  p99 {p99:8.2f} ms")
+
+        keyword = VOCABULARY[0].lower()
+        skip = args.deep_page * PAGE
+        started = time.perf_counter()
+        await collection.find({NORMALIZED_KEYWORDS_FIELD: keyword}).sort("_id", 1).skip(skip).limit(PAGE).to_list(PAGE)
+        skip_ms = (time.perf_counter() - started) * 1000
+        cursor, pages = None, 0
+        while pages <= args.deep_page:
+            _, cursor = await model.search_keywords(keyword, after=cursor, limit=PAGE)
+            pages += 1
+            if cursor is None:
+                break
+        started = time.perf_counter()
+        await model.search_keywords(keyword, after=cursor, limit=PAGE)
+        keyset_ms = (time.perf_counter() - started) * 1000
+        print(f"page {args.deep_page} of '{keyword}': skip/limit {skip_ms:.2f} ms, keyset cursor {keyset_ms:.2f} ms")
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--deep-page", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
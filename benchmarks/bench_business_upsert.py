@@ -0,0 +1,115 @@
+"""
+--writes parallel onboarding writes of business info, old flow vs new.
+
+--users users each send --writes / --users concurrent writes (a double
+submit of the onboarding form, a retried request, ...), half creates
+(POST) and half replaces (PUT), all at once:
+    old   exists_for_user + insert_one, get_by_user_id + replace_one/insert_one
+          (two round trips, check-then-act)
+    new   insert_one / replace_one(upsert=True) relying on the unique
+          `user_index` (one round trip)
+Reports wall time, per-write latency, duplicate-key errors surfacing to the
+caller (a 500 for the old flow) and the number of documents per user at the
+end (must be exactly one).
+
+Needs a reachable MongoDB (MONGODB_URL from env or src/.env); everything is
+written to the `bench_business_upsert` database, dropped at the end.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_business_upsert [--writes 1000] [--users 250]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
+
+from src.helpers.config import get_Settings
+from src.models.BuisnessInfoModel import BusinessInfoModel
+from src.models.db_schemas.BuisnessInfo import BuisnessInfo
+
+DATABASE = "bench_business_upsert"
+
+
+def business_info(user_id: str, i: int) -> BuisnessInfo:
+    return BuisnessInfo(user_id=user_id, businessName=f"Shop {i}", field="Retail",
+                        description="A neighbourhood shop selling local products. " * 2,
+                        businessKeyWords=["Local", "Shop"])
+
+
+async def old_create(model: BusinessInfoModel, info: BuisnessInfo):
+    if await model.exists_for_user(str(info.user_id)):
+        return
+    await model.collection.insert_one(info.model_dump(by_alias=True, exclude_unset=True))
+
+
+async def old_replace(model: BusinessInfoModel, info: BuisnessInfo):
+    existing = await model.get_by_user_id(str(info.user_id))
+    doc = info.model_dump(by_alias=True, exclude_unset=True)
+    if existing:
+        await model.collection.replace_one({"_id": ObjectId(existing.id)}, doc)
+    else:
+        await model.collection.insert_one(doc)
+
+
+async def run(model: BusinessInfoModel, users, per_user: int, create, replace):
+    await model.collection.delete_many({})
+    latencies, errors = [], 0
+
+    async def write(coro):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            await coro
+        except DuplicateKeyError:
+            errors += 1
+        latencies.append(time.perf_counter() - started)
+
+    writes = []
+    for n, user_id in enumerate(users):
+        for i in range(per_user):
+            info = business_info(user_id, n * per_user + i)
+            writes.append(write(create(model, info) if i % 2 == 0 else replace(model, info)))
+    started = time.perf_counter()
+    await asyncio.gather(*writes)
+    elapsed = time.perf_counter() - started
+
+    counts = await model.collection.aggregate([
+        {"$group": {"_id": "$user_id", "n": {"$sum": 1}}},
+        {"$group": {"_id": "$n", "users": {"$sum": 1}}},
+    ]).to_list(None)
+    latencies.sort()
+    return elapsed, statistics.median(latencies), latencies[int(0.99 * len(latencies))], errors, counts
+
+
+async def main(args):
+    settings = get_Settings()
+    client = AsyncIOMotorClient(settings.MONGODB_URL, maxPoolSize=settings.MONGODB_MAX_POOL_SIZE)
+    db = client[DATABASE]
+    model = await BusinessInfoModel.create_instance(db)
+    users = [str(ObjectId()) for _ in range(args.users)]
+    per_user = max(1, args.writes // args.users)
+    flows = {
+        "old": (old_create, old_replace),
+        "new": (lambda m, info: m.create_business_info(info), lambda m, info: m.replace_business_info(str(info.user_id), info)),
+    }
+    try:
+        for name, (create, replace) in flows.items():
+            elapsed, p50, p99, errors, counts = await run(model, users, per_user, create, replace)
+            per_user_docs = ", ".join(f"{c['users']} users with {c['_id']}" for c in sorted(counts, key=lambda c: c["_id"]))
+            print(f"{name}: {len(users) * per_user} writes in {elapsed:.2f} s "
+                  f"({len(users) * per_user / elapsed:,.0f}/s), p50 {p50 * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms, "
+                  f"{errors} duplicate-key errors, documents: {per_user_docs}")
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writes", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=250)
+    asyncio.run(main(parser.parse_args()))
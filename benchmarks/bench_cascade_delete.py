@@ -0,0 +1,146 @@
+"""
+Purge of --users users with realistic related data.
+
+Each seeded user has a business info with a Facebook page, a schedule,
+recommendations, notifications, drafts, analyses and daily engagement
+buckets of the page. Then:
+    baseline   per user, one delete_many per collection one after the other
+               (the previous `delete_user_by_id` flow, extended to every
+               collection), run on --baseline-sample users and extrapolated
+    cascade    `UserCascadeModel.delete_users`: chunks of --chunk-size users,
+               dependent collections deleted concurrently
+    --transaction additionally times the transactional mode (replica set)
+Every run checks that no related document is left behind.
+
+Needs a reachable MongoDB (MONGODB_URL from env or src/.env); everything is
+written to the `bench_cascade_delete` database, dropped at the end.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_cascade_delete [--users 10000] [--chunk-size 500] [--transaction]
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.helpers.config import get_Settings
+from src.models.UserCascadeModel import UserCascadeModel, USER_OWNED_COLLECTIONS, PAGE_OWNED_COLLECTIONS
+from src.models.db_schemas.Analysis import Analysis
+from src.models.db_schemas.BuisnessInfo import BuisnessInfo
+from src.models.db_schemas.Engagement import EngagementRollup
+from src.models.db_schemas.Notification import Notification
+from src.models.db_schemas.Post import Post
+from src.models.db_schemas.Recommendation import Recommendation
+from src.models.db_schemas.Schedule import Schedule
+from src.models.enums.DBEnums import DBEnums
+
+DATABASE = "bench_cascade_delete"
+PER_USER = {
+    DBEnums.COLLECTION_RECOMENDATION_NAME.value: 5,
+    DBEnums.COLLECTION_NOTIFICATION_NAME.value: 50,
+    DBEnums.COLLECTION_POST_NAME.value: 20,
+    DBEnums.COLLECTION_ANALYTICS_NAME.value: 10,
+}
+ENGAGEMENT_DAYS = 30
+
+
+async def seed(db, n_users: int) -> list:
+    rng = random.Random(5)
+    now = datetime.now(timezone.utc)
+    await db.client.drop_database(DATABASE)
+    schemas = {
+        DBEnums.COLLECTION_BUSINESS_INFO_NAME.value: BuisnessInfo,
+        DBEnums.COLLECTION_SCHEDULE_NAME.value: Schedule,
+        DBEnums.COLLECTION_RECOMENDATION_NAME.value: Recommendation,
+        DBEnums.COLLECTION_NOTIFICATION_NAME.value: Notification,
+        DBEnums.COLLECTION_POST_NAME.value: Post,
+        DBEnums.COLLECTION_ANALYTICS_NAME.value: Analysis,
+        DBEnums.COLLECTION_ENGAGEMENT_DAILY_NAME.value: EngagementRollup,
+    }
+    for name, schema in schemas.items():
+        for index in schema.get_indexes():
+            await db[name].create_index(index["key"], name=index["name"])
+
+    user_ids = []
+    for start in range(0, n_users, 500):
+        users = [{"_id": ObjectId(), "username": f"user {i}", "email": f"user{i}@example.com",
+                  "hashPassword": "x" * 60, "accountStatus": "inactive"} for i in range(start, min(n_users, start + 500))]
+        docs = {name: [] for name in schemas}
+        for user in users:
+            user_id = str(user["_id"])
+            page_id = str(10**14 + len(user_ids))
+            user_ids.append(user_id)
+            docs[DBEnums.COLLECTION_BUSINESS_INFO_NAME.value].append(
+                {"user_id": user_id, "businessName": "Shop", "field": "Retail", "description": "x" * 200,
+                 "facebook_page_id": page_id})
+            docs[DBEnums.COLLECTION_SCHEDULE_NAME.value].append({"user_id": user_id, "status": "active"})
+            for name, count in PER_USER.items():
+                docs[name].extend({"user_id": user_id, "content": "x" * 500,
+                                   "createdAt": now - timedelta(days=rng.uniform(0, 365))} for _ in range(count))
+            docs[DBEnums.COLLECTION_ENGAGEMENT_DAILY_NAME.value].extend(
+                {"page_id": page_id, "post_id": f"{page_id}_1", "bucket": now - timedelta(days=d), "reactions": d}
+                for d in range(ENGAGEMENT_DAYS))
+        await db[DBEnums.COLLECTION_USER_NAME.value].insert_many(users, ordered=False)
+        for name, batch in docs.items():
+            await db[name].insert_many(batch, ordered=False)
+    return user_ids
+
+
+async def remaining(db) -> int:
+    names = USER_OWNED_COLLECTIONS + [name for name, _ in PAGE_OWNED_COLLECTIONS] + [DBEnums.COLLECTION_USER_NAME.value]
+    return sum([await db[name].count_documents({}) for name in names])
+
+
+async def baseline(db, user_ids) -> float:
+    started = time.perf_counter()
+    for user_id in user_ids:
+        info = await db[DBEnums.COLLECTION_BUSINESS_INFO_NAME.value].find_one({"user_id": user_id})
+        await db[DBEnums.COLLECTION_USER_NAME.value].delete_one({"_id": ObjectId(user_id)})
+        for name in USER_OWNED_COLLECTIONS:
+            await db[name].delete_many({"user_id": user_id})
+        if info and info.get("facebook_page_id"):
+            for name, key in PAGE_OWNED_COLLECTIONS:
+                await db[name].delete_many({key: info["facebook_page_id"]})
+    return (time.perf_counter() - started) / len(user_ids)
+
+
+async def main(args):
+    settings = get_Settings()
+    client = AsyncIOMotorClient(settings.MONGODB_URL, maxPoolSize=settings.MONGODB_MAX_POOL_SIZE)
+    db = client[DATABASE]
+    related = sum(PER_USER.values()) + 2 + ENGAGEMENT_DAYS
+    try:
+        print(f"seeding {args.users} users x {related} related documents ...")
+        user_ids = await seed(db, args.users)
+        per_user = await baseline(db, user_ids[:args.baseline_sample])
+        print(f"baseline   sequential per user: {per_user * 1000:.2f} ms/user -> "
+              f"{per_user * args.users:.1f} s for {args.users} users (extrapolated)")
+
+        modes = [False, True] if args.transaction else [False]
+        for use_transaction in modes:
+            if use_transaction:
+                user_ids = await seed(db, args.users)
+            cascade = UserCascadeModel(db, chunk_size=args.chunk_size, use_transaction=use_transaction)
+            started = time.perf_counter()
+            result = await cascade.delete_users(user_filter={})
+            elapsed = time.perf_counter() - started
+            left = await remaining(db)
+            print(f"cascade    chunk {args.chunk_size}{' + transaction' if use_transaction else ''}: "
+                  f"{elapsed:.2f} s ({result['deleted_count'] / elapsed:,.0f} users/s, "
+                  f"{sum(result['related_deleted'].values()):,} related documents), {left} documents left")
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--baseline-sample", type=int, default=300)
+    parser.add_argument("--transaction", action="store_true")
+    asyncio.run(main(parser.parse_args()))
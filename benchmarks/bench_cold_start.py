@@ -0,0 +1,92 @@
+"""
+Cold start benchmark: import time of `src.main` (with a `-X importtime`
+breakdown per top-level package) and time from spawning a uvicorn worker
+to its first successful response (GET /auth/config, no database needed).
+
+Usage (from the repository root, with the app settings in env or src/.env):
+    python -m benchmarks.bench_cold_start [--runs 5] [--top 15]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+
+
+def import_breakdown():
+    """Total import time of src.main and cumulative time per top-level package (microseconds)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        capture_output=True, text=True, check=True,
+    )
+    per_package = defaultdict(int)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not self_us.isdigit():
+            continue  # header line
+        per_package[name.split(".")[0]] += int(self_us)
+        if name == "src.main":
+            total = int(cumulative_us)
+    return total, per_package
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_first_request(timeout: float = 30.0) -> float:
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=os.environ.copy(),
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/auth/config", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError("server did not answer in time")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    imports = [import_breakdown() for _ in range(args.runs)]
+    totals = [total for total, _ in imports]
+    packages = defaultdict(list)
+    for _, per_package in imports:
+        for name, us in per_package.items():
+            packages[name].append(us)
+
+    print(f"import src.main: median {statistics.median(totals) / 1000:.1f} ms over {args.runs} runs")
+    print(f"  top packages by self time (median):")
+    ranked = sorted(packages.items(), key=lambda item: -statistics.median(item[1]))
+    for name, values in ranked[:args.top]:
+        print(f"    {name:<28} {statistics.median(values) / 1000:7.1f} ms")
+
+    first = [time_to_first_request() for _ in range(args.runs)]
+    print(f"time to first request: median {statistics.median(first) * 1000:.0f} ms "
+          f"(min {min(first) * 1000:.0f}, max {max(first) * 1000:.0f})")
+
+
+if __name__ == "__main__":
+    main()
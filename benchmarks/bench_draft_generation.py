@@ -0,0 +1,127 @@
+"""
+Throughput of the draft generation pipeline (`GeneratorAgent`) against the
+stub provider simulating a remote model (--first-token-ms, then --token-ms
+per token), for several concurrency limits.
+
+For each limit, --drafts drafts are generated for one business over
+--slots upcoming scheduled posts. Without --mongo only the generation is
+measured; with --mongo the drafts are also stored (`insert_many` by
+batches of --batch-size) in a scratch database, as the background job does.
+
+Reports wall time, drafts per second and the time to the first draft,
+which stays near one model latency whatever the number of drafts.
+
+Then checks that generating again for the same schedule gives new drafts:
+two runs of --slots drafts share the LLM response cache and the user's
+near-duplicate index, and the second run must keep new drafts (exits with
+an error otherwise).
+
+Usage (from the repository root, with the app settings in env or src/.env):
+    python -m benchmarks.bench_draft_generation [--drafts 200] [--concurrency 1 4 16 64] [--mongo]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.agents.GeneratorAgent import GeneratorAgent
+from src.helpers.config import get_Settings
+from src.helpers.similarity import DraftSimilarityIndex, UserVectorIndex
+from src.models.PostModel import PostModel
+from src.models.db_schemas.BuisnessInfo import BuisnessInfo
+from src.models.db_schemas.Schedule import ScheduledPost
+from src.stores.LLMCache import LLMResponseCache
+from src.stores.LLMs import LLMClient
+from src.stores.providers.stub_provider import StubProvider
+
+DATABASE = "bench_draft_generation"
+
+
+def inputs(slot_count: int):
+    business_info = BuisnessInfo(
+        user_id=str(ObjectId()),
+        businessName="Corner Bakery",
+        field="Food",
+        description="A family bakery baking bread, pastries and cakes every morning.",
+        businessKeyWords=["bakery", "bread", "local"],
+        targetAudience=["families", "office workers"],
+        differentiators=["sourdough", "organic flour"],
+        theme=["warm", "friendly"],
+    )
+    now = datetime.now(timezone.utc)
+    slots = [
+        ScheduledPost(id=str(ObjectId()), date=now + timedelta(days=i + 1), content=f"Weekly special number {i + 1}")
+        for i in range(slot_count)
+    ]
+    return business_info, slots
+
+
+async def run(args, concurrency: int, post_model):
+    # the provider allows every call, the agent's limit is the one measured
+    provider = StubProvider(reply_tokens=args.tokens, first_token_latency=args.first_token_ms / 1000,
+                            token_latency=args.token_ms / 1000, max_concurrency=max(args.concurrency))
+    agent = GeneratorAgent(LLMClient({"stub": provider}, "stub"), concurrency=concurrency, max_tokens=args.tokens)
+    business_info, slots = inputs(args.slots)
+
+    started = time.perf_counter()
+    first = None
+    if post_model is None:
+        async for _ in agent.drafts(business_info, slots, args.drafts):
+            first = first or time.perf_counter() - started
+    else:
+        async for _ in agent.generate_and_store(post_model, business_info, slots, args.drafts, args.batch_size):
+            first = first or time.perf_counter() - started
+    return time.perf_counter() - started, first, agent.stats
+
+
+async def repeat(args):
+    provider = StubProvider(reply_tokens=args.tokens)
+    llm = LLMClient({"stub": provider}, "stub", cache=LLMResponseCache())
+    similarity = DraftSimilarityIndex()
+    seen = UserVectorIndex(similarity.dim)  # the user's stored posts, drafts of both runs included
+    business_info, slots = inputs(args.slots)
+    kept = []
+    for _ in range(2):
+        agent = GeneratorAgent(llm, max_tokens=args.tokens, similarity=similarity)
+        drafts = [post async for post in agent.drafts(business_info, slots, len(slots), seen)]
+        kept.append((len(drafts), agent.stats["duplicates"]))
+    print(f"repeat: run 1 kept {kept[0][0]} drafts, run 2 kept {kept[1][0]} new drafts "
+          f"({kept[1][1]} near-duplicates dropped)")
+    if not kept[1][0]:
+        raise SystemExit("a second generation for the same schedule gave the drafts of the first one")
+
+
+async def main(args):
+    await repeat(args)
+    client = post_model = None
+    if args.mongo:
+        client = AsyncIOMotorClient(get_Settings().MONGODB_URL)
+        post_model = await PostModel.create_instance(client[DATABASE])
+    try:
+        baseline = None
+        for concurrency in args.concurrency:
+            wall, first, stats = await run(args, concurrency, post_model)
+            baseline = baseline or wall
+            print(f"concurrency {concurrency:4d}: {args.drafts} drafts in {wall:7.2f} s "
+                  f"({args.drafts / wall:6.1f}/s, x{baseline / wall:5.1f}), first draft after {first * 1000:6.0f} ms, "
+                  f"generated {stats['generated']}, failed {stats['failed']}, stored {stats['stored']}")
+    finally:
+        if client is not None:
+            await client.drop_database(DATABASE)
+            client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--drafts", type=int, default=200)
+    parser.add_argument("--slots", type=int, default=14, help="upcoming scheduled posts")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--tokens", type=int, default=120)
+    parser.add_argument("--first-token-ms", type=float, default=300.0)
+    parser.add_argument("--token-ms", type=float, default=1.0)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--mongo", action="store_true", help="store the drafts (needs MongoDB)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,80 @@
+"""
+Lookup latency and accuracy of the near-duplicate draft index.
+
+One user's index is filled with --posts synthetic posts (sentences drawn
+from a vocabulary of --vocabulary words, like generated drafts of a single
+business). Then --queries drafts are checked against it: half are edited
+copies of indexed posts (--edits words replaced), half are new posts.
+
+Reports the time to vectorize a draft, the lookup time (one matrix-vector
+product over the user's posts), the share of edited copies detected and of
+new posts wrongly flagged, at the configured threshold.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_draft_similarity [--posts 10000] [--dim 128] [--threshold 0.75]
+"""
+import argparse
+import random
+import time
+
+from src.helpers.similarity import UserVectorIndex, text_vector
+
+
+def post(rng, vocabulary, words: int) -> str:
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def edited(rng, vocabulary, text: str, edits: int) -> str:
+    words = text.split()
+    for i in rng.sample(range(len(words)), edits):
+        words[i] = rng.choice(vocabulary)
+    return " ".join(words)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1e6
+
+
+def main(args):
+    rng = random.Random(5)
+    vocabulary = [f"w{i}" for i in range(args.vocabulary)]
+    texts = [post(rng, vocabulary, rng.randint(40, 120)) for _ in range(args.posts)]
+
+    index = UserVectorIndex(dim=args.dim, max_posts=args.posts)
+    started = time.perf_counter()
+    for i, text in enumerate(texts):
+        index.add(str(i), text_vector(text, args.dim))
+    build = time.perf_counter() - started
+
+    vectorize, lookup, detected, false_positives = [], [], 0, 0
+    for q in range(args.queries):
+        duplicate = q % 2 == 0
+        text = edited(rng, vocabulary, rng.choice(texts), args.edits) if duplicate else post(rng, vocabulary, rng.randint(40, 120))
+        started = time.perf_counter()
+        vector = text_vector(text, args.dim)
+        vectorized = time.perf_counter()
+        _, score = index.nearest(vector)
+        lookup.append(time.perf_counter() - vectorized)
+        vectorize.append(vectorized - started)
+        if score >= args.threshold:
+            detected += duplicate
+            false_positives += not duplicate
+
+    print(f"index of {len(index):,} posts x {args.dim} dims ({index._matrix.nbytes / 2**20:.1f} MiB) built in {build:.2f} s")
+    print(f"vectorize p50 {percentile(vectorize, 0.5):6.0f} us p99 {percentile(vectorize, 0.99):6.0f} us")
+    print(f"lookup    p50 {percentile(lookup, 0.5):6.0f} us p99 {percentile(lookup, 0.99):6.0f} us")
+    half = args.queries // 2
+    print(f"threshold {args.threshold}: {detected / half:.1%} of copies with {args.edits} words edited detected, "
+          f"{false_positives / half:.2%} of new posts flagged")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--vocabulary", type=int, default=300)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--edits", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.75)
+    main(parser.parse_args())
@@ -0,0 +1,123 @@
+"""
+Micro-benchmark: per-page engagement loop vs. vectorized engagement statistics.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_engagement_stats [--posts 100000] [--pages 1000]
+"""
+import argparse
+import random
+import statistics
+import time
+import numpy as np
+
+from src.controllers.engagement_stats import load_post_metrics, compute_engagement_stats
+
+
+def synthetic_pages(n_posts: int, n_pages: int, seed: int = 7):
+    rng = random.Random(seed)
+    per_page = n_posts // n_pages
+    return [
+        {
+            "page_id": f"page_{i}",
+            "fan_count": rng.randint(100, 1_000_000),
+            "posts": [
+                {
+                    "id": f"page_{i}_{j}",
+                    "status_type": rng.choice(["added_photos", "added_video", "mobile_status_update"]),
+                    "created_time": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00+0000",
+                    "reactions": {"summary": {"total_count": int(rng.expovariate(1 / 200))}},
+                    "comments": {"summary": {"total_count": int(rng.expovariate(1 / 20))}},
+                    "shares": {"count": int(rng.expovariate(1 / 5))},
+                }
+                for j in range(per_page)
+            ],
+        }
+        for i in range(n_pages)
+    ]
+
+
+def loop_baseline(pages):
+    """The per-page loop previously used by `FacebookController.analyze_competitors` (mean only)."""
+    results = []
+    for page in pages:
+        posts = page["posts"]
+        total_engagement = 0
+        for post in posts:
+            reactions = post.get("reactions", {}).get("summary", {}).get("total_count", 0)
+            comments = post.get("comments", {}).get("summary", {}).get("total_count", 0)
+            shares = post.get("shares", {}).get("count", 0)
+            total_engagement += (reactions + comments + shares)
+        results.append((total_engagement / len(posts)) if posts else 0)
+    return results
+
+
+def loop_full_stats(pages, top_k: int = 3, window: int = 5, z_threshold: float = 3.0):
+    """The same statistics as `compute_engagement_stats`, computed page by page in Python."""
+    results = []
+    for page in pages:
+        posts = sorted(page["posts"], key=lambda p: p["created_time"])
+        values = [
+            p["reactions"]["summary"]["total_count"] + p["comments"]["summary"]["total_count"] + p["shares"]["count"]
+            for p in posts
+        ]
+        n = len(values)
+        mean = statistics.fmean(values) if n else 0.0
+        std = statistics.pstdev(values) if n else 0.0
+        ordered = sorted(values)
+        quantiles = statistics.quantiles(ordered, n=100, method="inclusive") if n > 1 else [0.0] * 99
+        by_type = {}
+        for p, v in zip(posts, values):
+            count, total = by_type.get(p["status_type"], (0, 0))
+            by_type[p["status_type"]] = (count + 1, total + v)
+        xs = range(n)
+        sx, sy = sum(xs), sum(values)
+        sxx, sxy = sum(x * x for x in xs), sum(x * v for x, v in zip(xs, values))
+        denom = n * sxx - sx * sx
+        results.append({
+            "mean": mean,
+            "percentiles": [quantiles[q - 1] for q in (25, 50, 75, 90)],
+            "per_follower": mean / page["fan_count"],
+            "recent": statistics.fmean(values[-window:]) if n else 0.0,
+            "slope": (n * sxy - sx * sy) / denom if denom else 0.0,
+            "top": sorted(zip(values, posts), key=lambda t: -t[0])[:top_k],
+            "outliers": [p["id"] for p, v in zip(posts, values) if std and abs(v - mean) / std > z_threshold],
+            "by_type": {t: total / count for t, (count, total) in by_type.items()},
+        })
+    return results
+
+
+def timed(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--pages", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = synthetic_pages(args.posts, args.pages)
+    fans = np.array([p["fan_count"] for p in pages])
+
+    loop_time, loop_means = timed(lambda: loop_baseline(pages), args.repeat)
+    full_loop_time, _ = timed(lambda: loop_full_stats(pages), args.repeat)
+    load_time, metrics = timed(lambda: load_post_metrics(pages), args.repeat)
+    stats_time, stats = timed(lambda: compute_engagement_stats(metrics, fans), args.repeat)
+
+    assert np.allclose(loop_means, [s["avg_engagement_rate"] for s in stats])
+
+    print(f"{args.posts} posts over {args.pages} pages (best of {args.repeat})")
+    print(f"  python loop, mean only (previous)    : {loop_time * 1000:8.1f} ms")
+    print(f"  python loop, all statistics          : {full_loop_time * 1000:8.1f} ms")
+    print(f"  load_post_metrics (dicts -> arrays)  : {load_time * 1000:8.1f} ms")
+    print(f"  compute_engagement_stats, all stats  : {stats_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Load test: replay dashboard traffic against the local Graph stub
+(benchmarks/graph_stub.py) with and without the Graph GET cache.
+
+The trace models agency staff opening page dashboards: each session opens
+several tabs at once (page info, feed interactions, inbox and a few chat
+histories), then polls them and sometimes sends a reply. Pages follow a Zipf
+popularity, so several people often look at the same page at the same time.
+Simulated time is compressed by --speedup, TTLs are scaled the same way.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_graph_cache [--sessions 300] [--minutes 10] [--speedup 60]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from benchmarks.graph_stub import GraphStub
+from src.controllers.facebook import FacebookController
+from src.helpers.graph_cache import GraphCache, DEFAULT_TTLS
+from src.helpers.graph_client import GraphClient, set_graph_client
+from src.helpers.rate_limit import GraphRateGovernor
+
+
+def build_trace(args, seed: int = 3):
+    """List of (simulated second, action, page index, chat index) events."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(args.pages)]
+    duration = args.minutes * 60
+    events = []
+    for _ in range(args.sessions):
+        page = rng.choices(range(args.pages), weights)[0]
+        start = rng.uniform(0, duration)
+        length = rng.uniform(60, 300)
+        t = start
+        while t < min(start + length, duration):
+            events.append((t, "info", page, None))
+            events.append((t, "feed", page, None))
+            events.append((t, "inbox", page, None))
+            for chat in rng.sample(range(10), 3):
+                events.append((t + rng.uniform(0, 2), "chat", page, chat))
+            if rng.random() < 0.2:
+                events.append((t + rng.uniform(0, 10), "reply", page, rng.randrange(10)))
+            t += rng.uniform(10, 30)
+    return sorted(events)
+
+
+async def replay(events, args, cached: bool):
+    stub = GraphStub(app_calls_per_window=10**9, page_calls_per_window=10**9, latency=args.latency)
+    cache = GraphCache(ttls={k: v / args.speedup for k, v in DEFAULT_TTLS.items()}, default_ttl=30 / args.speedup)
+    client = GraphClient(
+        GraphRateGovernor(app_rate=10**6, page_rate=10**6), "v23.0", transport=stub.transport, cache=cache
+    )
+    set_graph_client(client)
+    latencies = []
+
+    async def run(action, page, chat):
+        page_id, token = f"10{page:04d}", f"page-token-{page}"
+        start = time.perf_counter()
+        if action == "info":
+            await client.get(page_id, params={"fields": "id,name,about,category", "access_token": token}, cache=cached)
+        elif action == "feed":
+            await FacebookController.fetch_page_feed_interactions(page_id, token, cache=cached)
+        elif action == "inbox":
+            await FacebookController.fetch_page_messages(page_id, token, cache=cached)
+        elif action == "chat":
+            await client.get(f"t_{page_id}{chat:06d}/messages",
+                             params={"fields": "message,from,to,created_time", "access_token": token}, cache=cached)
+        else:
+            await FacebookController.reply_to_message("psid", "Thanks!", page_id, token)
+        latencies.append(time.perf_counter() - start)
+
+    begin = time.perf_counter()
+    tasks = []
+    for t, action, page, chat in events:
+        delay = t / args.speedup - (time.perf_counter() - begin)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(run(action, page, chat)))
+    await asyncio.gather(*tasks)
+
+    set_graph_client(None)
+    await client.aclose()
+    return stub, cache, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--speedup", type=float, default=60)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub latency in seconds")
+    args = parser.parse_args()
+
+    events = build_trace(args)
+    print(f"{len(events)} dashboard requests, {args.sessions} sessions on {args.pages} pages, "
+          f"{args.minutes:g} simulated minutes")
+
+    for cached in (False, True):
+        stub, cache, latencies = asyncio.run(replay(events, args, cached))
+        p95 = latencies[int(0.95 * (len(latencies) - 1))]
+        print(f"{'with cache   ' if cached else 'without cache'}: {stub.requests:6d} upstream calls   "
+              f"p50 {statistics.median(latencies) * 1000:6.1f} ms   p95 {p95 * 1000:6.1f} ms")
+        if cached:
+            print(f"  hit ratio {cache.hit_ratio():.1%}   stats {cache.stats}")
+
+
+if __name__ == "__main__":
+    main()
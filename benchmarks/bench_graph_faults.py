@@ -0,0 +1,168 @@
+"""
+Fault injection: Graph API calls through the shared client while the local
+stub (benchmarks/graph_stub.py) fails a share of the requests.
+
+Injected faults, in equal parts: 500 responses (for POSTs half of them after
+the message was delivered), code 2 "service unavailable" errors and refused
+connections. Compares a client without retries with the default resilient
+client on throughput, success rate, duplicated POSTs and completeness of
+competitor analyses, then shows the circuit breaker during a full outage.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_graph_faults [--error-rate 0.1] [--requests 2000]
+"""
+import argparse
+import asyncio
+import logging
+import time
+from collections import Counter
+
+import httpx
+
+from benchmarks.graph_stub import GraphStub
+from src.controllers.facebook import FacebookController
+from src.helpers.graph_client import GraphClient, set_graph_client
+from src.helpers.rate_limit import GraphRateGovernor, GraphPriority
+from src.helpers.resilience import RetryPolicy, CircuitBreakerRegistry, GraphUnavailableError
+
+
+class FaultyGraphStub(GraphStub):
+    def __init__(self, error_rate: float, outage_path: str = None, **kwargs):
+        super().__init__(app_calls_per_window=10**9, page_calls_per_window=10**9, **kwargs)
+        self.error_rate = error_rate
+        self.outage_path = outage_path
+        self.delivered = Counter()
+        self.faults = Counter()
+
+    def error(self, request: httpx.Request):
+        if self.outage_path and request.url.path.endswith(self.outage_path):
+            self.faults["outage"] += 1
+            return httpx.Response(503, json={"error": {"code": 2, "message": "Service temporarily unavailable"}})
+
+        roll = self.random.random()
+        if roll >= self.error_rate:
+            self._deliver(request)
+            return None
+
+        kind = int(3 * roll / self.error_rate)
+        if kind == 0:
+            self.faults["connect"] += 1
+            raise httpx.ConnectError("connection refused", request=request)
+        if kind == 1:
+            self.faults["code_2"] += 1
+            return httpx.Response(503, json={"error": {"code": 2, "is_transient": True, "message": "Service unavailable"}})
+        self.faults["500"] += 1
+        if self.random.random() < 0.5:
+            self._deliver(request)
+        return httpx.Response(500, json={"error": {"code": 1, "message": "An unknown error occurred"}})
+
+    def _deliver(self, request: httpx.Request):
+        if request.method == "POST":
+            self.delivered[request.content] += 1
+
+
+def make_client(stub, resilient: bool) -> GraphClient:
+    governor = GraphRateGovernor(app_rate=10**6, page_rate=10**6)
+    if resilient:
+        policy = RetryPolicy(max_attempts=4, base_delay=0.02, max_delay=0.5)
+    else:
+        policy = RetryPolicy(max_attempts=1)
+    return GraphClient(
+        governor, api_version="v23.0", transport=stub.transport, deadline=10.0,
+        retry_policy=policy, breakers=CircuitBreakerRegistry(failure_threshold=10, recovery_time=0.5),
+    )
+
+
+async def mixed_load(client: GraphClient, n_requests: int, concurrency: int):
+    outcomes = Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            kind = "POST" if i % 4 == 0 else "GET"
+            try:
+                if kind == "POST":
+                    resp = await client.post(
+                        "1234/messages", params={"access_token": "page-token"},
+                        json={"recipient": {"id": "psid"}, "message": {"text": f"reply {i}"}},
+                        priority=GraphPriority.HIGH,
+                    )
+                else:
+                    resp = await client.get(f"{i % 50}/posts", params={"access_token": "page-token", "limit": 5})
+                outcomes[(kind, resp.status_code == 200)] += 1
+            except GraphUnavailableError:
+                outcomes[(kind, False)] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n_requests)))
+    return outcomes, time.perf_counter() - start
+
+
+async def competitor_analyses(client: GraphClient, runs: int):
+    set_graph_client(client)
+    keywords, max_pages = ["bakery", "coffee", "cake"], 5
+    complete, pages = 0, 0
+    for _ in range(runs):
+        try:
+            result = await FacebookController.analyze_competitors(keywords, "1234|app-secret", max_pages=max_pages)
+        except Exception:
+            continue
+        pages += len(result)
+        complete += len(result) == len(keywords) * max_pages
+    set_graph_client(None)
+    return complete, pages, runs * len(keywords) * max_pages
+
+
+async def scenario(resilient: bool, args):
+    stub = FaultyGraphStub(args.error_rate, latency=args.latency)
+    client = make_client(stub, resilient)
+    outcomes, elapsed = await mixed_load(client, args.requests, args.concurrency)
+    complete, pages, expected = await competitor_analyses(client, args.analyses)
+    await client.aclose()
+
+    ok = outcomes[("GET", True)] + outcomes[("POST", True)]
+    posts = outcomes[("POST", True)] + outcomes[("POST", False)]
+    gets = args.requests - posts
+    duplicates = sum(n - 1 for n in stub.delivered.values() if n > 1)
+    name = "resilient client" if resilient else "no retries      "
+    print(f"{name}: {ok / elapsed:7.0f} ok req/s   GET ok {outcomes[('GET', True)] / gets:6.1%}   "
+          f"POST ok {outcomes[('POST', True)] / posts:6.1%}   duplicated POSTs {duplicates}   "
+          f"analyses complete {complete}/{args.analyses} ({pages}/{expected} pages)   "
+          f"stub requests {stub.requests}, faults {dict(stub.faults)}")
+
+
+async def outage(args):
+    stub = FaultyGraphStub(0.0, outage_path="/search", latency=args.latency)
+    client = make_client(stub, resilient=True)
+    start = time.perf_counter()
+    fast_failures = 0
+    for _ in range(200):
+        try:
+            await client.get("search", params={"q": "x", "access_token": "1234|app-secret"}, priority=GraphPriority.LOW)
+        except GraphUnavailableError as exc:
+            fast_failures += exc.status_code == 503
+    elapsed = time.perf_counter() - start
+    healthy = await client.get("1/posts", params={"access_token": "page-token"})
+    await client.aclose()
+    print(f"outage of /search: 200 calls in {elapsed:.2f} s, {stub.faults['outage']} reached the stub, "
+          f"{fast_failures} failed fast with 503; other endpoints unaffected (GET 1/posts -> {healthy.status_code})")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--analyses", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.002)
+    args = parser.parse_args()
+    logging.getLogger("graph").setLevel(logging.ERROR)
+
+    print(f"{args.requests} requests (1/4 POST), concurrency {args.concurrency}, error rate {args.error_rate:.0%}")
+    asyncio.run(scenario(False, args))
+    asyncio.run(scenario(True, args))
+    asyncio.run(outage(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Throughput of the comment sentiment and topic analysis.
+
+A synthetic page of --comments comments over --posts posts (plus
+--messages Messenger messages) is built as Graph API payloads: short
+comments mixing sentiment words, negations, topic words and filler. It is
+analysed by `AnalyzerAgent.analyze` in batches of --batch-size, first on
+one core (thread executor), then on a process pool of --workers processes.
+
+Reports comments per second, per second per core, and the time of the
+merge (TF-IDF ranking) of the batch results.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_interaction_analysis [--comments 1000000] [--workers 4]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from src.agents.AnalyzerAgent import AnalyzerAgent
+from src.controllers import interaction_analysis as engine
+
+TOPICS = ["delivery", "sourdough", "croissant", "price", "staff", "opening", "parking", "coffee", "cake", "order",
+          "birthday", "weekend", "menu", "branch", "gluten"]
+FILLER = "the a and is was we our you this that it for with at to so very".split()
+POSITIVE = ["great", "love", "amazing", "delicious", "friendly", "perfect", "thanks", "\U0001f60d"]
+NEGATIVE = ["late", "cold", "rude", "expensive", "disappointed", "terrible", "\U0001f621"]
+
+
+def comment(rng) -> str:
+    words = rng.choices(FILLER, k=rng.randint(3, 9)) + rng.choices(TOPICS, k=rng.randint(1, 2))
+    roll = rng.random()
+    if roll < 0.45:
+        words.append(rng.choice(POSITIVE))
+    elif roll < 0.7:
+        words.append(rng.choice(NEGATIVE))
+    elif roll < 0.8:
+        words += ["not", rng.choice(POSITIVE)]
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+def page(args):
+    rng = random.Random(3)
+    per_post = args.comments // args.posts
+    posts = [{
+        "id": f"page_{i}",
+        "comments": {"data": [{"from": {"id": str(rng.randint(1, 10**6))}, "message": comment(rng)} for _ in range(per_post)]},
+    } for i in range(args.posts)]
+    conversations = [{"messages": {"data": [{"from": {"id": "customer"}, "message": comment(rng)}]}}
+                     for _ in range(args.messages)]
+    return posts, conversations
+
+
+async def run(agent: AnalyzerAgent, posts, conversations):
+    started = time.perf_counter()
+    result = await agent.analyze("page", posts, conversations)
+    return time.perf_counter() - started, result
+
+
+def main(args):
+    posts, conversations = page(args)
+    comments = sum(len(p["comments"]["data"]) for p in posts)
+    print(f"{comments:,} comments on {args.posts:,} posts, {args.messages:,} messages, "
+          f"{os.cpu_count()} CPUs available")
+
+    texts, groups, post_ids = engine.collect_texts(posts, conversations, "page")
+    started = time.perf_counter()
+    batches = [engine.score_batch(texts[s:e], groups[s:e], len(post_ids) + 1)
+               for s, e in engine.batch_bounds(len(texts), args.batch_size)]
+    scored = time.perf_counter() - started
+    started = time.perf_counter()
+    engine.merge_batches(batches, len(post_ids) + 1)
+    merged = time.perf_counter() - started
+    print(f"score_batch: {len(texts) / scored:,.0f} texts/s on one core; merge of {len(batches)} batches {merged:.2f} s")
+
+    with ThreadPoolExecutor(1) as threads:
+        wall, result = asyncio.run(run(AnalyzerAgent(executor=threads, batch_size=args.batch_size), posts, conversations))
+        print(f"1 core     : {wall:6.2f} s, {comments / wall:10,.0f} comments/s")
+        with ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context("spawn")) as processes:
+            list(processes.map(abs, range(args.workers)))  # start the processes before timing
+            agent = AnalyzerAgent(executor=threads, process_pool=processes, batch_size=args.batch_size, process_min_texts=0)
+            wall_p, _ = asyncio.run(run(agent, posts, conversations))
+        print(f"{args.workers} processes: {wall_p:6.2f} s, {comments / wall_p:10,.0f} comments/s "
+              f"({comments / wall_p / min(args.workers, os.cpu_count()):,.0f} per core used)")
+
+    overall = result.sentiment_breakdown["overall"]["shares"]
+    print(f"sentiment {overall}, page topics {result.topics}")
+    print(f"first post: {result.posts[0].sentiment['shares']} topics {result.posts[0].topics}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--comments", type=int, default=1_000_000)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=4)
+    main(parser.parse_args())
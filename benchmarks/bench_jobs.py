@@ -0,0 +1,135 @@
+"""
+Submission latency, de-duplication and crash recovery of the durable job
+runner (`JobRunner`), with jobs of a synthetic kind sleeping for their work.
+
+    submit    --submits jobs of each work size (--work seconds) are queued
+              and run by --workers runners; the submission latency (what
+              an HTTP request triggering the job waits for) is reported
+              with the time for all the jobs to finish
+    dedup     --duplicates identical submissions sent at once: one job is
+              queued, every caller gets its ID
+    recovery  a runner holding a job stops without releasing it (crash);
+              another runner takes the job over once its lease expired
+
+Needs a reachable MongoDB (MONGODB_URL from env or src/.env); everything is
+written to the `bench_jobs` database, dropped at the end.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_jobs [--submits 200] [--work 0.1 1 10] [--workers 4] [--lease 2]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.helpers.config import get_Settings
+from src.helpers.jobs import JobRunner, job_handler
+from src.models.enums.JobEnums import JobStatus
+
+DATABASE = "bench_jobs"
+
+
+@job_handler("bench_sleep")
+async def sleep_job(context, job, params):
+    steps = 10
+    for step in range(steps):
+        await asyncio.sleep(params["seconds"] / steps)
+        job.progress(step + 1, steps)
+    return {"slept": params["seconds"]}
+
+
+def runner(db, args, max_concurrent: int) -> JobRunner:
+    return JobRunner(db, max_concurrent=max_concurrent, lease_seconds=args.lease, poll_interval=0.2)
+
+
+async def wait_done(runners, job_ids, timeout: float) -> float:
+    started = time.perf_counter()
+    pending = set(job_ids)
+    while pending and time.perf_counter() - started < timeout:
+        await asyncio.sleep(0.05)
+        for job_id in list(pending):
+            job = await runners[0].get(job_id)
+            if job.done:
+                pending.discard(job_id)
+    return time.perf_counter() - started
+
+
+async def submit(db, args):
+    runners = [runner(db, args, args.concurrency) for _ in range(args.workers)]
+    for r in runners:
+        r.start()
+    try:
+        for seconds in args.work:
+            latencies, job_ids = [], []
+            for i in range(args.submits):
+                started = time.perf_counter()
+                job = await runners[i % len(runners)].submit("bench_sleep", {"seconds": seconds, "n": i})
+                latencies.append(time.perf_counter() - started)
+                job_ids.append(job.id)
+            latencies.sort()
+            drained = await wait_done(runners, job_ids, timeout=seconds * args.submits + 60)
+            print(f"work {seconds:6.1f} s/job: submit p50 {statistics.median(latencies) * 1000:6.2f} ms, "
+                  f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:6.2f} ms; "
+                  f"{args.submits} jobs done {drained:7.2f} s later")
+    finally:
+        for r in runners:
+            await r.close()
+
+
+async def dedup(db, args):
+    r = runner(db, args, args.concurrency)  # not started: the job stays pending
+    jobs = await asyncio.gather(*(r.submit("bench_sleep", {"seconds": 1.0, "n": "dup"}) for _ in range(args.duplicates)))
+    stored = await db["JOBS"].count_documents({"params.n": "dup"})
+    print(f"dedup: {args.duplicates} identical submissions -> {len({job.id for job in jobs})} job ID(s), "
+          f"{stored} job document(s)")
+
+
+async def recovery(db, args):
+    crashed = runner(db, args, 1)
+    crashed.start()
+    job = await crashed.submit("bench_sleep", {"seconds": args.lease * 2, "n": "crash"})
+    while (await crashed.get(job.id)).status != JobStatus.RUNNING:
+        await asyncio.sleep(0.05)
+    # crash: the runner stops without putting its job back in the queue
+    crashed._dispatcher.cancel()
+    for task in list(crashed._running.values()):
+        task.cancel()
+    crashed_at = time.perf_counter()
+
+    survivor = runner(db, args, 1)
+    survivor.start()
+    try:
+        while (await survivor.get(job.id)).record.leaseOwner != survivor.owner:
+            await asyncio.sleep(0.05)
+        taken_over = time.perf_counter() - crashed_at
+        await wait_done([survivor], [job.id], timeout=args.lease * 4 + 30)
+        final = await survivor.get(job.id)
+        print(f"recovery: job taken over {taken_over:.2f} s after the crash (lease {args.lease} s), "
+              f"{final.status.value} after {final.record.attempts} attempts")
+    finally:
+        await survivor.close()
+
+
+async def main(args):
+    client = AsyncIOMotorClient(get_Settings().MONGODB_URL)
+    db = client[DATABASE]
+    try:
+        await submit(db, args)
+        await dedup(db, args)
+        await recovery(db, args)
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--submits", type=int, default=200)
+    parser.add_argument("--work", type=float, nargs="+", default=[0.1, 1.0, 10.0], help="seconds of work per job")
+    parser.add_argument("--workers", type=int, default=4, help="runners (workers) sharing the queue")
+    parser.add_argument("--concurrency", type=int, default=50, help="jobs running at once per runner")
+    parser.add_argument("--duplicates", type=int, default=100)
+    parser.add_argument("--lease", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,132 @@
+"""
+Replayed agency workload against the stub provider, with and without the
+LLM response cache.
+
+--businesses businesses are served for --days days. Every day each of them
+gets a competitor summary (profile + weekly metrics, which change on a given
+day with probability --change-rate), --drafts post drafts on topics drawn
+from a small set, and a recommendation built from the profile and the
+metrics. The stub simulates a remote model (--first-token-ms, then --token-ms
+per token). Each day runs as a batch of concurrent generations; the
+in-memory tier is cleared between days (a restarted worker) when --mongo
+persists the responses, so the stored tier is exercised too.
+
+Reports wall time, tokens spent, hit rate, tokens and model time saved, and
+the latency of hits vs misses.
+
+Usage (from the repository root, with the app settings in env or src/.env):
+    python -m benchmarks.bench_llm_cache [--businesses 100] [--days 7] [--mongo]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.helpers.config import get_Settings
+from src.stores.LLMCache import LLMResponseCache, PromptTemplate
+from src.stores.LLMs import LLMClient
+from src.stores.providers.stub_provider import StubProvider
+
+DATABASE = "bench_llm_cache"
+TOPICS = ["new arrivals", "weekend offer", "behind the scenes", "customer story", "holiday hours", "tips"]
+
+SUMMARY = PromptTemplate("competitor_summary", "1", "You analyse Facebook competitors.",
+                         "Business: {profile}\nCompetitor metrics: {metrics}\nSummarize the competition.")
+DRAFT = PromptTemplate("post_draft", "1", "You write Facebook posts for {name}.",
+                       "Profile: {profile}\nWrite a post about: {topic}")
+RECOMMENDATION = PromptTemplate("recommendation", "1", "You advise small businesses.",
+                                "Profile: {profile}\nMetrics: {metrics}\nWhat should they do next week?")
+
+
+def businesses(n: int):
+    rng = random.Random(2)
+    return [{
+        "name": f"Shop {i}",
+        "profile": {"businessName": f"Shop {i}", "field": rng.choice(["Food", "Retail", "Sports"]),
+                    "businessKeyWords": rng.sample(["local", "eco", "coffee", "fitness", "fashion", "vegan"], 3)},
+        "metrics": {"avg_engagement": round(rng.uniform(10, 500), 1), "posts_per_week": rng.randint(1, 14)},
+    } for i in range(n)]
+
+
+def day_calls(shops, rng, args):
+    calls = []
+    for shop in shops:
+        if rng.random() < args.change_rate:
+            shop["metrics"] = {**shop["metrics"], "avg_engagement": round(rng.uniform(10, 500), 1)}
+        calls.append((SUMMARY, {"profile": shop["profile"], "metrics": shop["metrics"]}))
+        for topic in rng.sample(TOPICS, args.drafts):
+            calls.append((DRAFT, {"name": shop["name"], "profile": shop["profile"], "topic": topic}))
+        calls.append((RECOMMENDATION, {"profile": shop["profile"], "metrics": shop["metrics"]}))
+    return calls
+
+
+async def replay(args, cache):
+    provider = StubProvider(reply_tokens=args.tokens, first_token_latency=args.first_token_ms / 1000,
+                            token_latency=args.token_ms / 1000, max_concurrency=args.concurrency)
+    client = LLMClient({"stub": provider}, "stub", cache)
+    shops, rng = businesses(args.businesses), random.Random(9)
+    latencies = []
+
+    async def call(template, inputs):
+        started = time.perf_counter()
+        before = provider.stats["calls"]
+        await client.generate(template, inputs, max_tokens=args.tokens)
+        latencies.append((provider.stats["calls"] > before, time.perf_counter() - started))
+
+    started = time.perf_counter()
+    for _ in range(args.days):
+        if cache is not None and cache.collection is not None:
+            cache.invalidate()  # restarted worker: memory tier empty
+        await asyncio.gather(*(call(t, i) for t, i in day_calls(shops, rng, args)))
+    wall = time.perf_counter() - started
+    return wall, provider.stats, latencies
+
+
+def p50(values):
+    values = sorted(values)
+    return values[len(values) // 2] * 1000 if values else float("nan")
+
+
+async def main(args):
+    client = collection = None
+    if args.mongo:
+        client = AsyncIOMotorClient(get_Settings().MONGODB_URL)
+        collection = client[DATABASE]["LLM_CACHE"]
+        await collection.drop()
+    try:
+        wall, stats, _ = await replay(args, None)
+        tokens = stats["prompt_tokens"] + stats["completion_tokens"]
+        print(f"no cache  : {wall:6.1f} s, {stats['calls']:,} model calls, {tokens:,} tokens")
+
+        cache = LLMResponseCache(collection, max_entries=args.cache_size)
+        wall_c, stats_c, latencies = await replay(args, cache)
+        tokens_c = stats_c["prompt_tokens"] + stats_c["completion_tokens"]
+        hits = [t for missed, t in latencies if not missed]
+        misses = [t for missed, t in latencies if missed]
+        print(f"with cache: {wall_c:6.1f} s, {stats_c['calls']:,} model calls, {tokens_c:,} tokens "
+              f"({1 - tokens_c / tokens:.0%} fewer)")
+        print(f"hit rate {cache.hit_rate:.1%} (memory {cache.stats['memory_hits']:,}, stored {cache.stats['store_hits']:,}, "
+              f"coalesced {cache.stats['coalesced']:,}, misses {cache.stats['misses']:,}); "
+              f"saved {cache.stats['tokens_saved']:,} tokens and {cache.stats['seconds_saved']:,.0f} s of model time")
+        print(f"latency p50: hit {p50(hits):.2f} ms, miss {p50(misses):.0f} ms")
+    finally:
+        if client is not None:
+            await client.drop_database(DATABASE)
+            client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--businesses", type=int, default=100)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--drafts", type=int, default=3, help="drafts per business and day")
+    parser.add_argument("--change-rate", type=float, default=0.3, help="daily probability that metrics change")
+    parser.add_argument("--tokens", type=int, default=150)
+    parser.add_argument("--first-token-ms", type=float, default=200.0)
+    parser.add_argument("--token-ms", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--cache-size", type=int, default=2048)
+    parser.add_argument("--mongo", action="store_true", help="persist the responses (needs MongoDB)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,100 @@
+"""
+Offline benchmark of the LLM provider layer with the stub provider.
+
+--requests generations (a batch of drafts) are submitted at once to a stub
+provider simulating a remote model (--first-token-ms, then --token-ms per
+token, --tokens per reply), for each --concurrency limit:
+    wall time, throughput and latency percentiles of `complete`
+    time to first chunk of `stream` at the same load
+    event-loop lag meanwhile, sampled by a 10 ms ticker (API requests served
+    by the same worker wait at most this long)
+    overhead of the layer itself (semaphore, budget, timeout) per call, from
+    a zero-latency stub
+
+Usage (from the repository root, with the app settings in env or src/.env):
+    python -m benchmarks.bench_llm_provider [--requests 1000] [--concurrency 8,32,128]
+"""
+import argparse
+import asyncio
+import contextlib
+import time
+
+from src.stores.LLMs import TokenBudget
+from src.stores.providers.stub_provider import StubProvider
+
+
+def prompt(i: int):
+    return [
+        {"role": "system", "content": "You write short Facebook posts for a small business."},
+        {"role": "user", "content": f"Write post {i} about our new seasonal menu."},
+    ]
+
+
+async def loop_lag(stop: asyncio.Event, samples: list, interval: float = 0.01):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - started - interval)
+
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+async def run(args, concurrency: int):
+    provider = StubProvider(
+        reply_tokens=args.tokens, first_token_latency=args.first_token_ms / 1000, token_latency=args.token_ms / 1000,
+        max_concurrency=concurrency, timeout=600, budget=TokenBudget(),
+    )
+    latencies, first_chunks, lag = [], [], []
+    stop = asyncio.Event()
+    ticker = asyncio.ensure_future(loop_lag(stop, lag))
+
+    async def complete(i):
+        started = time.perf_counter()
+        await provider.complete(prompt(i), max_tokens=args.tokens)
+        latencies.append(time.perf_counter() - started)
+
+    async def stream(i):
+        started = time.perf_counter()
+        async with contextlib.aclosing(provider.stream(prompt(i), max_tokens=args.tokens)) as chunks:
+            async for _ in chunks:
+                first_chunks.append(time.perf_counter() - started)
+                break
+
+    started = time.perf_counter()
+    await asyncio.gather(*(complete(i) for i in range(args.requests)))
+    wall = time.perf_counter() - started
+    await asyncio.gather(*(stream(i) for i in range(args.requests)))
+    stop.set()
+    await ticker
+
+    print(f"concurrency {concurrency:>4}: {args.requests} drafts in {wall:6.2f} s ({args.requests / wall:7.1f}/s), "
+          f"latency p50 {pct(latencies, 0.5):8.0f} ms p99 {pct(latencies, 0.99):8.0f} ms, "
+          f"first chunk p50 {pct(first_chunks, 0.5):7.0f} ms, loop lag p99 {pct(lag, 0.99):5.2f} ms "
+          f"max {max(lag) * 1000:5.2f} ms")
+
+
+async def overhead(n: int):
+    provider = StubProvider(reply_tokens=1, budget=TokenBudget(tokens_per_minute=10**12, tokens_per_day=10**15))
+    started = time.perf_counter()
+    for i in range(n):
+        await provider.complete(prompt(i), max_tokens=1)
+    return (time.perf_counter() - started) / n * 1e6
+
+
+async def main(args):
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        await run(args, concurrency)
+    print(f"layer overhead (zero-latency stub, budget enforced): {await overhead(20_000):.1f} us/call")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", default="8,32,128")
+    parser.add_argument("--tokens", type=int, default=120, help="tokens per reply")
+    parser.add_argument("--first-token-ms", type=float, default=300.0)
+    parser.add_argument("--token-ms", type=float, default=5.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,106 @@
+"""
+Fan-out time and memory of a notification broadcast to many recipients.
+
+Seeds --recipients users into a scratch database, then sends one
+notification to all of them:
+    baseline    one insert_one per recipient (what N calls of
+                POST /notifications/ amount to, without the HTTP overhead),
+                run on --baseline-sample recipients and extrapolated
+    broadcast   the broadcast job (streamed user IDs, chunked unordered
+                insert_many, several chunks in flight)
+Peak Python heap (tracemalloc) and RSS growth are reported for the broadcast.
+
+Needs a reachable MongoDB (MONGODB_URL from env or src/.env); everything is
+written to the `bench_notification_broadcast` database, dropped at the end.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_notification_broadcast [--recipients 100000] [--chunk-size 1000] [--in-flight 4]
+"""
+import argparse
+import asyncio
+import resource
+import time
+import tracemalloc
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.controllers.notification_broadcast import broadcast_notifications
+from src.helpers.config import get_Settings
+from src.helpers.jobs import Job
+from src.models.db_schemas.Job import JobRecord
+from src.models.enums.DBEnums import DBEnums
+from src.models.schemas.NotificationSchemas import BroadcastRequest
+
+DATABASE = "bench_notification_broadcast"
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+
+
+async def seed(db, n: int) -> None:
+    users = db[DBEnums.COLLECTION_USER_NAME.value]
+    await users.drop()
+    batch = 10_000
+    for start in range(0, n, batch):
+        await users.insert_many([
+            {"_id": ObjectId(), "username": f"user {i}", "email": f"user{i}@example.com",
+             "hashPassword": "x" * 60, "accountStatus": "active"}
+            for i in range(start, min(n, start + batch))
+        ], ordered=False)
+
+
+async def baseline(db, sample: int) -> float:
+    notifications = db[DBEnums.COLLECTION_NOTIFICATION_NAME.value]
+    user_ids = [str(doc["_id"]) async for doc in db[DBEnums.COLLECTION_USER_NAME.value].find({}, {"_id": 1}).limit(sample)]
+    started = time.perf_counter()
+    for user_id in user_ids:
+        await notifications.insert_one({"title": "Benchmark announcement", "content": "A new feature is live.",
+                                        "seen": False, "user_id": user_id})
+    elapsed = time.perf_counter() - started
+    await notifications.delete_many({})
+    return elapsed / len(user_ids)
+
+
+async def main(args):
+    settings = get_Settings()
+    client = AsyncIOMotorClient(settings.MONGODB_URL, maxPoolSize=settings.MONGODB_MAX_POOL_SIZE)
+    db = client[DATABASE]
+    try:
+        print(f"seeding {args.recipients} users ...")
+        await seed(db, args.recipients)
+
+        per_call = await baseline(db, args.baseline_sample)
+        print(f"baseline  insert_one per recipient: {per_call * 1000:.3f} ms each -> "
+              f"{per_call * args.recipients:.1f} s for {args.recipients} (extrapolated from {args.baseline_sample})")
+
+        req = BroadcastRequest(title="Benchmark announcement", content="A new feature is live.",
+                               target={"kind": "all"})
+        job = Job(JobRecord(kind="notification_broadcast"))
+        rss_before = rss_mb()
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = await broadcast_notifications(db, req, job, chunk_size=args.chunk_size, max_in_flight=args.in_flight)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"broadcast chunk {args.chunk_size} x {args.in_flight} in flight: {elapsed:.2f} s "
+              f"({result['inserted'] / elapsed:,.0f} notifications/s), peak heap {peak / 2**20:.1f} MB, "
+              f"RSS +{rss_mb() - rss_before:.1f} MB, result {result}")
+
+        stored = await db[DBEnums.COLLECTION_NOTIFICATION_NAME.value].count_documents({})
+        print(f"stored notifications: {stored}")
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipients", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--in-flight", type=int, default=4)
+    parser.add_argument("--baseline-sample", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,294 @@
+"""
+Notification streams: how many idle SSE subscribers one worker holds, and
+the publish-to-deliver latency of the notification hub.
+
+Modes:
+    default   subscribers are consumer tasks reading `NotificationHub.stream`
+              in this process (cost of the hub itself, no sockets).
+    --http    a uvicorn worker serving `hub.stream` as text/event-stream is
+              started in a subprocess; the subscribers are real HTTP
+              connections, notifications are published with POST /publish.
+    --mongo   cross-worker path: a hub follows the notification collection
+              through a change stream while another client inserts the
+              notifications (needs a replica set, e.g. a single-node
+              `mongod --replSet rs0`, URL from --mongo).
+
+Latency is measured from the publish (or insert) call to the frame being
+read by the subscriber.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_notification_stream [--subscribers 10000] [--users 2000] [--notifications 2000]
+    python -m benchmarks.bench_notification_stream --http --subscribers 2000
+    python -m benchmarks.bench_notification_stream --mongo "mongodb://localhost:27017/?replicaSet=rs0"
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import httpx
+from bson import ObjectId
+
+from src.helpers.notification_hub import NotificationHub
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+
+
+def document(user_id: str) -> dict:
+    return {
+        "_id": ObjectId(),
+        "title": "Benchmark notification",
+        "content": json.dumps({"sent_at": time.time()}),
+        "seen": False,
+        "user_id": user_id,
+    }
+
+
+def sent_at(frame: bytes) -> float:
+    data = frame.split(b"data: ", 1)[1]
+    return json.loads(json.loads(data)["content"])["sent_at"]
+
+
+def report(title: str, latencies, extra: str = "") -> None:
+    latencies = sorted(latencies)
+    if not latencies:
+        print(f"{title}: no deliveries {extra}")
+        return
+    q = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    print(
+        f"{title}: {len(latencies)} deliveries  p50 {q(0.50):.3f} ms  p99 {q(0.99):.3f} ms  "
+        f"max {latencies[-1] * 1000:.3f} ms  mean {statistics.mean(latencies) * 1000:.3f} ms {extra}"
+    )
+
+
+# ---------------- In-process hub ---------------- #
+
+async def consume(hub: NotificationHub, user_id: str, latencies: list, ready: asyncio.Event = None):
+    async for frame in hub.stream(user_id):
+        if frame.startswith(b"id: "):
+            latencies.append(time.time() - sent_at(frame))
+        elif ready is not None and frame.startswith(b"retry:"):
+            ready.set()
+
+
+async def run_in_process(args):
+    hub = NotificationHub(queue_size=args.queue_size, keepalive_interval=args.keepalive)
+    hub.start()
+    users = [str(ObjectId()) for _ in range(args.users)]
+    latencies = []
+
+    gc.collect()
+    tracemalloc.start()
+    rss_before = rss_mb()
+    started = time.perf_counter()
+    tasks = [
+        asyncio.ensure_future(consume(hub, users[i % len(users)], latencies))
+        for i in range(args.subscribers)
+    ]
+    await asyncio.sleep(0.1)
+    elapsed = time.perf_counter() - started
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{hub.subscriber_count} idle subscribers in {elapsed:.2f}s: "
+        f"{traced / args.subscribers / 1024:.2f} KiB/subscriber (Python heap), "
+        f"RSS +{rss_mb() - rss_before:.1f} MB"
+    )
+
+    # idle period: only the single keep-alive task runs
+    cpu_before = time.process_time()
+    await asyncio.sleep(args.idle)
+    print(f"idle {args.idle:.0f}s with keep-alive every {args.keepalive:.0f}s: "
+          f"{(time.process_time() - cpu_before) / args.idle * 100:.2f}% CPU")
+
+    rng = random.Random(1)
+    interval = 1 / args.rate
+    for _ in range(args.notifications):
+        hub.publish(document(rng.choice(users)))
+        await asyncio.sleep(interval)
+    await asyncio.sleep(0.2)
+    report("publish -> deliver", latencies, f"({args.rate:.0f} notifications/s, fan-out "
+           f"{args.subscribers / args.users:.0f} streams/user)")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await hub.close()
+    print(f"after disconnect: {hub.subscriber_count} subscribers, stats {hub.stats}")
+
+
+# ---------------- HTTP (uvicorn worker) ---------------- #
+
+SERVER_APP = """
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from src.helpers.notification_hub import NotificationHub
+
+hub = NotificationHub(keepalive_interval={keepalive})
+app = FastAPI(on_startup=[hub.start])
+
+@app.get("/stream/{{user_id}}")
+async def stream(user_id: str):
+    return StreamingResponse(hub.stream(user_id), media_type="text/event-stream")
+
+@app.post("/publish")
+async def publish(request: Request):
+    doc = await request.json()
+    return {{"delivered": hub.publish(doc)}}
+
+@app.get("/stats")
+async def stats():
+    import resource
+    return {{"subscribers": hub.subscriber_count,
+             "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def http_subscriber(client: httpx.AsyncClient, url: str, latencies: list, connected: list):
+    async with client.stream("GET", url) as response:
+        connected.append(1)
+        buffer = b""
+        async for chunk in response.aiter_bytes():
+            buffer += chunk
+            while b"\n\n" in buffer:
+                frame, buffer = buffer.split(b"\n\n", 1)
+                if frame.startswith(b"id: "):
+                    latencies.append(time.time() - sent_at(frame))
+
+
+async def run_http(args):
+    port = free_port()
+    module = "bench_sse_app"
+    path = os.path.join("/tmp", module + ".py")
+    with open(path, "w") as f:
+        f.write(SERVER_APP.format(keepalive=args.keepalive))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{module}:app", "--port", str(port), "--log-level", "warning",
+         "--backlog", "4096"],
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(["/tmp", os.getcwd()])},
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        limits = httpx.Limits(max_connections=args.subscribers + 10, max_keepalive_connections=0)
+        async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+            for _ in range(100):
+                try:
+                    idle_stats = (await client.get(f"{base}/stats")).json()
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+
+            users = [str(ObjectId()) for _ in range(args.users)]
+            latencies, connected = [], []
+            started = time.perf_counter()
+            tasks = [
+                asyncio.ensure_future(http_subscriber(client, f"{base}/stream/{users[i % len(users)]}",
+                                                      latencies, connected))
+                for i in range(args.subscribers)
+            ]
+            while len(connected) < args.subscribers and not any(t.done() for t in tasks):
+                await asyncio.sleep(0.05)
+            elapsed = time.perf_counter() - started
+            failed = [t for t in tasks if t.done()]
+            await asyncio.sleep(1)
+            stats = (await client.get(f"{base}/stats")).json()
+            print(
+                f"{stats['subscribers']} open SSE connections in {elapsed:.2f}s "
+                f"({len(failed)} failed): server RSS {idle_stats['rss_mb']:.0f} -> {stats['rss_mb']:.0f} MB "
+                f"({(stats['rss_mb'] - idle_stats['rss_mb']) * 1024 / max(1, stats['subscribers']):.1f} KiB/connection)"
+            )
+
+            rng = random.Random(1)
+            for _ in range(args.notifications):
+                doc = document(rng.choice(users))
+                doc["_id"] = str(doc["_id"])
+                await client.post(f"{base}/publish", json=doc)
+                await asyncio.sleep(1 / args.rate)
+            await asyncio.sleep(0.5)
+            report("POST /publish -> SSE frame", latencies, f"({args.rate:.0f} notifications/s)")
+
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        server.terminate()
+        server.wait()
+        os.remove(path)
+
+
+# ---------------- Cross-worker (change stream) ---------------- #
+
+async def run_mongo(args):
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    reader = AsyncIOMotorClient(args.mongo)   # the worker holding the streams
+    writer = AsyncIOMotorClient(args.mongo)   # the worker creating the notifications
+    collection = reader["bench_notification_stream"]["NOTIFICATION"]
+    await collection.drop()
+
+    hub = NotificationHub()
+    hub.start(collection)
+    users = [str(ObjectId()) for _ in range(args.users)]
+    latencies = []
+    tasks = [asyncio.ensure_future(consume(hub, users[i % len(users)], latencies))
+             for i in range(min(args.subscribers, 1000))]
+    await asyncio.sleep(1)  # change stream opened
+
+    target = writer["bench_notification_stream"]["NOTIFICATION"]
+    rng = random.Random(1)
+    for _ in range(args.notifications):
+        await target.insert_one(document(rng.choice(users)))
+        await asyncio.sleep(1 / args.rate)
+    await asyncio.sleep(1)
+    report("insert (other client) -> change stream -> deliver", latencies, f"({args.rate:.0f} inserts/s)")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await hub.close()
+    await collection.drop()
+    reader.close()
+    writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--notifications", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=500.0, help="notifications per second")
+    parser.add_argument("--queue-size", type=int, default=100)
+    parser.add_argument("--keepalive", type=float, default=15.0)
+    parser.add_argument("--idle", type=float, default=30.0, help="seconds of idle measurement")
+    parser.add_argument("--http", action="store_true")
+    parser.add_argument("--mongo", default=None, help="replica set URL for the change stream mode")
+    args = parser.parse_args()
+
+    if args.mongo:
+        asyncio.run(run_mongo(args))
+    elif args.http:
+        asyncio.run(run_http(args))
+    else:
+        asyncio.run(run_in_process(args))
+
+
+if __name__ == "__main__":
+    main()
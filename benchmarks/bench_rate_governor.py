@@ -0,0 +1,107 @@
+"""
+Scenario: background competitor scans competing with user-facing replies
+for the same Graph quota, against the local Graph stub (benchmarks/graph_stub.py).
+
+Without the governor the scans exhaust the app quota and replies start
+failing with throttling errors; with it the scans are paced by the usage
+headers and queued behind replies, which keep succeeding.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_rate_governor [--scans 400] [--replies 60]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.graph_stub import GraphStub
+from src.helpers.graph_client import GraphClient
+from src.helpers.rate_limit import GraphRateGovernor, GraphPriority
+
+
+class NoGovernor:
+    """Sends every call immediately (previous behaviour)."""
+
+    async def acquire(self, page_key=None, priority=GraphPriority.NORMAL):
+        return None
+
+    def observe(self, headers, page_key=None, error_code=None):
+        return None
+
+
+async def run(governor, args):
+    stub = GraphStub(
+        app_calls_per_window=args.app_quota,
+        page_calls_per_window=args.page_quota,
+        window=args.window,
+        latency=args.latency,
+    )
+    client = GraphClient(governor, api_version="v23.0", transport=stub.transport)
+    results = {GraphPriority.LOW: [], GraphPriority.HIGH: []}
+
+    async def call(priority, method, path, **kwargs):
+        start = time.perf_counter()
+        response = await client.request(method, path, priority=priority, **kwargs)
+        results[priority].append((response.status_code == 200, time.perf_counter() - start))
+
+    async def scans():
+        await asyncio.gather(*(
+            call(GraphPriority.LOW, "GET", f"competitor_{i % 50}/posts",
+                 params={"access_token": "1234|app-secret", "limit": 10})
+            for i in range(args.scans)
+        ))
+
+    async def replies():
+        tasks = []
+        for i in range(args.replies):
+            tasks.append(asyncio.create_task(call(
+                GraphPriority.HIGH, "POST", "me/messages",
+                params={"access_token": f"page-token-{i % 3}"},
+                json={"recipient": {"id": "psid"}, "message": {"text": "Thanks!"}},
+            )))
+            await asyncio.sleep(args.reply_interval)
+        await asyncio.gather(*tasks)
+
+    start = time.perf_counter()
+    await asyncio.gather(scans(), replies())
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+    return stub, results, elapsed
+
+
+def report(name, stub, results, elapsed):
+    print(f"{name}: {elapsed:.2f} s, {stub.requests} requests, {stub.throttled} throttled by the stub")
+    for priority, rows in results.items():
+        ok = sum(1 for success, _ in rows if success)
+        latencies = sorted(latency for _, latency in rows)
+        p95 = latencies[int(0.95 * (len(latencies) - 1))]
+        print(f"  {priority.name:<5} {ok:4d}/{len(rows):<4d} ok   "
+              f"p50 {statistics.median(latencies) * 1000:8.1f} ms   p95 {p95 * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scans", type=int, default=400)
+    parser.add_argument("--replies", type=int, default=60)
+    parser.add_argument("--reply-interval", type=float, default=0.05)
+    parser.add_argument("--app-quota", type=int, default=200, help="app calls allowed per window")
+    parser.add_argument("--page-quota", type=int, default=40, help="calls allowed per page token per window")
+    parser.add_argument("--window", type=float, default=2.0, help="stub usage window in seconds")
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    stub, results, elapsed = asyncio.run(run(NoGovernor(), args))
+    report("without governor", stub, results, elapsed)
+
+    governor = GraphRateGovernor(
+        app_rate=args.app_quota / args.window,
+        page_rate=args.page_quota / args.window,
+        throttle_backoff=args.window,
+        usage_ttl=args.window / 4,
+    )
+    stub, results, elapsed = asyncio.run(run(governor, args))
+    report("with governor   ", stub, results, elapsed)
+
+
+if __name__ == "__main__":
+    main()
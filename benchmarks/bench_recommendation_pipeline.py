@@ -0,0 +1,135 @@
+"""
+Latency of the recommendation pipeline (`FacebookController.generate_recommendations`
+then `RecommenderAgent.recommend`) against the Graph stub and the stub LLM provider.
+
+The stub answers the page feed and inbox calls (interaction stage) after
+--interactions-ms with --comments comments, and the competitor search and
+competitor posts calls (competitor stage, searching the field, --keywords
+named competitors and the business keywords) after
+--competitors-ms. Each stage is first timed alone, then the inputs are
+gathered sequentially (one stage after the other) and with the stages
+running concurrently, and again once the stage cache is warm.
+
+Reports the latency of each stage, of the sequential and concurrent
+pipelines (the concurrent one should be close to the slowest stage, not the
+sum), of the model call, and the stage cache counters.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_recommendation_pipeline [--interactions-ms 300] [--competitors-ms 150]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+
+from benchmarks.graph_stub import GraphStub
+from src.agents.AnalyzerAgent import AnalyzerAgent
+from src.agents.RecommenderAgent import RecommenderAgent
+from src.controllers.facebook import FacebookController
+from src.helpers.graph_client import GraphClient, set_graph_client
+from src.helpers.rate_limit import GraphRateGovernor
+from src.helpers.stage_cache import StageCache
+from src.stores.LLMs import LLMClient
+from src.stores.providers.stub_provider import StubProvider
+
+PAGE_ID, TOKEN = "100001", "page-token"
+WORDS = "great love late cold price delivery sourdough staff thanks not the and was our very".split()
+PROFILE = {
+    "businessName": "Corner Bakery",
+    "field": "Food",
+    "description": "A family bakery baking bread, pastries and cakes every morning.",
+    "competitors": ["bakery", "patisserie", "coffee shop", "cake shop"],
+    "businessKeyWords": ["bakery", "bread", "local"],
+}
+
+
+class PipelineGraphStub(GraphStub):
+    """Graph stub with a latency per pipeline stage and a commented page feed."""
+
+    def __init__(self, interactions: float, competitors: float, comments: int):
+        super().__init__(app_calls_per_window=10**9, page_calls_per_window=10**9, latency=0)
+        self.interactions = interactions
+        self.competitors = competitors
+        rng = random.Random(5)
+        self.feed = [{
+            "id": f"{PAGE_ID}_{i}",
+            "comments": {"data": [
+                {"from": {"id": str(rng.randint(1, 10**6))}, "message": " ".join(rng.choices(WORDS, k=8))}
+                for _ in range(comments // 50)
+            ]},
+        } for i in range(50)]
+
+    def body(self, request: httpx.Request):
+        edge = request.url.path.rstrip("/").split("/")[-1]
+        if edge == "feed":
+            return {"data": self.feed}
+        if edge == "conversations":
+            return {"data": []}
+        return super().body(request)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        edge = request.url.path.rstrip("/").split("/")[-1]
+        await asyncio.sleep(self.interactions if edge in ("feed", "conversations") else self.competitors)
+        return await super().handle(request)
+
+
+async def timed(coro):
+    started = time.perf_counter()
+    result = await coro
+    return time.perf_counter() - started, result
+
+
+async def run(args):
+    stub = PipelineGraphStub(args.interactions_ms / 1000, args.competitors_ms / 1000, args.comments)
+    client = GraphClient(GraphRateGovernor(app_rate=10**6, page_rate=10**6), "v23.0", transport=stub.transport)
+    set_graph_client(client)
+    analyzer = AnalyzerAgent()
+    profile = dict(PROFILE, competitors=PROFILE["competitors"][:args.keywords])
+    keywords = FacebookController.competitor_keywords(profile)
+    await analyzer.analyze_page(PAGE_ID, TOKEN)  # import the engine before timing
+
+    interactions, _ = await timed(analyzer.analyze_page(PAGE_ID, TOKEN))
+    competitors, _ = await timed(FacebookController.analyze_competitors(keywords, TOKEN, max_pages=3))
+    print(f"interaction stage : {interactions * 1000:7.0f} ms")
+    print(f"competitor stage  : {competitors * 1000:7.0f} ms ({len(keywords)} keyword searches)")
+
+    async def sequential():
+        await analyzer.analyze_page(PAGE_ID, TOKEN)
+        await FacebookController.analyze_competitors(keywords, TOKEN, max_pages=3)
+
+    wall, _ = await timed(sequential())
+    print(f"sequential stages : {wall * 1000:7.0f} ms")
+
+    cache = StageCache({"interactions": 900.0, "competitors": 6 * 3600.0})
+    cold, inputs = await timed(FacebookController.generate_recommendations(
+        PAGE_ID, TOKEN, profile, analyzer=analyzer, stage_cache=cache))
+    warm, _ = await timed(FacebookController.generate_recommendations(
+        PAGE_ID, TOKEN, profile, analyzer=analyzer, stage_cache=cache))
+    print(f"concurrent stages : {cold * 1000:7.0f} ms "
+          f"(slowest stage {max(interactions, competitors) * 1000:.0f} ms, sum {(interactions + competitors) * 1000:.0f} ms)")
+    print(f"warm stage cache  : {warm * 1000:7.2f} ms")
+
+    provider = StubProvider(reply_tokens=args.tokens, first_token_latency=args.first_token_ms / 1000,
+                            token_latency=args.token_ms / 1000)
+    agent = RecommenderAgent(LLMClient({"stub": provider}, "stub"), max_tokens=args.tokens)
+    llm, recommendations = await timed(agent.recommend("user", inputs))
+    print(f"model call        : {llm * 1000:7.0f} ms, {len(recommendations)} recommendation(s)")
+    print(f"end to end (cold) : {(cold + llm) * 1000:7.0f} ms vs {(wall + llm) * 1000:.0f} ms sequential")
+    print(f"stage cache: {cache.stats}; Graph calls {stub.requests}")
+
+    set_graph_client(None)
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--interactions-ms", type=float, default=300)
+    parser.add_argument("--competitors-ms", type=float, default=150)
+    parser.add_argument("--comments", type=int, default=20_000)
+    parser.add_argument("--keywords", type=int, default=4)
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--first-token-ms", type=float, default=400)
+    parser.add_argument("--token-ms", type=float, default=2)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,179 @@
+"""
+Working-set size and hot query latency before and after applying the
+retention policies on a seeded dataset.
+
+Seeds a scratch database with --users users, each with a history of
+notifications (mostly old and seen), drafts (a share of them old and
+rejected) and analyses spread over two years. Then:
+    before   collection/index sizes, WiredTiger cache usage and the latency
+             of the hot per-user queries (latest notifications, unread
+             count, drafts, latest analyses)
+    apply    the seen-notification TTL index (the TTL monitor is set to run
+             every second) and the archiver for posts and analyses
+    after    the same measurements (collections are compacted first so the
+             freed space shows in the sizes)
+
+Needs a reachable MongoDB (MONGODB_URL from env or src/.env) where the
+benchmark may run `setParameter` and `compact`; everything is written to
+the `bench_retention` database, dropped at the end.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_retention [--users 2000] [--notifications 200] [--posts 50] [--analyses 30]
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DESCENDING
+
+from src.helpers.config import get_Settings
+from src.helpers.retention import Archiver, RetentionPolicy, ensure_ttl_index, NOTIFICATION_TTL_INDEX
+from src.models.db_schemas.Analysis import Analysis
+from src.models.db_schemas.Notification import Notification
+from src.models.db_schemas.Post import Post
+from src.models.enums.DBEnums import DBEnums
+from src.models.enums.PostEnums import PostStatus
+
+DATABASE = "bench_retention"
+NOTIFICATIONS = DBEnums.COLLECTION_NOTIFICATION_NAME.value
+POSTS = DBEnums.COLLECTION_POST_NAME.value
+ANALYSES = DBEnums.COLLECTION_ANALYTICS_NAME.value
+
+
+async def seed(db, args, users):
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    age = lambda: now - timedelta(days=rng.uniform(0, 730))
+    for name, schema in ((NOTIFICATIONS, Notification), (POSTS, Post), (ANALYSES, Analysis)):
+        await db[name].drop()
+        for index in schema.get_indexes():
+            await db[name].create_index(index["key"], name=index["name"])
+
+    for user_id in users:
+        notifications = []
+        for _ in range(args.notifications):
+            created = age()
+            notifications.append({"title": "Weekly engagement report", "content": "x" * 300, "user_id": user_id,
+                                  "createdAt": created, "seen": (now - created).days > 7 or rng.random() < 0.5})
+        posts = [{"title": "Draft", "content": "x" * 1500, "user_id": user_id, "createdAt": age(),
+                  "status": rng.choice([PostStatus.DRAFT, PostStatus.ACCEPTED, PostStatus.REJECTED, PostStatus.REJECTED]).value,
+                  "userFeedback": 0.0, "comments": []}
+                 for _ in range(args.posts)]
+        analyses = [{"user_id": user_id, "analysisType": "competitor", "content": "x" * 3000, "createdAt": age()}
+                    for _ in range(args.analyses)]
+        await db[NOTIFICATIONS].insert_many(notifications, ordered=False)
+        await db[POSTS].insert_many(posts, ordered=False)
+        await db[ANALYSES].insert_many(analyses, ordered=False)
+
+
+async def measure(db, users, samples: int):
+    sizes = {}
+    for name in (NOTIFICATIONS, POSTS, ANALYSES):
+        stats = await db.command("collStats", name)
+        sizes[name] = (stats["count"], stats["size"], stats["storageSize"], stats["totalIndexSize"])
+    status = await db.client.admin.command("serverStatus")
+    cache_bytes = status.get("wiredTiger", {}).get("cache", {}).get("bytes currently in the cache", 0)
+
+    rng = random.Random(1)
+    queries = {
+        "latest notifications": lambda u: db[NOTIFICATIONS].find({"user_id": u}).sort("createdAt", DESCENDING).limit(20).to_list(20),
+        "unread count": lambda u: db[NOTIFICATIONS].count_documents({"user_id": u, "seen": False}),
+        "user drafts": lambda u: db[POSTS].find({"user_id": u, "status": PostStatus.DRAFT.value}).to_list(None),
+        "latest analyses": lambda u: db[ANALYSES].find({"user_id": u}).sort("createdAt", DESCENDING).limit(5).to_list(5),
+    }
+    latencies = {}
+    for name, query in queries.items():
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            await query(rng.choice(users))
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        latencies[name] = (statistics.median(timings) * 1000, timings[int(0.99 * len(timings))] * 1000)
+    return sizes, cache_bytes, latencies
+
+
+def report(title, measurement):
+    sizes, cache_bytes, latencies = measurement
+    print(f"--- {title}")
+    total = 0
+    for name, (count, size, storage, index) in sizes.items():
+        total += size + index
+        print(f"{name:>14}: {count:>9,} docs  data {size / 2**20:8.1f} MB  storage {storage / 2**20:8.1f} MB  "
+              f"indexes {index / 2**20:6.1f} MB")
+    print(f"{'working set':>14}: {total / 2**20:.1f} MB (data + indexes), WiredTiger cache {cache_bytes / 2**20:.1f} MB")
+    for name, (p50, p99) in latencies.items():
+        print(f"{name:>22}: p50 {p50:.2f} ms  p99 {p99:.2f} ms")
+
+
+async def wait_for_ttl(db, seen_before: datetime, timeout: float = 120.0):
+    started = time.perf_counter()
+    query = {"seen": True, "createdAt": {"$lt": seen_before}}
+    while time.perf_counter() - started < timeout:
+        if not await db[NOTIFICATIONS].count_documents(query, limit=1):
+            return time.perf_counter() - started
+        await asyncio.sleep(1)
+    raise TimeoutError("TTL monitor did not remove the expired notifications in time")
+
+
+async def main(args):
+    settings = get_Settings()
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[DATABASE]
+    archive_dir = tempfile.mkdtemp(prefix="bench_retention_")
+    users = [str(ObjectId()) for _ in range(args.users)]
+    try:
+        print("seeding ...")
+        await seed(db, args, users)
+        report("before", await measure(db, users, args.samples))
+
+        try:
+            await client.admin.command("setParameter", 1, ttlMonitorSleepSecs=1)
+        except Exception as e:
+            print(f"could not speed up the TTL monitor ({e}), waiting for its regular 60 s pass")
+        started = time.perf_counter()
+        await ensure_ttl_index(db[NOTIFICATIONS], NOTIFICATION_TTL_INDEX, "createdAt",
+                               args.notification_days * 86400, partial_filter={"seen": True})
+        ttl_seconds = await wait_for_ttl(db, datetime.now(timezone.utc) - timedelta(days=args.notification_days),
+                                         timeout=max(120.0, args.users / 10))
+        print(f"TTL removed the seen notifications older than {args.notification_days} days in ~{ttl_seconds:.0f} s")
+
+        archiver = Archiver(db, archive_dir, batch_size=1000)
+        result = await archiver.run([
+            RetentionPolicy(POSTS, args.post_days, {"status": PostStatus.REJECTED.value}),
+            RetentionPolicy(ANALYSES, args.analysis_days),
+        ])
+        archived_bytes = sum(
+            os.path.getsize(r["file"]) for r in result["collections"].values() if r["file"]
+        )
+        print(f"archived {result['archived']:,} documents into {archived_bytes / 2**20:.1f} MB of gzip files "
+              f"in {time.perf_counter() - started:.1f} s total")
+
+        for name in (NOTIFICATIONS, POSTS, ANALYSES):
+            await db.command("compact", name)
+        report("after", await measure(db, users, args.samples))
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+        shutil.rmtree(archive_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--notifications", type=int, default=200, help="per user")
+    parser.add_argument("--posts", type=int, default=50, help="per user")
+    parser.add_argument("--analyses", type=int, default=30, help="per user")
+    parser.add_argument("--samples", type=int, default=500, help="timed queries per query type")
+    parser.add_argument("--notification-days", type=int, default=90)
+    parser.add_argument("--post-days", type=int, default=30)
+    parser.add_argument("--analysis-days", type=int, default=180)
+    asyncio.run(main(parser.parse_args()))
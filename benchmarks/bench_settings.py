@@ -0,0 +1,78 @@
+"""
+Micro-benchmark: per-request cost of reading the settings, re-parsed on
+every call (previous `get_Settings`) vs. the cached snapshot.
+
+Measures `get_Settings()` itself, a model instantiation (every model reads
+the settings in `BaseModel.__init__`) and an in-process request to
+GET /auth/config, which injects the settings with `Depends(get_Settings)`.
+
+Usage (from the repository root, with the app settings in env or src/.env):
+    python -m benchmarks.bench_settings [--requests 2000]
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.helpers import config
+from src.helpers.config import Settings, get_Settings
+from src.models import BaseModel as base_model
+from src.models.NotificationModel import NotificationModel
+
+
+def per_call(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def per_request(app, n: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/auth/config")
+        start = time.perf_counter()
+        for _ in range(n):
+            response = await client.get("/auth/config")
+            assert response.status_code == 200
+        return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    from src.main import app
+    db_client = AsyncIOMotorClient(get_Settings().MONGODB_URL, connect=False)
+
+    rows = []
+    # previous behaviour: a new Settings() parse for every call
+    base_model.get_Settings = Settings
+    app.dependency_overrides[get_Settings] = lambda: Settings()
+    rows.append((
+        "re-parsed",
+        per_call(Settings, args.calls),
+        per_call(lambda: NotificationModel(db_client), args.calls),
+        asyncio.run(per_request(app, args.requests)),
+    ))
+
+    base_model.get_Settings = config.get_Settings
+    app.dependency_overrides.clear()
+    rows.append((
+        "cached",
+        per_call(get_Settings, args.calls),
+        per_call(lambda: NotificationModel(db_client), args.calls),
+        asyncio.run(per_request(app, args.requests)),
+    ))
+
+    print(f"{'':<10} {'get_Settings':>14} {'model __init__':>16} {'GET /auth/config':>18}")
+    for name, settings_us, model_us, request_us in rows:
+        print(f"{name:<10} {settings_us:11.1f} us {model_us:13.1f} us {request_us:15.1f} us")
+
+
+if __name__ == "__main__":
+    main()
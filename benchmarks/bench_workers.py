@@ -0,0 +1,156 @@
+"""
+Throughput scaling of the production server (run.py) from 1 to N workers
+on the drafts and notification listing endpoints.
+
+Needs a reachable MongoDB (MONGODB_URL / MONGODB_DATABASE from env or
+src/.env). With --seed, drafts and notifications are inserted for a
+benchmark user first. The load is generated by --load-procs processes,
+each keeping --concurrency / --load-procs requests in flight.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_workers --seed [--max-workers 8] [--duration 10]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+import httpx
+
+BENCH_USER_ID = "65f0000000000000000be7c4"
+
+
+def seed(n_docs: int):
+    from pymongo import MongoClient
+    from src.helpers.config import get_Settings
+    from src.models.enums.DBEnums import DBEnums
+
+    settings = get_Settings()
+    db = MongoClient(settings.MONGODB_URL)[settings.MONGODB_DATABASE]
+    now = datetime.now(timezone.utc)
+    db[DBEnums.COLLECTION_POST_NAME.value].delete_many({"user_id": BENCH_USER_ID})
+    db[DBEnums.COLLECTION_NOTIFICATION_NAME.value].delete_many({"user_id": BENCH_USER_ID})
+    db[DBEnums.COLLECTION_POST_NAME.value].insert_many([
+        {"title": f"Draft {i}", "content": "x" * 200, "status": "DRAFT", "userFeedback": 0.0,
+         "comments": [], "createdAt": now, "user_id": BENCH_USER_ID}
+        for i in range(n_docs)
+    ])
+    db[DBEnums.COLLECTION_NOTIFICATION_NAME.value].insert_many([
+        {"title": f"Notification {i:04d}", "content": "New draft ready for review", "seen": False,
+         "createdAt": now, "user_id": BENCH_USER_ID}
+        for i in range(n_docs)
+    ])
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "run.py", "--workers", str(workers), "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/auth/config", timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+def stop_server(process: subprocess.Popen) -> int:
+    process.send_signal(signal.SIGTERM)
+    return process.wait(timeout=60)
+
+
+async def _load(url: str, concurrency: int, duration: float):
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        end = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < end:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def load_process(args):
+    return asyncio.run(_load(*args))
+
+
+def measure(url: str, concurrency: int, duration: float, procs: int):
+    per_proc = max(1, concurrency // procs)
+    with multiprocessing.Pool(procs) as pool:
+        results = pool.map(load_process, [(url, per_proc, duration)] * procs)
+    latencies = sorted(l for lat, _ in results for l in lat)
+    errors = sum(e for _, e in results)
+    return {
+        "rps": len(latencies) / duration,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(0.99 * (len(latencies) - 1))] * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--load-procs", type=int, default=2)
+    parser.add_argument("--seed", action="store_true", help="insert benchmark drafts and notifications first")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--paths", nargs="+", default=[
+        f"/drafts/users/{BENCH_USER_ID}/20/0",
+        f"/notifications/users/{BENCH_USER_ID}/20/0",
+    ])
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.docs)
+
+    counts = sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i < args.max_workers], args.max_workers})
+    baseline = {}
+    print(f"{'workers':>7}  {'path':<48} {'req/s':>9} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6}")
+    for workers in counts:
+        port = free_port()
+        server = start_server(workers, port)
+        try:
+            for path in args.paths:
+                result = measure(f"http://127.0.0.1:{port}{path}", args.concurrency, args.duration, args.load_procs)
+                baseline.setdefault(path, result["rps"])
+                print(f"{workers:>7}  {path:<48} {result['rps']:9.0f} {result['rps'] / baseline[path]:7.2f}x "
+                      f"{result['p50']:8.1f} {result['p99']:8.1f} {result['errors']:6d}")
+        finally:
+            code = stop_server(server)
+        if code not in (0, -signal.SIGTERM):  # a single worker re-raises SIGTERM after draining
+            print(f"  server exited with {code} after SIGTERM")
+
+
+if __name__ == "__main__":
+    main()
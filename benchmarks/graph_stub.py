@@ -0,0 +1,132 @@
+"""
+Local stand-in for the Facebook Graph API, served through `httpx.MockTransport`.
+
+The stub counts calls per app and per page token over a sliding window,
+reports the usage in X-App-Usage / X-Page-Usage / X-Business-Use-Case-Usage
+like Graph does (as a percentage of the allowed calls), and answers with the
+throttling errors 4 (app) or 32 (page) once a quota is exhausted. App
+tokens ("{app-id}|{secret}") only count against the app quota. Windows
+are seconds instead of Graph's hour so scenarios run quickly.
+"""
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict, deque
+from typing import Dict, Optional
+import httpx
+
+
+class GraphStub:
+    def __init__(
+        self,
+        app_calls_per_window: int = 200,
+        page_calls_per_window: int = 40,
+        window: float = 2.0,
+        latency: float = 0.005,
+        seed: int = 1,
+    ):
+        self.app_calls_per_window = app_calls_per_window
+        self.page_calls_per_window = page_calls_per_window
+        self.window = window
+        self.latency = latency
+        self.random = random.Random(seed)
+
+        self.app_calls: deque = deque()
+        self.page_calls: Dict[str, deque] = defaultdict(deque)
+        self.requests = 0
+        self.throttled = 0
+        self.by_path: Dict[str, int] = defaultdict(int)
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def _usage(self, calls: deque, limit: int, now: float) -> float:
+        while calls and calls[0] < now - self.window:
+            calls.popleft()
+        return 100.0 * len(calls) / limit
+
+    @staticmethod
+    def _counters(usage: float) -> Dict[str, int]:
+        return {"call_count": int(usage), "total_cputime": int(usage * 0.5), "total_time": int(usage * 0.6)}
+
+    def _app_headers(self, usage: float) -> Dict[str, str]:
+        return {"x-app-usage": json.dumps(self._counters(usage))}
+
+    def _page_headers(self, usage: float, page_key: str) -> Dict[str, str]:
+        regain = self.window / 60 if usage >= 100 else 0
+        page = self._counters(usage)
+        return {
+            "x-page-usage": json.dumps(page),
+            "x-business-use-case-usage": json.dumps(
+                {page_key: [{"type": "pages", **page, "estimated_time_to_regain_access": regain}]}
+            ),
+        }
+
+    def body(self, request: httpx.Request) -> Optional[dict]:
+        """Successful response payload for a request (override to customise)."""
+        path = request.url.path.rstrip("/").split("/")
+        if path[-1] == "search":
+            return {"data": [
+                {"id": f"{self.random.randint(1, 10**9)}", "name": "Competitor", "category": "Shop", "fan_count": 1000}
+                for _ in range(int(request.url.params.get("limit", 3)))
+            ]}
+        if path[-1] == "posts" and request.method == "GET":
+            return {"data": [
+                {
+                    "id": f"{path[-2]}_{i}",
+                    "created_time": "2025-10-20T18:00:00+0000",
+                    "status_type": "added_photos",
+                    "reactions": {"summary": {"total_count": self.random.randint(0, 500)}},
+                    "comments": {"summary": {"total_count": self.random.randint(0, 50)}},
+                    "shares": {"count": self.random.randint(0, 10)},
+                }
+                for i in range(int(request.url.params.get("limit", 10)))
+            ]}
+        if path[-1] == "messages" and request.method == "POST":
+            return {"recipient_id": "psid", "message_id": f"m_{self.requests}"}
+        return {"id": f"{self.requests}", "success": True}
+
+    def error(self, request: httpx.Request) -> Optional[httpx.Response]:
+        """Hook for fault injection: return a response to fail the request (None to serve it)."""
+        return None
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.by_path[request.url.path] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        token = request.url.params.get("access_token")
+        if token is None and request.content:
+            form = httpx.QueryParams(request.content.decode(errors="ignore"))
+            token = form.get("access_token")
+        page_key = None if token is None or "|" in token else token
+
+        now = time.monotonic()
+        app_usage = self._usage(self.app_calls, self.app_calls_per_window, now)
+        page_usage = 0.0
+        headers = self._app_headers(app_usage)
+        if page_key is not None:
+            page_usage = self._usage(self.page_calls[page_key], self.page_calls_per_window, now)
+            headers.update(self._page_headers(page_usage, page_key))
+
+        if app_usage >= 100 or page_usage >= 100:
+            self.throttled += 1
+            code = 4 if app_usage >= 100 else 32
+            return httpx.Response(
+                400 if code == 32 else 403,
+                headers=headers,
+                json={"error": {"message": "Calls limit reached", "type": "OAuthException", "code": code}},
+            )
+
+        self.app_calls.append(now)
+        if page_key is not None:
+            self.page_calls[page_key].append(now)
+
+        failure = self.error(request)
+        if failure is not None:
+            failure.headers.update(headers)
+            return failure
+        return httpx.Response(200, headers=headers, json=self.body(request))
@@ -1,4 +1,56 @@
+import argparse
+import importlib.util
+import os
 import uvicorn
 
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the Social Marketing Agency API.")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=_env_int("PORT", 8000))
+    parser.add_argument("--reload", action="store_true",
+                        help="development mode: single process restarted on code changes")
+    parser.add_argument("--workers", type=int, default=_env_int("WEB_CONCURRENCY", os.cpu_count() or 1),
+                        help="worker processes (default: WEB_CONCURRENCY or the CPU count)")
+    parser.add_argument("--keep-alive", type=int, default=_env_int("KEEP_ALIVE", 5),
+                        help="seconds an idle keep-alive connection is kept open")
+    parser.add_argument("--backlog", type=int, default=_env_int("BACKLOG", 2048),
+                        help="maximum number of pending connections")
+    parser.add_argument("--graceful-timeout", type=int, default=_env_int("GRACEFUL_TIMEOUT", 30),
+                        help="seconds in-flight requests get to finish after SIGTERM")
+    parser.add_argument("--log-level", default=os.environ.get("LOG_LEVEL", "info"))
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.reload:
+        uvicorn.run("src.main:app", host=args.host, port=args.port, reload=True, log_level=args.log_level)
+        return
+
+    # Each worker runs the application lifespan (connection pools, warmup) before it
+    # starts accepting connections. On SIGTERM the workers stop accepting, finish the
+    # in-flight requests (up to --graceful-timeout) and run the lifespan teardown.
+    uvicorn.run(
+        "src.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        timeout_keep_alive=args.keep_alive,
+        backlog=args.backlog,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
+        forwarded_allow_ips=os.environ.get("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        log_level=args.log_level,
+    )
+
+
 if __name__ == "__main__":
-    uvicorn.run("src.main:app", host="0.0.0.0", port=8000, reload=True)
+    main()
@@ -1 +1,161 @@
 # Customer & competitor analysis
+import asyncio
+import functools
+from concurrent.futures import Executor
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from src.controllers.facebook import FacebookController
+from src.models.AnalysisModel import AnalysisModel
+from src.models.db_schemas.Analysis import Analysis
+from src.models.enums.AnalysisEnums import AnlaysisType
+from src.models.schemas.InteractionsResponse import InteractionResponse, PostInteractionBreakdown
+
+# numpy and the analysis engine are imported in the methods using them, so
+# workers start without loading them
+if TYPE_CHECKING:
+    import numpy as np
+
+# Posts detailed in an analysis document (the most commented ones)
+MAX_POST_BREAKDOWNS = 1000
+
+
+class AnalyzerAgent:
+    """
+    Sentiment distribution and top topics of the comments and Messenger
+    messages of a page, per post and for the whole page.
+
+    Texts are scored in batches of `batch_size` with the vectorized engine of
+    `interaction_analysis`. Batches run in `executor` (a thread pool, so the
+    event loop stays free), or in `process_pool` when the page has at least
+    `process_min_texts` texts, where they are scored in parallel.
+
+    Args:
+        executor (Optional[Executor]): Thread pool, defaults to the loop's default executor.
+        process_pool (Optional[Executor]): Process pool for large pages (None: never used).
+        batch_size (int): Texts per batch.
+        process_min_texts (int): Texts from which the process pool is used.
+        top_k (int): Topics kept per post and for the page.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        process_pool: Optional[Executor] = None,
+        batch_size: int = 20_000,
+        process_min_texts: int = 50_000,
+        top_k: int = 5,
+    ):
+        self.executor = executor
+        self.process_pool = process_pool
+        self.batch_size = batch_size
+        self.process_min_texts = process_min_texts
+        self.top_k = top_k
+
+    async def score(self, texts: List[str], groups: "np.ndarray", n_groups: int) -> Dict[str, Any]:
+        """Score texts in batches and merge the results (see `interaction_analysis.merge_batches`)."""
+        from src.controllers import interaction_analysis as engine
+
+        loop = asyncio.get_running_loop()
+        use_processes = self.process_pool is not None and len(texts) >= self.process_min_texts
+        pool = self.process_pool if use_processes else self.executor
+        batches = await asyncio.gather(*(
+            loop.run_in_executor(pool, engine.score_batch, texts[start:end], groups[start:end], n_groups)
+            for start, end in engine.batch_bounds(len(texts), self.batch_size)
+        ))
+        return await loop.run_in_executor(
+            self.executor, functools.partial(engine.merge_batches, list(batches), n_groups, top_k=self.top_k)
+        )
+
+    async def analyze(
+        self, page_id: str, posts: List[Dict[str, Any]], conversations: List[Dict[str, Any]]
+    ) -> InteractionResponse:
+        """
+        Analyze Graph feed (posts with comments) and inbox payloads of a page.
+
+        The page's own comments and replies are left out.
+        """
+        import numpy as np
+        from src.controllers import interaction_analysis as engine
+
+        texts, groups, post_ids = engine.collect_texts(posts, conversations, page_id)
+        n_groups = len(post_ids) + 1  # the inbox is the last group
+        merged = await self.score(texts, groups, n_groups)
+
+        sentiment, score_sum = merged["sentiment"], merged["score_sum"]
+        comments = sentiment[:-1].sum(axis=0)
+        messages = sentiment[-1]
+        comment_counts = sentiment[:-1].sum(axis=1)
+        commented = [i for i in np.argsort(-comment_counts, kind="stable")[:MAX_POST_BREAKDOWNS] if comment_counts[i]]
+
+        return InteractionResponse(
+            page_id=page_id,
+            analyzed_at=datetime.now(timezone.utc).isoformat(),
+            total_posts=len(post_ids),
+            total_comments=int(comments.sum()),
+            total_messages=int(messages.sum()),
+            sentiment_breakdown={
+                "comments": engine.breakdown(comments, score_sum[:-1].sum()),
+                "messages": engine.breakdown(messages, score_sum[-1]),
+                "overall": engine.breakdown(sentiment.sum(axis=0), score_sum.sum()),
+            },
+            topics=merged["page_topics"],
+            posts=[
+                PostInteractionBreakdown(
+                    post_id=post_ids[i],
+                    comments=int(comment_counts[i]),
+                    sentiment=engine.breakdown(sentiment[i], score_sum[i]),
+                    topics=merged["topics"][i],
+                )
+                for i in commented
+            ],
+        )
+
+    async def analyze_page(self, page_id: str, access_token: str) -> InteractionResponse:
+        """Fetch the feed and inbox of a page and analyze them."""
+        posts, conversations = await asyncio.gather(
+            FacebookController.fetch_page_feed_interactions(page_id, access_token),
+            FacebookController.fetch_page_messages(page_id, access_token),
+        )
+        return await self.analyze(page_id, posts, conversations)
+
+    @staticmethod
+    def summary(result: InteractionResponse) -> str:
+        shares = result.sentiment_breakdown["overall"]["shares"]
+        text = (
+            f"{result.total_comments} comments on {result.total_posts} posts and "
+            f"{result.total_messages} messages analysed: {shares['positive']:.0%} positive, "
+            f"{shares['neutral']:.0%} neutral, {shares['negative']:.0%} negative."
+        )
+        if result.topics:
+            text += f" Top topics: {', '.join(result.topics)}."
+        return text
+
+    async def run(self, db_client, user_id: str, page_id: str, access_token: str, job=None) -> Dict[str, Any]:
+        """
+        Analyze a page and store the result as an interaction analysis of
+        the user (background job body).
+
+        Returns:
+            Dict[str, Any]: The `InteractionResponse` with the ID of the analysis
+            document, which holds the per-post breakdown left out here.
+        """
+        if job is not None:
+            job.progress(0, 2)
+        result = await self.analyze_page(page_id, access_token)
+        if job is not None:
+            job.progress(1)
+
+        analysis_model = await AnalysisModel.create_instance(db_client)
+        analysis_id = await analysis_model.create_analysis(Analysis(
+            analysisType=AnlaysisType.INTERACTION_ANALYSIS,
+            content=self.summary(result),
+            user_id=user_id,
+            page_id=page_id,
+            sentiment_breakdown=result.sentiment_breakdown,
+            topics=result.topics,
+            post_breakdown=[post.model_dump() for post in result.posts],
+        ))
+        result.analysis_id = str(analysis_id)
+        if job is not None:
+            job.progress(2)
+        return result.model_dump(exclude={"posts"})
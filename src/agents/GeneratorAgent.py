@@ -1 +1,284 @@
 # Content/post generation
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+from bson import ObjectId
+from pydantic import ValidationError
+from src.helpers.similarity import DraftSimilarityIndex, UserVectorIndex, get_similarity_index
+from src.models.BuisnessInfoModel import BusinessInfoModel
+from src.models.PostModel import PostModel
+from src.models.ScheduleModel import ScheduleModel
+from src.models.db_schemas.BuisnessInfo import BuisnessInfo
+from src.models.db_schemas.Post import Post
+from src.models.db_schemas.Schedule import ScheduledPost
+from src.models.enums.PostEnums import PostStatus
+from src.stores.LLMCache import PromptTemplate
+from src.stores.LLMs import LLMClient, LLMError, get_llm_client
+
+logger = logging.getLogger("llm")
+
+DRAFT_TEMPLATE = PromptTemplate(
+    name="post_draft",
+    version="1",
+    system=(
+        "You are the social media manager of {businessName}, a business in {field}. "
+        "You write engaging Facebook posts in the voice of the business."
+    ),
+    user=(
+        "Business description: {description}\n"
+        "Keywords: {keywords}\n"
+        "Target audience: {targetAudience}\n"
+        "Differentiators: {differentiators}\n"
+        "Themes: {theme}\n\n"
+        "Write a Facebook post to publish on {date}.\n"
+        "Brief: {brief}\n"
+        "This is variant {variant}: make it different from the other variants.\n\n"
+        "Answer with the title on the first line as 'Title: <title>', then the post."
+    ),
+)
+
+# Brief of the drafts made when the schedule has fewer upcoming posts than requested
+DEFAULT_BRIEF = "A post presenting the business and what makes it different."
+
+
+def parse_draft(text: str, brief: str) -> Dict[str, str]:
+    """Split a generated draft into title and content (the brief gives the title when none was generated)."""
+    lines = text.strip().splitlines()
+    if lines and lines[0].lower().startswith("title:"):
+        title = lines[0].split(":", 1)[1].strip()
+        content = "\n".join(lines[1:]).strip()
+    else:
+        title, content = brief, text.strip()
+    title = title.strip("*#\" ") or brief
+    if len(title) > 100:
+        title = title[:97].rstrip() + "..."
+    return {"title": title, "content": content}
+
+
+class GeneratorAgent:
+    """
+    Generates post drafts for a business with the LLM layer.
+
+    Each requested draft is one generation of `DRAFT_TEMPLATE` from the
+    business profile and the brief of an upcoming scheduled post (slots are
+    used in date order, round-robin when more drafts than slots are
+    requested). At most `concurrency` generations run at once; drafts are
+    yielded as soon as they are ready, in completion order, and stored in
+    batches with one `insert_many`.
+
+    Generations that fail (provider error, timeout, budget) or whose text is
+    not a valid post are skipped and counted in `stats`, as are the
+    near-duplicates of a recent draft or accepted post of the user (or of a
+    draft of the same run) when a similarity index is available.
+
+    Drafts are sampled, so they bypass the LLM response cache: generating
+    again for the same schedule gives new drafts rather than the previous ones.
+
+    Args:
+        llm (Optional[LLMClient]): LLM client, defaults to the worker's.
+        concurrency (int): Generations in flight at once.
+        provider (Optional[str]): LLM provider, defaults to the client's default.
+        max_tokens (int): Maximum tokens per draft.
+        temperature (float): Sampling temperature.
+        similarity (Optional[DraftSimilarityIndex]): Near-duplicate index, defaults to the worker's.
+    """
+
+    def __init__(
+        self,
+        llm: Optional[LLMClient] = None,
+        concurrency: int = 8,
+        provider: Optional[str] = None,
+        max_tokens: int = 600,
+        temperature: float = 0.8,
+        similarity: Optional[DraftSimilarityIndex] = None,
+    ):
+        self.llm = llm or get_llm_client()
+        self.concurrency = concurrency
+        self.provider = provider
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.similarity = similarity or get_similarity_index()
+        self.stats = {"generated": 0, "failed": 0, "duplicates": 0, "stored": 0}
+
+    # ---------------- Inputs ---------------- #
+
+    @staticmethod
+    async def load_inputs(db_client, user_id: str) -> tuple:
+        """
+        Load the business info of a user and the upcoming posts of their schedule.
+
+        Returns:
+            tuple: (Optional[BuisnessInfo], List[ScheduledPost]) - slots sorted by date.
+        """
+        business_model = await BusinessInfoModel.create_instance(db_client)
+        schedule_model = await ScheduleModel.create_instance(db_client)
+        business_info, schedule = await asyncio.gather(
+            business_model.get_by_user_id(user_id), schedule_model.get_by_user_id(user_id)
+        )
+        now = datetime.now(timezone.utc)
+        slots = sorted(
+            (slot for slot in (schedule.posts if schedule else [])
+             if slot.date.replace(tzinfo=slot.date.tzinfo or timezone.utc) >= now),
+            key=lambda slot: slot.date.replace(tzinfo=slot.date.tzinfo or timezone.utc),
+        )
+        return business_info, slots
+
+    @staticmethod
+    def prompt_inputs(business_info: BuisnessInfo, slot: Optional[ScheduledPost], variant: int) -> Dict[str, Any]:
+        return {
+            "businessName": business_info.businessName,
+            "field": business_info.field,
+            "description": business_info.description,
+            "keywords": ", ".join(business_info.businessKeyWords) or "-",
+            "targetAudience": ", ".join(business_info.targetAudience) or "-",
+            "differentiators": ", ".join(business_info.differentiators) or "-",
+            "theme": ", ".join(business_info.theme) or "-",
+            "date": slot.date.strftime("%A %d %B %Y") if slot else "the coming days",
+            "brief": slot.content if slot else DEFAULT_BRIEF,
+            "variant": variant,
+        }
+
+    # ---------------- Generation ---------------- #
+
+    async def _generate(self, business_info: BuisnessInfo, slot: Optional[ScheduledPost], variant: int) -> Optional[Post]:
+        try:
+            result = await self.llm.generate(
+                DRAFT_TEMPLATE,
+                self.prompt_inputs(business_info, slot, variant),
+                provider=self.provider,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                bypass_cache=True,
+            )
+            draft = parse_draft(result.text, slot.content if slot else DEFAULT_BRIEF)
+            post = Post(
+                title=draft["title"],
+                content=draft["content"],
+                status=PostStatus.DRAFT,
+                user_id=business_info.user_id,
+            )
+        except (LLMError, ValidationError) as e:
+            self.stats["failed"] += 1
+            logger.warning("Draft %d for user %s skipped: %s", variant, business_info.user_id, e)
+            return None
+        self.stats["generated"] += 1
+        return post
+
+    def _is_duplicate(self, post: Post, seen: UserVectorIndex) -> bool:
+        """Check a draft against the user's index; a new draft gets its ID and joins the index."""
+        vector = self.similarity.vector(post.title, post.content)
+        duplicate_of, score = self.similarity.check(seen, vector)
+        if duplicate_of is not None:
+            self.stats["duplicates"] += 1
+            logger.info("Draft for user %s dropped: %.2f similar to post %s", post.user_id, score, duplicate_of)
+            return True
+        post.id = str(ObjectId())
+        seen.add(post.id, vector)
+        return False
+
+    async def drafts(
+        self, business_info: BuisnessInfo, slots: List[ScheduledPost], count: int,
+        seen: Optional[UserVectorIndex] = None,
+    ) -> AsyncIterator[Post]:
+        """
+        Generate `count` drafts, yielding each one as soon as it is ready.
+        Closing the iterator early cancels the generations still running.
+
+        Args:
+            business_info (BuisnessInfo): Profile of the business.
+            slots (List[ScheduledPost]): Upcoming scheduled posts giving the briefs (may be empty).
+            count (int): Number of drafts.
+            seen (Optional[UserVectorIndex]): Posts of the user; near-duplicates of them
+                are dropped and the drafts yielded are added (with their ID set).
+        """
+        pending: asyncio.Queue = asyncio.Queue()
+        for variant in range(count):
+            pending.put_nowait((slots[variant % len(slots)] if slots else None, variant + 1))
+        ready: asyncio.Queue = asyncio.Queue()
+
+        async def worker():
+            while not pending.empty():
+                slot, variant = pending.get_nowait()
+                try:
+                    ready.put_nowait(await self._generate(business_info, slot, variant))
+                except Exception as e:  # unexpected: handed to the consumer, which raises it
+                    ready.put_nowait(e)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.concurrency, count))]
+        try:
+            for _ in range(count):
+                post = await ready.get()
+                if isinstance(post, Exception):
+                    raise post
+                if post is not None and not (seen is not None and self._is_duplicate(post, seen)):
+                    yield post
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def generate_and_store(
+        self, post_model: PostModel, business_info: BuisnessInfo, slots: List[ScheduledPost], count: int,
+        batch_size: int = 20,
+    ) -> AsyncIterator[List[Post]]:
+        """
+        Generate drafts and store them by batches of `batch_size`, yielding
+        each stored batch (the posts have their ID).
+        """
+        seen = None
+        if self.similarity is not None:
+            seen = await self.similarity.user_index(business_info.user_id, post_model)
+
+        async def store(batch: List[Post]) -> List[Post]:
+            stored = await post_model.insert_many_posts(batch)
+            self.stats["stored"] += len(stored)
+            if seen is not None and len(stored) < len(batch):
+                stored_ids = {post.id for post in stored}
+                for post in batch:
+                    if post.id not in stored_ids:
+                        seen.remove(post.id)
+            return stored
+
+        batch: List[Post] = []
+        async for post in self.drafts(business_info, slots, count, seen):
+            batch.append(post)
+            if len(batch) >= batch_size:
+                yield await store(batch)
+                batch = []
+        if batch:
+            yield await store(batch)
+
+    async def run(self, db_client, user_id: str, count: int, job=None, batch_size: int = 20) -> Dict[str, Any]:
+        """
+        Generate and store `count` drafts for a user (background job body).
+
+        Args:
+            db_client: The MongoDB client or database.
+            user_id (str): The user's ID.
+            count (int): Number of drafts.
+            job (Optional[Job]): Job receiving the progress (drafts stored so far).
+            batch_size (int): Drafts stored per `insert_many`.
+
+        Returns:
+            Dict[str, Any]: Stored and failed counts and the IDs of the drafts.
+        """
+        business_info, slots = await self.load_inputs(db_client, user_id)
+        if business_info is None:
+            raise ValueError(f"No business info for user {user_id}")
+        post_model = await PostModel.create_instance(db_client)
+        if job is not None:
+            job.progress(0, count)
+
+        post_ids: List[str] = []
+        async for stored in self.generate_and_store(post_model, business_info, slots, count, batch_size):
+            post_ids.extend(post.id for post in stored)
+            if job is not None:
+                job.progress(len(post_ids))
+        return {
+            "stored": len(post_ids),
+            "failed": self.stats["failed"],
+            "duplicates": self.stats["duplicates"],
+            "slots": len(slots),
+            "post_ids": post_ids,
+        }
@@ -1 +1,175 @@
-# Offers & sponsorship suggestions
\ No newline at end of file
+# Offers & sponsorship suggestions
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional
+from pydantic import ValidationError
+from src.controllers.facebook import FacebookController
+from src.models.RecommendationModel import RecommendationModel
+from src.models.db_schemas.Recommendation import Recommendation
+from src.stores.LLMCache import PromptTemplate
+from src.stores.LLMs import LLMClient, get_llm_client
+
+logger = logging.getLogger("llm")
+
+RECOMMENDATION_TEMPLATE = PromptTemplate(
+    name="recommendations",
+    version="1",
+    system=(
+        "You are a social media marketing consultant for small businesses. "
+        "You give concrete, actionable advice (offers, sponsorships, content, timing) based on data."
+    ),
+    user=(
+        "Business: {business}\n\n"
+        "Audience interactions on the business page: {interactions}\n\n"
+        "Competitor pages: {competitors}\n\n"
+        "Give {count} recommendations for the coming weeks. Answer with a JSON list of objects "
+        "with a \"title\" (10 to 100 characters) and a \"content\" (the recommendation and why)."
+    ),
+)
+
+# Business info fields given to the model (never the page token)
+PROFILE_FIELDS = (
+    "businessName", "field", "description", "theme", "longTermGoals", "shortTermGoals",
+    "targetAudience", "differentiators", "businessKeyWords",
+)
+# Competitor statistics given to the model, for the most engaging pages
+COMPETITOR_FIELDS = ("name", "category", "posts", "avg_engagement_rate", "engagement_per_follower", "trend_slope")
+MAX_COMPETITORS = 8
+
+
+def parse_recommendations(text: str, user_id: str, fallback_title: str) -> List[Recommendation]:
+    """
+    Recommendations of a model answer: the JSON list asked for (possibly
+    wrapped in prose or a code block), else the whole answer as one
+    recommendation. Items that are not valid recommendations are skipped.
+    """
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    items = None
+    if match:
+        try:
+            items = json.loads(match.group(0))
+        except ValueError:
+            items = None
+    if not isinstance(items, list):
+        items = [{"title": fallback_title, "content": text.strip()}]
+
+    recommendations = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            recommendations.append(Recommendation(
+                title=str(item.get("title", "")).strip()[:100],
+                content=str(item.get("content", "")).strip(),
+                user_id=user_id,
+            ))
+        except ValidationError as e:
+            logger.warning("Recommendation skipped: %s", e)
+    return recommendations
+
+
+class RecommenderAgent:
+    """
+    Turns the recommendation inputs of a page (interaction analysis,
+    competitor statistics, business profile) into recommendations with the
+    LLM layer, and stores them.
+
+    The prompt only carries a compact view of the inputs: the profile fields
+    of `PROFILE_FIELDS`, the sentiment shares and topics of the page, and the
+    `MAX_COMPETITORS` competitors with the highest engagement rate. Identical
+    inputs are answered from the LLM response cache.
+
+    Args:
+        llm (Optional[LLMClient]): LLM client, defaults to the worker's.
+        provider (Optional[str]): LLM provider, defaults to the client's default.
+        count (int): Recommendations asked for.
+        max_tokens (int): Maximum tokens of the answer.
+        temperature (float): Sampling temperature.
+    """
+
+    def __init__(
+        self,
+        llm: Optional[LLMClient] = None,
+        provider: Optional[str] = None,
+        count: int = 3,
+        max_tokens: int = 800,
+        temperature: float = 0.4,
+    ):
+        self.llm = llm or get_llm_client()
+        self.provider = provider
+        self.count = count
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+
+    def prompt_inputs(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        profile = inputs.get("business_profile") or {}
+        summary = inputs.get("summary") or {}
+        overall = (summary.get("sentiment_breakdown") or {}).get("overall", {})
+        competitors = sorted(
+            inputs.get("competitors") or [], key=lambda c: c.get("avg_engagement_rate") or 0, reverse=True
+        )[:MAX_COMPETITORS]
+        return {
+            "business": json.dumps({k: profile[k] for k in PROFILE_FIELDS if profile.get(k)}, ensure_ascii=False),
+            "interactions": json.dumps({
+                "posts": summary.get("total_posts", 0),
+                "comments": summary.get("total_comments", 0),
+                "messages": summary.get("total_messages", 0),
+                "sentiment": overall.get("shares", {}),
+                "topics": summary.get("topics", []),
+            }, ensure_ascii=False),
+            "competitors": json.dumps([
+                {k: round(c[k], 4) if isinstance(c.get(k), float) else c.get(k) for k in COMPETITOR_FIELDS}
+                for c in competitors
+            ], ensure_ascii=False),
+            "count": self.count,
+        }
+
+    async def recommend(self, user_id: str, inputs: Dict[str, Any]) -> List[Recommendation]:
+        """Generate recommendations from the pipeline inputs (not stored)."""
+        result = await self.llm.generate(
+            RECOMMENDATION_TEMPLATE,
+            self.prompt_inputs(inputs),
+            provider=self.provider,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+        )
+        name = (inputs.get("business_profile") or {}).get("businessName") or "your page"
+        return parse_recommendations(result.text, user_id, f"Recommendations for {name}"[:100])
+
+    async def run(
+        self,
+        db_client,
+        user_id: str,
+        page_id: str,
+        access_token: str,
+        business_profile: Optional[Dict[str, Any]] = None,
+        analyzer=None,
+        job=None,
+    ) -> Dict[str, Any]:
+        """
+        Gather the inputs of a page (`FacebookController.generate_recommendations`),
+        generate recommendations and store them (background job body).
+
+        Returns:
+            Dict[str, Any]: IDs of the stored recommendations and their titles.
+        """
+        if job is not None:
+            job.progress(0, 3)
+        inputs = await FacebookController.generate_recommendations(
+            page_id, access_token, business_profile, analyzer=analyzer
+        )
+        if job is not None:
+            job.progress(1)
+        recommendations = await self.recommend(user_id, inputs)
+        if job is not None:
+            job.progress(2)
+
+        model = await RecommendationModel.create_instance(db_client)
+        ids = await model.create_recommendations(recommendations)
+        if job is not None:
+            job.progress(3)
+        return {
+            "recommendation_ids": [str(rec_id) for rec_id in ids],
+            "titles": [rec.title for rec in recommendations],
+        }
@@ -0,0 +1,212 @@
+"""
+Vectorized engagement statistics for Facebook pages.
+
+Posts of every analysed page are flattened into one set of NumPy arrays
+(`PostMetrics`) and all per-page statistics are computed in a single pass
+with grouped operations (`bincount`, packed-key sorts, cumulative sums), instead
+of looping over pages and posts in Python.
+"""
+from dataclasses import dataclass
+from typing import List, Dict, Any
+import numpy as np
+
+PERCENTILES = (25, 50, 75, 90)
+_EMPTY: Dict[str, Any] = {}
+
+
+@dataclass
+class PostMetrics:
+    """Column-oriented per-post metrics for a set of pages."""
+    page_ids: List[str]
+    post_types: List[str]       # vocabulary of Graph `status_type` values
+    page_index: np.ndarray      # int64, index into page_ids
+    post_ids: np.ndarray        # object
+    post_type_index: np.ndarray  # int64, index into post_types
+    created_time: np.ndarray    # int64, epoch seconds
+    reactions: np.ndarray       # int64
+    comments: np.ndarray        # int64
+    shares: np.ndarray          # int64
+
+    @property
+    def engagement(self) -> np.ndarray:
+        return self.reactions + self.comments + self.shares
+
+
+def load_post_metrics(pages: List[Dict[str, Any]]) -> PostMetrics:
+    """
+    Flatten Graph API post payloads into column arrays.
+
+    Args:
+        pages (List[Dict]): Items of the form {"page_id": str, "posts": [<Graph post>, ...]}.
+            Posts are expected to carry `reactions.summary`, `comments.summary` and `shares`.
+
+    Returns:
+        PostMetrics: The flattened metrics of every post of every page.
+    """
+    page_ids = [page["page_id"] for page in pages]
+    posts = [post for page in pages for post in page.get("posts", [])]
+    counts = [len(page.get("posts", [])) for page in pages]
+
+    type_codes: Dict[str, int] = {}
+    flat: List[int] = []
+    for p in posts:
+        flat.extend((
+            p.get("reactions", _EMPTY).get("summary", _EMPTY).get("total_count", 0),
+            p.get("comments", _EMPTY).get("summary", _EMPTY).get("total_count", 0),
+            p.get("shares", _EMPTY).get("count", 0),
+            type_codes.setdefault(p.get("status_type") or "unknown", len(type_codes)),
+        ))
+    rows = np.array(flat, dtype=np.int64).reshape(-1, 4)
+    created_time = np.array(
+        [(p.get("created_time") or "1970-01-01T00:00:00")[:19] for p in posts],
+        dtype="datetime64[s]",
+    )
+
+    return PostMetrics(
+        page_ids=page_ids,
+        post_types=list(type_codes),
+        page_index=np.repeat(np.arange(len(pages), dtype=np.int64), counts),
+        post_ids=np.array([p.get("id") for p in posts], dtype=object),
+        post_type_index=rows[:, 3],
+        created_time=created_time.astype(np.int64),
+        reactions=rows[:, 0],
+        comments=rows[:, 1],
+        shares=rows[:, 2],
+    )
+
+
+def _group_sort(page: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Indices sorting rows by (page, value) for non-negative integer values.
+
+    Both keys are packed into one int64 so a single `argsort` replaces the
+    slower multi-key `lexsort`.
+    """
+    if not len(page):
+        return np.zeros(0, dtype=np.int64)
+    low = values - values.min()
+    return np.argsort(page * (int(low.max()) + 1) + low)
+
+
+def _group_percentiles(sorted_values: np.ndarray, starts: np.ndarray, sizes: np.ndarray, q: float) -> np.ndarray:
+    """Linear-interpolated percentile of each group of a value array sorted within groups."""
+    position = (sizes - 1).clip(min=0) * (q / 100.0)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    frac = position - lower
+    last = max(len(sorted_values) - 1, 0)
+    lo = sorted_values[np.minimum(starts + lower, last)] if len(sorted_values) else np.zeros(len(sizes))
+    hi = sorted_values[np.minimum(starts + upper, last)] if len(sorted_values) else np.zeros(len(sizes))
+    return np.where(sizes > 0, lo + (hi - lo) * frac, 0.0)
+
+
+def compute_engagement_stats(
+    metrics: PostMetrics,
+    fan_counts: np.ndarray,
+    top_k: int = 3,
+    window: int = 5,
+    z_threshold: float = 3.0,
+) -> List[Dict[str, Any]]:
+    """
+    Compute per-page engagement statistics in one vectorized pass.
+
+    For every page: mean/median/percentiles of engagement (reactions +
+    comments + shares), engagement per follower, the mean of the last
+    `window` posts and the slope of engagement over post order (trend),
+    the `top_k` posts, z-score outliers and a per-post-type breakdown.
+
+    Args:
+        metrics (PostMetrics): Flattened post metrics.
+        fan_counts (np.ndarray): Followers of each page, aligned with `metrics.page_ids`.
+        top_k (int): Number of top posts to keep per page.
+        window (int): Number of most recent posts used for the rolling mean.
+        z_threshold (float): Absolute z-score above which a post is an outlier.
+
+    Returns:
+        List[Dict]: One statistics dict per page, aligned with `metrics.page_ids`.
+    """
+    n_pages = len(metrics.page_ids)
+    page = metrics.page_index
+    engagement_counts = metrics.engagement
+    engagement = engagement_counts.astype(np.float64)
+
+    sizes = np.bincount(page, minlength=n_pages)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.int64)
+    safe_sizes = np.maximum(sizes, 1)
+
+    # Moments
+    total = np.bincount(page, weights=engagement, minlength=n_pages)
+    mean = total / safe_sizes
+    sq_total = np.bincount(page, weights=engagement ** 2, minlength=n_pages)
+    std = np.sqrt(np.maximum(sq_total / safe_sizes - mean ** 2, 0.0))
+
+    # Percentiles: sort by (page, engagement)
+    by_value = _group_sort(page, engagement_counts)
+    sorted_values = engagement[by_value]
+    percentiles = {q: _group_percentiles(sorted_values, starts, sizes, q) for q in PERCENTILES}
+
+    # Top-k: sort by (page, -engagement), keep the first k of each group
+    by_value_desc = _group_sort(page, -engagement_counts)
+    rank = np.arange(len(page)) - starts[page[by_value_desc]]
+    top_rows = np.split(by_value_desc[rank < top_k], np.cumsum(np.minimum(sizes, top_k))[:-1])
+
+    # Outliers
+    z = np.divide(engagement - mean[page], std[page], out=np.zeros_like(engagement), where=std[page] > 0)
+    outlier_rows = np.flatnonzero(np.abs(z) > z_threshold)
+    outlier_rows = outlier_rows[np.argsort(page[outlier_rows], kind="stable")]
+    outlier_rows = np.split(outlier_rows, np.cumsum(np.bincount(page[outlier_rows], minlength=n_pages))[:-1])
+
+    # Trend and rolling mean: sort by (page, created_time)
+    by_time = _group_sort(page, metrics.created_time)
+    timeline = engagement[by_time]
+    x = (np.arange(len(page)) - starts[page[by_time]]).astype(np.float64)
+    sum_x = np.bincount(page[by_time], weights=x, minlength=n_pages)
+    sum_xx = np.bincount(page[by_time], weights=x * x, minlength=n_pages)
+    sum_xy = np.bincount(page[by_time], weights=x * timeline, minlength=n_pages)
+    denom = sizes * sum_xx - sum_x ** 2
+    slope = np.divide(sizes * sum_xy - sum_x * total, denom, out=np.zeros(n_pages), where=denom > 0)
+
+    cumulative = np.concatenate(([0.0], np.cumsum(timeline)))
+    ends = starts + sizes
+    window_starts = np.maximum(ends - window, starts)
+    recent_mean = np.divide(
+        cumulative[ends] - cumulative[window_starts], ends - window_starts,
+        out=np.zeros(n_pages), where=ends > window_starts,
+    )
+
+    # Per-post-type breakdown
+    types = metrics.post_types
+    key = page * len(types) + metrics.post_type_index
+    type_counts = np.bincount(key, minlength=n_pages * len(types)).reshape(n_pages, len(types))
+    type_totals = np.bincount(key, weights=engagement, minlength=n_pages * len(types)).reshape(n_pages, len(types))
+
+    fans = np.asarray(fan_counts, dtype=np.float64)
+    per_follower = np.divide(mean, fans, out=np.zeros(n_pages), where=fans > 0)
+
+    results = []
+    for i, page_id in enumerate(metrics.page_ids):
+        results.append({
+            "page_id": page_id,
+            "posts": int(sizes[i]),
+            "avg_engagement_rate": float(mean[i]),
+            "median_engagement": float(percentiles[50][i]),
+            "percentiles": {f"p{q}": float(percentiles[q][i]) for q in PERCENTILES},
+            "std_engagement": float(std[i]),
+            "engagement_per_follower": float(per_follower[i]),
+            "recent_avg_engagement": float(recent_mean[i]),
+            "trend_slope": float(slope[i]),
+            "top_posts": [
+                {"post_id": metrics.post_ids[row], "engagement": int(engagement[row])} for row in top_rows[i]
+            ],
+            "outliers": [
+                {"post_id": metrics.post_ids[row], "z_score": float(z[row])} for row in outlier_rows[i]
+            ],
+            "by_post_type": {
+                str(types[t]): {
+                    "posts": int(type_counts[i, t]),
+                    "avg_engagement": float(type_totals[i, t] / type_counts[i, t]),
+                }
+                for t in np.flatnonzero(type_counts[i])
+            },
+        })
+    return results
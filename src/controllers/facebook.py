@@ -1,14 +1,24 @@
-from typing import List, Dict, Any
-import httpx
+import asyncio
+import itertools
+import json
+import logging
+from typing import Callable, List, Dict, Any, Optional
 from fastapi import HTTPException
-from src.helpers.config import get_Settings
+from src.helpers.graph_client import get_graph_client
+from src.helpers.rate_limit import GraphPriority
+from src.helpers.resilience import GraphUnavailableError
+from src.helpers.stage_cache import StageCache, get_stage_cache
 from src.models.schemas.facebookSchemas import FacebookReplyRequest
-import requests
-from aiohttp import ClientSession
+from src.models.BuisnessInfoModel import normalize_keywords
+from src.models.db_schemas.Engagement import EngagementMeta, EngagementSnapshot
+from src.models.db_schemas.PostingHistogram import PostingHistogram
+from datetime import datetime, timezone
 
-settings = get_Settings()
+# numpy and the numpy based helpers (engagement_stats, posting_times) are imported
+# in the methods using them, so workers start without loading them
+
+logger = logging.getLogger("graph")
 
-GRAPH_URL = "https://graph.facebook.com/v23.0"
 class FacebookController:
     """
     Controller for handling Facebook Graph API operations:
@@ -29,6 +39,7 @@ class FacebookController:
         page_id: str,
         facebookPageAccessToken: str,
         messaging_type: str = "RESPONSE",
+        idempotency_key: Optional[str] = None,
     ) -> Dict:
         """
         Send a reply to a user's Messenger message.
@@ -39,11 +50,11 @@ class FacebookController:
             page_id (str): ID of the Facebook Page.
             facebookPageAccessToken (str): Valid Page Access Token with `pages_messaging`.
             messaging_type (str, optional): Messaging type. Default = "RESPONSE".
+            idempotency_key (str, optional): Key under which a repeated request is sent only once.
 
         Returns:
             Dict: API response with recipient ID and message ID.
         """
-        url = f"https://graph.facebook.com/{settings.GRAPH_API_VERSION}/{page_id}/messages"
         params = {"access_token": facebookPageAccessToken}
 
         payload = FacebookReplyRequest(
@@ -52,8 +63,10 @@ class FacebookController:
             messaging_type=messaging_type,
         ).model_dump()
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(url, params=params, json=payload)
+        resp = await get_graph_client().post(
+            f"{page_id}/messages", params=params, json=payload, priority=GraphPriority.HIGH,
+            idempotency_key=idempotency_key and f"{page_id}:message:{idempotency_key}",
+        )
 
         if resp.status_code != 200:
             raise HTTPException(status_code=resp.status_code, detail=resp.json())
@@ -64,41 +77,54 @@ class FacebookController:
     # Page Messages (Inbox)
     # ----------------------
     @classmethod
-    async def fetch_page_messages(cls, page_id: str, access_token: str) -> List[Dict]:
+    async def fetch_page_messages(
+        cls, page_id: str, access_token: str, cache: bool = False, since: Optional[datetime] = None
+    ) -> List[Dict]:
         """
         Retrieve all conversation threads and messages for a Page.
 
         Args:
             page_id (str): ID of the Facebook Page.
             access_token (str): Valid Page Access Token with `pages_messaging`.
+            cache (bool): Serve the Graph responses from the client cache when fresh enough.
+            since (Optional[datetime]): Only return the conversations updated
+                after this time. Conversations come most recently updated
+                first, so paging stops at the first older one.
 
         Returns:
             List[Dict]: A list of conversations with participants and messages.
         """
-        url = f"https://graph.facebook.com/{settings.GRAPH_API_VERSION}/{page_id}/conversations"
         params = {
             "access_token": access_token,
-            "fields": "participants,messages{from,message,created_time}",
+            "fields": "participants,updated_time,messages{from,message,created_time}",
         }
+        if since is None:
+            return await cls._fetch_all_pages(f"{page_id}/conversations", params, cache=cache)
+
+        from src.controllers import posting_times
+        since_epoch = posting_times.to_epoch(since)
+
+        def is_older(conversation: Dict) -> bool:
+            return int(posting_times.to_epoch_seconds([conversation["updated_time"]])[0]) <= since_epoch
 
-        return await cls._fetch_all_pages(url, params)
+        return await cls._fetch_all_pages(f"{page_id}/conversations", params, cache=cache, stop=is_older)
 
     # ----------------------
     # Page Feed (Posts, Comments, Reactions)
     # ----------------------
     @classmethod
-    async def fetch_page_feed_interactions(cls, page_id: str, access_token: str) -> List[Dict]:
+    async def fetch_page_feed_interactions(cls, page_id: str, access_token: str, cache: bool = False) -> List[Dict]:
         """
         Retrieve all posts from a Page including comments and reactions.
 
         Args:
             page_id (str): ID of the Facebook Page.
             access_token (str): Valid Page Access Token with `pages_read_engagement`.
+            cache (bool): Serve the Graph responses from the client cache when fresh enough.
 
         Returns:
             List[Dict]: A list of posts with comments and reactions.
         """
-        url = f"https://graph.facebook.com/{settings.GRAPH_API_VERSION}/{page_id}/posts"
         params = {
             "access_token": access_token,
             "fields": "id,message,created_time,"
@@ -106,7 +132,148 @@ class FacebookController:
                       "reactions{type,id,name}"
         }
 
-        return await cls._fetch_all_pages(url, params)
+        return await cls._fetch_all_pages(f"{page_id}/posts", params, cache=cache)
+
+    # ----------------------
+    # Post Engagement Counters
+    # ----------------------
+    @classmethod
+    async def fetch_post_engagement(
+        cls, page_id: str, access_token: str, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Retrieve the posts of a Page with their engagement totals only.
+
+        Counters are requested as `summary(true)` totals with `limit(0)` so the
+        Graph API does not return the individual reactions and comments.
+
+        Args:
+            page_id (str): ID of the Facebook Page.
+            access_token (str): Valid Page Access Token with `pages_read_engagement`.
+            since (Optional[datetime]): Only return posts published after this time.
+            until (Optional[datetime]): Only return posts published before this time.
+
+        Returns:
+            List[Dict]: Posts with `created_time`, `reactions`, `comments` and `shares` summaries.
+        """
+        params = {
+            "access_token": access_token,
+            "fields": "id,created_time,"
+                      "reactions.summary(true).limit(0),comments.summary(true).limit(0),shares",
+        }
+        if since or until:
+            from src.controllers import posting_times
+            if since:
+                params["since"] = posting_times.to_epoch(since)
+            if until:
+                params["until"] = posting_times.to_epoch(until)
+
+        return await cls._fetch_all_pages(f"{page_id}/posts", params)
+
+    # ----------------------
+    # Posting Time Histograms
+    # ----------------------
+    @classmethod
+    async def update_posting_histogram(
+        cls, histogram: PostingHistogram, access_token: str
+    ) -> PostingHistogram:
+        """
+        Add the posts and messages published since the histogram watermarks.
+
+        Only new activity is fetched (posts through the Graph `since` filter,
+        conversations updated since the message watermark) and binned, then
+        added to the existing slots; the page history is never re-processed.
+        A post is binned once, so only posts older than
+        `posting_times.POST_MATURITY` are: by then they gathered most of their
+        engagement. Younger posts are left for a later refresh.
+
+        Args:
+            histogram (PostingHistogram): The cached histograms (possibly empty).
+            access_token (str): Valid Page Access Token.
+
+        Returns:
+            PostingHistogram: The updated histograms with advanced watermarks.
+        """
+        import numpy as np
+        from src.controllers import posting_times
+
+        page_id = histogram.page_id
+        mature_until = datetime.now(timezone.utc) - posting_times.POST_MATURITY
+        posts = await cls.fetch_post_engagement(
+            page_id, access_token, since=histogram.posts_until, until=mature_until
+        )
+        conversations = await cls.fetch_page_messages(page_id, access_token, since=histogram.messages_until)
+
+        # Graph `since`/`until` are inclusive and conversations hold older messages too
+        post_times = posting_times.to_epoch_seconds([p["created_time"] for p in posts])
+        is_new_post = (post_times > posting_times.to_epoch(histogram.posts_until)) & \
+            (post_times <= posting_times.to_epoch(mature_until))
+        posts = [post for post, is_new in zip(posts, is_new_post) if is_new]
+        post_times = post_times[is_new_post]
+
+        message_times = posting_times.to_epoch_seconds([
+            m["created_time"]
+            for c in conversations
+            for m in c.get("messages", {}).get("data", [])
+        ])
+        message_times = message_times[message_times > posting_times.to_epoch(histogram.messages_until)]
+
+        binned = posting_times.post_histograms(post_times, posts)
+        histogram.posts = (np.asarray(histogram.posts) + binned["posts"]).tolist()
+        histogram.engagement = (np.asarray(histogram.engagement) + binned["engagement"]).tolist()
+        histogram.messages = (np.asarray(histogram.messages) + posting_times.bin_week(message_times)).tolist()
+
+        if len(post_times):
+            histogram.posts_until = datetime.fromtimestamp(int(post_times.max()), timezone.utc)
+        if len(message_times):
+            histogram.messages_until = datetime.fromtimestamp(int(message_times.max()), timezone.utc)
+        histogram.updatedAt = datetime.now(timezone.utc)
+
+        return histogram
+
+    # ----------------------
+    # Engagement Snapshots
+    # ----------------------
+    @classmethod
+    async def collect_engagement_snapshots(cls, page_id: str, access_token: str) -> List[EngagementSnapshot]:
+        """
+        Read the current engagement counters of a Page and of each of its posts.
+
+        Args:
+            page_id (str): ID of the Facebook Page.
+            access_token (str): Valid Page Access Token with `pages_read_engagement`.
+
+        Returns:
+            List[EngagementSnapshot]: One snapshot per post plus one page-level snapshot.
+        """
+        posts = await cls.fetch_post_engagement(page_id, access_token)
+        conversations = await cls._fetch_all_pages(
+            f"{page_id}/conversations",
+            {"access_token": access_token, "fields": "message_count"},
+        )
+
+        timestamp = datetime.now(timezone.utc)
+        snapshots = [
+            EngagementSnapshot(
+                timestamp=timestamp,
+                meta=EngagementMeta(page_id=page_id, post_id=post["id"]),
+                reactions=post.get("reactions", {}).get("summary", {}).get("total_count", 0),
+                comments=post.get("comments", {}).get("summary", {}).get("total_count", 0),
+                shares=post.get("shares", {}).get("count", 0),
+            )
+            for post in posts
+        ]
+        snapshots.append(
+            EngagementSnapshot(
+                timestamp=timestamp,
+                meta=EngagementMeta(page_id=page_id),
+                reactions=sum(s.reactions for s in snapshots),
+                comments=sum(s.comments for s in snapshots),
+                shares=sum(s.shares for s in snapshots),
+                messages=sum(c.get("message_count", 0) for c in conversations),
+            )
+        )
+        return snapshots
 
     # ----------------------
     # Comment Replies
@@ -117,6 +284,7 @@ class FacebookController:
         comment_id: str,
         reply: str,
         access_token: str,
+        idempotency_key: Optional[str] = None,
     ) -> Dict:
         """
         Post a reply to a specific comment on a Page post.
@@ -125,15 +293,17 @@ class FacebookController:
             comment_id (str): ID of the comment to reply to.
             reply (str): Reply text.
             access_token (str): Valid Page Access Token with `pages_manage_engagement`.
+            idempotency_key (str, optional): Key under which a repeated request is sent only once.
 
         Returns:
             Dict: API response containing the ID of the reply comment.
         """
-        url = f"https://graph.facebook.com/{settings.GRAPH_API_VERSION}/{comment_id}/comments"
         payload = {"message": reply, "access_token": access_token}
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(url, data=payload)
+        resp = await get_graph_client().post(
+            f"{comment_id}/comments", data=payload, priority=GraphPriority.HIGH,
+            idempotency_key=idempotency_key and f"{comment_id}:comment:{idempotency_key}",
+        )
 
         if resp.status_code != 200:
             raise HTTPException(status_code=resp.status_code, detail=resp.json())
@@ -144,31 +314,50 @@ class FacebookController:
     # Helper (Pagination)
     # ----------------------
     @classmethod
-    async def _fetch_all_pages(cls, url: str, params: Dict) -> List[Dict]:
+    async def _fetch_all_pages(
+        cls,
+        url: str,
+        params: Dict,
+        priority: GraphPriority = GraphPriority.NORMAL,
+        cache: bool = False,
+        stop: Optional[Callable[[Dict], bool]] = None,
+    ) -> List[Dict]:
         """
         Helper method to handle Graph API pagination.
 
         Args:
-            url (str): Initial Graph API endpoint.
+            url (str): Initial Graph API path or endpoint.
             params (Dict): Query params including access_token and fields.
+            priority (GraphPriority): Priority of the calls for the rate governor.
+            cache (bool): Read the pages through the client cache.
+            stop (Optional[Callable]): For results in a known order: predicate
+                of the first item not to return; no further page is requested.
 
         Returns:
             List[Dict]: Aggregated list of results from all pages.
         """
         all_data = []
+        client = get_graph_client()
 
-        async with httpx.AsyncClient() as client:
-            while url:
-                resp = await client.get(url, params=params if "after" not in url else None)
-                if resp.status_code != 200:
-                    raise HTTPException(status_code=resp.status_code, detail=resp.json())
-
-                result = resp.json()
-                data = result.get("data", [])
+        while url:
+            resp = await client.get(
+                url, params=params if "after" not in url else None, priority=priority, cache=cache
+            )
+            if resp.status_code != 200:
+                raise HTTPException(status_code=resp.status_code, detail=resp.json())
+
+            result = resp.json()
+            data = result.get("data", [])
+            if stop is not None:
+                kept = list(itertools.takewhile(lambda item: not stop(item), data))
+                all_data.extend(kept)
+                if len(kept) < len(data):
+                    break
+            else:
                 all_data.extend(data)
 
-                paging = result.get("paging", {})
-                url = paging.get("next")  # Use "next" URL directly (includes cursor)
+            paging = result.get("paging", {})
+            url = paging.get("next")  # Use "next" URL directly (includes cursor)
 
         return all_data
     
@@ -178,24 +367,26 @@ class FacebookController:
         """
         Fetch posts, comments, and conversations for a page to calculate basic metrics.
         """
+        client = get_graph_client()
+
         # 1️⃣ Fetch posts (with comments and reactions)
-        posts_url = f"{GRAPH_URL}/{page_id}/posts"
         posts_params = {
             "fields": "id,message,created_time,"
                       "comments.limit(10){id,message,from,created_time},"
                       "reactions.summary(true),shares",
             "access_token": page_access_token
         }
-        post_response = requests.get(posts_url, params=posts_params).json()
+        post_response = (await client.get(f"{page_id}/posts", params=posts_params)).json()
         posts = post_response.get("data", [])
 
         # 2️⃣ Fetch conversations (Messenger threads)
-        conversation_url = f"{GRAPH_URL}/{page_id}/conversations"
         conversation_params = {
             "fields": "messages.limit(10){id,from,message,created_time}",
             "access_token": page_access_token
         }
-        conversation_response = requests.get(conversation_url, params=conversation_params).json()
+        conversation_response = (
+            await client.get(f"{page_id}/conversations", params=conversation_params)
+        ).json()
         messages = conversation_response.get("data", [])
 
         # 3️⃣ Compute basic metrics
@@ -213,90 +404,151 @@ class FacebookController:
     # ===========================================================
 
     @classmethod
-    async def analyze_competitors(key_words_list: List[str], page_access_token: str, max_pages: int = 5):
-        """
-        Search competitor pages by keyword and compute average engagement.
+    async def analyze_competitors(cls, key_words_list: List[str], page_access_token: str, max_pages: int = 5):
         """
-        results = []
-        
-        async with ClientSession() as session:
-            for kw in key_words_list:
-                search_url = f"{GRAPH_URL}/search"
-                params = {
-                    "type": "page",
-                    "q": kw,
-                    "fields": "id,name,category,fan_count",
-                    "limit": max_pages,
-                    "access_token": page_access_token
-                }
-                async with session.get(search_url, params=params) as resp:
-                    search_data = await resp.json()
-                    pages = search_data.get("data", [])
-                    
-                for p in pages:
-                    page_id = p.get("id")
-                    name = p.get("name")
-
-                    posts_url = f"{GRAPH_URL}/{page_id}/posts"
-                    post_params = {
-                        "fields": "id,message,created_time,reactions.summary(true),comments.summary(true),shares",
-                        "limit": 10,
-                        "access_token": page_access_token
-                    }
-                    async with session.get(posts_url, params=post_params) as resp:
-                        post_data = await resp.json()
-                        posts = post_data.get("data", [])
-                    
-                    total_engagement = 0
-                    for post in posts:
-                        reactions = post.get("reactions", {}).get("summary", {}).get("total_count", 0)
-                        comments = post.get("comments", {}).get("summary", {}).get("total_count", 0)
-                        shares = post.get("shares", {}).get("count", 0)
-                        total_engagement += (reactions + comments + shares)
-
-                    avg_engagement_rate = (total_engagement / len(posts)) if posts else 0
-
-                    results.append({
-                        "page_id": page_id,
-                        "name": name,
-                        "avg_engagement_rate": avg_engagement_rate,
-                        "category": p.get("category"),
-                    })
-
-        return results
+        Search competitor pages by keyword and compute their engagement statistics.
 
-    # ===========================================================
+        Posts of all competitor pages are collected first, then the statistics of
+        every page are computed at once by `compute_engagement_stats`.
+
+        A keyword search or competitor page that still fails after the client
+        retries is skipped, so one flaky call does not fail the whole analysis.
+        The searches, then the posts of the pages found, are fetched concurrently
+        (the Graph client paces them against the rate limits).
+        """
+        async def search(kw: str) -> List[Dict]:
+            params = {
+                "type": "page",
+                "q": kw,
+                "fields": "id,name,category,fan_count",
+                "limit": max_pages,
+                "access_token": page_access_token
+            }
+            search_data = await cls._get_or_skip("search", params)
+            return search_data.get("data", []) if search_data is not None else []
+
+        async def page_posts(p: Dict) -> Optional[Dict]:
+            post_params = {
+                "fields": "id,message,created_time,status_type,"
+                          "reactions.summary(true),comments.summary(true),shares",
+                "limit": 10,
+                "access_token": page_access_token
+            }
+            post_data = await cls._get_or_skip(f"{p.get('id')}/posts", post_params)
+            if post_data is None:
+                return None
+            return {
+                "page_id": p.get("id"),
+                "page": p,
+                "posts": post_data.get("data", []),
+            }
+
+        searches = await asyncio.gather(*(search(kw) for kw in key_words_list))
+        pages = [p for found in searches for p in found]
+        competitors = [c for c in await asyncio.gather(*(page_posts(p) for p in pages)) if c is not None]
+
+        import numpy as np
+        from src.controllers.engagement_stats import load_post_metrics, compute_engagement_stats
+
+        metrics = load_post_metrics(competitors)
+        stats = compute_engagement_stats(
+            metrics, np.array([c["page"].get("fan_count") or 0 for c in competitors])
+        )
+
+        return [
+            {**page_stats, "name": c["page"].get("name"), "category": c["page"].get("category")}
+            for c, page_stats in zip(competitors, stats)
+        ]
 
     @classmethod
-    async def generate_recommendations(page_id: str, page_access_token: str, business_profile: Dict = None):
+    async def _get_or_skip(cls, path: str, params: Dict) -> Optional[Dict]:
         """
-        Combine page analytics and competitor analysis to prepare AI recommendation input.
+        Low priority GET used by background analyses: returns None (and logs)
+        instead of raising when the call fails.
         """
-        # 1️⃣ Analyze current page performance
-        interaction_summary = await FacebookController.analyze_interaction_by_page_id(page_id, page_access_token)
+        try:
+            resp = await get_graph_client().get(path, params=params, priority=GraphPriority.LOW)
+        except GraphUnavailableError as exc:
+            logger.warning("Skipping %s: %s", path, exc.detail)
+            return None
+        if resp.status_code != 200:
+            logger.warning("Skipping %s: Graph API returned %s", path, resp.status_code)
+            return None
+        return resp.json()
 
-        # 2️⃣ Extract competitor keywords
+    # ===========================================================
+
+    @staticmethod
+    def competitor_keywords(business_profile: Optional[Dict]) -> List[str]:
+        """Keywords searched for competitors: field or industry, named competitors and business keywords."""
         keywords = []
         if business_profile:
-            if business_profile.get("industry"):
-                keywords.append(business_profile["industry"])
+            if business_profile.get("industry") or business_profile.get("field"):
+                keywords.append(business_profile.get("industry") or business_profile["field"])
             if business_profile.get("competitors"):
                 keywords.extend(business_profile["competitors"])
-
-        # 3️⃣ Analyze competitors
-        competitor_insights = []
-        if keywords:
-            competitor_insights = await FacebookController.analyze_competitors(
-                keywords, page_access_token, max_pages=3
+            # stored business info: the normalized keywords, deduplicated on write
+            keywords.extend(
+                business_profile.get("businessKeyWordsNormalized")
+                or normalize_keywords(business_profile.get("businessKeyWords"))
             )
+            keywords = list(dict.fromkeys(k for k in keywords if k))
+        return keywords
+
+    @classmethod
+    async def generate_recommendations(
+        cls,
+        page_id: str,
+        page_access_token: str,
+        business_profile: Dict = None,
+        analyzer=None,
+        stage_cache: Optional[StageCache] = None,
+    ) -> Dict[str, Any]:
+        """
+        Combine page analytics and competitor analysis to prepare AI recommendation input.
+
+        The two stages are independent and run concurrently, so the inputs are
+        ready after the slowest of them. Each stage output is served from the
+        stage cache while fresh ("interactions" by page, "competitors" by
+        keyword list), so only stale stages are recomputed.
+
+        Args:
+            page_id (str): ID of the Facebook Page.
+            page_access_token (str): Valid Page Access Token.
+            business_profile (Dict, optional): Business info of the page owner.
+            analyzer (Optional[AnalyzerAgent]): Agent analyzing the comments and messages.
+            stage_cache (Optional[StageCache]): Stage cache, defaults to the worker's (None: no caching).
 
-        # 4️⃣ Combine all insights
-        inputs = {
+        Returns:
+            Dict[str, Any]: `summary` (interaction analysis), `competitors` and `business_profile`.
+        """
+        from src.agents.AnalyzerAgent import AnalyzerAgent
+
+        analyzer = analyzer or AnalyzerAgent()
+        cache = stage_cache or get_stage_cache()
+        keywords = cls.competitor_keywords(business_profile)
+
+        async def interactions() -> Dict[str, Any]:
+            result = await analyzer.analyze_page(page_id, page_access_token)
+            return result.model_dump(exclude={"posts"})
+
+        async def competitors() -> List[Dict]:
+            if not keywords:
+                return []
+            return await cls.analyze_competitors(keywords, page_access_token, max_pages=3)
+
+        async def stage(name: str, key: str, compute):
+            if cache is None:
+                return await compute()
+            return await cache.get_or_compute(name, key, compute)
+
+        interaction_summary, competitor_insights = await asyncio.gather(
+            stage("interactions", page_id, interactions),
+            stage("competitors", json.dumps(sorted(keywords)), competitors),
+        )
+        return {
             "summary": interaction_summary,
             "competitors": competitor_insights,
             "business_profile": business_profile or {}
         }
 
-        # Later: send to AI model for recommendations
-        return inputs
-
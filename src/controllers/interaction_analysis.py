@@ -0,0 +1,251 @@
+"""
+Vectorized sentiment and topic analysis of comments and Messenger messages.
+
+A batch of texts is tokenized with one regular expression over the joined
+batch, tokens are mapped to integer IDs once, and everything else is NumPy:
+lexicon scores (with negation) are summed per text with `bincount`, and the
+term counts per group (post, or the inbox) are packed-key `unique` counts.
+
+`score_batch` only depends on its arguments and returns plain arrays, so
+batches can be scored in a process pool and merged with `merge_batches`,
+which ranks the topics of each group and of the whole page by TF-IDF.
+"""
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+SENTIMENTS = ("positive", "neutral", "negative")
+
+POSITIVE = {
+    "good": 1, "great": 2, "excellent": 2, "amazing": 2, "awesome": 2, "love": 2, "loved": 2, "lovely": 2,
+    "like": 1, "liked": 1, "nice": 1, "best": 2, "perfect": 2, "fantastic": 2, "wonderful": 2, "beautiful": 2,
+    "happy": 1, "glad": 1, "thanks": 1, "thank": 1, "thx": 1, "recommend": 2, "recommended": 2, "delicious": 2,
+    "tasty": 2, "fresh": 1, "friendly": 1, "helpful": 1, "fast": 1, "quick": 1, "clean": 1, "cool": 1,
+    "enjoy": 1, "enjoyed": 1, "favorite": 2, "favourite": 2, "fun": 1, "impressive": 2, "incredible": 2,
+    "outstanding": 2, "quality": 1, "reliable": 1, "satisfied": 1, "superb": 2, "worth": 1, "yummy": 2,
+    "affordable": 1, "brilliant": 2, "cute": 1, "exciting": 1, "glorious": 2, "gorgeous": 2, "kind": 1,
+    "pleased": 1, "polite": 1, "professional": 1, "smooth": 1, "stunning": 2, "wow": 2, "yes": 1,
+    "\U0001f60d": 2, "❤": 2, "\U0001f44d": 1, "\U0001f60a": 1, "\U0001f602": 1, "\U0001f525": 1, "\U0001f64f": 1,
+}
+NEGATIVE = {
+    "bad": -1, "terrible": -2, "awful": -2, "horrible": -2, "worst": -2, "hate": -2, "hated": -2, "poor": -1,
+    "disappointed": -2, "disappointing": -2, "disgusting": -2, "rude": -2, "slow": -1, "late": -1,
+    "expensive": -1, "overpriced": -2, "broken": -1, "cold": -1, "dirty": -2, "never": -1, "problem": -1,
+    "problems": -1, "issue": -1, "issues": -1, "complaint": -1, "refund": -1, "scam": -2, "fake": -2,
+    "waste": -2, "wrong": -1, "useless": -2, "angry": -2, "annoying": -1, "boring": -1, "cancel": -1,
+    "cancelled": -1, "damaged": -2, "delay": -1, "delayed": -1, "fail": -1, "failed": -1, "missing": -1,
+    "nobody": -1, "sad": -1, "sick": -1, "stale": -1, "unacceptable": -2, "unhappy": -2, "upset": -1,
+    "mediocre": -1, "meh": -1, "ugly": -1, "worse": -2, "lost": -1, "ignored": -2, "unprofessional": -2,
+    "\U0001f621": -2, "\U0001f620": -2, "\U0001f44e": -1, "\U0001f622": -1, "\U0001f92e": -2, "\U0001f61e": -1,
+}
+LEXICON = {**POSITIVE, **NEGATIVE}
+NEGATORS = {"not", "no", "never", "dont", "don", "didn", "didnt", "isn", "isnt", "wasn", "wasnt", "aren",
+            "won", "cannot", "cant", "without", "hardly"}
+STOPWORDS = set("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further get got had has
+have having he her here hers herself him himself his how i if in into is it its itself just let me more
+most my myself nor now of off on once only or other our ours ourselves out over own please same she
+should so some still such than that the their theirs them themselves then there these they this those
+through to too under until up us very was we were what when where which while who whom why will with
+would you your yours yourself yourselves im ive youre thats its whats one two also really much many
+even well way back new see know want need make made come came going go day today time yes ok okay
+www http https com page post
+""".split())
+
+SEPARATOR = "\x1f"  # joins the texts of a batch; never part of a token
+TOKEN_RE = re.compile(r"\w+|[☀-➿\U0001f300-\U0001faff]|\x1f")
+
+
+@dataclass
+class BatchScores:
+    """Partial results of `score_batch`, merged with `merge_batches`."""
+    texts: int
+    sentiment: np.ndarray     # (groups, 3) int64: positive, neutral, negative texts
+    score_sum: np.ndarray     # (groups,) float64: summed lexicon scores
+    terms: List[str]          # topic terms occurring in the batch
+    doc_freq: np.ndarray      # (terms,) int64: texts containing each term
+    group_index: np.ndarray   # int64 \
+    term_index: np.ndarray    # int64  } counts of each (group, term) pair
+    counts: np.ndarray        # int64 /
+
+
+def score_batch(texts: Sequence[str], groups: np.ndarray, n_groups: int, min_term_length: int = 3) -> BatchScores:
+    """
+    Score a batch of texts.
+
+    Args:
+        texts (Sequence[str]): Comment or message texts.
+        groups (np.ndarray): Group (post or inbox) index of each text, in [0, n_groups).
+        n_groups (int): Number of groups.
+        min_term_length (int): Shortest word counted as a topic.
+
+    Returns:
+        BatchScores: Sentiment counts and scores per group, and topic term counts.
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    tokens = TOKEN_RE.findall(SEPARATOR.join(texts).lower())
+    vocabulary: Dict[str, int] = {SEPARATOR: 0}
+    ids = np.fromiter(
+        (vocabulary.setdefault(token, len(vocabulary)) for token in tokens), dtype=np.int64, count=len(tokens)
+    )
+    words = list(vocabulary)
+
+    # text of each token, separators dropped
+    is_separator = ids == 0
+    doc = np.cumsum(is_separator)
+    ids, doc = ids[~is_separator], doc[~is_separator]
+
+    # lexicon scores, negated when the previous word of the same text is a negator
+    weights = np.fromiter((LEXICON.get(word, 0) for word in words), dtype=np.float64, count=len(words))
+    negator = np.fromiter((word in NEGATORS for word in words), dtype=bool, count=len(words))
+    negated = np.zeros(len(ids), dtype=bool)
+    if len(ids) > 1:
+        negated[1:] = negator[ids[:-1]] & (doc[1:] == doc[:-1])
+    token_scores = np.where(negated, -weights[ids], weights[ids])
+    doc_scores = np.bincount(doc, weights=token_scores, minlength=len(texts))
+
+    labels = np.where(doc_scores > 0, 0, np.where(doc_scores < 0, 2, 1))
+    sentiment = np.bincount(groups * 3 + labels, minlength=n_groups * 3).reshape(n_groups, 3)
+    score_sum = np.bincount(groups, weights=doc_scores, minlength=n_groups)
+
+    # topic terms: words that are not stopwords, sentiment words, negators or numbers
+    topical = np.fromiter(
+        (len(word) >= min_term_length and not word.isdigit() and word not in STOPWORDS
+         and word not in LEXICON and word not in NEGATORS for word in words),
+        dtype=bool, count=len(words),
+    )
+    keep = topical[ids]
+    ids, doc = ids[keep], doc[keep]
+    vocabulary_size = len(words)
+    doc_terms = np.unique(doc * vocabulary_size + ids)
+    doc_freq = np.bincount(doc_terms % vocabulary_size, minlength=vocabulary_size)
+    pairs, counts = np.unique(groups[doc] * vocabulary_size + ids, return_counts=True)
+
+    # renumber the topic terms of the batch densely
+    used = np.flatnonzero(doc_freq)
+    dense = np.full(vocabulary_size, -1, dtype=np.int64)
+    dense[used] = np.arange(len(used))
+    return BatchScores(
+        texts=len(texts),
+        sentiment=sentiment,
+        score_sum=score_sum,
+        terms=[words[i] for i in used],
+        doc_freq=doc_freq[used],
+        group_index=pairs // vocabulary_size,
+        term_index=dense[pairs % vocabulary_size],
+        counts=counts,
+    )
+
+
+def merge_batches(batches: List[BatchScores], n_groups: int, top_k: int = 5, min_doc_freq: int = 2) -> Dict[str, Any]:
+    """
+    Merge batch scores and rank the topics by TF-IDF.
+
+    A term's weight in a group is its count there times
+    log((1 + texts) / (1 + texts containing it)) + 1; terms found in fewer
+    than `min_doc_freq` texts are not topics.
+
+    Returns:
+        Dict[str, Any]: `texts`, `sentiment` ((groups, 3) counts), `score_sum`,
+        `topics` (top terms per group) and `page_topics`.
+    """
+    texts = sum(batch.texts for batch in batches)
+    sentiment = np.zeros((n_groups, 3), dtype=np.int64)
+    score_sum = np.zeros(n_groups, dtype=np.float64)
+    vocabulary: Dict[str, int] = {}
+    group_parts, term_parts, count_parts, df_parts, df_terms = [], [], [], [], []
+    for batch in batches:
+        sentiment += batch.sentiment
+        score_sum += batch.score_sum
+        to_global = np.fromiter(
+            (vocabulary.setdefault(term, len(vocabulary)) for term in batch.terms), dtype=np.int64, count=len(batch.terms)
+        )
+        df_terms.append(to_global)
+        df_parts.append(batch.doc_freq)
+        group_parts.append(batch.group_index)
+        term_parts.append(to_global[batch.term_index])
+        count_parts.append(batch.counts)
+
+    terms = list(vocabulary)
+    topics: List[List[str]] = [[] for _ in range(n_groups)]
+    page_topics: List[str] = []
+    if terms:
+        doc_freq = np.bincount(np.concatenate(df_terms), weights=np.concatenate(df_parts), minlength=len(terms))
+        idf = np.log((1 + texts) / (1 + doc_freq)) + 1
+        idf[doc_freq < min_doc_freq] = 0.0
+
+        group_index = np.concatenate(group_parts)
+        term_index = np.concatenate(term_parts)
+        weights = np.concatenate(count_parts) * idf[term_index]
+
+        page_weights = np.bincount(term_index, weights=weights, minlength=len(terms))
+        page_topics = [terms[i] for i in np.argsort(-page_weights, kind="stable")[:top_k] if page_weights[i] > 0]
+
+        # a (group, term) pair can come from several batches: sum them, then rank inside each group
+        pairs, inverse = np.unique(group_index * len(terms) + term_index, return_inverse=True)
+        pair_weights = np.bincount(inverse, weights=weights)
+        pair_groups, pair_terms = pairs // len(terms), pairs % len(terms)
+        order = np.lexsort((-pair_weights, pair_groups))
+        pair_groups, pair_terms, pair_weights = pair_groups[order], pair_terms[order], pair_weights[order]
+        starts = np.searchsorted(pair_groups, np.arange(n_groups))
+        rank = np.arange(len(pair_groups)) - starts[pair_groups]
+        selected = (rank < top_k) & (pair_weights > 0)
+        for group, term in zip(pair_groups[selected].tolist(), pair_terms[selected].tolist()):
+            topics[group].append(terms[term])
+
+    return {
+        "texts": texts,
+        "sentiment": sentiment,
+        "score_sum": score_sum,
+        "topics": topics,
+        "page_topics": page_topics,
+    }
+
+
+def breakdown(counts: np.ndarray, score_sum: float) -> Dict[str, Any]:
+    """Sentiment distribution of a set of texts: counts, shares and average score."""
+    total = int(counts.sum())
+    result: Dict[str, Any] = {name: int(count) for name, count in zip(SENTIMENTS, counts)}
+    result["total"] = total
+    result["shares"] = {name: round(int(count) / total, 4) if total else 0.0 for name, count in zip(SENTIMENTS, counts)}
+    result["average_score"] = round(float(score_sum) / total, 4) if total else 0.0
+    return result
+
+
+def collect_texts(
+    posts: List[Dict[str, Any]], conversations: List[Dict[str, Any]], page_id: Optional[str] = None
+) -> Tuple[List[str], np.ndarray, List[str]]:
+    """
+    Flatten Graph feed and inbox payloads into texts and group indexes.
+
+    Comments are grouped by post (group i is `posts[i]`) and the Messenger
+    messages of customers (not the page's own replies) form the last group.
+
+    Returns:
+        Tuple[List[str], np.ndarray, List[str]]: Texts, group of each text, and post IDs.
+    """
+    texts: List[str] = []
+    groups: List[int] = []
+    post_ids: List[str] = []
+    for index, post in enumerate(posts):
+        post_ids.append(post.get("id", ""))
+        for comment in post.get("comments", {}).get("data", []):
+            if comment.get("message") and comment.get("from", {}).get("id") != page_id:
+                texts.append(comment["message"])
+                groups.append(index)
+    inbox = len(posts)
+    for conversation in conversations:
+        for message in conversation.get("messages", {}).get("data", []):
+            if message.get("message") and message.get("from", {}).get("id") != page_id:
+                texts.append(message["message"])
+                groups.append(inbox)
+    return texts, np.asarray(groups, dtype=np.int64), post_ids
+
+
+def batch_bounds(total: int, batch_size: int) -> List[Tuple[int, int]]:
+    """[start, end) slices splitting `total` texts into batches of at most `batch_size`."""
+    count = max(1, math.ceil(total / batch_size))
+    return [(i * total // count, (i + 1) * total // count) for i in range(count)]
@@ -0,0 +1,110 @@
+"""
+Fan-out of one notification to many users.
+
+Recipient IDs are streamed from the users or business info collection in
+cursor batches and written in chunks with unordered `insert_many`; a few
+chunks are written concurrently while the next ones are read, so memory
+stays bounded by `chunk_size * max_in_flight` whatever the audience size.
+"""
+import asyncio
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Any, List
+from src.helpers.jobs import Job
+from src.models.BuisnessInfoModel import BusinessInfoModel
+from src.models.NotificationModel import NotificationModel
+from src.models.UserModel import UserModel
+from src.models.schemas.NotificationSchemas import BroadcastRequest, BroadcastTarget
+
+
+async def _explicit_ids(user_ids: List[str]) -> AsyncIterator[str]:
+    for user_id in dict.fromkeys(user_ids):
+        yield user_id
+
+
+async def resolve_recipients(db_client, target: BroadcastTarget, batch_size: int = 1000):
+    """
+    Return (recipient count, async iterator of recipient user IDs) for a target.
+    """
+    if target.kind == "users":
+        user_ids = list(dict.fromkeys(target.user_ids))
+        return len(user_ids), _explicit_ids(user_ids)
+
+    if target.kind == "field":
+        business_model = BusinessInfoModel(db_client)
+        total = await business_model.collection.count_documents({"field": target.field})
+        return total, business_model.iter_user_ids_by_field(target.field, batch_size=batch_size)
+
+    user_filter = {"accountStatus": target.account_status.value} if target.account_status else {}
+    user_model = UserModel(db_client)
+    total = await user_model.count_users_by_filter(user_filter)
+    return total, user_model.iter_user_ids(user_filter, batch_size=batch_size)
+
+
+async def broadcast_notifications(
+    db_client,
+    req: BroadcastRequest,
+    job: Job,
+    chunk_size: int = 1000,
+    max_in_flight: int = 4,
+) -> Dict[str, Any]:
+    """
+    Create the notification `req` for every recipient of `req.target`.
+
+    Args:
+        db_client: The MongoDB database client.
+        req (BroadcastRequest): Title, content and recipients.
+        job (Job): Job receiving the progress (notifications written so far).
+        chunk_size (int): Notifications per `insert_many`.
+        max_in_flight (int): Chunks written concurrently.
+
+    Returns:
+        Dict[str, Any]: Recipient, inserted and failed counts.
+    """
+    notification_model = await NotificationModel.create_instance(db_client)
+    total, recipients = await resolve_recipients(db_client, req.target, batch_size=chunk_size)
+    job.progress(0, total)
+
+    created_at = datetime.now(timezone.utc)
+    counts = {"recipients": 0, "inserted": 0}
+    pending = set()
+
+    def on_written(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is None:
+            counts["inserted"] += task.result()
+        job.progress(counts["inserted"])
+
+    async def write(chunk: List[dict]) -> None:
+        while len(pending) >= max_in_flight:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            for task in done:
+                task.result()  # a failed chunk fails the job
+        task = asyncio.ensure_future(notification_model.insert_many_notifications(chunk))
+        task.add_done_callback(on_written)
+        pending.add(task)
+
+    try:
+        chunk = []
+        async for user_id in recipients:
+            chunk.append({
+                "title": req.title,
+                "content": req.content,
+                "seen": False,
+                "createdAt": created_at,
+                "user_id": user_id,
+            })
+            if len(chunk) >= chunk_size:
+                counts["recipients"] += len(chunk)
+                await write(chunk)
+                chunk = []
+        if chunk:
+            counts["recipients"] += len(chunk)
+            await write(chunk)
+        if pending:
+            await asyncio.gather(*pending)
+    finally:
+        for task in pending:
+            task.cancel()
+
+    job.progress(counts["inserted"], counts["recipients"])
+    return {**counts, "failed": counts["recipients"] - counts["inserted"]}
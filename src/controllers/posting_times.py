@@ -0,0 +1,115 @@
+"""
+Weekday x hour audience activity histograms used to rank posting slots.
+
+Timestamps are binned into the 168 hours of a week (Monday 00:00 UTC is
+slot 0) with a single `np.bincount`, so adding a batch of new posts or
+messages to an existing histogram costs O(batch) and never requires the
+page history to be reprocessed.
+"""
+import calendar
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional
+import numpy as np
+
+HOURS_PER_WEEK = 7 * 24
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday
+# Age after which a post has gathered most of its engagement; posts are binned
+# once, so younger ones are left for a later refresh
+POST_MATURITY = timedelta(hours=48)
+_EMPTY: Dict[str, Any] = {}
+
+
+def to_epoch(moment: Optional[datetime]) -> int:
+    """
+    Epoch seconds of a datetime, reading naive values (as returned by Motor) as UTC.
+    None maps to the smallest int64 so it compares lower than any timestamp.
+    """
+    if moment is None:
+        return int(np.iinfo(np.int64).min)
+    return calendar.timegm(moment.utctimetuple())
+
+
+def to_epoch_seconds(graph_times: List[str]) -> np.ndarray:
+    """Convert Graph API `created_time` strings (e.g. 2025-10-24T12:00:00+0000) to epoch seconds."""
+    return np.array([t[:19] for t in graph_times], dtype="datetime64[s]").astype(np.int64)
+
+
+def hour_of_week(epoch_seconds: np.ndarray) -> np.ndarray:
+    """Map epoch seconds to a UTC slot in [0, 168): weekday * 24 + hour."""
+    hours = np.asarray(epoch_seconds, dtype=np.int64) // 3600
+    return ((hours // 24 + _EPOCH_WEEKDAY) % 7) * 24 + hours % 24
+
+
+def bin_week(epoch_seconds: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """Histogram of timestamps (optionally weighted) over the 168 slots of a week."""
+    return np.bincount(
+        hour_of_week(epoch_seconds), weights=weights, minlength=HOURS_PER_WEEK
+    ).astype(np.float64)
+
+
+def post_histograms(times: np.ndarray, posts: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Bin posts by publication slot.
+
+    Args:
+        times (np.ndarray): Publication time of each post, in epoch seconds.
+        posts (List[Dict]): Graph posts with `reactions.summary` and `comments.summary`.
+
+    Returns:
+        Dict[str, np.ndarray]: `posts` (number of posts) and `engagement`
+        (reactions + comments) per slot.
+    """
+    engagement = np.fromiter(
+        (
+            p.get("reactions", _EMPTY).get("summary", _EMPTY).get("total_count", 0)
+            + p.get("comments", _EMPTY).get("summary", _EMPTY).get("total_count", 0)
+            for p in posts
+        ),
+        dtype=np.float64, count=len(posts),
+    )
+    return {"posts": bin_week(times), "engagement": bin_week(times, engagement)}
+
+
+def rank_slots(
+    engagement: np.ndarray,
+    posts: np.ndarray,
+    messages: np.ndarray,
+    limit: int = 5,
+    now: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Rank the slots of the week by expected audience activity.
+
+    The score averages two normalized signals: the mean engagement of posts
+    published in a slot and the volume of Messenger messages received in it.
+    Slots where the page never posted rely on the messaging signal only.
+
+    Args:
+        engagement (np.ndarray): Engagement per slot.
+        posts (np.ndarray): Number of posts per slot.
+        messages (np.ndarray): Number of messages per slot.
+        limit (int): Number of slots to return.
+        now (Optional[datetime]): Reference time for `next_occurrence`. Defaults to now (UTC).
+
+    Returns:
+        List[Dict]: Slots ordered by score with weekday, hour, score and the
+        next UTC datetime falling in the slot.
+    """
+    per_post = np.divide(engagement, posts, out=np.zeros(HOURS_PER_WEEK), where=posts > 0)
+    signals = [s / s.max() for s in (per_post, messages) if s.max() > 0]
+    score = np.mean(signals, axis=0) if signals else np.zeros(HOURS_PER_WEEK)
+
+    top = np.argsort(-score, kind="stable")[:limit]
+
+    now = (now or datetime.now(timezone.utc)).replace(minute=0, second=0, microsecond=0)
+    current_slot = now.weekday() * 24 + now.hour
+    return [
+        {
+            "weekday": WEEKDAYS[slot // 24],
+            "hour": int(slot % 24),
+            "score": float(score[slot]),
+            "next_occurrence": now + timedelta(hours=int((slot - current_slot - 1) % HOURS_PER_WEEK) + 1),
+        }
+        for slot in top
+    ]
@@ -1,4 +1,6 @@
 import os
+import threading
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # points to src/
@@ -17,8 +19,129 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_DAYS: int
 
+    # Mongo connection pool (one pool per worker)
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 5
+    MONGODB_COMPRESSORS: Optional[str] = None  # e.g. "zstd,snappy,zlib"
+
+    # Threads running blocking calls (sync HTTP, password hashing)
+    BLOCKING_IO_WORKERS: int = 8
+
+    # Graph API client-side rate limits (requests per second)
+    GRAPH_APP_CALLS_PER_SECOND: float = 50.0
+    GRAPH_PAGE_CALLS_PER_SECOND: float = 5.0
+
+    # Graph API retries, deadlines and circuit breaking
+    GRAPH_REQUEST_DEADLINE_SECONDS: float = 60.0
+    GRAPH_MAX_ATTEMPTS: int = 4
+    GRAPH_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    GRAPH_CIRCUIT_RECOVERY_SECONDS: float = 30.0
+
+    # Notification streams (Server-Sent Events)
+    NOTIFICATION_STREAM_QUEUE_SIZE: int = 100
+    NOTIFICATION_STREAM_KEEPALIVE_SECONDS: float = 15.0
+    NOTIFICATION_CHANGE_STREAM: bool = True  # propagate notifications between workers
+
+    # Retention: seen notifications are deleted by a TTL index, older rejected drafts,
+    # analyses and recommendations are moved to the archive (0 keeps them forever)
+    SEEN_NOTIFICATION_RETENTION_DAYS: int = 90
+    REJECTED_POST_RETENTION_DAYS: int = 30
+    ANALYSIS_RETENTION_DAYS: int = 180
+    RECOMMENDATION_RETENTION_DAYS: int = 180
+    ARCHIVE_DIR: str = "archive"
+    ARCHIVE_FORMAT: str = "ndjson"  # or "bson"
+    ARCHIVE_BATCH_SIZE: int = 1000
+
+    # Background jobs (analyses, generations, broadcasts, bulk deletes), stored in MongoDB:
+    # jobs running at once per worker, lease renewed by the running worker (a job whose
+    # lease expires is run again, at most JOBS_MAX_ATTEMPTS times), queue polling and
+    # how long finished jobs stay queryable
+    JOBS_MAX_CONCURRENT: int = 4
+    JOBS_LEASE_SECONDS: float = 60.0
+    JOBS_POLL_SECONDS: float = 2.0
+    JOBS_MAX_ATTEMPTS: int = 3
+    JOBS_RETENTION_SECONDS: int = 86400
+
+    # Verified access tokens cached per worker, and how often revocations made
+    # by other workers (logout, deactivation) are picked up
+    TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0
+
+    # Language models of the agents: "stub" (local, offline), "openai" or "huggingface";
+    # a provider without its credentials stops the worker at startup (build_llm_client)
+    LLM_PROVIDER: str = "stub"
+    LLM_MAX_CONCURRENCY: int = 8  # calls in flight per provider and worker
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_MAX_RETRIES: int = 2
+    LLM_TOKENS_PER_MINUTE: Optional[int] = None  # per provider and worker, None: unlimited
+    LLM_TOKENS_PER_DAY: Optional[int] = None
+    OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None
+    OPENAI_MODEL: str = "gpt-4o-mini"
+    HF_API_TOKEN: Optional[str] = None
+    HF_MODEL: str = "meta-llama/Llama-3.1-8B-Instruct"
+    # Responses of identical generations (same template version, inputs, model), 0 disables
+    LLM_CACHE_TTL_SECONDS: int = 7 * 86400
+    LLM_CACHE_MAX_ENTRIES: int = 2048  # kept in memory per worker, all of them in MongoDB
+    # Drafts generated at once by one draft generation (bounded by LLM_MAX_CONCURRENCY too)
+    DRAFT_GENERATION_CONCURRENCY: int = 8
+    # Near-duplicate drafts: cosine similarity (0-1) from which a draft repeats a recent
+    # draft or accepted post of the user; generated ones are dropped, written ones flagged
+    DRAFT_DUPLICATE_THRESHOLD: float = 0.75
+    DRAFT_SIMILARITY_MAX_POSTS: int = 10_000  # recent posts compared, per user
+    DRAFT_SIMILARITY_MAX_USERS: int = 1000    # users whose posts are kept in memory per worker
+    DRAFT_SIMILARITY_TTL_SECONDS: float = 600.0
+
+    # Comment and message analysis: texts scored per batch, and processes scoring the
+    # batches of pages with at least ANALYSIS_PROCESS_MIN_TEXTS texts (0: thread pool only)
+    ANALYSIS_BATCH_SIZE: int = 20_000
+    ANALYSIS_PROCESS_WORKERS: int = 2
+    ANALYSIS_PROCESS_MIN_TEXTS: int = 50_000
+
+    # Freshness of the recommendation pipeline stages, reused across runs per worker
+    RECOMMENDATION_INTERACTIONS_TTL_SECONDS: float = 900.0
+    RECOMMENDATION_COMPETITORS_TTL_SECONDS: float = 6 * 3600.0
+
+    # Shared key required by the admin endpoints (disabled when unset)
+    ADMIN_API_KEY: Optional[str] = None
+
     class Config:
         env_file = os.path.join(BASE_DIR, ".env")  # src/.env
+        frozen = True  # snapshots are shared between requests
+
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+
+def get_Settings() -> Settings:
+    """
+    Return the current settings snapshot, parsing env and `src/.env` only once.
+
+    Usable directly or as a FastAPI dependency (`Depends(get_Settings)`).
+    """
+    settings = _settings
+    if settings is None:
+        with _settings_lock:
+            if _settings is None:
+                return reload_Settings()
+            settings = _settings
+    return settings
+
+
+def reload_Settings() -> Settings:
+    """
+    Re-read env and `src/.env` and atomically swap the settings snapshot.
+
+    Requests already running keep the snapshot they started with. If the new
+    configuration is invalid the error is raised and the current snapshot is
+    kept. Values captured at startup (Mongo client, encryption key, Graph
+    client limits) still need a restart to change.
 
-def get_Settings():
-    return Settings()
+    Returns:
+        Settings: The new snapshot.
+    """
+    global _settings
+    settings = Settings()
+    _settings = settings
+    return settings
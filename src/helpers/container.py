@@ -0,0 +1,178 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from motor.motor_asyncio import AsyncIOMotorClient
+from src.helpers.config import Settings
+from src.helpers.encryption import EncryptionService
+from src.helpers.graph_client import GraphClient, build_graph_client, set_graph_client
+from src.helpers.jobs import JobRunner
+from src.helpers.notification_hub import NotificationHub, set_notification_hub
+from src.helpers.retention import ensure_ttl_indexes
+from src.helpers.similarity import DraftSimilarityIndex, set_similarity_index
+from src.helpers.stage_cache import StageCache, set_stage_cache
+from src.helpers.token_cache import TokenCache, set_token_cache
+from src.models.enums.DBEnums import DBEnums
+from src.stores.LLMs import LLMClient, build_llm_client, set_llm_client
+
+logger = logging.getLogger("request")
+
+WARMUP_TIMEOUT_SECONDS = 5.0
+
+
+class AppContainer:
+    """
+    Shared resources of one worker, built once in the application lifespan.
+
+    Holds the Mongo connection pool, the Graph API client (HTTP pool, rate
+    governor and response cache), the LLM providers of the agents, a thread
+    pool for blocking calls, a process pool for CPU-heavy analyses, the
+    hub feeding the notification streams, the verified access token cache,
+    the near-duplicate draft index, the recommendation stage cache and the
+    background job runner (the container is the context of the job handlers).
+    `start` builds and warms them up, `close` releases them in reverse
+    order once the server stopped accepting requests.
+
+    Args:
+        settings (Settings): Settings snapshot used to configure the resources.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.mongo_conn: Optional[AsyncIOMotorClient] = None
+        self.db_client = None
+        self.graph_client: Optional[GraphClient] = None
+        self.llm_client: Optional[LLMClient] = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+        self.notification_hub: Optional[NotificationHub] = None
+        self.token_cache: Optional[TokenCache] = None
+        self.similarity_index: Optional[DraftSimilarityIndex] = None
+        self.stage_cache: Optional[StageCache] = None
+        self.jobs: Optional[JobRunner] = None
+
+    async def start(self) -> None:
+        """Create the shared resources and warm them up."""
+        settings = self.settings
+
+        mongo_options = {
+            "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+            "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        }
+        if settings.MONGODB_COMPRESSORS:
+            mongo_options["compressors"] = settings.MONGODB_COMPRESSORS
+        self.mongo_conn = AsyncIOMotorClient(settings.MONGODB_URL, **mongo_options)
+        self.db_client = self.mongo_conn[settings.MONGODB_DATABASE]
+
+        self.graph_client = build_graph_client(settings)
+        set_graph_client(self.graph_client)
+
+        self.llm_client = build_llm_client(settings, self.db_client[DBEnums.COLLECTION_LLM_CACHE_NAME.value])
+        set_llm_client(self.llm_client)
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.BLOCKING_IO_WORKERS, thread_name_prefix="blocking-io"
+        )
+        if settings.ANALYSIS_PROCESS_WORKERS > 0:
+            # spawned (not forked) so children do not inherit the event loop and the Mongo pool;
+            # processes are started on the first submitted task
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=settings.ANALYSIS_PROCESS_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+
+        self.notification_hub = NotificationHub(
+            queue_size=settings.NOTIFICATION_STREAM_QUEUE_SIZE,
+            keepalive_interval=settings.NOTIFICATION_STREAM_KEEPALIVE_SECONDS,
+        )
+        set_notification_hub(self.notification_hub)
+        self.notification_hub.start(
+            self.db_client[DBEnums.COLLECTION_NOTIFICATION_NAME.value]
+            if settings.NOTIFICATION_CHANGE_STREAM else None
+        )
+
+        self.token_cache = TokenCache(
+            max_entries=settings.TOKEN_CACHE_MAX_ENTRIES, sync_interval=settings.TOKEN_REVOCATION_SYNC_SECONDS
+        )
+        set_token_cache(self.token_cache)
+        self.token_cache.start(self.db_client[DBEnums.COLLECTION_REVOKED_TOKEN_NAME.value])
+
+        self.similarity_index = DraftSimilarityIndex(
+            threshold=settings.DRAFT_DUPLICATE_THRESHOLD,
+            max_posts=settings.DRAFT_SIMILARITY_MAX_POSTS,
+            max_users=settings.DRAFT_SIMILARITY_MAX_USERS,
+            ttl=settings.DRAFT_SIMILARITY_TTL_SECONDS,
+        )
+        set_similarity_index(self.similarity_index)
+
+        self.stage_cache = StageCache({
+            "interactions": settings.RECOMMENDATION_INTERACTIONS_TTL_SECONDS,
+            "competitors": settings.RECOMMENDATION_COMPETITORS_TTL_SECONDS,
+        })
+        set_stage_cache(self.stage_cache)
+
+        self.jobs = JobRunner(
+            self.db_client,
+            context=self,
+            max_concurrent=settings.JOBS_MAX_CONCURRENT,
+            lease_seconds=settings.JOBS_LEASE_SECONDS,
+            poll_interval=settings.JOBS_POLL_SECONDS,
+            max_attempts=settings.JOBS_MAX_ATTEMPTS,
+            retention=settings.JOBS_RETENTION_SECONDS,
+        )
+
+        await self.warmup()
+        self.jobs.start()
+
+    async def warmup(self) -> None:
+        """
+        Open connections before the first request: ping Mongo (the pool then
+        keeps `minPoolSize` connections open), apply the retention TTL indexes
+        and build the Fernet cipher. Failures are logged, not raised, so a
+        worker can start while Mongo is still coming up.
+        """
+        try:
+            await asyncio.wait_for(self.mongo_conn.admin.command("ping"), timeout=WARMUP_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning("MongoDB warmup ping failed: %r", e)
+        else:
+            try:
+                await asyncio.wait_for(ensure_ttl_indexes(self.db_client, self.settings), timeout=WARMUP_TIMEOUT_SECONDS)
+            except Exception as e:
+                logger.warning("Retention TTL indexes could not be applied: %r", e)
+
+        try:
+            EncryptionService.configure(self.settings.ENCRYPTION_KEY)
+        except ValueError as e:
+            logger.warning("Encryption key could not be loaded: %s", e)
+
+    async def run_blocking(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking function (sync HTTP call, password hashing) in the shared thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    async def close(self) -> None:
+        """Release the resources: jobs, token cache, notification hub, LLM and Graph clients, thread and process pools, then the Mongo pool."""
+        if self.jobs is not None:
+            await self.jobs.close()
+        set_similarity_index(None)
+        set_stage_cache(None)
+        if self.token_cache is not None:
+            await self.token_cache.close()
+            set_token_cache(None)
+        if self.notification_hub is not None:
+            await self.notification_hub.close()
+            set_notification_hub(None)
+        if self.llm_client is not None:
+            await self.llm_client.aclose()
+            set_llm_client(None)
+        if self.graph_client is not None:
+            await self.graph_client.aclose()
+            set_graph_client(None)
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=True, cancel_futures=True)
+        if self.mongo_conn is not None:
+            self.mongo_conn.close()
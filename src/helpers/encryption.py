@@ -1,16 +1,21 @@
-from cryptography.fernet import Fernet
 from src.helpers.config import get_Settings
 
 class EncryptionService:
     _fernet = None
 
+    @classmethod
+    def configure(cls, key: str) -> None:
+        """Build the cipher from `key` (called once by the application container)."""
+        from cryptography.fernet import Fernet
+
+        if not key:
+            raise ValueError("ENCRYPTION_KEY is not set in configuration")
+        cls._fernet = Fernet(key)
+
     @classmethod
     def _get_fernet(cls):
         if cls._fernet is None:
-            settings = get_Settings()
-            if not settings.ENCRYPTION_KEY:
-                raise ValueError("ENCRYPTION_KEY is not set in configuration")
-            cls._fernet = Fernet(settings.ENCRYPTION_KEY)
+            cls.configure(get_Settings().ENCRYPTION_KEY)
         return cls._fernet
 
     @classmethod
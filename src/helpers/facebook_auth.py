@@ -1,4 +1,3 @@
-import requests
 from fastapi import HTTPException
 from src.helpers.config import get_Settings
 
@@ -17,6 +16,8 @@ class FacebookAuthService:
         Raises:
             HTTPException: If the exchange fails.
         """
+        import requests  # only needed for the token exchange, keep it out of start-up
+
         settings = get_Settings()
         
         url = "https://graph.facebook.com/v23.0/oauth/access_token"
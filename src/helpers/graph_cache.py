@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import httpx
+
+logger = logging.getLogger("graph")
+
+# Seconds a response stays fresh, per endpoint (see `resilience.endpoint_key`)
+DEFAULT_TTLS: Dict[str, float] = {
+    "GET {id}": 300.0,                 # page info
+    "GET search": 3600.0,              # competitor search
+    "GET {id}/posts": 60.0,            # feed interactions
+    "GET {id}/conversations": 30.0,    # inbox
+    "GET {id}/messages": 15.0,         # chat history
+}
+
+
+class CacheEntry:
+    def __init__(self, response: httpx.Response, ttl: float, stale_ttl: float):
+        now = time.monotonic()
+        self.response = response
+        self.fresh_until = now + ttl
+        self.stale_until = now + ttl + stale_ttl
+
+
+class GraphCache:
+    """
+    Read-through cache for Graph API GET responses.
+
+    Entries are keyed by path, query (without the token) and token identity,
+    so two pages never share data. Each endpoint has its own TTL; after it
+    expires an entry is still served for `stale_factor * ttl` seconds while a
+    single background call refreshes it (stale-while-revalidate). Concurrent
+    misses for the same key share one upstream call (single-flight). Only
+    successful responses are stored.
+
+    Args:
+        ttls (Optional[Dict[str, float]]): TTL per endpoint key, defaults to `DEFAULT_TTLS`.
+        default_ttl (float): TTL of endpoints missing from `ttls`.
+        stale_factor (float): Stale window as a multiple of the TTL (0 disables it).
+        max_entries (int): Least recently used entries are evicted beyond this size.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 30.0,
+        stale_factor: float = 1.0,
+        max_entries: int = 5000,
+    ):
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.stale_factor = stale_factor
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[Tuple[str, str], CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._refreshing = set()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0}
+
+    @staticmethod
+    def key(url: httpx.URL, params: Optional[Dict], page_key: Optional[str]) -> Tuple[str, str]:
+        """Cache key: (token identity, URL with sorted query and without the access token)."""
+        query = dict(url.params)
+        query.update({k: str(v) for k, v in (params or {}).items()})
+        query.pop("access_token", None)
+        path = str(url.copy_with(query=None))
+        return page_key or "", path + "?" + "&".join(f"{k}={query[k]}" for k in sorted(query))
+
+    def _store(self, key, endpoint: str, response: httpx.Response) -> None:
+        if response.status_code != 200:
+            return
+        ttl = self.ttls.get(endpoint, self.default_ttl)
+        self._entries[key] = CacheEntry(response, ttl, ttl * self.stale_factor)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _load(self, key, endpoint: str, loader: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        if key in self._inflight:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(self._inflight[key])
+
+        task = asyncio.ensure_future(loader())
+        self._inflight[key] = task
+        try:
+            response = await asyncio.shield(task)
+        finally:
+            self._inflight.pop(key, None)
+        self._store(key, endpoint, response)
+        return response
+
+    async def _refresh(self, key, endpoint: str, loader) -> None:
+        try:
+            await self._load(key, endpoint, loader)
+        except Exception as exc:  # keep serving the stale entry until it expires
+            logger.warning("Background refresh of %s failed: %r", endpoint, exc)
+
+    async def get(
+        self, key, endpoint: str, loader: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """
+        Return the cached response for `key`, calling `loader` on a miss.
+
+        Args:
+            key: Key built by `GraphCache.key`.
+            endpoint (str): Endpoint key selecting the TTL.
+            loader (Callable): Coroutine function performing the upstream call.
+
+        Returns:
+            httpx.Response: Cached, shared or freshly loaded response.
+        """
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and now < entry.stale_until:
+            self._entries.move_to_end(key)
+            if now < entry.fresh_until:
+                self.stats["hits"] += 1
+            else:
+                self.stats["stale_hits"] += 1
+                if key not in self._inflight:
+                    self.stats["refreshes"] += 1
+                    task = asyncio.ensure_future(self._refresh(key, endpoint, loader))
+                    self._refreshing.add(task)
+                    task.add_done_callback(self._refreshing.discard)
+            return entry.response
+
+        self.stats["misses"] += 1
+        return await self._load(key, endpoint, loader)
+
+    def invalidate(self, page_key: Optional[str]) -> None:
+        """Drop every entry read with the token `page_key` (after a write to that page)."""
+        owner = page_key or ""
+        for key in [k for k in self._entries if k[0] == owner]:
+            del self._entries[key]
+
+    def hit_ratio(self) -> float:
+        served = self.stats["hits"] + self.stats["stale_hits"] + self.stats["misses"]
+        return (self.stats["hits"] + self.stats["stale_hits"]) / served if served else 0.0
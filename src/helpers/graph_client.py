@@ -0,0 +1,280 @@
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional
+import httpx
+from src.helpers.config import get_Settings, Settings
+from src.helpers.graph_cache import GraphCache
+from src.helpers.rate_limit import GraphRateGovernor, GraphPriority
+from src.helpers.resilience import (
+    RetryPolicy,
+    CircuitBreakerRegistry,
+    IdempotencyCache,
+    GraphUnavailableError,
+    RETRYABLE_STATUS_CODES,
+    TRANSIENT_ERROR_CODES,
+    endpoint_key,
+    graph_error,
+)
+
+GRAPH_HOST = "https://graph.facebook.com"
+
+logger = logging.getLogger("graph")
+
+
+def token_identity(access_token: Optional[str]) -> Optional[str]:
+    """Stable, non-reversible key for an access token (one page token = one page)."""
+    if not access_token:
+        return None
+    return hashlib.sha256(access_token.encode()).hexdigest()[:16]
+
+
+class GraphClient:
+    """
+    Shared async client for the Facebook Graph API.
+
+    Wraps one pooled `httpx.AsyncClient` and routes every call through a
+    `GraphRateGovernor`, which waits for rate-limit tokens before sending and
+    learns from the usage headers of every response.
+
+    Failed calls are retried with jittered exponential backoff according to
+    the `RetryPolicy`, each endpoint has its own circuit breaker, and every
+    call (retries and rate-limit waits included) must finish within its
+    deadline. Exhausted deadlines, open circuits and connection failures
+    raise `GraphUnavailableError`; Graph error responses are returned as is.
+
+    GETs made with `cache=True` are served through a `GraphCache`
+    (per-endpoint TTLs, stale-while-revalidate, single-flight); any write
+    made with a page token invalidates the cached reads of that token.
+
+    Args:
+        governor (GraphRateGovernor): Rate governor shared by all calls.
+        api_version (str): Graph API version used to build relative URLs.
+        transport (Optional[httpx.AsyncBaseTransport]): Custom transport (e.g. a local stub).
+        timeout (float): Per-attempt timeout in seconds.
+        deadline (float): Default total time budget of a call in seconds.
+        retry_policy (Optional[RetryPolicy]): Retry rules, defaults to `RetryPolicy()`.
+        breakers (Optional[CircuitBreakerRegistry]): Circuit breakers, defaults to `CircuitBreakerRegistry()`.
+        cache (Optional[GraphCache]): Cache of GET responses, defaults to `GraphCache()`.
+    """
+
+    def __init__(
+        self,
+        governor: GraphRateGovernor,
+        api_version: str,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        timeout: float = 30.0,
+        deadline: float = 60.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+        cache: Optional[GraphCache] = None,
+    ):
+        self.governor = governor
+        self.base_url = f"{GRAPH_HOST}/{api_version}"
+        self.timeout = timeout
+        self.deadline = deadline
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breakers = breakers or CircuitBreakerRegistry()
+        self.idempotency = IdempotencyCache()
+        self.cache = cache or GraphCache()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._client = httpx.AsyncClient(
+            transport=transport,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+
+    def url(self, path: str) -> str:
+        """Absolute URL of a Graph path (absolute URLs, e.g. paging links, are kept)."""
+        if path.startswith("http"):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    @staticmethod
+    def page_key(url: httpx.URL, params: Optional[Dict] = None, data: Optional[Dict] = None) -> Optional[str]:
+        """Identity of the access token a request is made with."""
+        access_token = (params or {}).get("access_token") or (data or {}).get("access_token") \
+            or url.params.get("access_token")
+        return token_identity(access_token)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        priority: GraphPriority = GraphPriority.NORMAL,
+        deadline: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> httpx.Response:
+        """
+        Send a Graph API request once the rate governor allows it.
+
+        Args:
+            method (str): HTTP method.
+            path (str): Graph path (e.g. "{page_id}/feed") or absolute URL.
+            params (Optional[Dict]): Query parameters.
+            data (Optional[Dict]): Form body.
+            json (Optional[Dict]): JSON body.
+            priority (GraphPriority): Priority of the call for the governor.
+            deadline (Optional[float]): Total time budget in seconds (defaults to the client deadline).
+            idempotency_key (Optional[str]): Key of a non-idempotent call. Concurrent or
+                repeated calls with the same key are sent once and share the response.
+
+        Returns:
+            httpx.Response: The raw response; callers keep handling Graph errors.
+
+        Raises:
+            GraphUnavailableError: If the endpoint circuit is open, the deadline is
+                exceeded or the connection fails.
+        """
+        if method == "GET":
+            return await self._send(method, path, params, data, json, priority, deadline)
+
+        try:
+            return await self._write(method, path, params, data, json, priority, deadline, idempotency_key)
+        finally:
+            # reads cached with this page token may be outdated by the write
+            self.cache.invalidate(self.page_key(httpx.URL(self.url(path)), params, data))
+
+    async def _write(self, method, path, params, data, json, priority, deadline, idempotency_key) -> httpx.Response:
+        if idempotency_key is None:
+            return await self._send(method, path, params, data, json, priority, deadline)
+
+        cached = self.idempotency.get(idempotency_key)
+        if cached is not None:
+            return cached
+        if idempotency_key in self._inflight:
+            return await asyncio.shield(self._inflight[idempotency_key])
+
+        task = asyncio.ensure_future(self._send(method, path, params, data, json, priority, deadline))
+        self._inflight[idempotency_key] = task
+        try:
+            response = await asyncio.shield(task)
+        finally:
+            self._inflight.pop(idempotency_key, None)
+
+        if response.status_code < 400:
+            self.idempotency.put(idempotency_key, response)
+        return response
+
+    async def _send(self, method, path, params, data, json, priority, deadline) -> httpx.Response:
+        url = self.url(path)
+        page_key = self.page_key(httpx.URL(url), params, data)
+        endpoint = endpoint_key(method, httpx.URL(url))
+        breaker = self.breakers.get(endpoint)
+        policy = self.retry_policy
+        expires_at = time.monotonic() + (deadline or self.deadline)
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise GraphUnavailableError(
+                    503, "Graph API endpoint is temporarily unavailable", endpoint, breaker.retry_after()
+                )
+
+            try:
+                await asyncio.wait_for(
+                    self.governor.acquire(page_key, priority), max(0.0, expires_at - time.monotonic())
+                )
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                response = await self._client.request(
+                    method, url, params=params, data=data, json=json,
+                    timeout=min(self.timeout, remaining),
+                )
+            except asyncio.TimeoutError:
+                raise GraphUnavailableError(504, "Graph API request deadline exceeded", endpoint)
+            except httpx.TransportError as exc:
+                breaker.record_failure()
+                retry = policy.should_retry_exception(method, exc)
+                response = None
+                failure = exc
+            else:
+                error = graph_error(response)
+                self.governor.observe(response.headers, page_key, error.get("code"))
+                if response.status_code in RETRYABLE_STATUS_CODES or error.get("code") in TRANSIENT_ERROR_CODES:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                retry = policy.should_retry_response(method, response)
+
+            attempt += 1
+            delay = policy.backoff(attempt - 1)
+            if not retry or attempt >= policy.max_attempts or time.monotonic() + delay >= expires_at:
+                if response is not None:
+                    return response
+                raise GraphUnavailableError(
+                    504 if isinstance(failure, httpx.TimeoutException) else 503,
+                    f"Graph API request failed ({failure.__class__.__name__})",
+                    endpoint,
+                ) from failure
+
+            logger.warning(
+                "Retrying %s (attempt %d/%d) in %.2fs: %s", endpoint, attempt + 1, policy.max_attempts, delay,
+                response.status_code if response is not None else failure.__class__.__name__,
+            )
+            await asyncio.sleep(delay)
+
+    async def get(
+        self, path: str, params: Optional[Dict[str, Any]] = None, cache: bool = False, **kwargs
+    ) -> httpx.Response:
+        """GET a Graph path, through the response cache if `cache` is set."""
+        if not cache:
+            return await self.request("GET", path, params=params, **kwargs)
+
+        url = httpx.URL(self.url(path))
+        return await self.cache.get(
+            GraphCache.key(url, params, self.page_key(url, params)),
+            endpoint_key("GET", url),
+            lambda: self.request("GET", path, params=params, **kwargs),
+        )
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    async def delete(self, path: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", path, params=params, **kwargs)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_graph_client: Optional[GraphClient] = None
+
+
+def build_graph_client(settings: Settings) -> GraphClient:
+    """Create a GraphClient configured from the settings."""
+    return GraphClient(
+        GraphRateGovernor(
+            app_rate=settings.GRAPH_APP_CALLS_PER_SECOND,
+            page_rate=settings.GRAPH_PAGE_CALLS_PER_SECOND,
+        ),
+        api_version=settings.GRAPH_API_VERSION,
+        deadline=settings.GRAPH_REQUEST_DEADLINE_SECONDS,
+        retry_policy=RetryPolicy(max_attempts=settings.GRAPH_MAX_ATTEMPTS),
+        breakers=CircuitBreakerRegistry(
+            failure_threshold=settings.GRAPH_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_time=settings.GRAPH_CIRCUIT_RECOVERY_SECONDS,
+        ),
+    )
+
+
+def get_graph_client() -> GraphClient:
+    """
+    Return the process-wide GraphClient: the one owned by the application
+    container, or one created on first use outside the app (scripts, benchmarks).
+    """
+    global _graph_client
+    if _graph_client is None:
+        _graph_client = build_graph_client(get_Settings())
+    return _graph_client
+
+
+def set_graph_client(client: Optional[GraphClient]) -> None:
+    """Replace the process-wide GraphClient (e.g. with one using a local stub transport)."""
+    global _graph_client
+    _graph_client = client
@@ -0,0 +1,296 @@
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Type
+from pydantic import BaseModel
+from src.models.JobModel import JobModel
+from src.models.db_schemas.Job import JobRecord
+from src.models.enums.JobEnums import JobStatus
+
+logger = logging.getLogger("request")
+
+
+class Job:
+    """
+    A background job, as stored in the jobs collection.
+
+    The job handler reports progress through `job.progress`; the progress is
+    saved with the next heartbeat of the worker running it. The handler's
+    return value (a small dict: counts, IDs of the documents written) becomes
+    the job result.
+    """
+
+    def __init__(self, record: JobRecord):
+        self.record = record
+
+    @property
+    def id(self) -> str:
+        return self.record.id
+
+    @property
+    def kind(self) -> str:
+        return self.record.kind
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return self.record.params
+
+    @property
+    def status(self) -> JobStatus:
+        return self.record.status
+
+    @property
+    def processed(self) -> int:
+        return self.record.processed
+
+    @property
+    def total(self) -> Optional[int]:
+        return self.record.total
+
+    def progress(self, processed: int, total: Optional[int] = None) -> None:
+        self.record.processed = processed
+        if total is not None:
+            self.record.total = total
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = self.record
+        return {
+            "job_id": record.id,
+            "kind": record.kind,
+            "status": record.status.value,
+            "params": record.params,
+            "total": record.total,
+            "processed": record.processed,
+            "result": record.result,
+            "error": record.error,
+            "attempts": record.attempts,
+            "created_at": record.createdAt,
+            "started_at": record.startedAt,
+            "finished_at": record.finishedAt,
+        }
+
+
+@dataclasses.dataclass(frozen=True)
+class JobKind:
+    """
+    A kind of background job: `handler(context, job, params)` runs it, with
+    `params` parsed by `params_model` (the raw dict when None). Jobs of
+    `admin` kinds are only submitted and read with the admin key.
+    `max_attempts` overrides the runner's for handlers that must not run
+    twice (1: a job whose worker was lost or shut down fails).
+    """
+    name: str
+    handler: Callable[[Any, Job, Any], Awaitable[Optional[Dict[str, Any]]]]
+    params_model: Optional[Type[BaseModel]] = None
+    admin: bool = False
+    max_attempts: Optional[int] = None
+
+
+_job_kinds: Dict[str, JobKind] = {}
+
+
+def job_handler(
+    kind: str, params_model: Optional[Type[BaseModel]] = None, admin: bool = False, max_attempts: Optional[int] = None
+):
+    """Decorator registering the coroutine function running the jobs of `kind`."""
+    def register(handler):
+        _job_kinds[kind] = JobKind(kind, handler, params_model, admin, max_attempts)
+        return handler
+    return register
+
+
+def get_job_kind(kind: str) -> Optional[JobKind]:
+    return _job_kinds.get(kind)
+
+
+def dedup_key(kind: str, params: Dict[str, Any]) -> str:
+    """Identity of a job: its kind and parameters."""
+    payload = json.dumps({"kind": kind, "params": params}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class JobRunner:
+    """
+    Durable runner for long operations started by an HTTP request (analyses,
+    generations, broadcasts, bulk deletes): the request stores the job and
+    returns its ID at once, whatever the size of the work, and the client
+    polls the job for its progress.
+
+    Jobs are MongoDB records, so any worker can report them and they survive
+    restarts. Each worker runs at most `max_concurrent` jobs: it claims the
+    oldest pending job under a lease of `lease_seconds`, renewed with the
+    progress every `heartbeat_interval`. A worker that crashed stops
+    renewing, so its jobs are claimed again once their lease expired, up to
+    `max_attempts` runs (handlers must therefore be safe to run again). A job
+    that raises fails at once. On shutdown, running jobs are put back in the
+    queue for the other workers, except those of kinds allowing a single
+    attempt, which fail.
+
+    A job identical to a pending or running one (same kind and parameters)
+    is not submitted again: the active job is returned instead.
+
+    Args:
+        db_client: The MongoDB database client.
+        context: Passed to the handlers (the application container).
+        max_concurrent (int): Jobs running at the same time on this worker.
+        lease_seconds (float): Time a worker may go without renewing a lease.
+        poll_interval (float): Seconds between polls of the queue when idle
+            (jobs submitted on this worker start at once).
+        heartbeat_interval (float): Seconds between lease renewals and progress saves.
+        max_attempts (int): Runs of a job whose worker keeps disappearing.
+        retention (float): Seconds a finished job stays queryable.
+    """
+
+    def __init__(
+        self,
+        db_client,
+        context: Any = None,
+        max_concurrent: int = 4,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 2.0,
+        heartbeat_interval: float = 1.0,
+        max_attempts: int = 3,
+        retention: float = 86400.0,
+    ):
+        self.db_client = db_client
+        self.context = context
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = min(heartbeat_interval, lease_seconds / 3)
+        self.max_attempts = max_attempts
+        self.retention = retention
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._wake = asyncio.Event()
+        self._model: Optional[JobModel] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._running: Dict[str, asyncio.Task] = {}
+        self._closing = False
+
+    async def model(self) -> JobModel:
+        if self._model is None:
+            self._model = await JobModel.create_instance(self.db_client)
+        return self._model
+
+    async def submit(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Job:
+        """
+        Queue a job, or return the identical job still pending or running.
+
+        Args:
+            kind (str): Job type, registered with `job_handler`, e.g. "notification_broadcast".
+            params (Optional[Dict]): JSON parameters of the handler, shown with the job status.
+
+        Returns:
+            Job: The pending (or active) job.
+
+        Raises:
+            ValueError: If no handler is registered for `kind`.
+        """
+        if kind not in _job_kinds:
+            raise ValueError(f"Unknown job kind: {kind}")
+        params = params or {}
+        model = await self.model()
+        record, created = await model.enqueue(JobRecord(kind=kind, params=params, dedupKey=dedup_key(kind, params)))
+        if created:
+            self._wake.set()
+        return Job(record)
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        model = await self.model()
+        record = await model.get_job(job_id)
+        return Job(record) if record else None
+
+    def start(self) -> None:
+        """Start claiming and running jobs."""
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        while True:
+            await self._slots.acquire()
+            self._wake.clear()
+            try:
+                model = await self.model()
+                record = await model.claim(self.owner, list(_job_kinds), self.lease_seconds)
+            except Exception as e:
+                logger.warning("Job queue unavailable: %r", e)
+                record = None
+            if record is None:
+                self._slots.release()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            task = asyncio.create_task(self._run(Job(record)))
+            self._running[record.id] = task
+
+    async def _run(self, job: Job) -> None:
+        model = await self.model()
+        heartbeat = asyncio.create_task(self._heartbeat(job, asyncio.current_task()))
+        status, result, error = JobStatus.SUCCEEDED, None, None
+        kind = _job_kinds[job.kind]
+        max_attempts = kind.max_attempts or self.max_attempts
+        try:
+            if job.record.attempts > max_attempts:
+                raise RuntimeError(f"Abandoned after {max_attempts} attempt(s) (worker lost)")
+            params = kind.params_model(**job.params) if kind.params_model else job.params
+            started = time.perf_counter()
+            result = await kind.handler(self.context, job, params)
+            result = {**(result or {}), "duration_seconds": round(time.perf_counter() - started, 3)}
+        except asyncio.CancelledError:
+            heartbeat.cancel()
+            if not self._closing:  # lease lost: the new owner records the outcome
+                return
+            if max_attempts > 1:
+                await model.release(job.id, self.owner)
+                return
+            # a job that must not run twice is not put back in the queue
+            status, error = JobStatus.FAILED, "Interrupted by a worker shutdown"
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            status, error = JobStatus.FAILED, str(e)
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job.id, None)
+            self._slots.release()
+
+        try:
+            await model.finish(
+                job.id, self.owner, status, self.retention, job.processed, job.total, result=result, error=error
+            )
+        except Exception:
+            logger.exception("Outcome of job %s (%s) could not be saved", job.id, job.kind)
+
+    async def _heartbeat(self, job: Job, task: asyncio.Task) -> None:
+        model = await self.model()
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                leased = await model.heartbeat(job.id, self.owner, self.lease_seconds, job.processed, job.total)
+            except Exception as e:
+                logger.warning("Lease of job %s could not be renewed: %r", job.id, e)
+                continue
+            if not leased:
+                logger.warning("Job %s (%s) was taken over by another worker, stopping it", job.id, job.kind)
+                task.cancel()
+                return
+
+    async def close(self) -> None:
+        """Stop claiming jobs and put the running ones back in the queue."""
+        self._closing = True
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*([self._dispatcher] if self._dispatcher else []), *tasks, return_exceptions=True)
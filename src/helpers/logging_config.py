@@ -1,7 +1,5 @@
 import logging
-from .config import get_Settings
-from logtail import LogtailHandler
-import sys
+import os
 def setup_logger():
     logger = logging.getLogger("request")
 
@@ -12,6 +10,7 @@ def setup_logger():
     )
 
     # CONSOLE HANDLER (always present)
+    os.makedirs("logs", exist_ok=True)
     File_handler = logging.FileHandler("logs/request.log")
 
     #set the format of the handler
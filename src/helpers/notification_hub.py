@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+from pymongo.errors import OperationFailure, PyMongoError
+from src.models.db_schemas.Notification import Notification
+
+logger = logging.getLogger("request")
+
+KEEPALIVE_FRAME = b": keepalive\n\n"
+
+# Server error code when change streams are not available (standalone mongod)
+CHANGE_STREAM_UNSUPPORTED_CODES = {40573}
+
+# Field of the notification documents naming the worker that inserted them
+ORIGIN_FIELD = "origin"
+
+
+def sse_frame(notification: Notification) -> bytes:
+    """Server-Sent Events frame of a notification; the event ID lets clients resume."""
+    data = notification.model_dump_json(by_alias=True)
+    return f"id: {notification.id}\nevent: notification\ndata: {data}\n\n".encode()
+
+
+class UnreadCounters:
+    """
+    Per-user unread notification counts cached in one worker.
+
+    Counts are loaded with `count_documents` and then kept up to date by the
+    writes this worker sees (created notifications, including those of other
+    workers received through the change stream, and seen/deleted ones). Writes
+    made by other workers that do not reach this one (marking as seen) are
+    corrected when the entry is reconciled after `ttl` seconds.
+
+    A count loaded while the user's notifications changed is not stored,
+    since it may or may not include that change. Changes are only tracked
+    for users being loaded, so broadcasts to many users cost no memory here.
+
+    Args:
+        ttl (float): Seconds before a cached count is reloaded from MongoDB.
+        max_entries (int): Least recently used users are evicted beyond this size.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 50_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._counts: "OrderedDict[str, tuple]" = OrderedDict()  # user -> (count, loaded_at)
+        self._clock = 0
+        self._loading: Dict[str, int] = {}      # user -> loads in flight
+        self._changed_at: Dict[str, int] = {}   # user being loaded -> clock of its last change
+
+    def get(self, user_id: str) -> Optional[int]:
+        entry = self._counts.get(str(user_id))
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            return None
+        self._counts.move_to_end(str(user_id))
+        return entry[0]
+
+    def begin_load(self, user_id: str) -> int:
+        """Register a count about to be loaded from MongoDB; returns the token for `end_load`."""
+        user_id = str(user_id)
+        self._loading[user_id] = self._loading.get(user_id, 0) + 1
+        return self._clock
+
+    def end_load(self, user_id: str, token: int, count: Optional[int]) -> None:
+        """Cache the loaded count (None if loading failed) unless the user changed meanwhile."""
+        user_id = str(user_id)
+        changed_at = self._changed_at.get(user_id, -1)
+        self._loading[user_id] -= 1
+        if not self._loading[user_id]:
+            del self._loading[user_id]
+            self._changed_at.pop(user_id, None)
+        if count is None or changed_at > token:
+            return
+        self._counts[user_id] = (count, time.monotonic())
+        self._counts.move_to_end(user_id)
+        while len(self._counts) > self.max_entries:
+            self._counts.popitem(last=False)
+
+    def _changed(self, user_id: str) -> None:
+        self._clock += 1
+        if user_id in self._loading:
+            self._changed_at[user_id] = self._clock
+
+    def adjust(self, user_id: str, delta: int) -> None:
+        user_id = str(user_id)
+        self._changed(user_id)
+        entry = self._counts.get(user_id)
+        if entry is not None:
+            self._counts[user_id] = (max(0, entry[0] + delta), entry[1])
+
+    def invalidate(self, user_id: str) -> None:
+        user_id = str(user_id)
+        self._changed(user_id)
+        self._counts.pop(user_id, None)
+
+
+class NotificationHub:
+    """
+    In-process publish/subscribe hub for notification streams.
+
+    Every open stream holds one bounded queue registered under its user ID.
+    `publish` serializes a notification once and puts the frame in the
+    queues of that user's streams; a stream that does not keep up loses its
+    oldest frames rather than growing without limit (clients catch up with
+    `Last-Event-ID`). One keep-alive task writes a comment frame into idle
+    queues, so waiting streams need no timer of their own.
+
+    With several workers, a notification is created in one process while the
+    user's stream may be held by another. `start` therefore also follows the
+    notification collection through a MongoDB change stream (replica sets
+    only) and publishes the inserts of the other workers. The documents a
+    worker inserts carry its `origin` (see `tag`) and the change stream
+    filters them out on the server, so a local publish is never echoed back,
+    however far the stream lags behind (e.g. a broadcast to many users).
+    Since it sees every insert, the hub also keeps the workers'
+    `UnreadCounters` up to date.
+
+    Args:
+        queue_size (int): Frames buffered per stream.
+        keepalive_interval (float): Seconds between keep-alive comments.
+        dedup_size (int): Number of recent notification IDs remembered
+            (guards against the same insert being published twice, e.g. on
+            a change stream resume).
+        unread_ttl (float): Seconds before a cached unread count is reconciled.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 100,
+        keepalive_interval: float = 15.0,
+        dedup_size: int = 10_000,
+        unread_ttl: float = 60.0,
+    ):
+        self.queue_size = queue_size
+        self.keepalive_interval = keepalive_interval
+        self.dedup_size = dedup_size
+        self.origin = uuid.uuid4().hex
+        self.unread = UnreadCounters(ttl=unread_ttl)
+
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._published: "OrderedDict[str, None]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats = {"published": 0, "delivered": 0, "dropped": 0, "duplicates": 0}
+
+    # ---------------- Subscriptions ---------------- #
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(str(user_id), set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(str(user_id))
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[str(user_id)]
+
+    async def stream(self, user_id: str, backlog: Iterable[Notification] = ()) -> AsyncIterator[bytes]:
+        """
+        SSE frames for one client: the `backlog` first (notifications missed
+        while disconnected), then every notification published for the user.
+        The subscription ends when the client disconnects.
+        """
+        queue = self.subscribe(user_id)
+        try:
+            yield f"retry: {int(self.keepalive_interval * 1000)}\n\n".encode()
+            for notification in backlog:
+                yield sse_frame(notification)
+            while True:
+                yield await queue.get()
+        finally:
+            self.unsubscribe(user_id, queue)
+
+    # ---------------- Publishing ---------------- #
+
+    def tag(self, document: dict) -> dict:
+        """Mark a notification document about to be inserted (and published) by this worker."""
+        document[ORIGIN_FIELD] = self.origin
+        return document
+
+    def publish(self, document: dict) -> int:
+        """
+        Deliver a notification document to the streams of its user.
+
+        Args:
+            document (dict): Inserted notification document (with `_id`).
+
+        Returns:
+            int: Number of streams it was delivered to (0 for a duplicate).
+        """
+        notif_id = str(document.get("_id"))
+        if notif_id in self._published:
+            self.stats["duplicates"] += 1
+            return 0
+        self._published[notif_id] = None
+        if len(self._published) > self.dedup_size:
+            self._published.popitem(last=False)
+        self.stats["published"] += 1
+        if not document.get("seen", False):
+            self.unread.adjust(document.get("user_id"), 1)
+
+        queues = self._subscribers.get(str(document.get("user_id")))
+        if not queues:
+            return 0
+
+        frame = sse_frame(Notification(**document))
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()
+                self.stats["dropped"] += 1
+            queue.put_nowait(frame)
+        self.stats["delivered"] += len(queues)
+        return len(queues)
+
+    # ---------------- Background tasks ---------------- #
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def start(self, collection=None) -> None:
+        """
+        Start the keep-alive task and, if a collection is given, the change
+        stream watcher that propagates notifications created by other workers.
+        """
+        self._spawn(self._keepalive())
+        if collection is not None:
+            self._spawn(self._watch(collection))
+
+    async def _keepalive(self) -> None:
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            for queues in list(self._subscribers.values()):
+                for queue in queues:
+                    if queue.empty():
+                        queue.put_nowait(KEEPALIVE_FRAME)
+
+    async def _watch(self, collection, max_backoff: float = 30.0) -> None:
+        # inserts of this worker were published when they were made
+        pipeline = [{"$match": {"operationType": "insert", f"fullDocument.{ORIGIN_FIELD}": {"$ne": self.origin}}}]
+        resume_token = None
+        backoff = 1.0
+        while True:
+            try:
+                async with collection.watch(pipeline, resume_after=resume_token) as change_stream:
+                    backoff = 1.0
+                    async for change in change_stream:
+                        resume_token = change_stream.resume_token
+                        try:
+                            self.publish(change["fullDocument"])
+                        except ValueError as exc:  # document not matching the Notification schema
+                            logger.warning("Skipping notification %s: %s", change["documentKey"], exc)
+            except OperationFailure as exc:
+                if exc.code in CHANGE_STREAM_UNSUPPORTED_CODES:
+                    logger.info("Change streams unavailable, notification streams are served per worker: %s", exc)
+                    return
+                if exc.code == 286 or exc.has_error_label("NonResumableChangeStreamError"):
+                    # resume point no longer in the oplog: continue from now
+                    resume_token = None
+                logger.warning("Notification change stream failed, retrying in %.0fs: %r", backoff, exc)
+            except PyMongoError as exc:
+                logger.warning("Notification change stream failed, retrying in %.0fs: %r", backoff, exc)
+            await asyncio.sleep(backoff)
+            backoff = min(max_backoff, backoff * 2)
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+_notification_hub: Optional[NotificationHub] = None
+
+
+def get_notification_hub() -> Optional[NotificationHub]:
+    """Return the hub of this worker (None outside the application, e.g. in scripts)."""
+    return _notification_hub
+
+
+def set_notification_hub(hub: Optional[NotificationHub]) -> None:
+    global _notification_hub
+    _notification_hub = hub
@@ -0,0 +1,233 @@
+import asyncio
+import json
+import time
+from enum import IntEnum
+from typing import Dict, Mapping, Optional
+
+# Graph API error codes meaning "rate limited": app (4), user (17), page (32), custom (613)
+THROTTLING_ERROR_CODES = {4, 17, 32, 613}
+
+
+class GraphPriority(IntEnum):
+    """Priority of a Graph API call. Lower values are served first."""
+    HIGH = 0    # user-facing writes: message and comment replies, uploads
+    NORMAL = 1  # interactive reads
+    LOW = 2     # background scans: competitor analysis, syncs
+
+
+class TokenBucket:
+    """
+    Classic token bucket whose refill rate can be changed on the fly.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum burst size.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until one token is available (0 if available now)."""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self._refill()
+        self.tokens -= 1
+
+
+class UsageState:
+    """Latest usage reported by Graph for one scope (the app or one page)."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.bucket = TokenBucket(rate, capacity)
+        self.usage = 0.0
+        self.observed_at = 0.0
+        self.blocked_until = 0.0
+
+
+def parse_usage_headers(headers: Mapping[str, str]) -> Dict[str, object]:
+    """
+    Extract the usage percentages reported by the Graph API.
+
+    Args:
+        headers (Mapping[str, str]): Response headers.
+
+    Returns:
+        dict: `app` and `page` usage in percent (None if the header is absent)
+        and `regain_seconds`, the longest `estimated_time_to_regain_access`
+        announced in X-Business-Use-Case-Usage.
+    """
+    def max_usage(raw: Optional[str]) -> Optional[float]:
+        if not raw:
+            return None
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return None
+        return float(max(data.get("call_count", 0), data.get("total_cputime", 0), data.get("total_time", 0)))
+
+    page_usage = max_usage(headers.get("x-page-usage"))
+    regain_seconds = 0.0
+
+    raw_buc = headers.get("x-business-use-case-usage")
+    if raw_buc:
+        try:
+            for entries in json.loads(raw_buc).values():
+                for entry in entries:
+                    usage = max(entry.get("call_count", 0), entry.get("total_cputime", 0), entry.get("total_time", 0))
+                    page_usage = max(page_usage or 0.0, float(usage))
+                    regain_seconds = max(regain_seconds, entry.get("estimated_time_to_regain_access", 0) * 60.0)
+        except (ValueError, AttributeError):
+            pass
+
+    return {
+        "app": max_usage(headers.get("x-app-usage")),
+        "page": page_usage,
+        "regain_seconds": regain_seconds,
+    }
+
+
+class GraphRateGovernor:
+    """
+    Client-side rate limiter for the Graph API driven by its usage headers.
+
+    Every call first waits for a token of the app-wide bucket and of the
+    bucket of the page (token) it acts for. After each response the usage
+    percentages from X-App-Usage, X-Page-Usage and X-Business-Use-Case-Usage
+    slow the buckets down linearly once usage crosses `soft_limit`, and a
+    throttling error or a `estimated_time_to_regain_access` blocks the scope
+    until access is regained.
+
+    Low priority calls are queued (they wait, they never fail) while usage is
+    above `low_priority_ceiling` or while higher priority calls are waiting,
+    which keeps the remaining quota for user-facing work. A usage reading
+    older than `usage_ttl` seconds lets a single call through to refresh it,
+    so a quiet scope is not blocked forever by its last (stale) report.
+    """
+
+    def __init__(
+        self,
+        app_rate: float = 50.0,
+        page_rate: float = 5.0,
+        soft_limit: float = 50.0,
+        low_priority_ceiling: float = 75.0,
+        hard_limit: float = 95.0,
+        throttle_backoff: float = 60.0,
+        min_rate_factor: float = 0.05,
+        usage_ttl: float = 60.0,
+    ):
+        self.app_rate = app_rate
+        self.page_rate = page_rate
+        self.soft_limit = soft_limit
+        self.low_priority_ceiling = low_priority_ceiling
+        self.hard_limit = hard_limit
+        self.throttle_backoff = throttle_backoff
+        self.min_rate_factor = min_rate_factor
+        self.usage_ttl = usage_ttl
+
+        self.app = UsageState(app_rate, capacity=app_rate)
+        self.pages: Dict[str, UsageState] = {}
+        self._waiting = {priority: 0 for priority in GraphPriority}
+        self._poll = 0.05
+
+    def _page(self, page_key: Optional[str]) -> Optional[UsageState]:
+        if page_key is None:
+            return None
+        if page_key not in self.pages:
+            self.pages[page_key] = UsageState(self.page_rate, capacity=self.page_rate)
+        return self.pages[page_key]
+
+    def _ceiling(self, priority: GraphPriority) -> float:
+        return self.low_priority_ceiling if priority == GraphPriority.LOW else self.hard_limit
+
+    def _over_ceiling(self, scope: UsageState, priority: GraphPriority, now: float) -> bool:
+        return scope.usage >= self._ceiling(priority) and now - scope.observed_at < self.usage_ttl
+
+    def _delay(self, scopes, priority: GraphPriority) -> float:
+        now = time.monotonic()
+        delay = 0.0
+        for scope in scopes:
+            delay = max(delay, scope.blocked_until - now, scope.bucket.delay())
+            if self._over_ceiling(scope, priority, now):
+                delay = max(delay, self._poll)
+        if any(self._waiting[p] for p in GraphPriority if p < priority):
+            delay = max(delay, self._poll)
+        return delay
+
+    async def acquire(self, page_key: Optional[str] = None, priority: GraphPriority = GraphPriority.NORMAL) -> None:
+        """
+        Wait until a call for `page_key` at `priority` may be sent, then consume its tokens.
+
+        Args:
+            page_key (Optional[str]): Identity of the page (token) the call acts for.
+            priority (GraphPriority): Priority of the call.
+        """
+        scopes = [s for s in (self.app, self._page(page_key)) if s is not None]
+        self._waiting[priority] += 1
+        try:
+            while True:
+                delay = self._delay(scopes, priority)
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+        finally:
+            self._waiting[priority] -= 1
+        now = time.monotonic()
+        for scope in scopes:
+            scope.bucket.take()
+            if scope.usage >= self._ceiling(priority):
+                # stale reading: this call is the probe, the others wait for its headers
+                scope.observed_at = now
+
+    def _apply(self, scope: UsageState, usage: Optional[float]) -> None:
+        if usage is None:
+            return
+        scope.usage = usage
+        scope.observed_at = time.monotonic()
+        if usage <= self.soft_limit:
+            factor = 1.0
+        else:
+            factor = max(self.min_rate_factor, (100.0 - usage) / (100.0 - self.soft_limit))
+        scope.bucket.rate = scope.bucket.base_rate * factor
+
+    def observe(
+        self,
+        headers: Mapping[str, str],
+        page_key: Optional[str] = None,
+        error_code: Optional[int] = None,
+    ) -> None:
+        """
+        Update the buckets from the usage headers (and error code) of a response.
+
+        Args:
+            headers (Mapping[str, str]): Response headers.
+            page_key (Optional[str]): Identity of the page (token) the call acted for.
+            error_code (Optional[int]): Graph `error.code` if the call failed.
+        """
+        usage = parse_usage_headers(headers)
+        page = self._page(page_key)
+
+        self._apply(self.app, usage["app"])
+        if page is not None:
+            self._apply(page, usage["page"])
+
+        now = time.monotonic()
+        if usage["regain_seconds"] and page is not None:
+            page.blocked_until = max(page.blocked_until, now + usage["regain_seconds"])
+
+        if error_code in THROTTLING_ERROR_CODES:
+            scope = self.app if error_code == 4 or page is None else page
+            scope.blocked_until = max(scope.blocked_until, now + max(usage["regain_seconds"], self.throttle_backoff))
@@ -0,0 +1,196 @@
+import random
+import re
+import time
+from enum import Enum
+from typing import Dict, Optional
+import httpx
+from fastapi import HTTPException
+from src.helpers.rate_limit import THROTTLING_ERROR_CODES
+
+# Graph API error codes for temporary failures: unknown error (1), service unavailable (2)
+TRANSIENT_ERROR_CODES = {1, 2}
+RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+
+# Transport errors raised before the request could reach Graph: always safe to retry
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+_ID_SEGMENT = re.compile(r"^[0-9_]+$|^[A-Za-z0-9_\-]*\d[A-Za-z0-9_\-]{8,}$")
+
+
+class GraphUnavailableError(HTTPException):
+    """
+    Raised when the Graph API cannot answer: the endpoint circuit is open,
+    the request deadline is exhausted or the connection keeps failing.
+    """
+
+    def __init__(self, status_code: int, message: str, endpoint: str, retry_after: Optional[float] = None):
+        headers = {"Retry-After": str(max(1, int(retry_after)))} if retry_after else None
+        super().__init__(
+            status_code=status_code,
+            detail={"message": message, "endpoint": endpoint},
+            headers=headers,
+        )
+
+
+def endpoint_key(method: str, url: httpx.URL) -> str:
+    """
+    Group requests by endpoint (method + path with object IDs replaced),
+    e.g. `POST {id}/messages` for every page's Send API calls.
+    """
+    segments = [s for s in url.path.split("/") if s]
+    if segments and re.match(r"^v\d+\.\d+$", segments[0]):
+        segments = segments[1:]
+    return f"{method} " + "/".join("{id}" if _ID_SEGMENT.match(s) else s for s in segments)
+
+
+def graph_error(response: httpx.Response) -> Dict:
+    """Graph `error` object of a failed response ({} if the body is not a Graph error)."""
+    if response.status_code < 400:
+        return {}
+    try:
+        error = response.json().get("error")
+    except (ValueError, AttributeError):
+        return {}
+    return error if isinstance(error, dict) else {}
+
+
+class RetryPolicy:
+    """
+    Decide which failures are retried and how long to wait in between.
+
+    Delays use exponential backoff with full jitter: attempt `n` waits a
+    random time in [0, min(max_delay, base_delay * 2**n)].
+
+    Idempotency: GET and DELETE are retried on any transient failure. Other
+    methods (replies, uploads) are only retried when Graph certainly did not
+    act on the request: the connection could not be established, or the call
+    was rejected by throttling. A 5xx or a read timeout after a POST is
+    ambiguous (the reply may have been sent), so it is returned to the caller.
+
+    Args:
+        max_attempts (int): Total number of attempts, including the first one.
+        base_delay (float): Backoff base in seconds.
+        max_delay (float): Upper bound of a single backoff in seconds.
+    """
+
+    IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "DELETE"}
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def should_retry_response(self, method: str, response: httpx.Response) -> bool:
+        error = graph_error(response)
+        if error.get("code") in THROTTLING_ERROR_CODES:
+            return True
+        if method not in self.IDEMPOTENT_METHODS:
+            return False
+        return (
+            response.status_code in RETRYABLE_STATUS_CODES
+            or error.get("code") in TRANSIENT_ERROR_CODES
+            or bool(error.get("is_transient"))
+        )
+
+    def should_retry_exception(self, method: str, exc: Exception) -> bool:
+        if isinstance(exc, NOT_SENT_ERRORS):
+            return True
+        return method in self.IDEMPOTENT_METHODS and isinstance(exc, httpx.TransportError)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail fast for `recovery_time` seconds; then a single trial call is let
+    through (half-open) and its outcome closes or re-opens the circuit.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        recovery_time (float): Seconds the circuit stays open.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def retry_after(self) -> float:
+        """Seconds until the next trial call is allowed."""
+        return max(0.0, self.opened_at + self.recovery_time - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.retry_after() <= 0:
+            # one trial call per recovery period (also if a previous trial never reported back)
+            self.state = CircuitState.HALF_OPEN
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+
+class CircuitBreakerRegistry:
+    """Lazily creates one CircuitBreaker per endpoint key."""
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        if endpoint not in self.breakers:
+            self.breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.recovery_time)
+        return self.breakers[endpoint]
+
+
+class IdempotencyCache:
+    """
+    Remember the responses of non-idempotent calls by caller-supplied key.
+
+    A call repeated with the same key within `ttl` seconds (a client retrying
+    an upload, a redelivered webhook answering the same message) gets the
+    stored response instead of being sent to Graph again.
+    """
+
+    def __init__(self, ttl: float = 600.0):
+        self.ttl = ttl
+        self._responses: Dict[str, tuple] = {}
+
+    def get(self, key: str) -> Optional[httpx.Response]:
+        entry = self._responses.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._responses[key]
+            return None
+        return response
+
+    def put(self, key: str, response: httpx.Response) -> None:
+        now = time.monotonic()
+        if len(self._responses) > 10_000:
+            self._responses = {k: v for k, v in self._responses.items() if now - v[0] <= self.ttl}
+        self._responses[key] = (now, response)
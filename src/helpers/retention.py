@@ -0,0 +1,211 @@
+"""
+Data retention: TTL indexes and the cold archive.
+
+Seen notifications are removed by MongoDB itself through a partial TTL
+index. Rejected drafts, analyses and recommendations are archived before
+being removed: `Archiver` streams the expired documents of a policy into a
+gzip-compressed NDJSON (Extended JSON) or BSON file on local disk, and
+deletes each batch only once it has been written and synced to the file.
+"""
+import asyncio
+import gzip
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+import bson
+from bson import json_util
+from pymongo.errors import OperationFailure
+from src.helpers.config import Settings
+from src.models.enums.DBEnums import DBEnums
+from src.models.enums.PostEnums import PostStatus
+
+logger = logging.getLogger("request")
+
+NOTIFICATION_TTL_INDEX = "seen_notification_ttl_index"
+
+# Server error codes when an index exists with other options (e.g. another expireAfterSeconds)
+INDEX_OPTIONS_CONFLICT_CODES = {85, 86}
+
+
+@dataclass
+class RetentionPolicy:
+    """Documents of `collection` matching `filter` expire `max_age_days` after `date_field`."""
+    collection: str
+    max_age_days: int
+    filter: Dict[str, Any] = field(default_factory=dict)
+    date_field: str = "createdAt"
+
+    def expired_filter(self, now: datetime) -> Dict[str, Any]:
+        cutoff = now - timedelta(days=self.max_age_days)
+        return {**self.filter, self.date_field: {"$lt": cutoff}}
+
+
+def archive_policies(settings: Settings) -> List[RetentionPolicy]:
+    """Archiving policies enabled in the settings (a retention of 0 or None keeps documents forever)."""
+    policies = [
+        RetentionPolicy(
+            DBEnums.COLLECTION_POST_NAME.value,
+            settings.REJECTED_POST_RETENTION_DAYS,
+            {"status": PostStatus.REJECTED.value},
+        ),
+        RetentionPolicy(DBEnums.COLLECTION_ANALYTICS_NAME.value, settings.ANALYSIS_RETENTION_DAYS),
+        RetentionPolicy(DBEnums.COLLECTION_RECOMENDATION_NAME.value, settings.RECOMMENDATION_RETENTION_DAYS),
+    ]
+    return [policy for policy in policies if policy.max_age_days]
+
+
+async def ensure_ttl_index(
+    collection, name: str, key: str, expire_after_seconds: Optional[int], partial_filter: Optional[Dict] = None
+) -> None:
+    """
+    Create, update or drop a TTL index so that it matches the configured retention.
+
+    Args:
+        collection: Motor collection.
+        name (str): Index name.
+        key (str): Date field the expiry is computed from.
+        expire_after_seconds (Optional[int]): Retention; None or 0 drops the index.
+        partial_filter (Optional[Dict]): Only documents matching it expire.
+    """
+    if not expire_after_seconds:
+        existing = await collection.index_information()
+        if name in existing:
+            await collection.drop_index(name)
+        return
+
+    options = {"name": name, "expireAfterSeconds": expire_after_seconds}
+    if partial_filter:
+        options["partialFilterExpression"] = partial_filter
+    try:
+        await collection.create_index([(key, 1)], **options)
+    except OperationFailure as e:
+        if e.code not in INDEX_OPTIONS_CONFLICT_CODES:
+            raise
+        # the retention changed: update the index in place instead of rebuilding it
+        await collection.database.command(
+            "collMod", collection.name, index={"name": name, "expireAfterSeconds": expire_after_seconds}
+        )
+
+
+async def ensure_ttl_indexes(db, settings: Settings) -> None:
+    """Apply the TTL indexes of the settings (seen notifications)."""
+    days = settings.SEEN_NOTIFICATION_RETENTION_DAYS
+    await ensure_ttl_index(
+        db[DBEnums.COLLECTION_NOTIFICATION_NAME.value],
+        NOTIFICATION_TTL_INDEX,
+        "createdAt",
+        days * 86400 if days else None,
+        partial_filter={"seen": True},
+    )
+
+
+class ArchiveWriter:
+    """Append documents to a gzip file as NDJSON (Extended JSON) or concatenated BSON."""
+
+    def __init__(self, path: str, fmt: str = "ndjson"):
+        self.path = path
+        self.fmt = fmt
+        self._file = gzip.open(path, "ab")
+
+    def write(self, documents: List[dict]) -> None:
+        if self.fmt == "bson":
+            payload = b"".join(bson.encode(doc) for doc in documents)
+        else:
+            payload = "".join(
+                json_util.dumps(doc, json_options=json_util.RELAXED_JSON_OPTIONS) + "\n" for doc in documents
+            ).encode()
+        self._file.write(payload)
+        self._file.flush()              # complete gzip block on disk
+        os.fsync(self._file.fileno())   # before the documents are deleted
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class Archiver:
+    """
+    Move expired documents from MongoDB to compressed files on local disk.
+
+    Files are named `<archive_dir>/<collection>/<UTC timestamp>.<fmt>.gz`,
+    one per run and collection. Documents are read in `_id` order in
+    batches; each batch is written and synced to the file before it is
+    deleted, so an interrupted run loses nothing (at worst a batch is
+    archived twice).
+
+    Args:
+        db: Motor database.
+        archive_dir (str): Root directory of the archive.
+        batch_size (int): Documents archived and deleted per round trip.
+        fmt (str): "ndjson" (readable, `mongoimport`) or "bson" (`mongorestore` after gunzip).
+    """
+
+    def __init__(self, db, archive_dir: str, batch_size: int = 1000, fmt: str = "ndjson"):
+        if fmt not in ("ndjson", "bson"):
+            raise ValueError(f"Unknown archive format: {fmt}")
+        self.db = db
+        self.archive_dir = archive_dir
+        self.batch_size = batch_size
+        self.fmt = fmt
+
+    async def archive(self, policy: RetentionPolicy, now: Optional[datetime] = None, progress=None) -> Dict[str, Any]:
+        """
+        Archive then delete the expired documents of one policy.
+
+        Args:
+            policy (RetentionPolicy): What to archive.
+            now (Optional[datetime]): Reference time (defaults to now, UTC).
+            progress (Optional[Callable[[int], None]]): Called with the number archived so far.
+
+        Returns:
+            Dict[str, Any]: Archived and deleted counts and the archive file (None if nothing expired).
+        """
+        now = now or datetime.now(timezone.utc)
+        collection = self.db[policy.collection]
+        query = policy.expired_filter(now)
+        cursor = collection.find(query).sort("_id", 1).batch_size(self.batch_size)
+
+        directory = os.path.join(self.archive_dir, policy.collection)
+        path = os.path.join(directory, f"{now.strftime('%Y%m%dT%H%M%SZ')}.{self.fmt}.gz")
+        writer = None
+        archived = deleted = 0
+        batch = []
+
+        async def flush():
+            nonlocal writer, archived, deleted
+            if writer is None:
+                await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+                writer = ArchiveWriter(path, self.fmt)
+            await asyncio.to_thread(writer.write, batch)
+            archived += len(batch)
+            result = await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+            deleted += result.deleted_count
+            if progress is not None:
+                progress(archived)
+
+        try:
+            async for doc in cursor:
+                batch.append(doc)
+                if len(batch) >= self.batch_size:
+                    await flush()
+                    batch = []
+            if batch:
+                await flush()
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if archived:
+            logger.info("Archived %d documents of %s to %s", archived, policy.collection, path)
+        return {"archived": archived, "deleted": deleted, "file": path if archived else None}
+
+    async def run(self, policies: List[RetentionPolicy], job=None) -> Dict[str, Any]:
+        """Archive every policy in turn; `job` (optional) receives the total archived so far."""
+        now = datetime.now(timezone.utc)
+        results, total = {}, 0
+        for policy in policies:
+            report = (lambda n, base=total: job.progress(base + n)) if job is not None else None
+            results[policy.collection] = await self.archive(policy, now, progress=report)
+            total += results[policy.collection]["archived"]
+        return {"collections": results, "archived": total}
@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+# numpy is imported where it is used, so workers start without loading it
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger("request")
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def text_vector(text: str, dim: int = 128) -> "np.ndarray":
+    """
+    Unit vector of a text for cosine similarity: its word 2- and 3-shingles
+    feature-hashed (CRC32, signed) into `dim` dimensions. Texts sharing most
+    of their phrasing score close to 1 even when a few words changed, while
+    texts only sharing vocabulary stay low. Empty texts give a zero vector.
+    """
+    import numpy as np
+
+    words = WORD_RE.findall(text.lower())
+    shingles = [" ".join(words[i:i + 2]) for i in range(len(words) - 1)]
+    shingles += [" ".join(words[i:i + 3]) for i in range(len(words) - 2)]
+    vector = np.zeros(dim, dtype=np.float32)
+    if not shingles:
+        return vector
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint32, count=len(shingles))
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+    np.add.at(vector, hashes % dim, signs)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class UserVectorIndex:
+    """
+    Vectors of the recent posts of one user, as the rows of a NumPy matrix
+    grown by doubling up to `max_posts` rows; beyond that the oldest row is
+    overwritten. A lookup is one matrix-vector product.
+
+    Args:
+        dim (int): Vector dimension.
+        max_posts (int): Posts kept.
+    """
+
+    def __init__(self, dim: int = 128, max_posts: int = 10_000):
+        import numpy as np
+
+        self.dim = dim
+        self.max_posts = max_posts
+        self._matrix = np.zeros((min(64, max_posts), dim), dtype=np.float32)
+        self._ids: List[Optional[str]] = []   # post ID of each row, None once removed
+        self._rows: Dict[str, int] = {}
+        self._next = 0                        # row written by the next add once full
+        self.loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, post_id: str, vector: "np.ndarray") -> None:
+        """Index (or re-index) a post."""
+        import numpy as np
+
+        row = self._rows.get(post_id)
+        if row is None:
+            if len(self._ids) < self.max_posts:
+                row = len(self._ids)
+                if row == len(self._matrix):
+                    grown = np.zeros((min(2 * row, self.max_posts), self.dim), dtype=np.float32)
+                    grown[:row] = self._matrix
+                    self._matrix = grown
+                self._ids.append(None)
+            else:
+                row = self._next
+                self._next = (self._next + 1) % self.max_posts
+                self._rows.pop(self._ids[row], None)
+            self._ids[row] = post_id
+            self._rows[post_id] = row
+        self._matrix[row] = vector
+
+    def remove(self, post_id: str) -> None:
+        row = self._rows.pop(post_id, None)
+        if row is not None:
+            self._ids[row] = None
+            self._matrix[row] = 0.0
+
+    def nearest(self, vector: "np.ndarray") -> Tuple[Optional[str], float]:
+        """ID and cosine similarity of the most similar indexed post ((None, 0.0) when empty)."""
+        if not self._rows:
+            return None, 0.0
+        scores = self._matrix[:len(self._ids)] @ vector
+        row = int(scores.argmax())
+        return self._ids[row], float(scores[row])
+
+
+class DraftSimilarityIndex:
+    """
+    Per-user vector indexes of the recent accepted and draft posts of a
+    worker, used to spot near-duplicate drafts before they are stored.
+
+    A user's index is loaded from the posts collection on first use (the
+    `max_posts` most recent posts, concurrent loads shared) and kept up to
+    date by the writes of this worker; it is reloaded after `ttl` seconds to
+    pick up those of the other workers. The least recently used users are
+    dropped beyond `max_users`.
+
+    Args:
+        threshold (float): Cosine similarity from which a draft is a near-duplicate.
+        dim (int): Vector dimension.
+        max_posts (int): Posts indexed per user.
+        max_users (int): Users kept in memory.
+        ttl (float): Seconds before a user's index is reloaded.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.75,
+        dim: int = 128,
+        max_posts: int = 10_000,
+        max_users: int = 1000,
+        ttl: float = 600.0,
+    ):
+        self.threshold = threshold
+        self.dim = dim
+        self.max_posts = max_posts
+        self.max_users = max_users
+        self.ttl = ttl
+        self._users: "OrderedDict[str, UserVectorIndex]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self.stats = {"lookups": 0, "duplicates": 0, "loads": 0}
+
+    def vector(self, title: str, content: str) -> "np.ndarray":
+        return text_vector(f"{title}\n{content}", self.dim)
+
+    def cached(self, user_id: str) -> Optional[UserVectorIndex]:
+        """The loaded, unexpired index of a user, or None."""
+        index = self._users.get(user_id)
+        if index is None or time.monotonic() - index.loaded_at > self.ttl:
+            return None
+        self._users.move_to_end(user_id)
+        return index
+
+    async def user_index(self, user_id: str, post_model) -> UserVectorIndex:
+        """
+        Index of a user, loaded with `post_model.list_recent_posts` when missing or expired.
+        """
+        index = self.cached(user_id)
+        if index is not None:
+            return index
+        loading = self._loading.get(user_id)
+        if loading is not None:
+            try:
+                return await asyncio.shield(loading)
+            except asyncio.CancelledError:
+                if not loading.cancelled():  # this caller was cancelled
+                    raise
+                return await self.user_index(user_id, post_model)  # the loading caller was
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[user_id] = future
+        try:
+            index = UserVectorIndex(self.dim, self.max_posts)
+            posts = await post_model.list_recent_posts(user_id, limit=self.max_posts)
+            for post in reversed(posts):  # oldest first: the most recent are overwritten last
+                index.add(str(post["_id"]), self.vector(post.get("title", ""), post.get("content", "")))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._loading[user_id]
+        self.stats["loads"] += 1
+        self._users[user_id] = index
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+        future.set_result(index)
+        return index
+
+    def check(self, index: UserVectorIndex, vector: "np.ndarray") -> Tuple[Optional[str], float]:
+        """
+        Most similar post of the index when it is a near-duplicate of `vector`.
+
+        Returns:
+            Tuple[Optional[str], float]: (post ID, similarity), (None, similarity) below the threshold.
+        """
+        self.stats["lookups"] += 1
+        post_id, score = index.nearest(vector)
+        if post_id is None or score < self.threshold:
+            return None, score
+        self.stats["duplicates"] += 1
+        return post_id, score
+
+    def update(self, user_id: str, post_id: str, title: str, content: str) -> None:
+        """Index a post created or edited by this worker (no-op when the user's index is not loaded)."""
+        index = self._users.get(user_id)
+        if index is not None:
+            index.add(post_id, self.vector(title, content))
+
+    def discard(self, post_ids: Iterable[str], user_id: Optional[str] = None) -> None:
+        """Forget posts that were rejected or deleted (in every index when the user is unknown)."""
+        indexes = [self._users[user_id]] if user_id in self._users else (
+            [] if user_id is not None else list(self._users.values())
+        )
+        for index in indexes:
+            for post_id in post_ids:
+                index.remove(post_id)
+
+
+_similarity_index: Optional[DraftSimilarityIndex] = None
+
+
+def get_similarity_index() -> Optional[DraftSimilarityIndex]:
+    """Similarity index of this worker (set by the application container)."""
+    return _similarity_index
+
+
+def set_similarity_index(index: Optional[DraftSimilarityIndex]) -> None:
+    global _similarity_index
+    _similarity_index = index
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("request")
+
+# Seconds the output of a recommendation pipeline stage stays fresh
+DEFAULT_STAGE_TTLS: Dict[str, float] = {
+    "interactions": 900.0,      # comments and messages of the page
+    "competitors": 6 * 3600.0,  # competitor search and engagement statistics
+}
+
+
+class StageCache:
+    """
+    Outputs of analysis stages (recommendation pipeline) cached per worker.
+
+    Entries are keyed by stage and stage key (e.g. page ID, keyword list);
+    each stage has its own freshness window, so a slow-moving analysis
+    (competitors) is reused for hours while a fast-moving one (the page's
+    own comments) is recomputed after minutes. Concurrent misses for the
+    same entry share one computation (single-flight); failures are not
+    cached. The least recently used entries are evicted beyond `max_entries`.
+
+    Args:
+        ttls (Optional[Dict[str, float]]): Freshness per stage, defaults to `DEFAULT_STAGE_TTLS`.
+        default_ttl (float): Freshness of stages missing from `ttls` (0: not cached).
+        max_entries (int): Entries kept.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 0.0, max_entries: int = 1000):
+        self.ttls = DEFAULT_STAGE_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, float]]" = OrderedDict()  # -> (output, fresh until)
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, stage: str, outcome: str) -> None:
+        counts = self.stats.setdefault(stage, {"hits": 0, "misses": 0, "coalesced": 0})
+        counts[outcome] += 1
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        """Fresh output of a stage, or None."""
+        entry = self._entries.get((stage, key))
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._entries[(stage, key)]
+            return None
+        self._entries.move_to_end((stage, key))
+        return entry[0]
+
+    def put(self, stage: str, key: str, output: Any) -> None:
+        ttl = self.ttls.get(stage, self.default_ttl)
+        if ttl <= 0:
+            return
+        self._entries[(stage, key)] = (output, time.monotonic() + ttl)
+        self._entries.move_to_end((stage, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(self, stage: str, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the fresh output of `stage` for `key`, or run `compute()` once
+        (concurrent callers wait for it) and cache its result.
+        """
+        output = self.get(stage, key)
+        if output is not None:
+            self._count(stage, "hits")
+            return output
+        inflight = self._inflight.get((stage, key))
+        if inflight is not None:
+            self._count(stage, "coalesced")
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():  # this caller was cancelled
+                    raise
+                # the computing caller was cancelled: compute here instead
+
+        self._count(stage, "misses")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[(stage, key)] = future
+        try:
+            output = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: no warning when nobody else waited
+            raise
+        else:
+            future.set_result(output)
+            self.put(stage, key, output)
+            return output
+        finally:
+            del self._inflight[(stage, key)]
+
+    def invalidate(self, stage: Optional[str] = None, key: Optional[str] = None) -> None:
+        """Forget the entries of a stage (and key), or all of them."""
+        for entry_key in list(self._entries):
+            if (stage is None or entry_key[0] == stage) and (key is None or entry_key[1] == key):
+                del self._entries[entry_key]
+
+
+_stage_cache: Optional[StageCache] = None
+
+
+def get_stage_cache() -> Optional[StageCache]:
+    """Stage cache of this worker (set by the application container, None in scripts)."""
+    return _stage_cache
+
+
+def set_stage_cache(cache: Optional[StageCache]) -> None:
+    global _stage_cache
+    _stage_cache = cache
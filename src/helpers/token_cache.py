@@ -0,0 +1,153 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set, Tuple
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger("request")
+
+# Revocations written by other workers are re-read with this overlap, so
+# clock differences between workers cannot hide one
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def token_digest(token: str) -> str:
+    """SHA-256 of a token: the cache and deny-list key (the token itself is never stored)."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenCache:
+    """
+    Decoded claims of verified access tokens, so a token is verified
+    (signature and claims) once per worker instead of on every request.
+
+    Entries are keyed by the token digest and kept until the token's `exp`;
+    the least recently used ones are evicted beyond `max_entries`.
+
+    Revocations are checked on every request with two dict lookups:
+        - a token deny-list (logout), entries dropped once the token expired;
+        - a per-user cutoff (account deactivated, password changed): tokens of
+          the user issued (`iat`) before it are refused.
+    They are stored in the revoked tokens collection; `start` polls it every
+    `sync_interval` seconds to pick up the ones made by other workers.
+
+    Args:
+        max_entries (int): Cached tokens per worker.
+        sync_interval (float): Seconds between two reads of the revocations.
+    """
+
+    def __init__(self, max_entries: int = 10_000, sync_interval: float = 5.0):
+        self.max_entries = max_entries
+        self.sync_interval = sync_interval
+        self._claims: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._denied: Dict[str, float] = {}                       # digest -> token exp
+        self._user_cutoffs: Dict[str, Tuple[float, float]] = {}   # user -> (revoked at, until)
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats = {"hits": 0, "misses": 0, "revoked": 0}
+
+    # ---------------- Cache ---------------- #
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Claims of a verified, unexpired token, or None."""
+        claims = self._claims.get(digest)
+        if claims is None:
+            self.stats["misses"] += 1
+            return None
+        if claims["exp"] <= time.time():
+            del self._claims[digest]
+            self.stats["misses"] += 1
+            return None
+        self._claims.move_to_end(digest)
+        self.stats["hits"] += 1
+        return claims
+
+    def put(self, digest: str, claims: Dict[str, Any]) -> None:
+        """Remember the claims of a token that passed verification (tokens without `exp` are not cached)."""
+        if not isinstance(claims.get("exp"), (int, float)):
+            return
+        self._claims[digest] = claims
+        self._claims.move_to_end(digest)
+        while len(self._claims) > self.max_entries:
+            self._claims.popitem(last=False)
+
+    # ---------------- Revocation ---------------- #
+
+    def is_revoked(self, digest: str, claims: Dict[str, Any]) -> bool:
+        if digest in self._denied:
+            self.stats["revoked"] += 1
+            return True
+        cutoff = self._user_cutoffs.get(claims.get("sub"))
+        if cutoff is not None and claims.get("iat", 0) < cutoff[0]:
+            self.stats["revoked"] += 1
+            return True
+        return False
+
+    def deny(self, digest: str, expires_at: float) -> None:
+        """Refuse a token until it expires by itself."""
+        self._denied[digest] = expires_at
+        self._claims.pop(digest, None)
+
+    def revoke_user(self, user_id: str, revoked_at: float, until: float) -> None:
+        """Refuse the tokens of a user issued before `revoked_at` (until they all expired)."""
+        current = self._user_cutoffs.get(user_id)
+        if current is None or current[0] < revoked_at:
+            self._user_cutoffs[user_id] = (revoked_at, until)
+
+    def apply(self, revocation: Dict[str, Any]) -> None:
+        """Apply a document of the revoked tokens collection."""
+        until = revocation["expiresAt"].replace(tzinfo=timezone.utc).timestamp()
+        if revocation.get("token_digest"):
+            self.deny(revocation["token_digest"], until)
+        elif revocation.get("user_id"):
+            revoked_at = revocation["revokedAt"].replace(tzinfo=timezone.utc).timestamp()
+            self.revoke_user(str(revocation["user_id"]), revoked_at, until)
+
+    def prune(self) -> None:
+        """Forget the revocations of tokens that expired anyway."""
+        now = time.time()
+        self._denied = {d: exp for d, exp in self._denied.items() if exp > now}
+        self._user_cutoffs = {u: c for u, c in self._user_cutoffs.items() if c[1] > now}
+
+    # ---------------- Synchronization ---------------- #
+
+    def start(self, collection=None) -> None:
+        """Start polling the revoked tokens collection (no-op without a collection)."""
+        if collection is not None:
+            task = asyncio.ensure_future(self._sync(collection))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _sync(self, collection) -> None:
+        since: Optional[datetime] = None
+        while True:
+            try:
+                now = datetime.now(timezone.utc)
+                query = {"expiresAt": {"$gt": now}} if since is None else {"revokedAt": {"$gte": since - SYNC_OVERLAP}}
+                async for revocation in collection.find(query):
+                    self.apply(revocation)
+                since = now
+                self.prune()
+            except PyMongoError as exc:
+                logger.warning("Token revocations could not be read: %r", exc)
+            await asyncio.sleep(self.sync_interval)
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+_token_cache: Optional[TokenCache] = None
+
+
+def get_token_cache() -> Optional[TokenCache]:
+    """Return the token cache of this worker (None outside the application, e.g. in scripts)."""
+    return _token_cache
+
+
+def set_token_cache(cache: Optional[TokenCache]) -> None:
+    global _token_cache
+    _token_cache = cache
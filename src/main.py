@@ -1,20 +1,53 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from motor.motor_asyncio import AsyncIOMotorClient
-from src.routes import drafts, business_info, frontend
+from src.routes import drafts, business_info, frontend, admin, jobs
 from .routes import facebook, webhook, notification, schedule, analytics, auth
 from src.routes.auth import auth_router
-from src.helpers.config import get_Settings
+from src.helpers.config import get_Settings, reload_Settings
+from src.helpers.container import AppContainer
 from src.helpers.logging_config import setup_logger
 from src.middleware.request_logger import log_requests
+import asyncio
+import logging
 import os
+import signal
 
 
-get_Settings()
-setup_logger()
+def install_settings_reload():
+    # `kill -HUP <pid>` reloads the settings, like POST /admin/settings/reload
+    def reload():
+        try:
+            reload_Settings()
+        except Exception:
+            logging.getLogger("request").exception("Settings reload failed, keeping the current settings")
 
-app = FastAPI()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload)
+    except (AttributeError, NotImplementedError, RuntimeError):
+        pass  # no SIGHUP (Windows) or not the main thread
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # settings and logging are resolved here rather than at import time
+    settings = get_Settings()
+    setup_logger()
+
+    container = AppContainer(settings)
+    await container.start()
+    app.container = container
+    app.mongo_conn = container.mongo_conn
+    app.db_client = container.db_client
+    install_settings_reload()
+
+    yield
+
+    await container.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.middleware("http")(log_requests)
 
@@ -30,16 +63,6 @@ app.add_middleware(
 if os.path.exists("frontend/static"):
     app.mount("/static", StaticFiles(directory="frontend/static"), name="static")
 
-@app.on_event("startup")
-async def startup_db_client():
-    settings = get_Settings()
-    app.mongo_conn = AsyncIOMotorClient(settings.MONGODB_URL)
-    app.db_client = app.mongo_conn[settings.MONGODB_DATABASE]
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    app.mongo_conn.close()
-
 app.include_router(frontend.frontend_router)
 app.include_router(auth.auth_router)
 app.include_router(business_info.business_info_router)
@@ -49,3 +72,5 @@ app.include_router(webhook.webhook_router)
 app.include_router(notification.notification_route)
 app.include_router(schedule.schedule_router)
 app.include_router(analytics.analytics_router)
+app.include_router(admin.admin_router)
+app.include_router(jobs.jobs_router)
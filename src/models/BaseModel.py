@@ -1,10 +1,11 @@
 # The base Model for all database models
+from typing import Optional
 from src.helpers.config import get_Settings, Settings
 
 class BaseModel:
 
-    def __init__(self, db_client: object):
-        self.app_settings = get_Settings()
+    def __init__(self, db_client: object, app_settings: Optional[Settings] = None):
+        self.app_settings = app_settings or get_Settings()
         
         # Determine if db_client is a Database or Client
         # Use isinstance because MotorClient dynamic attributes make hasattr return True for everything
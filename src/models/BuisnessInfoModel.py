@@ -1,10 +1,55 @@
-from typing import Optional, List, Any, Dict
+import base64
+import json
+import re
+import unicodedata
+from typing import Optional, List, Any, AsyncIterator, Dict, Tuple
 from bson import ObjectId
 from bson.errors import InvalidId
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
 from src.models.BaseModel import BaseModel
 from src.models.db_schemas import BuisnessInfo
 from src.models.enums.DBEnums import DBEnums
 
+NORMALIZED_KEYWORDS_FIELD = "businessKeyWordsNormalized"
+
+# Fields never returned by the cross-tenant search endpoints
+SEARCH_PROJECTION = {"facebook_page_access_token": 0, NORMALIZED_KEYWORDS_FIELD: 0}
+
+
+def is_user_conflict(error: DuplicateKeyError) -> bool:
+    """Whether a duplicate key error comes from `user_index` (and not e.g. `facebook_page_id_index`)."""
+    key_pattern = (error.details or {}).get("keyPattern")
+    if key_pattern is not None:
+        return "user_id" in key_pattern
+    return "user_index" in str(error)  # servers not reporting the key pattern
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Canonical form of a keyword: Unicode NFKC, case-folded, single spaces."""
+    return " ".join(unicodedata.normalize("NFKC", keyword).casefold().split())
+
+
+def normalize_keywords(keywords: List[str]) -> List[str]:
+    """Normalized, de-duplicated keywords (original order kept)."""
+    return list(dict.fromkeys(k for k in map(normalize_keyword, keywords or []) if k))
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Opaque keyset pagination cursor (base64 JSON)."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor made by `encode_cursor`; raises ValueError if malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        ObjectId(values["id"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError("Invalid cursor") from e
+    return values
+
+
 class BusinessInfoModel(BaseModel):
     """
     Repository layer for managing the BusinessInfo collection in MongoDB.
@@ -12,8 +57,13 @@ class BusinessInfoModel(BaseModel):
     This class provides CRUD operations and custom queries for the
     BusinessInfo documents. It ensures async, non-blocking operations
     with Motor and enforces indexes as defined in the schema.
+
+    Every write keeps `businessKeyWordsNormalized` (lowercase, normalized
+    copies of `businessKeyWords`) in sync, for indexed keyword search.
     """
 
+    _indexes_ready = False
+
     def __init__(self, db_client):
         """
         Initialize the BusinessInfoModel with a MongoDB client.
@@ -48,36 +98,49 @@ class BusinessInfoModel(BaseModel):
         """
         Initialize the business info collection in the database.
 
-        - Checks if the collection exists; if not, creates it.
-        - Applies indexes as defined in the BuisnessInfo schema.
-        """
-        all_collections = await self.db.list_collection_names()
-        if DBEnums.COLLECTION_BUSINESS_INFO_NAME.value not in all_collections:
-            self.collection = self.db[DBEnums.COLLECTION_BUSINESS_INFO_NAME.value]
-            indexes = BuisnessInfo.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],
-                    name=index["name"],
-                    unique=index["unique"],
-                    sparse=index.get("sparse", False),
-                )
+        - Applies indexes as defined in the BuisnessInfo schema, once per
+          process (creating an existing index is a no-op), so indexes added
+          later also reach existing collections.
+        """
+        if BusinessInfoModel._indexes_ready:
+            return
+        indexes = BuisnessInfo.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"],
+                sparse=index.get("sparse", False),
+                **index.get("options", {}),
+            )
+        BusinessInfoModel._indexes_ready = True
 
     # ---------------- CRUD ---------------- #
 
-    async def create_business_info(self, business_info: BuisnessInfo) -> ObjectId:
+    async def create_business_info(self, business_info: BuisnessInfo) -> Optional[ObjectId]:
         """
         Insert a new BusinessInfo document into the collection.
 
+        The unique `user_index` rejects a second document for the same user,
+        so no existence check is needed before the insert.
+
         Args:
             business_info (BuisnessInfo): The BusinessInfo object to insert.
 
         Returns:
-            ObjectId: The inserted document ID.
+            Optional[ObjectId]: The inserted document ID, or None if the user already has business info.
+
+        Raises:
+            DuplicateKeyError: If the Facebook Page is linked to another business.
         """
-        result = await self.collection.insert_one(
-            business_info.model_dump(by_alias=True, exclude_unset=True)
-        )
+        doc = business_info.model_dump(by_alias=True, exclude_unset=True)
+        doc[NORMALIZED_KEYWORDS_FIELD] = normalize_keywords(doc.get("businessKeyWords"))
+        try:
+            result = await self.collection.insert_one(doc)
+        except DuplicateKeyError as e:
+            if is_user_conflict(e):
+                return None
+            raise
         return result.inserted_id
 
     async def get_by_user_id(self, user_id: str) -> Optional[BuisnessInfo]:
@@ -111,6 +174,10 @@ class BusinessInfoModel(BaseModel):
     async def replace_business_info(self, user_id: str, new_info: BuisnessInfo) -> Dict[str, Any]:
         """
         Replace (or create) the business info for a user.
+
+        A single `replace_one(upsert=True)` on `user_id`: the unique
+        `user_index` makes concurrent writes for the same user resolve to
+        one document, and the existing `_id` is kept.
         
         Args:
             user_id (str): The user's ID.
@@ -118,31 +185,29 @@ class BusinessInfoModel(BaseModel):
             
         Returns:
             dict: {"matched_count": int, "modified_count": int, "upserted_id": Any}
+
+        Raises:
+            DuplicateKeyError: If the Facebook Page is linked to another business.
         """
         # Ensure user_id matches
         new_info.user_id = user_id
         
-        existing = await self.get_by_user_id(user_id)
-        
         doc = new_info.model_dump(by_alias=True, exclude_unset=True)
-        
-        if existing:
-            # Preserve the _id of the existing document
-            doc["_id"] = ObjectId(existing.id)
-            if not doc.get("_id"):
-                 pass
-
-            # We use the _id from existing to target the replacement exactly
-            result = await self.collection.replace_one(
-                {"_id": ObjectId(existing.id)},
-                doc
-            )
-            return {"matched_count": result.matched_count, "modified_count": result.modified_count}
-        else:
-            # Create new
-            result = await self.collection.insert_one(doc)
-            return {"matched_count": 0, "modified_count": 0, "upserted_id": result.inserted_id}
+        doc.pop("_id", None)
+        doc[NORMALIZED_KEYWORDS_FIELD] = normalize_keywords(doc.get("businessKeyWords"))
 
+        try:
+            result = await self.collection.replace_one({"user_id": user_id}, doc, upsert=True)
+        except DuplicateKeyError as e:
+            if not is_user_conflict(e):
+                raise
+            # a concurrent upsert inserted the document first: replace it
+            result = await self.collection.replace_one({"user_id": user_id}, doc)
+        return {
+            "matched_count": result.matched_count,
+            "modified_count": result.modified_count,
+            "upserted_id": result.upserted_id,
+        }
 
     async def update_business_info(self, user_id: str, update_data: dict) -> dict:
         """
@@ -159,6 +224,9 @@ class BusinessInfoModel(BaseModel):
              query = {"$or": [{"user_id": ObjectId(user_id)}, {"user_id": user_id}]}
         except InvalidId:
              query = {"user_id": user_id}
+
+        if "businessKeyWords" in update_data:
+            update_data = {**update_data, NORMALIZED_KEYWORDS_FIELD: normalize_keywords(update_data["businessKeyWords"])}
         
         result = await self.collection.update_one(
             query, {"$set": update_data}
@@ -231,13 +299,28 @@ class BusinessInfoModel(BaseModel):
         results = await cursor.to_list(length=page_size)
         return [BuisnessInfo(**doc) for doc in results]
 
+    async def iter_user_ids_by_field(self, field: str, batch_size: int = 1000) -> AsyncIterator[str]:
+        """
+        Stream the IDs of the users whose business belongs to a given field,
+        reading only `user_id` in cursor batches of `batch_size`.
+
+        Args:
+            field (str): The business field to filter by.
+            batch_size (int, optional): Documents fetched per round trip.
+
+        Yields:
+            str: User IDs.
+        """
+        cursor = self.collection.find({"field": field}, {"user_id": 1, "_id": 0}).batch_size(batch_size)
+        async for doc in cursor:
+            yield str(doc["user_id"])
+
     async def search_by_keyword(
         self, keyword: str, page_no: int = 1, page_size: int = 20
     ) -> List[BuisnessInfo]:
         """
-        Search BusinessInfo documents by keyword (case-insensitive).
-
-        Looks for matches inside the businessKeyWords array.
+        Search BusinessInfo documents by keyword (case-insensitive exact match
+        on the normalized keywords, served by the `keywords_index` index).
 
         Args:
             keyword (str): The keyword to search for.
@@ -249,7 +332,7 @@ class BusinessInfoModel(BaseModel):
         """
         cursor = (
             self.collection.find(
-                {"businessKeyWords": {"$regex": keyword, "$options": "i"}}
+                {NORMALIZED_KEYWORDS_FIELD: normalize_keyword(keyword)}
             )
             .skip((page_no - 1) * page_size)
             .limit(page_size)
@@ -257,6 +340,116 @@ class BusinessInfoModel(BaseModel):
         results = await cursor.to_list(length=page_size)
         return [BuisnessInfo(**doc) for doc in results]
 
+    async def search_keywords(
+        self, keyword: str, prefix: bool = False, after: Optional[str] = None, limit: int = 20
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Find businesses having a keyword (or a keyword starting with `keyword`
+        when `prefix` is set), in `_id` order with keyset pagination.
+
+        Both forms use the multikey `keywords_index`: the normalized keyword
+        is an equality (or an anchored, case-sensitive regex, i.e. a range)
+        on the index.
+
+        Args:
+            keyword (str): Keyword or keyword prefix.
+            prefix (bool): Match keywords starting with `keyword`.
+            after (Optional[str]): Cursor returned with the previous page.
+            limit (int): Page size.
+
+        Returns:
+            Tuple[List[dict], Optional[str]]: Documents (without tokens) and the next cursor.
+        """
+        normalized = normalize_keyword(keyword)
+        query: Dict[str, Any] = {
+            NORMALIZED_KEYWORDS_FIELD: {"$regex": "^" + re.escape(normalized)} if prefix else normalized
+        }
+        if after:
+            query["_id"] = {"$gt": ObjectId(decode_cursor(after)["id"])}
+
+        cursor = self.collection.find(query, SEARCH_PROJECTION).sort("_id", 1).limit(limit)
+        docs = await cursor.to_list(length=limit)
+        next_cursor = encode_cursor({"id": str(docs[-1]["_id"])}) if len(docs) == limit else None
+        return docs, next_cursor
+
+    async def search_text(
+        self, text: str, after: Optional[str] = None, limit: int = 20
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Ranked full-text search over business name (weight 10), keywords (5)
+        and description (1) using the `business_text_index` text index.
+
+        Results are ordered by relevance then `_id`; the cursor holds the
+        (score, _id) of the last result, so later pages continue after it
+        instead of skipping over the previous ones.
+
+        Args:
+            text (str): Search terms.
+            after (Optional[str]): Cursor returned with the previous page.
+            limit (int): Page size.
+
+        Returns:
+            Tuple[List[dict], Optional[str]]: Documents (with their `score`) and the next cursor.
+        """
+        pipeline: List[Dict[str, Any]] = [
+            {"$match": {"$text": {"$search": text}}},
+            {"$addFields": {"score": {"$meta": "textScore"}}},
+        ]
+        if after:
+            position = decode_cursor(after)
+            if not isinstance(position.get("score"), (int, float)):
+                raise ValueError("Invalid cursor")
+            last_id = ObjectId(position["id"])
+            pipeline.append({"$match": {"$or": [
+                {"score": {"$lt": position["score"]}},
+                {"score": position["score"], "_id": {"$gt": last_id}},
+            ]}})
+        pipeline += [
+            {"$sort": {"score": -1, "_id": 1}},
+            {"$limit": limit},
+            {"$project": SEARCH_PROJECTION},
+        ]
+        docs = await self.collection.aggregate(pipeline).to_list(length=limit)
+        next_cursor = (
+            encode_cursor({"score": docs[-1]["score"], "id": str(docs[-1]["_id"])}) if len(docs) == limit else None
+        )
+        return docs, next_cursor
+
+    async def backfill_normalized_keywords(self, batch_size: int = 1000, job=None) -> Dict[str, int]:
+        """
+        Compute `businessKeyWordsNormalized` for documents written before it
+        existed, with one unordered bulk write per batch.
+
+        Args:
+            batch_size (int, optional): Documents updated per bulk write.
+            job (Optional[Job]): Background job receiving the progress.
+
+        Returns:
+            Dict[str, int]: Number of updated documents.
+        """
+        query = {NORMALIZED_KEYWORDS_FIELD: {"$exists": False}}
+        if job is not None:
+            job.progress(0, await self.collection.count_documents(query))
+
+        updated = 0
+        batch = []
+        cursor = self.collection.find(query, {"businessKeyWords": 1}).batch_size(batch_size)
+        async for doc in cursor:
+            batch.append(UpdateOne(
+                {"_id": doc["_id"]},
+                {"$set": {NORMALIZED_KEYWORDS_FIELD: normalize_keywords(doc.get("businessKeyWords"))}},
+            ))
+            if len(batch) >= batch_size:
+                updated += (await self.collection.bulk_write(batch, ordered=False)).modified_count
+                batch = []
+                if job is not None:
+                    job.progress(updated)
+        if batch:
+            updated += (await self.collection.bulk_write(batch, ordered=False)).modified_count
+        if job is not None:
+            job.progress(updated)
+        return {"updated": updated}
+
     async def exists_for_user(self, user_id: str) -> bool:
         """
         Check if a user already has a BusinessInfo document.
@@ -297,8 +490,11 @@ class BusinessInfoModel(BaseModel):
              query = {"$or": [{"user_id": ObjectId(user_id)}, {"user_id": user_id}]}
         except InvalidId:
              query = {"user_id": user_id}
+        update = {field_name: value}
+        if field_name == "businessKeyWords" and normalize_keyword(value):
+            update[NORMALIZED_KEYWORDS_FIELD] = normalize_keyword(value)
         result = await self.collection.update_one(
-            query, {"$addToSet": {field_name: value}}
+            query, {"$addToSet": update}
         )
         return {
             "matched_count": result.matched_count,
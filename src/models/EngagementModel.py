@@ -0,0 +1,226 @@
+from datetime import datetime
+from typing import List, Optional
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING
+from src.models.BaseModel import BaseModel
+from src.models.db_schemas.Engagement import EngagementSnapshot, EngagementRollup
+from src.models.enums.AnalysisEnums import RollupGranularity
+from src.models.enums.DBEnums import DBEnums
+
+_METRICS = ("reactions", "comments", "shares", "messages")
+
+
+class EngagementModel(BaseModel):
+    """
+    Data access layer for engagement history.
+
+    Raw snapshots are written to a MongoDB time-series collection and folded
+    into hourly and daily rollup collections with `$merge` pipelines. Read
+    queries only touch the rollups, so a year of history is served from a
+    few hundred daily documents instead of every raw snapshot.
+    """
+
+    def __init__(self, db_client: AsyncIOMotorClient):
+        """
+        Initialize EngagementModel with the provided database client.
+
+        Args:
+            db_client (AsyncIOMotorClient): The MongoDB client.
+        """
+        super().__init__(db_client)
+        self.collection = self.db[DBEnums.COLLECTION_ENGAGEMENT_NAME.value]
+        self.rollups = {
+            RollupGranularity.HOUR: self.db[DBEnums.COLLECTION_ENGAGEMENT_HOURLY_NAME.value],
+            RollupGranularity.DAY: self.db[DBEnums.COLLECTION_ENGAGEMENT_DAILY_NAME.value],
+        }
+
+    @classmethod
+    async def create_instance(cls, db_client: AsyncIOMotorClient) -> "EngagementModel":
+        """
+        Factory method to create and initialize an instance.
+
+        Ensures that the time-series collection, the rollup collections and
+        their indexes exist before returning the instance.
+
+        Args:
+            db_client (AsyncIOMotorClient): The MongoDB client.
+
+        Returns:
+            EngagementModel: An initialized instance.
+        """
+        instance = cls(db_client)
+        await instance.init_collection()
+        return instance
+
+    async def init_collection(self) -> None:
+        """
+        Create the snapshot time-series collection and the rollup collections
+        if they do not exist yet, along with their indexes.
+        """
+        all_collections = await self.db.list_collection_names()
+
+        if DBEnums.COLLECTION_ENGAGEMENT_NAME.value not in all_collections:
+            self.collection = await self.db.create_collection(
+                DBEnums.COLLECTION_ENGAGEMENT_NAME.value,
+                timeseries=EngagementSnapshot.get_timeseries_options(),
+            )
+            for index in EngagementSnapshot.get_indexes():
+                await self.collection.create_index(
+                    index["key"],
+                    name=index["name"],
+                    unique=index.get("unique", False)
+                )
+
+        for granularity, collection in self.rollups.items():
+            if collection.name not in all_collections:
+                for index in EngagementRollup.get_indexes():
+                    await collection.create_index(
+                        index["key"],
+                        name=index["name"],
+                        unique=index.get("unique", False)
+                    )
+
+    # ---------------- Writes ---------------- #
+
+    async def record_snapshots(self, snapshots: List[EngagementSnapshot]) -> int:
+        """
+        Insert a batch of raw engagement snapshots.
+
+        Args:
+            snapshots (List[EngagementSnapshot]): The snapshots to store.
+
+        Returns:
+            int: Number of inserted snapshots.
+        """
+        if not snapshots:
+            return 0
+        result = await self.collection.insert_many(
+            [snapshot.model_dump() for snapshot in snapshots],
+            ordered=False,
+        )
+        return len(result.inserted_ids)
+
+    async def refresh_rollups(self, page_id: str, since: datetime) -> None:
+        """
+        Recompute the hourly and daily buckets of a page touched since `since`.
+
+        Only the buckets overlapping the new snapshots are rebuilt: hourly
+        buckets are folded from raw snapshots, then daily buckets are folded
+        from the refreshed hourly buckets. Both are upserted with `$merge`.
+
+        Args:
+            page_id (str): The Facebook Page ID.
+            since (datetime): Timestamp of the oldest snapshot written since the last refresh.
+        """
+        hourly = self.rollups[RollupGranularity.HOUR]
+        daily = self.rollups[RollupGranularity.DAY]
+
+        await self.collection.aggregate(
+            self._rollup_pipeline(
+                match={"meta.page_id": page_id},
+                time_field="timestamp",
+                since=since,
+                series={"page_id": "$meta.page_id", "post_id": "$meta.post_id"},
+                granularity=RollupGranularity.HOUR,
+                samples={"$sum": 1},
+                into=hourly.name,
+            )
+        ).to_list(length=None)
+
+        await hourly.aggregate(
+            self._rollup_pipeline(
+                match={"page_id": page_id},
+                time_field="bucket",
+                since=since,
+                series={"page_id": "$page_id", "post_id": "$post_id"},
+                granularity=RollupGranularity.DAY,
+                samples={"$sum": "$samples"},
+                into=daily.name,
+            )
+        ).to_list(length=None)
+
+    @staticmethod
+    def _rollup_pipeline(
+        match: dict,
+        time_field: str,
+        since: datetime,
+        series: dict,
+        granularity: RollupGranularity,
+        samples: dict,
+        into: str,
+    ) -> List[dict]:
+        """
+        Build the aggregation pipeline folding one level into the next one.
+
+        `since` is truncated to the target bucket so partially covered buckets
+        are always rebuilt from scratch rather than patched. The composite
+        group key doubles as the rollup `_id`, which `$merge` matches on
+        (page-level series have a null `post_id`, which `on` fields reject).
+        """
+        bucket_start = since.replace(minute=0, second=0, microsecond=0)
+        if granularity == RollupGranularity.DAY:
+            bucket_start = bucket_start.replace(hour=0)
+
+        group = {
+            "_id": {**series, "bucket": {"$dateTrunc": {"date": f"${time_field}", "unit": granularity.value}}},
+            "samples": samples,
+        }
+        for metric in _METRICS:
+            group[metric] = {"$last": f"${metric}"}
+
+        return [
+            {"$match": {**match, time_field: {"$gte": bucket_start}}},
+            {"$sort": {time_field: ASCENDING}},
+            {"$group": group},
+            {
+                "$project": {
+                    "page_id": "$_id.page_id",
+                    "post_id": "$_id.post_id",
+                    "bucket": "$_id.bucket",
+                    "granularity": {"$literal": granularity.value},
+                    "samples": 1,
+                    **{metric: 1 for metric in _METRICS},
+                }
+            },
+            {
+                "$merge": {
+                    "into": into,
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert",
+                }
+            },
+        ]
+
+    # ---------------- Queries ---------------- #
+
+    async def get_rollups(
+        self,
+        page_id: str,
+        granularity: RollupGranularity,
+        start: datetime,
+        end: datetime,
+        post_id: Optional[str] = None,
+    ) -> List[EngagementRollup]:
+        """
+        Fetch the rollup buckets of a series within a time range, oldest first.
+
+        Args:
+            page_id (str): The Facebook Page ID.
+            granularity (RollupGranularity): Hourly or daily buckets.
+            start (datetime): Inclusive lower bound of the range.
+            end (datetime): Exclusive upper bound of the range.
+            post_id (Optional[str]): Post ID, or None for page-level counters.
+
+        Returns:
+            List[EngagementRollup]: The matching buckets.
+        """
+        cursor = self.rollups[granularity].find(
+            {
+                "page_id": page_id,
+                "post_id": post_id,
+                "bucket": {"$gte": start, "$lt": end},
+            },
+            {"_id": 0},
+        ).sort("bucket", ASCENDING)
+
+        return [EngagementRollup(**doc) async for doc in cursor]
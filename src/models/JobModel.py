@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from src.models.BaseModel import BaseModel
+from src.models.db_schemas.Job import JobRecord
+from src.models.enums.DBEnums import DBEnums
+from src.models.enums.JobEnums import JobStatus
+
+
+class JobModel(BaseModel):
+    """
+    Repository of background job records (see `JobRunner`).
+
+    Every state change of a running job is conditioned on its lease owner,
+    so a worker that lost the lease of a job can no longer update it.
+    """
+
+    _indexes_ready = False
+
+    def __init__(self, db_client):
+        super().__init__(db_client)
+        self.collection = self.db[DBEnums.COLLECTION_JOB_NAME.value]
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        await instance.init_collection()
+        return instance
+
+    async def init_collection(self):
+        """Create the indexes (TTL included) once per process."""
+        if JobModel._indexes_ready:
+            return
+        for index in JobRecord.get_indexes():
+            await self.collection.create_index(
+                index["key"], name=index["name"], unique=index["unique"], **index.get("options", {})
+            )
+        JobModel._indexes_ready = True
+
+    # ---------------- Submission ---------------- #
+
+    async def enqueue(self, record: JobRecord) -> Tuple[JobRecord, bool]:
+        """
+        Store a pending job, unless an identical job (same `dedupKey`) is
+        still pending or running.
+
+        Returns:
+            Tuple[JobRecord, bool]: The stored job, or the identical active
+            one, and whether the job was created.
+        """
+        document = record.model_dump(by_alias=True, exclude_none=True)
+        for attempt in range(3):
+            try:
+                result = await self.collection.insert_one(dict(document))
+            except DuplicateKeyError:
+                existing = await self.collection.find_one({"dedupKey": record.dedupKey})
+                if existing is not None:
+                    return JobRecord(**existing), False
+                if attempt == 2:
+                    raise
+                continue  # finished in between, submit again
+            record.id = str(result.inserted_id)
+            return record, True
+
+    async def get_job(self, job_id: str) -> Optional[JobRecord]:
+        if not ObjectId.is_valid(job_id):
+            return None
+        document = await self.collection.find_one({"_id": ObjectId(job_id)})
+        return JobRecord(**document) if document else None
+
+    # ---------------- Leases ---------------- #
+
+    async def claim(self, owner: str, kinds: List[str], lease_seconds: float) -> Optional[JobRecord]:
+        """
+        Take the oldest pending job of `kinds`, or a running one whose lease
+        expired, and lease it to `owner`.
+        """
+        now = datetime.now(timezone.utc)
+        document = await self.collection.find_one_and_update(
+            {
+                "kind": {"$in": kinds},
+                "$or": [
+                    {"status": JobStatus.PENDING.value},
+                    {"status": JobStatus.RUNNING.value, "leaseExpiresAt": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING.value,
+                    "leaseOwner": owner,
+                    "leaseExpiresAt": now + timedelta(seconds=lease_seconds),
+                    "startedAt": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("createdAt", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return JobRecord(**document) if document else None
+
+    async def heartbeat(
+        self, job_id: str, owner: str, lease_seconds: float, processed: int, total: Optional[int]
+    ) -> bool:
+        """Save the progress of a running job and extend its lease; False if the lease was lost."""
+        result = await self.collection.update_one(
+            {"_id": ObjectId(job_id), "leaseOwner": owner, "status": JobStatus.RUNNING.value},
+            {"$set": {
+                "processed": processed,
+                "total": total,
+                "leaseExpiresAt": datetime.now(timezone.utc) + timedelta(seconds=lease_seconds),
+            }},
+        )
+        return result.matched_count == 1
+
+    async def finish(
+        self,
+        job_id: str,
+        owner: str,
+        status: JobStatus,
+        retention: float,
+        processed: int,
+        total: Optional[int],
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        """Record the outcome of a job, kept `retention` seconds; False if the lease was lost."""
+        now = datetime.now(timezone.utc)
+        update = await self.collection.update_one(
+            {"_id": ObjectId(job_id), "leaseOwner": owner},
+            {
+                "$set": {
+                    "status": status.value,
+                    "processed": processed,
+                    "total": total,
+                    "result": result or {},
+                    "error": error,
+                    "finishedAt": now,
+                    "expiresAt": now + timedelta(seconds=retention),
+                },
+                "$unset": {"dedupKey": "", "leaseOwner": "", "leaseExpiresAt": ""},
+            },
+        )
+        return update.matched_count == 1
+
+    async def release(self, job_id: str, owner: str) -> bool:
+        """Put a running job back in the queue (worker shutdown of a retriable kind), without counting the attempt."""
+        result = await self.collection.update_one(
+            {"_id": ObjectId(job_id), "leaseOwner": owner, "status": JobStatus.RUNNING.value},
+            {
+                "$set": {"status": JobStatus.PENDING.value},
+                "$unset": {"leaseOwner": "", "leaseExpiresAt": ""},
+                "$inc": {"attempts": -1},
+            },
+        )
+        return result.matched_count == 1
@@ -1,8 +1,11 @@
+from datetime import datetime
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import DESCENDING
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import BulkWriteError
 from typing import List, Optional
 from src.models.db_schemas.Notification import Notification
+from src.helpers.notification_hub import get_notification_hub
 from src.models.BaseModel import BaseModel
 from src.models.enums.DBEnums import DBEnums
 
@@ -14,8 +17,13 @@ class NotificationModel(BaseModel):
     This class provides CRUD operations for notifications stored in the
     `COLLECTION_NOTIFICATION_NAME` collection, as defined in DBEnums.
     It uses Motor (async MongoDB driver) to perform non-blocking database operations.
+
+    Unread counts are cached per worker (see `UnreadCounters`) and adjusted by
+    every write made through this class.
     """
 
+    _indexes_ready = False
+
     def __init__(self, db_client: AsyncIOMotorClient):
         """
         Initialize NotificationModel with the provided database client.
@@ -46,24 +54,32 @@ class NotificationModel(BaseModel):
     async def init_collection(self)-> None:
         """
         Initialize the collection and ensure necessary indexes are created.
-        If the collection does not exist, it is created and indexes are applied.
-        """
-        all_collections = await self.db.list_collection_names()
-        if DBEnums.COLLECTION_NOTIFICATION_NAME.value not in all_collections:
-            self.collection = self.db[DBEnums.COLLECTION_NOTIFICATION_NAME.value]
-            indexes = Notification.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],
-                    name=index["name"],
-                    unique=index.get("unique", False)
-                )
+        Indexes are created once per process (creating an existing index is a
+        no-op), so indexes added later also reach existing collections.
+        """
+        if NotificationModel._indexes_ready:
+            return
+        indexes = Notification.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index.get("unique", False)
+            )
+        NotificationModel._indexes_ready = True
+
+    @property
+    def unread_counters(self):
+        hub = get_notification_hub()
+        return hub.unread if hub is not None else None
 
     # ---------------- CRUD ---------------- #
 
     async def create_notification(self, notification: Notification) -> ObjectId:
         """
-        Insert a new notification document into the database.
+        Insert a new notification document into the database and push it to
+        the user's open notification streams in this worker (other workers
+        receive it through the change stream of the collection).
 
         Args:
             notification (Notification): The notification object to insert.
@@ -72,10 +88,45 @@ class NotificationModel(BaseModel):
             Notification ID: The inserted notification ID.
         """
         notif_dict = notification.model_dump(by_alias=True, exclude_none=True)
+        hub = get_notification_hub()
+        if hub is not None:
+            hub.tag(notif_dict)
         result = await self.collection.insert_one(notif_dict)
+
+        if hub is not None:
+            hub.publish({**notif_dict, "_id": result.inserted_id})
         return result.inserted_id
 
 
+    async def insert_many_notifications(self, documents: List[dict]) -> int:
+        """
+        Insert a chunk of notification documents with one unordered
+        `insert_many` and push them to the open notification streams.
+        Documents rejected by the server do not stop the others.
+
+        Args:
+            documents (List[dict]): Notification documents (as dumped from `Notification`).
+
+        Returns:
+            int: Number of inserted notifications.
+        """
+        hub = get_notification_hub()
+        if hub is not None:
+            for doc in documents:
+                hub.tag(doc)
+
+        failed = set()
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+
+        if hub is not None:
+            for index, doc in enumerate(documents):
+                if index not in failed:
+                    hub.publish(doc)
+        return len(documents) - len(failed)
+
     async def get_by_id(self, notif_id: str) -> Optional[Notification]:
         """
         Fetch a single notification by its ID.
@@ -109,6 +160,66 @@ class NotificationModel(BaseModel):
         
         return Notifications
 
+    async def get_user_notifications_after(self, user_id: str, after_id: str, limit: int = 100) -> List[Notification]:
+        """
+        Fetch the notifications of a user created after a given notification,
+        oldest first (replayed to a stream reconnecting with `Last-Event-ID`).
+
+        Args:
+            user_id (str): The ID of the user.
+            after_id (str): ID of the last notification the client received.
+            limit (int, optional): Maximum number to return.
+
+        Returns:
+            List[Notification]: The missed notifications.
+        """
+        cursor = self.collection.find(
+            {"user_id": user_id, "_id": {"$gt": ObjectId(after_id)}}
+        ).sort("_id", ASCENDING).limit(limit)
+        return [Notification(**doc) async for doc in cursor]
+
+    async def get_user_notifications_since(self, user_id: str, since: datetime, limit: int = 50) -> List[Notification]:
+        """
+        Fetch the notifications of a user created after a point in time,
+        newest first (served by the `user_createdAt_index` index).
+
+        Args:
+            user_id (str): The ID of the user.
+            since (datetime): Only notifications created after this time are returned.
+            limit (int, optional): Maximum number to return.
+
+        Returns:
+            List[Notification]: The new notifications.
+        """
+        cursor = self.collection.find(
+            {"user_id": user_id, "createdAt": {"$gt": since}}
+        ).sort("createdAt", DESCENDING).limit(limit)
+        return [Notification(**doc) async for doc in cursor]
+
+    async def count_unread(self, user_id: str) -> int:
+        """
+        Number of unseen notifications of a user, from the worker cache when
+        available, otherwise counted on the `user_seen_index` index.
+
+        Args:
+            user_id (str): The ID of the user.
+
+        Returns:
+            int: The unread count.
+        """
+        counters = self.unread_counters
+        if counters is None:
+            return await self.collection.count_documents({"user_id": user_id, "seen": False})
+
+        count = counters.get(user_id)
+        if count is None:
+            token = counters.begin_load(user_id)
+            try:
+                count = await self.collection.count_documents({"user_id": user_id, "seen": False})
+            finally:
+                counters.end_load(user_id, token, count)
+        return count
+
     async def mark_as_seen(self, notif_id: str) -> dict:
         """
         Mark a notification as seen.
@@ -119,10 +230,55 @@ class NotificationModel(BaseModel):
         Returns:
             dict: Update result with matched and modified counts.
         """
-        result = await self.collection.update_one(
+        previous = await self.collection.find_one_and_update(
             {"_id": ObjectId(notif_id)},
+            {"$set": {"seen": True}},
+            projection={"user_id": 1, "seen": 1},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if previous is None:
+            return {"matched_count": 0, "modified_count": 0}
+
+        modified = 0 if previous.get("seen") else 1
+        if modified and self.unread_counters is not None:
+            self.unread_counters.adjust(previous["user_id"], -1)
+        return {"matched_count": 1, "modified_count": modified}
+
+    async def mark_many_as_seen(self, user_id: str, notif_ids: List[str]) -> dict:
+        """
+        Mark several notifications of a user as seen in one update.
+
+        Args:
+            user_id (str): The ID of the user owning the notifications.
+            notif_ids (List[str]): IDs of the notifications.
+
+        Returns:
+            dict: Update result with matched and modified counts.
+        """
+        result = await self.collection.update_many(
+            {"_id": {"$in": [ObjectId(i) for i in notif_ids]}, "user_id": user_id},
             {"$set": {"seen": True}}
         )
+        if result.modified_count and self.unread_counters is not None:
+            self.unread_counters.adjust(user_id, -result.modified_count)
+        return {"matched_count": result.matched_count, "modified_count": result.modified_count}
+
+    async def mark_all_as_seen(self, user_id: str) -> dict:
+        """
+        Mark every unseen notification of a user as seen in one update.
+
+        Args:
+            user_id (str): The ID of the user.
+
+        Returns:
+            dict: Update result with matched and modified counts.
+        """
+        result = await self.collection.update_many(
+            {"user_id": user_id, "seen": False},
+            {"$set": {"seen": True}}
+        )
+        if self.unread_counters is not None:
+            self.unread_counters.adjust(user_id, -result.modified_count)
         return {"matched_count": result.matched_count, "modified_count": result.modified_count}
 
     async def update_notification(self, notif_id: str, update_data: dict) -> dict:
@@ -137,8 +293,21 @@ class NotificationModel(BaseModel):
             dict: Update result with matched and modified counts.
         """
         update = {"$set": update_data}
-        result = await self.collection.update_one({"_id": ObjectId(notif_id)}, update)
-        return {"matched_count": result.matched_count, "modified_count": result.modified_count}
+        if self.unread_counters is None or not {"seen", "user_id"} & update_data.keys():
+            result = await self.collection.update_one({"_id": ObjectId(notif_id)}, update)
+            return {"matched_count": result.matched_count, "modified_count": result.modified_count}
+
+        # the unread count of the owner(s) may change: drop the cached counts
+        previous = await self.collection.find_one_and_update(
+            {"_id": ObjectId(notif_id)}, update, projection={"user_id": 1, **{k: 1 for k in update_data}}
+        )
+        if previous is None:
+            return {"matched_count": 0, "modified_count": 0}
+        self.unread_counters.invalidate(previous["user_id"])
+        if "user_id" in update_data:
+            self.unread_counters.invalidate(update_data["user_id"])
+        modified = any(previous.get(k) != v for k, v in update_data.items())
+        return {"matched_count": 1, "modified_count": int(modified)}
 
     async def delete_notification_by_id(self, notif_id: str) -> dict:
         """
@@ -150,8 +319,14 @@ class NotificationModel(BaseModel):
         Returns:
             dict: Delete result with deleted count.
         """
-        result = await self.collection.delete_one({"_id": ObjectId(notif_id)})
-        return {"deleted_count": result.deleted_count}
+        deleted = await self.collection.find_one_and_delete(
+            {"_id": ObjectId(notif_id)}, projection={"user_id": 1, "seen": 1}
+        )
+        if deleted is None:
+            return {"deleted_count": 0}
+        if not deleted.get("seen") and self.unread_counters is not None:
+            self.unread_counters.adjust(deleted["user_id"], -1)
+        return {"deleted_count": 1}
 
     async def delete_notifications_by_user_id(self, user_id: str) -> dict:
         """
@@ -164,4 +339,6 @@ class NotificationModel(BaseModel):
             dict: Delete result with deleted count.
         """
         result = await self.collection.delete_many({"user_id": ObjectId(user_id)})
+        if self.unread_counters is not None:
+            self.unread_counters.invalidate(user_id)
         return {"deleted_count": result.deleted_count}
@@ -4,11 +4,14 @@ from .db_schemas.Post import Post
 from .enums.DBEnums import DBEnums
 from .enums.PostEnums import PostStatus
 from bson.objectid import ObjectId
+from pymongo.errors import BulkWriteError
 from typing import List, Optional
 from datetime import datetime
 
 
 class PostModel(BaseModel):
+    _indexes_ready = False
+
     def __init__(self, db_client):
         """
         Initialize the PostModel with a MongoDB client.
@@ -17,7 +20,7 @@ class PostModel(BaseModel):
             db_client (object): The MongoDB client instance for database operations.
         """
         super().__init__(db_client)
-        self.collection = self.db_client[DBEnums.COLLECTION_POST_NAME.value]
+        self.collection = self.db[DBEnums.COLLECTION_POST_NAME.value]
         
     @classmethod
     async def create_instance(cls, db_client: object):
@@ -38,21 +41,21 @@ class PostModel(BaseModel):
     
     async def init_collection(self) -> None:
         """
-        Initialize the post collection in the database.
+        Create the indexes defined in the Post schema, once per process.
 
-        Checks if the post collection exists; if not, creates it and sets up the necessary indexes
-        as defined in the Post schema.
+        `create_index` is a no-op for an existing index, so indexes added to
+        the schema are also built on existing collections.
         """
-        all_collections = await self.db.list_collection_names()
-        if DBEnums.COLLECTION_POST_NAME.value not in all_collections:
-            self.collection = self.db[DBEnums.COLLECTION_POST_NAME.value]
-            indexes = Post.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],
-                    name=index["name"],
-                    unique=index["unique"],
-                )
+        if PostModel._indexes_ready:
+            return
+        indexes = Post.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"],
+            )
+        PostModel._indexes_ready = True
     
     async def create_post(self, post: Post) -> ObjectId:
         """
@@ -66,6 +69,36 @@ class PostModel(BaseModel):
         """
         result = await self.collection.insert_one(post.dict(by_alias=True, exclude_unset=True))
         return result.inserted_id
+
+    async def insert_many_posts(self, posts: List[Post]) -> List[Post]:
+        """
+        Insert a batch of posts with one unordered `insert_many`. Posts
+        rejected by the server do not stop the others. Posts whose ID is
+        already set are inserted with it.
+
+        Args:
+            posts (List[Post]): The posts to insert.
+
+        Returns:
+            List[Post]: The inserted posts, with their ID set.
+        """
+        if not posts:
+            return []
+        documents = [post.model_dump(by_alias=True, exclude_none=True) for post in posts]
+        for doc in documents:
+            doc["_id"] = ObjectId(doc["_id"]) if "_id" in doc else ObjectId()
+        failed = set()
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+
+        inserted = []
+        for index, (post, doc) in enumerate(zip(posts, documents)):
+            if index not in failed:
+                post.id = str(doc["_id"])
+                inserted.append(post)
+        return inserted
     
     async def get_post_by_id(self, post_id: str) -> Optional[Post]:
         """
@@ -239,6 +272,28 @@ class PostModel(BaseModel):
             posts.append(Post(**doc))
         return posts
     
+    async def list_recent_posts(
+        self, user_id: str, statuses: Optional[List[PostStatus]] = None, limit: int = 10_000
+    ) -> List[dict]:
+        """
+        Retrieve the title and content of the most recent posts of a user,
+        newest first (for the draft similarity index).
+
+        Args:
+            user_id (str): User ID.
+            statuses (Optional[List[PostStatus]]): Statuses of the posts, DRAFT and ACCEPTED by default.
+            limit (int, optional): Maximum number of posts to return. Defaults to 10,000.
+
+        Returns:
+            List[dict]: Raw documents with `_id`, `title` and `content`.
+        """
+        statuses = statuses or [PostStatus.DRAFT, PostStatus.ACCEPTED]
+        cursor = self.collection.find(
+            {"user_id": user_id, "status": {"$in": [status.value for status in statuses]}},
+            {"title": 1, "content": 1},
+        ).sort("_id", -1).limit(limit)
+        return await cursor.to_list(length=limit)
+
     async def list_draft_posts_by_user_id(self, user_id: str, limit: int = 10, skip: int = 0) -> List[Post]:
         """
         Retrieve all DRAFT posts created by a specific user with pagination support.
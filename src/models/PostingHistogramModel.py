@@ -0,0 +1,80 @@
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorClient
+from src.models.BaseModel import BaseModel
+from src.models.db_schemas.PostingHistogram import PostingHistogram
+from src.models.enums.DBEnums import DBEnums
+
+
+class PostingHistogramModel(BaseModel):
+    """
+    Data access layer for the per-page posting-time histograms cache.
+    """
+
+    def __init__(self, db_client: AsyncIOMotorClient):
+        """
+        Initialize PostingHistogramModel with the provided database client.
+
+        Args:
+            db_client (AsyncIOMotorClient): The MongoDB client.
+        """
+        super().__init__(db_client)
+        self.collection = self.db[DBEnums.COLLECTION_POSTING_HISTOGRAM_NAME.value]
+
+    @classmethod
+    async def create_instance(cls, db_client: AsyncIOMotorClient) -> "PostingHistogramModel":
+        """
+        Factory method to create and initialize an instance.
+
+        Args:
+            db_client (AsyncIOMotorClient): The MongoDB client.
+
+        Returns:
+            PostingHistogramModel: An initialized instance.
+        """
+        instance = cls(db_client)
+        await instance.init_collection()
+        return instance
+
+    async def init_collection(self) -> None:
+        """
+        Initialize the collection and ensure necessary indexes are created.
+        If the collection does not exist, it is created and indexes are applied.
+        """
+        all_collections = await self.db.list_collection_names()
+        if DBEnums.COLLECTION_POSTING_HISTOGRAM_NAME.value not in all_collections:
+            self.collection = self.db[DBEnums.COLLECTION_POSTING_HISTOGRAM_NAME.value]
+            indexes = PostingHistogram.get_indexes()
+            for index in indexes:
+                await self.collection.create_index(
+                    index["key"],
+                    name=index["name"],
+                    unique=index.get("unique", False)
+                )
+
+    # ---------------- CRUD ---------------- #
+
+    async def get_by_page_id(self, page_id: str) -> Optional[PostingHistogram]:
+        """
+        Fetch the cached histograms of a page.
+
+        Args:
+            page_id (str): The Facebook Page ID.
+
+        Returns:
+            Optional[PostingHistogram]: The histograms if cached, else None.
+        """
+        doc = await self.collection.find_one({"page_id": page_id})
+        return PostingHistogram(**doc) if doc else None
+
+    async def save(self, histogram: PostingHistogram) -> None:
+        """
+        Store the histograms of a page, replacing the cached version.
+
+        Args:
+            histogram (PostingHistogram): The updated histograms.
+        """
+        await self.collection.replace_one(
+            {"page_id": histogram.page_id},
+            histogram.model_dump(exclude={"id"}),
+            upsert=True,
+        )
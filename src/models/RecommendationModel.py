@@ -68,6 +68,25 @@ class RecommendationModel(BaseModel):
         result = await self.collection.insert_one(rec_dict)
         return result.inserted_id
 
+    async def create_recommendations(self, recommendations: List[Recommendation]) -> List[ObjectId]:
+        """
+        Insert several recommendations with one `insert_many`.
+
+        Args:
+            recommendations (List[Recommendation]): Recommendations to insert.
+
+        Returns:
+            List[ObjectId]: The inserted documents' IDs, in order.
+        """
+        if not recommendations:
+            return []
+        result = await self.collection.insert_many(
+            [rec.model_dump(by_alias=True, exclude_none=True) for rec in recommendations]
+        )
+        for rec, rec_id in zip(recommendations, result.inserted_ids):
+            rec.id = str(rec_id)
+        return result.inserted_ids
+
     async def get_by_user_id(self, user_id: str, skip: int, limit: int) -> Optional[List[Recommendation]]:
         """
         Fetch a single recommendation by its ID.
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from src.helpers.token_cache import get_token_cache
+from src.models.BaseModel import BaseModel
+from src.models.db_schemas.RevokedToken import RevokedToken
+from src.models.enums.DBEnums import DBEnums
+
+
+class RevokedTokenModel(BaseModel):
+    """
+    Repository of access token revocations.
+
+    Each revocation is stored (so every worker's `TokenCache` picks it up on
+    its next sync) and applied to the cache of this worker at once.
+    """
+
+    _indexes_ready = False
+
+    def __init__(self, db_client):
+        super().__init__(db_client)
+        self.collection = self.db[DBEnums.COLLECTION_REVOKED_TOKEN_NAME.value]
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        await instance.init_collection()
+        return instance
+
+    async def init_collection(self):
+        """Create the indexes (TTL included) once per process."""
+        if RevokedTokenModel._indexes_ready:
+            return
+        for index in RevokedToken.get_indexes():
+            await self.collection.create_index(
+                index["key"], name=index["name"], unique=index["unique"], **index.get("options", {})
+            )
+        RevokedTokenModel._indexes_ready = True
+
+    # ---------------- Revocation ---------------- #
+
+    async def revoke_token(self, digest: str, expires_at: datetime) -> None:
+        """
+        Revoke one token (logout).
+
+        Args:
+            digest (str): `token_digest` of the token.
+            expires_at (datetime): Expiry of the token (UTC).
+        """
+        revocation = RevokedToken(token_digest=digest, expiresAt=expires_at)
+        await self._store(revocation)
+
+    async def revoke_user(self, user_id: str, expires_in: Optional[timedelta] = None) -> None:
+        """
+        Revoke every token issued so far to a user.
+
+        Args:
+            user_id (str): The user's ID.
+            expires_in (Optional[timedelta]): Lifetime of the tokens, defaults to ACCESS_TOKEN_EXPIRE_DAYS.
+        """
+        expires_in = expires_in or timedelta(days=self.app_settings.ACCESS_TOKEN_EXPIRE_DAYS)
+        revocation = RevokedToken(user_id=user_id, expiresAt=datetime.now(timezone.utc) + expires_in)
+        await self._store(revocation)
+
+    async def _store(self, revocation: RevokedToken) -> None:
+        await self.collection.insert_one(revocation.model_dump(by_alias=True, exclude_none=True))
+        cache = get_token_cache()
+        if cache is not None:
+            cache.apply(revocation.model_dump())
@@ -0,0 +1,159 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+from bson import ObjectId
+from src.helpers.notification_hub import get_notification_hub
+from src.models.BaseModel import BaseModel
+from src.models.enums.DBEnums import DBEnums
+
+# Collections holding documents of a user (by `user_id`)
+USER_OWNED_COLLECTIONS = [
+    DBEnums.COLLECTION_BUSINESS_INFO_NAME.value,
+    DBEnums.COLLECTION_SCHEDULE_NAME.value,
+    DBEnums.COLLECTION_RECOMENDATION_NAME.value,
+    DBEnums.COLLECTION_NOTIFICATION_NAME.value,
+    DBEnums.COLLECTION_POST_NAME.value,
+    DBEnums.COLLECTION_ANALYTICS_NAME.value,
+]
+
+# Collections holding documents of the user's Facebook page (collection, page id field)
+PAGE_OWNED_COLLECTIONS = [
+    (DBEnums.COLLECTION_ENGAGEMENT_NAME.value, "meta.page_id"),
+    (DBEnums.COLLECTION_ENGAGEMENT_HOURLY_NAME.value, "page_id"),
+    (DBEnums.COLLECTION_ENGAGEMENT_DAILY_NAME.value, "page_id"),
+    (DBEnums.COLLECTION_POSTING_HISTOGRAM_NAME.value, "page_id"),
+]
+
+
+class UserCascadeModel(BaseModel):
+    """
+    Deletes users together with everything that belongs to them.
+
+    Users are processed in chunks of `chunk_size` IDs. For each chunk the
+    Facebook pages of the users are looked up, then the documents of every
+    dependent collection are deleted concurrently with one `delete_many`
+    per collection, and the user documents last: an interrupted purge can
+    simply be run again.
+
+    `user_id` is stored as a string by most models and as an ObjectId by
+    older documents, so both forms are matched.
+
+    With `use_transaction` (replica sets only) the user-owned documents and
+    the users of a chunk are deleted in one transaction; the deletes then run
+    one after the other, since a session cannot be shared by concurrent
+    operations. Page metrics (time series, not writable in transactions) are
+    deleted right after the commit.
+
+    Args:
+        db_client: The MongoDB client or database.
+        chunk_size (int): Users deleted per batch.
+        use_transaction (bool): Delete each chunk in a transaction.
+    """
+
+    def __init__(self, db_client, chunk_size: int = 500, use_transaction: bool = False):
+        super().__init__(db_client)
+        self.collection = self.db[DBEnums.COLLECTION_USER_NAME.value]
+        self.chunk_size = chunk_size
+        self.use_transaction = use_transaction
+
+    # ---------------- Deletion ---------------- #
+
+    @staticmethod
+    def _owner_filter(user_ids: List[ObjectId]) -> Dict[str, Any]:
+        return {"user_id": {"$in": [str(i) for i in user_ids] + list(user_ids)}}
+
+    async def _page_ids(self, user_ids: List[ObjectId], session=None) -> List[str]:
+        business_infos = self.db[DBEnums.COLLECTION_BUSINESS_INFO_NAME.value]
+        cursor = business_infos.find(
+            {**self._owner_filter(user_ids), "facebook_page_id": {"$ne": None}},
+            {"facebook_page_id": 1, "_id": 0},
+            session=session,
+        )
+        return [doc["facebook_page_id"] async for doc in cursor]
+
+    async def _delete_pages(self, page_ids: List[str], counts: Dict[str, int]) -> None:
+        if not page_ids:
+            return
+        results = await asyncio.gather(*[
+            self.db[name].delete_many({key: {"$in": page_ids}}) for name, key in PAGE_OWNED_COLLECTIONS
+        ])
+        for (name, _), result in zip(PAGE_OWNED_COLLECTIONS, results):
+            counts[name] = counts.get(name, 0) + result.deleted_count
+
+    async def delete_chunk(self, user_ids: List[ObjectId]) -> Dict[str, int]:
+        """
+        Delete a chunk of users and their related documents.
+
+        Args:
+            user_ids (List[ObjectId]): IDs of the users.
+
+        Returns:
+            Dict[str, int]: Deleted documents per collection.
+        """
+        owner_filter = self._owner_filter(user_ids)
+        counts: Dict[str, int] = {}
+
+        if self.use_transaction:
+            async with await self.db_client.start_session() as session:
+                async with session.start_transaction():
+                    page_ids = await self._page_ids(user_ids, session)
+                    for name in USER_OWNED_COLLECTIONS:
+                        result = await self.db[name].delete_many(owner_filter, session=session)
+                        counts[name] = result.deleted_count
+                    result = await self.collection.delete_many({"_id": {"$in": user_ids}}, session=session)
+                    counts[DBEnums.COLLECTION_USER_NAME.value] = result.deleted_count
+            await self._delete_pages(page_ids, counts)
+        else:
+            page_ids = await self._page_ids(user_ids)
+            results = await asyncio.gather(
+                *[self.db[name].delete_many(owner_filter) for name in USER_OWNED_COLLECTIONS],
+                self._delete_pages(page_ids, counts),
+            )
+            for name, result in zip(USER_OWNED_COLLECTIONS, results):
+                counts[name] = result.deleted_count
+            result = await self.collection.delete_many({"_id": {"$in": user_ids}})
+            counts[DBEnums.COLLECTION_USER_NAME.value] = result.deleted_count
+
+        hub = get_notification_hub()
+        if hub is not None:
+            for user_id in user_ids:
+                hub.unread.invalidate(str(user_id))
+        return counts
+
+    async def delete_users(self, user_filter: Optional[dict] = None, user_ids: Optional[List[str]] = None, job=None) -> Dict[str, Any]:
+        """
+        Delete the users matching a filter or a list of IDs, chunk by chunk.
+
+        Args:
+            user_filter (Optional[dict]): Filter on the user documents.
+            user_ids (Optional[List[str]]): Explicit user IDs (used instead of the filter).
+            job (Optional[Job]): Job receiving the progress (users deleted so far).
+
+        Returns:
+            Dict[str, Any]: Users deleted and related documents deleted per collection.
+        """
+        if user_ids is not None:
+            user_filter = {"_id": {"$in": [ObjectId(i) for i in dict.fromkeys(user_ids)]}}
+        user_filter = user_filter or {}
+        if job is not None:
+            job.progress(0, await self.collection.count_documents(user_filter))
+
+        totals: Dict[str, int] = {}
+        chunk: List[ObjectId] = []
+
+        async def flush():
+            for name, count in (await self.delete_chunk(chunk)).items():
+                totals[name] = totals.get(name, 0) + count
+            if job is not None:
+                job.progress(totals.get(DBEnums.COLLECTION_USER_NAME.value, 0))
+
+        cursor = self.collection.find(user_filter, {"_id": 1}).sort("_id", 1).batch_size(self.chunk_size)
+        async for doc in cursor:
+            chunk.append(doc["_id"])
+            if len(chunk) >= self.chunk_size:
+                await flush()
+                chunk = []
+        if chunk:
+            await flush()
+
+        deleted = totals.pop(DBEnums.COLLECTION_USER_NAME.value, 0)
+        return {"deleted_count": deleted, "related_deleted": totals}
@@ -4,11 +4,9 @@ from .db_schemas.User import User
 from .enums.UserEnums import AccountStatus
 from .enums.DBEnums import DBEnums
 from bson.objectid import ObjectId
-from typing import List, Optional
-from .BuisnessInfoModel import BusinessInfoModel
-from .ScheduleModel import ScheduleModel
-from .RecommendationModel import RecommendationModel
-from .NotificationModel import NotificationModel
+from typing import AsyncIterator, List, Optional
+from .UserCascadeModel import UserCascadeModel
+from .RevokedTokenModel import RevokedTokenModel
 
 
 class UserModel(BaseModel):
@@ -106,6 +104,9 @@ class UserModel(BaseModel):
         """
         Update the account status of a user by their unique ID.
 
+        Leaving the active status revokes the tokens issued to the user so
+        far, so a reactivated account has to log in again.
+
         Args:
             user_id (str): The string representation of the user's ObjectId.
             new_status (AccountStatus): The new account status to set.
@@ -117,6 +118,8 @@ class UserModel(BaseModel):
             {"_id": ObjectId(user_id)},
             {"$set": {"accountStatus": new_status.value}}
         )
+        if result.matched_count and new_status != AccountStatus.ACTIVE:
+            await (await RevokedTokenModel.create_instance(self.db)).revoke_user(user_id)
         return {"matched_count": result.matched_count, "modified_count": result.modified_count}
 
     async def update_user_username_by_id(self, user_id: str, new_username: str) -> dict:
@@ -138,7 +141,8 @@ class UserModel(BaseModel):
 
     async def update_user_hash_password_by_id(self, user_id: str, new_hash: str) -> dict:
         """
-        Update the hashed password of a user by their unique ID.
+        Update the hashed password of a user by their unique ID, revoking
+        the tokens issued with the previous password.
 
         Args:
             user_id (str): The string representation of the user's ObjectId.
@@ -151,67 +155,36 @@ class UserModel(BaseModel):
             {"_id": ObjectId(user_id)},
             {"$set": {"hashPassword": new_hash}}
         )
+        if result.matched_count:
+            await (await RevokedTokenModel.create_instance(self.db)).revoke_user(user_id)
         return {"matched_count": result.matched_count, "modified_count": result.modified_count}
 
     async def delete_user_by_id(self, user_id: str) -> dict:
         """
-        Delete a user document by its unique ID.
+        Delete a user document by its unique ID, together with all related
+        documents (see `UserCascadeModel`).
 
         Args:
             user_id (str): The string representation of the user's ObjectId.
 
         Returns:
-            dict: Contains 'deleted_count' indicating the number of deleted documents.
+            dict: Contains 'deleted_count' and 'related_deleted' (deleted documents per collection).
         """
-        result = await self.collection.delete_one({"_id": ObjectId(user_id)})
-        if result.deleted_count:
-            business_model = await BusinessInfoModel.create_instance(self.db_client)
-            schedule_model = await ScheduleModel.create_instance(self.db_client)
-            recommendation_model = await RecommendationModel.create_instance(self.db_client)
-            notification_model = await NotificationModel.create_instance(self.db_client)
-
-            await business_model.delete_by_user_id(user_id)
-            await schedule_model.delete_by_user_id(user_id)
-            await recommendation_model.delete_recommendations_by_user_id(user_id)
-            await notification_model.delete_notifications_by_user_id(user_id)
-            
-    async def delete_many_by_filter(self, filter: dict) -> dict:
-
-        users = await self.collection.find(filter, {"_id": 1}).to_list(None)
-        user_ids = [u["_id"] for u in users]
-
-        if not user_ids:
-            return {"deleted_count": 0, "related_deleted": {}}
-
-        result = await self.collection.delete_many(filter)
+        return await UserCascadeModel(self.db).delete_users(user_ids=[user_id])
 
-        business_info_model = BusinessInfoModel(self.db_client)
-        schedule_model = ScheduleModel(self.db_client)
-        recommendation_model = RecommendationModel(self.db_client)
-        notification_model = NotificationModel(self.db_client)
-
-        related_deleted = {}
-
-        related_deleted["business_infos"] = (
-            await business_info_model.delete_many_by_filter({"user_id": {"$in": user_ids}})
-        )["deleted_count"]
-
-        related_deleted["schedules"] = (
-            await schedule_model.delete_many_by_filter({"user_id": {"$in": user_ids}})
-        )["deleted_count"]
-
-        related_deleted["recommendations"] = (
-            await recommendation_model.delete_many_by_filter({"user_id": {"$in": user_ids}})
-        )["deleted_count"]
+    async def delete_many_by_filter(self, filter: dict, job=None) -> dict:
+        """
+        Delete the users matching a filter and all their related documents,
+        in chunks with the dependent collections deleted concurrently.
 
-        related_deleted["notifications"] = (
-            await notification_model.delete_many_by_filter({"user_id": {"$in": user_ids}})
-        )["deleted_count"]
+        Args:
+            filter (dict): Filter on the user documents.
+            job (Optional[Job]): Background job receiving the progress.
 
-        return {
-            "deleted_count": result.deleted_count,
-            "related_deleted": related_deleted
-        }
+        Returns:
+            dict: Contains 'deleted_count' and 'related_deleted' (deleted documents per collection).
+        """
+        return await UserCascadeModel(self.db).delete_users(user_filter=filter, job=job)
 
 
     # ---------------- Utility ---------------- #
@@ -257,6 +230,22 @@ class UserModel(BaseModel):
         results = await cursor.to_list(length=page_size)
         return [User(**doc) for doc in results]
     
+    async def iter_user_ids(self, filter: dict = None, batch_size: int = 1000) -> AsyncIterator[str]:
+        """
+        Stream the IDs of the users matching a filter, reading only `_id`
+        in cursor batches of `batch_size` (no full list in memory).
+
+        Args:
+            filter (dict, optional): Filter on the user documents (default: all users).
+            batch_size (int, optional): Documents fetched per round trip.
+
+        Yields:
+            str: User IDs.
+        """
+        cursor = self.collection.find(filter or {}, {"_id": 1}).batch_size(batch_size)
+        async for doc in cursor:
+            yield str(doc["_id"])
+
     async def count_users_by_filter(self, filter: dict = None) -> int:
         """
         Count the number of users in the collection matching a filter.
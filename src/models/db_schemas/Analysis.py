@@ -1,4 +1,4 @@
-from typing import Optional, Annotated
+from typing import Optional, Annotated, Any, Dict, List
 from pydantic import BaseModel, Field, ConfigDict, BeforeValidator
 from datetime import datetime, timezone
 from bson.objectid import ObjectId
@@ -28,6 +28,12 @@ class Analysis(BaseModel):
 
     user_id: PyObjectId
 
+    # Computed interaction analyses: sentiment distributions and TF-IDF topics
+    page_id: Optional[str] = None
+    sentiment_breakdown: Optional[Dict[str, Any]] = None
+    topics: Optional[List[str]] = None
+    post_breakdown: Optional[List[Dict[str, Any]]] = None
+
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
         populate_by_name=True,
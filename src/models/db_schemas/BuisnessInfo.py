@@ -79,4 +79,20 @@ class BuisnessInfo(BaseModel):
                 "unique": True,
                 "sparse": True,
             },
+            {
+                "key": [("field", 1)],
+                "name": "field_index",
+                "unique": False,
+            },
+            {
+                "key": [("businessKeyWordsNormalized", 1), ("_id", 1)],
+                "name": "keywords_index",
+                "unique": False,
+            },
+            {
+                "key": [("businessName", "text"), ("businessKeyWords", "text"), ("description", "text")],
+                "name": "business_text_index",
+                "unique": False,
+                "options": {"weights": {"businessName": 10, "businessKeyWords": 5, "description": 1}},
+            },
         ]
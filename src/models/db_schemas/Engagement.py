@@ -0,0 +1,95 @@
+from typing import Optional, Annotated
+from pydantic import BaseModel, Field, ConfigDict, BeforeValidator
+from datetime import datetime, timezone
+
+from ..enums.AnalysisEnums import RollupGranularity
+
+PyObjectId = Annotated[str, BeforeValidator(str)]
+
+
+class EngagementMeta(BaseModel):
+    """Series identity of a snapshot (stored in the time-series `metaField`)."""
+    page_id: str
+    post_id: Optional[str] = Field(
+        None,
+        description="Post the counters belong to, or None for a page-level snapshot."
+    )
+
+
+class EngagementSnapshot(BaseModel):
+    """A point-in-time reading of the engagement counters of a page or a post."""
+
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    meta: EngagementMeta
+
+    reactions: int = Field(default=0, ge=0)
+    comments: int = Field(default=0, ge=0)
+    shares: int = Field(default=0, ge=0)
+    messages: int = Field(default=0, ge=0)
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        json_schema_extra={
+            "example": {
+                "timestamp": "2025-10-24T12:00:00Z",
+                "meta": {"page_id": "123456789", "post_id": "123456789_987654321"},
+                "reactions": 120,
+                "comments": 14,
+                "shares": 3,
+                "messages": 0,
+            }
+        }
+    )
+
+    @classmethod
+    def get_timeseries_options(cls):
+        return {"timeField": "timestamp", "metaField": "meta", "granularity": "hours"}
+
+    @classmethod
+    def get_indexes(cls):
+        return [
+            {"key": [("meta.page_id", 1), ("meta.post_id", 1), ("timestamp", -1)], "name": "series_index", "unique": False},
+        ]
+
+
+class EngagementRollup(BaseModel):
+    """
+    Pre-aggregated engagement counters for one series over one time bucket.
+
+    Counters hold the last value observed inside the bucket, so charting a
+    range of buckets gives the evolution of the totals over time.
+    """
+
+    page_id: str
+    post_id: Optional[str] = None
+    granularity: RollupGranularity
+    bucket: datetime
+
+    reactions: int = 0
+    comments: int = 0
+    shares: int = 0
+    messages: int = 0
+    samples: int = Field(default=0, description="Number of raw snapshots folded into the bucket.")
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        json_schema_extra={
+            "example": {
+                "page_id": "123456789",
+                "post_id": None,
+                "granularity": "day",
+                "bucket": "2025-10-24T00:00:00Z",
+                "reactions": 1520,
+                "comments": 210,
+                "shares": 37,
+                "messages": 64,
+                "samples": 24,
+            }
+        }
+    )
+
+    @classmethod
+    def get_indexes(cls):
+        return [
+            {"key": [("page_id", 1), ("post_id", 1), ("bucket", 1)], "name": "series_bucket_index", "unique": False},
+        ]
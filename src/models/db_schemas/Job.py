@@ -0,0 +1,46 @@
+from typing import Any, Dict, Optional, Annotated
+from pydantic import BaseModel, Field, ConfigDict, BeforeValidator
+from datetime import datetime, timezone
+from src.models.enums.JobEnums import JobStatus
+
+PyObjectId = Annotated[str, BeforeValidator(str)]
+
+class JobRecord(BaseModel):
+    """
+    A background job run by a `JobRunner`.
+
+    `dedupKey` is only set while the job is pending or running, so an
+    identical job submitted meanwhile collides on its unique index.
+    `leaseOwner` is the worker running the job until `leaseExpiresAt`; a job
+    whose lease expired (its worker crashed) is claimed again. Finished jobs
+    are removed by a TTL index at `expiresAt`.
+    """
+    id: Optional[PyObjectId] = Field(None, alias="_id")
+    kind: str
+    status: JobStatus = JobStatus.PENDING
+    params: Dict[str, Any] = {}
+    dedupKey: Optional[str] = None
+    total: Optional[int] = None
+    processed: int = 0
+    result: Dict[str, Any] = {}
+    error: Optional[str] = None
+    attempts: int = 0
+    leaseOwner: Optional[str] = None
+    leaseExpiresAt: Optional[datetime] = None
+    createdAt: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    startedAt: Optional[datetime] = None
+    finishedAt: Optional[datetime] = None
+    expiresAt: Optional[datetime] = None
+
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+    @classmethod
+    def get_indexes(cls):
+        return [
+            {"key": [("status", 1), ("createdAt", 1)], "name": "status_createdAt_index", "unique": False},
+            {"key": [("status", 1), ("leaseExpiresAt", 1)], "name": "status_leaseExpiresAt_index", "unique": False},
+            {"key": [("dedupKey", 1)], "name": "dedupKey_unique_index", "unique": True,
+             "options": {"sparse": True}},
+            {"key": [("expiresAt", 1)], "name": "expiresAt_ttl_index", "unique": False,
+             "options": {"expireAfterSeconds": 0}},
+        ]
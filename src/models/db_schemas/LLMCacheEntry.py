@@ -0,0 +1,19 @@
+from typing import Any, Dict
+from pydantic import BaseModel, Field, ConfigDict
+from datetime import datetime, timezone
+
+class LLMCacheEntry(BaseModel):
+    """A cached LLM response (`LLMResult` fields) stored under its content hash."""
+    key: str = Field(..., alias="_id")
+    result: Dict[str, Any]
+    createdAt: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    expiresAt: datetime
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @classmethod
+    def get_indexes(cls):
+        return [
+            {"key": [("expiresAt", 1)], "name": "expiresAt_ttl_index", "unique": False,
+             "options": {"expireAfterSeconds": 0}},
+        ]
@@ -32,4 +32,6 @@ class Notification(BaseModel):
         return [
             {"key": [("user_id", 1)], "name": "user_index", "unique": False},
             {"key": [("createdAt", -1)], "name": "createdAt", "unique": False},
+            {"key": [("user_id", 1), ("seen", 1)], "name": "user_seen_index", "unique": False},
+            {"key": [("user_id", 1), ("createdAt", -1)], "name": "user_createdAt_index", "unique": False},
         ]
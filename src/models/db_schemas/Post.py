@@ -30,6 +30,10 @@ class Post(BaseModel):
     )
 
     user_id: PyObjectId
+
+    # Set on drafts stored although a previous post of the user is nearly identical
+    duplicateOf: Optional[PyObjectId] = None
+    similarity: Optional[float] = Field(None, ge=-1.0, le=1.0)
     
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
@@ -59,5 +63,15 @@ class Post(BaseModel):
                 "name": "post_index",
                 "unique": False,
             },
+            {
+                "key": [("user_id", 1), ("status", 1)],
+                "name": "user_status_index",
+                "unique": False,
+            },
+            {
+                "key": [("status", 1), ("createdAt", 1)],
+                "name": "status_createdAt_index",
+                "unique": False,
+            },
         ]
     
\ No newline at end of file
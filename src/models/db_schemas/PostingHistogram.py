@@ -0,0 +1,43 @@
+from typing import Optional, List, Annotated
+from pydantic import BaseModel, Field, ConfigDict, BeforeValidator
+from datetime import datetime, timezone
+
+PyObjectId = Annotated[str, BeforeValidator(str)]
+
+HOURS_PER_WEEK = 7 * 24
+
+
+def _empty_week() -> List[float]:
+    return [0.0] * HOURS_PER_WEEK
+
+
+class PostingHistogram(BaseModel):
+    """
+    Cached weekday x hour activity histograms of a Facebook Page.
+
+    Each histogram is a flat list of 168 slots (weekday * 24 + hour, UTC,
+    Monday first). The watermarks record the newest post and message already
+    binned, so refreshes only fetch and add what was published after them.
+    """
+
+    id: Optional[PyObjectId] = Field(None, alias="_id")
+    page_id: str
+
+    engagement: List[float] = Field(default_factory=_empty_week, description="Reactions + comments of posts per slot.")
+    posts: List[float] = Field(default_factory=_empty_week, description="Number of posts published per slot.")
+    messages: List[float] = Field(default_factory=_empty_week, description="Number of Messenger messages per slot.")
+
+    posts_until: Optional[datetime] = None
+    messages_until: Optional[datetime] = None
+    updatedAt: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True,
+        populate_by_name=True,
+    )
+
+    @classmethod
+    def get_indexes(cls):
+        return [
+            {"key": [("page_id", 1)], "name": "page_index", "unique": True},
+        ]
@@ -0,0 +1,27 @@
+from typing import Optional, Annotated
+from pydantic import BaseModel, Field, ConfigDict, BeforeValidator
+from datetime import datetime, timezone
+
+PyObjectId = Annotated[str, BeforeValidator(str)]
+
+class RevokedToken(BaseModel):
+    """
+    A revoked access token (`token_digest`, on logout) or all the tokens of a
+    user issued before `revokedAt` (`user_id`, on status or password change).
+    Removed by a TTL index once the revoked tokens have expired anyway.
+    """
+    id: Optional[PyObjectId] = Field(None, alias="_id")
+    token_digest: Optional[str] = None
+    user_id: Optional[PyObjectId] = None
+    revokedAt: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    expiresAt: datetime
+
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+    @classmethod
+    def get_indexes(cls):
+        return [
+            {"key": [("revokedAt", 1)], "name": "revokedAt_index", "unique": False},
+            {"key": [("expiresAt", 1)], "name": "expiresAt_ttl_index", "unique": False,
+             "options": {"expireAfterSeconds": 0}},
+        ]
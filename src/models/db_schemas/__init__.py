@@ -2,4 +2,8 @@ from .BuisnessInfo import BuisnessInfo, BusinessResource
 from  .Notification import Notification
 from .Recommendation import Recommendation
 from .Schedule import InteractionAnalysisDate, ScheduledCompetitorAnalysis, ScheduledPost, Schedule
-from .User import User
\ No newline at end of file
+from .User import User
+from .Engagement import EngagementMeta, EngagementSnapshot, EngagementRollup
+from .RevokedToken import RevokedToken
+from .LLMCacheEntry import LLMCacheEntry
+from .Job import JobRecord
@@ -3,4 +3,8 @@ from enum import Enum
 
 class AnlaysisType(str, Enum):
     INTERACTION_ANALYSIS = "interaction analysis"
-    COMPETITOR_ANALYSIS="Competitor analysis"
\ No newline at end of file
+    COMPETITOR_ANALYSIS="Competitor analysis"
+
+class RollupGranularity(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
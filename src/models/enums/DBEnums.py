@@ -8,3 +8,10 @@ class DBEnums(str, Enum):
     COLLECTION_NOTIFICATION_NAME= "NOTIFICATION"
     COLLECTION_POST_NAME= "POSTS"
     COLLECTION_ANALYTICS_NAME= "ANALYTICS"
+    COLLECTION_ENGAGEMENT_NAME = "ENGAGEMENT"
+    COLLECTION_ENGAGEMENT_HOURLY_NAME = "ENGAGEMENT_HOURLY"
+    COLLECTION_ENGAGEMENT_DAILY_NAME = "ENGAGEMENT_DAILY"
+    COLLECTION_POSTING_HISTOGRAM_NAME = "POSTING_HISTOGRAM"
+    COLLECTION_REVOKED_TOKEN_NAME = "REVOKED_TOKENS"
+    COLLECTION_LLM_CACHE_NAME = "LLM_CACHE"
+    COLLECTION_JOB_NAME = "JOBS"
@@ -15,8 +15,13 @@ class ResponseSignal(Enum):
     REJECTED_POST_NOT_FOUND= "No rejected posts found"
 
     INVALID_USER_ID ="Invalid user_id format"
+    USER_NOT_FOUND = "User not found"
     FAILED_TO_MARK_AS_READ = "Failed to mark notification as read"
     NOTIFICATION_NOT_FOUND = "Notification not found."
+    INVALID_NOTIFICATION_ID = "Invalid notification_id format"
+    JOB_NOT_FOUND = "Job not found"
+    UNKNOWN_JOB_KIND = "Unknown job kind"
+    LLM_PROVIDER_NOT_CONFIGURED = "LLM provider not configured"
     
     ERROR_USER_IS_ALREADY_EXIST = "error user is already exist"
     USER_REGISTERED_SUCCESSFULLY= "User registered successfully"
@@ -24,9 +29,17 @@ class ResponseSignal(Enum):
     RECOMMENDATION_NOT_FOUND = "Recommendation not found"
     COMPETITOR_ANALYSIS_NOT_FOUND = "Competitor analysis not found"
     INTERACTION_ANALYSIS_NOT_FOUND = "Interaction analysis not found"
+    ENGAGEMENT_HISTORY_NOT_FOUND = "Engagement history not found"
 
     BUSINESS_INFO_CREATED = "Business Info created successfully"
     BUSINESS_INFO_UPDATED = "Business Info updated successfully"
     BUSINESS_INFO_NOT_FOUND = "Business Info not found"
     BUSINESS_INFO_ALREADY_EXISTS = "Business Info already exists"
+    FACEBOOK_PAGE_ALREADY_LINKED = "Facebook Page already linked to another business"
     FACEBOOK_CREDENTIALS_UPDATED = "Facebook credentials updated successfully"
+    INVALID_CURSOR = "Invalid pagination cursor"
+
+    ADMIN_API_DISABLED = "Admin API is disabled"
+    INVALID_ADMIN_KEY = "Invalid admin key"
+    SETTINGS_RELOADED = "Settings reloaded successfully"
+    RETENTION_DISABLED = "No retention policy is enabled"
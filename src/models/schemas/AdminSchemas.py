@@ -0,0 +1,20 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from src.models.enums.UserEnums import AccountStatus
+
+
+class UserPurgeRequest(BaseModel):
+    account_status: Optional[AccountStatus] = Field(None, description="delete the users with this account status")
+    user_ids: Optional[List[str]] = Field(None, description="delete these users (instead of the status filter)")
+    use_transaction: bool = Field(False, description="delete each batch in a transaction (replica sets only)")
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if not self.account_status and not self.user_ids:
+            raise ValueError("account_status or user_ids is required")
+        return self
+
+
+class UserDeleteResponse(BaseModel):
+    deleted_count: int
+    related_deleted: dict
@@ -0,0 +1,22 @@
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from src.models.db_schemas.BuisnessInfo import PyObjectId
+
+
+class BusinessSearchResult(BaseModel):
+    """Public fields of a business matched by a search (no page token)."""
+    id: PyObjectId = Field(..., alias="_id")
+    user_id: PyObjectId
+    businessName: str
+    field: str
+    description: str
+    businessKeyWords: List[str] = []
+    facebook_page_id: Optional[str] = None
+    score: Optional[float] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BusinessSearchResponse(BaseModel):
+    items: List[BusinessSearchResult]
+    next_cursor: Optional[str] = None
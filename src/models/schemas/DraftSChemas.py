@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel, Field
 from src.models.enums.PostEnums import PostStatus
 
@@ -32,3 +33,13 @@ class CreatePostRequest(BaseModel):
 class EditPostRequest(BaseModel):
     new_title: str = Field(..., min_length=3, max_length=100)
     new_content: str = Field(..., min_length=100)
+
+class GenerateDraftsRequest(BaseModel):
+    user_id: str
+    count: int = Field(
+        5,
+        ge=1,
+        le=100,
+        description="Number of drafts, spread over the upcoming posts of the user's schedule."
+    )
+    provider: Optional[str] = Field(None, description="LLM provider, the configured one by default.")
@@ -2,10 +2,20 @@ from pydantic import BaseModel
 from typing import Optional, List
 
 
+class PostInteractionBreakdown(BaseModel):
+    post_id: str
+    comments: int
+    sentiment: dict
+    topics: List[str] = []
+
+
 class InteractionResponse(BaseModel):
     page_id: str
     analyzed_at: str
     total_posts: int
     total_comments: int
     total_messages: int
-    sentiment_breakdown: dict
\ No newline at end of file
+    sentiment_breakdown: dict
+    topics: List[str] = []
+    posts: List[PostInteractionBreakdown] = []
+    analysis_id: Optional[str] = None
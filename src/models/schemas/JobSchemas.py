@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+from src.models.enums.JobEnums import JobStatus
+
+
+class JobRequest(BaseModel):
+    kind: str = Field(..., description="job type, e.g. interaction_analysis or draft_generation")
+    params: Dict[str, Any] = Field(default_factory=dict, description="parameters of the job type")
+
+
+class PageJobParams(BaseModel):
+    page_id: str = Field(..., min_length=1, description="Facebook Page ID")
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: JobStatus
+    params: Dict[str, Any] = {}
+    total: Optional[int] = None
+    processed: int = 0
+    result: Dict[str, Any] = {}
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
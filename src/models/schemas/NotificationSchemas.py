@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+from src.models.enums.UserEnums import AccountStatus
 class SendNotificationRequest(BaseModel):
     user_id: str
 
@@ -9,3 +11,35 @@ class SendNotificationRequest(BaseModel):
 class MarkReadResponse(BaseModel):
     notification_id: str
     modified_count: int
+
+class MarkManySeenRequest(BaseModel):
+    notification_ids: List[str] = Field(..., min_length=1, max_length=500)
+
+class BulkMarkSeenResponse(BaseModel):
+    user_id: str
+    matched_count: int
+    modified_count: int
+    unread_count: int
+
+class BroadcastTarget(BaseModel):
+    kind: Literal["all", "field", "users"] = Field(..., description="all users, users by business field, or explicit user ids")
+    account_status: Optional[AccountStatus] = Field(None, description="with kind=all: only users with this status")
+    field: Optional[str] = Field(None, description="with kind=field: business field of the recipients")
+    user_ids: Optional[List[str]] = Field(None, description="with kind=users: the recipients")
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if self.kind == "field" and not self.field:
+            raise ValueError("field is required when kind is 'field'")
+        if self.kind == "users" and not self.user_ids:
+            raise ValueError("user_ids is required when kind is 'users'")
+        return self
+
+class BroadcastRequest(BaseModel):
+    title: str = Field(..., min_length= 10, max_length=100)
+    content: str = Field(..., min_length=10)
+    target: BroadcastTarget
+
+class UnreadCountResponse(BaseModel):
+    user_id: str
+    unread_count: int
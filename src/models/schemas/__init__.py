@@ -1,3 +1,3 @@
 from .CompetitorSummary import CompetitorSummary
 from .CompetitorRequest import CompetitorRequest
-from .InteractionsResponse import InteractionResponse
\ No newline at end of file
+from .InteractionsResponse import InteractionResponse, PostInteractionBreakdown
\ No newline at end of file
@@ -0,0 +1,179 @@
+import secrets
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, status, Depends, HTTPException, Header, Request
+from bson import ObjectId
+from pydantic import ValidationError
+from src.helpers.config import get_Settings, reload_Settings, Settings
+from src.helpers.jobs import Job, job_handler
+from src.helpers.retention import Archiver, archive_policies
+from src.models.BuisnessInfoModel import BusinessInfoModel
+from src.models.UserCascadeModel import UserCascadeModel
+from src.models.enums.ResponseSignal import ResponseSignal
+from src.models.schemas.AdminSchemas import UserPurgeRequest, UserDeleteResponse
+from src.models.schemas.JobSchemas import JobResponse
+
+admin_router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+async def require_admin_key(
+    admin_key: Optional[str] = Header(None, alias="X-Admin-Key"),
+    settings: Settings = Depends(get_Settings),
+) -> None:
+    """Dependency allowing the request only with the configured ADMIN_API_KEY."""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=ResponseSignal.ADMIN_API_DISABLED.value)
+    if not admin_key or not secrets.compare_digest(admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=ResponseSignal.INVALID_ADMIN_KEY.value)
+
+
+@admin_router.post("/settings/reload", status_code=status.HTTP_200_OK, dependencies=[Depends(require_admin_key)])
+async def reload_settings():
+    """
+    Re-read env and `src/.env` and swap the settings snapshot used by new requests.
+
+    The same reload is triggered by sending SIGHUP to the server process.
+
+    Returns:
+        dict: Confirmation with the application name and version now in effect.
+
+    Raises:
+        HTTPException: 422 if the new configuration is invalid (the current one is kept).
+    """
+    try:
+        settings = reload_Settings()
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=[{"loc": err["loc"], "msg": err["msg"]} for err in e.errors()])
+
+    return {
+        "message": ResponseSignal.SETTINGS_RELOADED.value,
+        "app_name": settings.APP_NAME,
+        "app_version": settings.APP_VERSION,
+    }
+
+
+@admin_router.post(
+    "/retention/run",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_admin_key)],
+)
+async def run_retention(request: Request, settings: Settings = Depends(get_Settings)) -> JobResponse:
+    """
+    Archive the expired rejected drafts, analyses and recommendations to
+    compressed files under ARCHIVE_DIR and delete them, as a background job.
+    Meant to be called periodically (e.g. by cron) on one worker.
+
+    Returns:
+        JobResponse: The pending job; poll `GET /admin/jobs/{job_id}` for its progress.
+
+    Raises:
+        HTTPException: 409 if every archiving retention is disabled.
+    """
+    if not archive_policies(settings):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=ResponseSignal.RETENTION_DISABLED.value)
+
+    job = await request.app.container.jobs.submit("retention_archive")
+    return JobResponse(**job.to_dict())
+
+
+@job_handler("retention_archive", admin=True)
+async def run_retention_job(container, job: Job, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Job body of `POST /admin/retention/run`, with the policies in effect when it starts."""
+    settings = get_Settings()
+    archiver = Archiver(
+        container.db_client, settings.ARCHIVE_DIR, batch_size=settings.ARCHIVE_BATCH_SIZE, fmt=settings.ARCHIVE_FORMAT
+    )
+    return await archiver.run(archive_policies(settings), job)
+
+
+@admin_router.post(
+    "/business-info/reindex-keywords",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_admin_key)],
+)
+async def reindex_business_keywords(request: Request) -> JobResponse:
+    """
+    Compute the normalized search keywords of business infos written before
+    keyword search existed, as a background job. Safe to run again.
+
+    Returns:
+        JobResponse: The pending job; poll `GET /admin/jobs/{job_id}` for its progress.
+    """
+    job = await request.app.container.jobs.submit("business_keywords_backfill")
+    return JobResponse(**job.to_dict())
+
+
+@job_handler("business_keywords_backfill", admin=True)
+async def run_keywords_backfill_job(container, job: Job, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Job body of `POST /admin/business-info/reindex-keywords`."""
+    model = await BusinessInfoModel.create_instance(container.db_client)
+    return await model.backfill_normalized_keywords(job=job)
+
+
+@admin_router.delete(
+    "/users/{user_id}",
+    response_model=UserDeleteResponse,
+    dependencies=[Depends(require_admin_key)],
+)
+async def delete_user(user_id: str, request: Request) -> UserDeleteResponse:
+    """
+    Delete a user and everything that belongs to them (business info, schedule,
+    recommendations, notifications, posts, analyses and page metrics).
+
+    Raises:
+        HTTPException: 400 if the ID is malformed, 404 if the user does not exist.
+    """
+    if not ObjectId.is_valid(user_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ResponseSignal.INVALID_USER_ID.value)
+
+    result = await UserCascadeModel(request.app.db_client).delete_users(user_ids=[user_id])
+    if not result["deleted_count"]:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=ResponseSignal.USER_NOT_FOUND.value)
+    return UserDeleteResponse(**result)
+
+
+@admin_router.post(
+    "/users/purge",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_admin_key)],
+)
+async def purge_users(req: UserPurgeRequest, request: Request) -> JobResponse:
+    """
+    Delete many users (by account status or IDs) and their related documents
+    as a background job, in batches of 500 users.
+
+    Returns:
+        JobResponse: The pending job; poll `GET /admin/jobs/{job_id}` for its progress.
+
+    Raises:
+        HTTPException: 400 if a user ID is malformed.
+    """
+    if req.user_ids and not all(ObjectId.is_valid(user_id) for user_id in req.user_ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ResponseSignal.INVALID_USER_ID.value)
+
+    job = await request.app.container.jobs.submit("user_purge", req.model_dump(mode="json", exclude_none=True))
+    return JobResponse(**job.to_dict())
+
+
+@job_handler("user_purge", UserPurgeRequest, admin=True)
+async def run_user_purge_job(container, job: Job, req: UserPurgeRequest) -> Dict[str, Any]:
+    """Job body of `POST /admin/users/purge`."""
+    cascade = UserCascadeModel(container.db_client, use_transaction=req.use_transaction)
+    user_filter = {"accountStatus": req.account_status.value} if req.account_status else None
+    return await cascade.delete_users(user_filter=user_filter, user_ids=req.user_ids, job=job)
+
+
+@admin_router.get("/jobs/{job_id}", response_model=JobResponse, dependencies=[Depends(require_admin_key)])
+async def get_job(job_id: str, request: Request) -> JobResponse:
+    """
+    Return the status and progress of a background job of any kind.
+
+    Raises:
+        HTTPException: 404 if the job is unknown or expired.
+    """
+    job = await request.app.container.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=ResponseSignal.JOB_NOT_FOUND.value)
+    return JobResponse(**job.to_dict())
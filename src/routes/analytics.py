@@ -1,13 +1,25 @@
 # -----------------------------------
 # Analytics Routes
 # -----------------------------------
-from fastapi import APIRouter, status, Depends, HTTPException, Request, Path
-from typing import List
+from fastapi import APIRouter, status, Depends, HTTPException, Request, Path, Query
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
 from src.models.db_schemas.Recommendation import Recommendation
 from src.models.db_schemas.Analysis import Analysis
+from src.models.db_schemas.Engagement import EngagementRollup
+from src.models.schemas.JobSchemas import JobResponse, PageJobParams
+from src.agents.AnalyzerAgent import AnalyzerAgent
+from src.agents.RecommenderAgent import RecommenderAgent
+from src.helpers.config import get_Settings, Settings
+from src.helpers.jobs import Job, job_handler
+from src.models.BuisnessInfoModel import BusinessInfoModel
 from src.models.RecommendationModel import RecommendationModel
 from src.models.AnalysisModel import AnalysisModel
+from src.models.EngagementModel import EngagementModel
+from src.models.enums.AnalysisEnums import RollupGranularity
 from src.models.enums.ResponseSignal import ResponseSignal
+from src.controllers.facebook import FacebookController
+from src.routes.facebook import get_token_from_db
 
 
 # -----------------------------------
@@ -50,6 +62,56 @@ async def get_analysis_model(request: Request) -> AnalysisModel:
     return await AnalysisModel.create_instance(db_client)
 
 
+def build_analyzer_agent(container, settings: Settings) -> AnalyzerAgent:
+    """
+    Build an `AnalyzerAgent` scoring on the container's thread and process pools.
+
+    Args:
+        container (AppContainer): The application container.
+        settings (Settings): The settings in effect.
+
+    Returns:
+        AnalyzerAgent: The configured comment and message analyzer.
+    """
+    return AnalyzerAgent(
+        executor=container.executor,
+        process_pool=container.process_pool,
+        batch_size=settings.ANALYSIS_BATCH_SIZE,
+        process_min_texts=settings.ANALYSIS_PROCESS_MIN_TEXTS,
+    )
+
+
+async def get_page_business_info(db_client, page_id: str):
+    """
+    Return the business info linked to a page.
+
+    Raises:
+        HTTPException: 404 if no business info is linked to the page.
+    """
+    business_model = await BusinessInfoModel.create_instance(db_client)
+    business_info = await business_model.get_by_page_id(page_id)
+    if business_info is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ResponseSignal.BUSINESS_INFO_NOT_FOUND.value
+        )
+    return business_info
+
+
+async def get_engagement_model(request: Request) -> EngagementModel:
+    """
+    Retrieve an `EngagementModel` instance for database operations.
+
+    Args:
+        request (Request): The incoming FastAPI request object.
+
+    Returns:
+        EngagementModel: An initialized EngagementModel instance connected to the database.
+    """
+    db_client = request.app.db_client
+    return await EngagementModel.create_instance(db_client)
+
+
 # -----------------------------------
 # Recommendation Endpoints
 # -----------------------------------
@@ -104,6 +166,68 @@ async def get_recommendations(
     return recs
 
 
+@analytics_router.post(
+    "/pages/{page_id}/recommendations/generate",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def generate_recommendations(request: Request, page_id: str) -> JobResponse:
+    """
+    Generate recommendations for a page owner from the analysis of the page
+    interactions and of its competitors, as a background job. The two
+    analyses run concurrently and are reused while fresh; the recommendations
+    are stored for the owner.
+
+    Args:
+        page_id: The Facebook Page ID.
+
+    Returns:
+        JobResponse: The pending job; poll `GET /analytics/recommendations/generate/{job_id}`
+        for its progress. Its result lists the stored recommendations.
+
+    Raises:
+        HTTPException: 404 if no business info is linked to the page.
+    """
+    await get_page_business_info(request.app.db_client, page_id)
+    await get_token_from_db(page_id, request.app.db_client)
+
+    job = await request.app.container.jobs.submit("recommendation_generation", {"page_id": page_id})
+    return JobResponse(**job.to_dict())
+
+
+@job_handler("recommendation_generation", PageJobParams)
+async def run_recommendation_job(container, job: Job, params: PageJobParams) -> Dict[str, Any]:
+    """Job body of `POST /analytics/pages/{page_id}/recommendations/generate`."""
+    business_info = await get_page_business_info(container.db_client, params.page_id)
+    access_token = await get_token_from_db(params.page_id, container.db_client)
+    profile = business_info.model_dump(exclude={"id", "facebook_page_access_token"})
+    analyzer = build_analyzer_agent(container, get_Settings())
+    return await RecommenderAgent(container.llm_client).run(
+        container.db_client, business_info.user_id, params.page_id, access_token, profile, analyzer, job
+    )
+
+
+@analytics_router.get(
+    "/recommendations/generate/{job_id}",
+    response_model=JobResponse,
+    status_code=status.HTTP_200_OK
+)
+async def get_recommendation_job(job_id: str, request: Request) -> JobResponse:
+    """
+    Return the status and progress of a recommendation generation job.
+
+    Raises:
+        HTTPException: 404 if the job is unknown or expired.
+    """
+    job = await request.app.container.jobs.get(job_id)
+    if job is None or job.kind != "recommendation_generation":
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ResponseSignal.JOB_NOT_FOUND.value
+        )
+    return JobResponse(**job.to_dict())
+
+
 # -----------------------------------
 # Analysis Endpoints
 # -----------------------------------
@@ -187,3 +311,134 @@ async def get_interaction_analysis(
             detail=ResponseSignal.INTERACTION_ANALYSIS_NOT_FOUND.value
         )
     return recs
+
+
+@analytics_router.post(
+    "/pages/{page_id}/analysis/interaction",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def run_interaction_analysis(request: Request, page_id: str) -> JobResponse:
+    """
+    Compute the sentiment distribution and top topics of the comments (per
+    post and for the page) and Messenger messages of a page, as a background
+    job. The result is stored as an interaction analysis of the page owner.
+
+    Args:
+        page_id: The Facebook Page ID.
+
+    Returns:
+        JobResponse: The pending job; poll `GET /analytics/analysis/interaction/{job_id}`
+        for its progress. Its result is an `InteractionResponse` without the
+        per-post breakdown, stored in the analysis `analysis_id`.
+
+    Raises:
+        HTTPException: 404 if no business info is linked to the page.
+    """
+    await get_page_business_info(request.app.db_client, page_id)
+    await get_token_from_db(page_id, request.app.db_client)
+
+    job = await request.app.container.jobs.submit("interaction_analysis", {"page_id": page_id})
+    return JobResponse(**job.to_dict())
+
+
+@job_handler("interaction_analysis", PageJobParams)
+async def run_interaction_analysis_job(container, job: Job, params: PageJobParams) -> Dict[str, Any]:
+    """Job body of `POST /analytics/pages/{page_id}/analysis/interaction`."""
+    business_info = await get_page_business_info(container.db_client, params.page_id)
+    access_token = await get_token_from_db(params.page_id, container.db_client)
+    agent = build_analyzer_agent(container, get_Settings())
+    return await agent.run(container.db_client, business_info.user_id, params.page_id, access_token, job)
+
+
+@analytics_router.get(
+    "/analysis/interaction/{job_id}",
+    response_model=JobResponse,
+    status_code=status.HTTP_200_OK
+)
+async def get_interaction_analysis_job(job_id: str, request: Request) -> JobResponse:
+    """
+    Return the status and progress of an interaction analysis job.
+
+    Raises:
+        HTTPException: 404 if the job is unknown or expired.
+    """
+    job = await request.app.container.jobs.get(job_id)
+    if job is None or job.kind != "interaction_analysis":
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ResponseSignal.JOB_NOT_FOUND.value
+        )
+    return JobResponse(**job.to_dict())
+
+
+# -----------------------------------
+# Engagement History Endpoints
+# -----------------------------------
+@analytics_router.post(
+    "/pages/{page_id}/engagement/sync",
+    status_code=status.HTTP_201_CREATED
+)
+async def sync_engagement(
+    request: Request,
+    page_id: str,
+    engagement_model: EngagementModel = Depends(get_engagement_model)
+):
+    """
+    Snapshot the current engagement counters of a page and its posts, then
+    refresh the hourly and daily rollups touched by the new snapshots.
+
+    Args:
+        page_id: The Facebook Page ID.
+
+    Returns:
+        The page ID and the number of recorded snapshots.
+    """
+    access_token = await get_token_from_db(page_id, request.app.db_client)
+
+    snapshots = await FacebookController.collect_engagement_snapshots(page_id, access_token)
+    recorded = await engagement_model.record_snapshots(snapshots)
+    await engagement_model.refresh_rollups(page_id, since=snapshots[0].timestamp)
+
+    return {"page_id": page_id, "snapshots": recorded}
+
+
+@analytics_router.get(
+    "/pages/{page_id}/engagement/{granularity}",
+    response_model=List[EngagementRollup],
+    status_code=status.HTTP_200_OK
+)
+async def get_engagement_history(
+    page_id: str,
+    granularity: RollupGranularity,
+    start: Optional[datetime] = Query(None, description="Start of the range. Defaults to 30 days before `end`."),
+    end: Optional[datetime] = Query(None, description="End of the range. Defaults to now."),
+    post_id: Optional[str] = Query(None, description="Post ID. Omit for page-level counters."),
+    engagement_model: EngagementModel = Depends(get_engagement_model)
+):
+    """
+    Get the engagement history of a page (or one of its posts) from the
+    pre-aggregated hourly or daily rollups.
+
+    Args:
+        page_id: The Facebook Page ID.
+        granularity: `hour` or `day` buckets.
+        start: Inclusive start of the range.
+        end: Exclusive end of the range.
+        post_id: Optional post ID.
+
+    Returns:
+        The rollup buckets in chronological order.
+    """
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=30)
+
+    rollups = await engagement_model.get_rollups(
+        page_id=page_id, granularity=granularity, start=start, end=end, post_id=post_id
+    )
+    if not rollups:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ResponseSignal.ENGAGEMENT_HISTORY_NOT_FOUND.value
+        )
+    return rollups
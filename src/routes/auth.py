@@ -1,6 +1,6 @@
 from fastapi import Depends, status, HTTPException, APIRouter, Request
 from src.models.UserModel import UserModel
-from src.helpers.config import get_Settings
+from src.helpers.config import get_Settings, Settings
 from src.models.db_schemas.User import User
 from src.models.enums.ResponseSignal import ResponseSignal
 from src.models.enums.UserEnums import AccountStatus
@@ -8,7 +8,11 @@ from fastapi.responses import JSONResponse
 import bcrypt
 from datetime import datetime, timedelta
 from fastapi.security import OAuth2PasswordRequestForm
-from src.routes.authentication import create_access_token, get_current_user
+from src.routes.authentication import create_access_token, get_current_user, oauth2_scheme
+from src.routes.authentication.authentication import decode_access_token
+from src.helpers.token_cache import token_digest
+from src.models.RevokedTokenModel import RevokedTokenModel
+from jose import JWTError
 
 auth_router = APIRouter(
     prefix="/auth",
@@ -32,7 +36,9 @@ async def register_user(user_data: UserRegisterRequest, request: Request):
             }
         )
         
-    hashed_password = bcrypt.hashpw(user_data.password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    hashed_password = (await request.app.container.run_blocking(
+        bcrypt.hashpw, user_data.password.encode("utf-8"), bcrypt.gensalt()
+    )).decode("utf-8")
     
     new_user = User(
         username=user_data.username,
@@ -63,7 +69,10 @@ async def login_for_access_token(
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
 
-    if not bcrypt.checkpw(form_data.password.encode("utf-8"), user.hashPassword.encode("utf-8")):
+    password_ok = await request.app.container.run_blocking(
+        bcrypt.checkpw, form_data.password.encode("utf-8"), user.hashPassword.encode("utf-8")
+    )
+    if not password_ok:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
 
     if user.accountStatus != AccountStatus.ACTIVE:
@@ -77,12 +86,27 @@ async def login_for_access_token(
 async def read_current_user(user = Depends(get_current_user)):
     return {"user": str(user.id)}
 
+@auth_router.post("/logout")
+async def logout(request: Request, token: str = Depends(oauth2_scheme)):
+    """
+    Revoke the access token of the request on every worker (within
+    TOKEN_REVOCATION_SYNC_SECONDS for the other workers).
+    """
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise HTTPException(
+            status_code=401, detail="Could not validate credentials", headers={"WWW-Authenticate": "Bearer"}
+        )
+    model = await RevokedTokenModel.create_instance(request.app.db_client)
+    await model.revoke_token(token_digest(token), datetime.utcfromtimestamp(payload["exp"]))
+    return {"detail": "Logged out"}
+
 @auth_router.get("/config")
-async def get_public_config():
+async def get_public_config(settings: Settings = Depends(get_Settings)):
     """
     Returns public configuration required by the frontend.
     """
-    settings = get_Settings()
     return {
         "facebook_app_id": settings.FACEBOOK_APP_ID,
         "api_version": settings.GRAPH_API_VERSION
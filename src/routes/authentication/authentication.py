@@ -1,30 +1,51 @@
-from fastapi import Depends, HTTPException
+import time
+from typing import Any, Dict
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from src.models.UserModel import UserModel
+from src.models.enums.UserEnums import AccountStatus
 from src.helpers.config import get_Settings
-from motor.motor_asyncio import AsyncIOMotorClient
-from functools import lru_cache
-setting_object = get_Settings()
-
-SECRET_KEY = setting_object.SECRET_KEY   
-ALGORITHM = setting_object.ALGORITHM or "HS256"
-ACCESS_TOKEN_EXPIRE_DAYS = setting_object.ACCESS_TOKEN_EXPIRE_DAYS
+from src.helpers.token_cache import get_token_cache, token_digest
 
 # tells FastAPI where the login route is
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 def create_access_token(data: dict):
+    settings = get_Settings()
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    expire = datetime.utcnow() + timedelta(days=settings.ACCESS_TOKEN_EXPIRE_DAYS)
+    # iat with sub-second precision: a token issued right after a user-wide revocation stays valid
+    to_encode.update({"exp": expire, "iat": time.time()})
+    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM or "HS256")
     return encoded_jwt
 
-@lru_cache()
-def get_db_client():
-    return AsyncIOMotorClient(setting_object.MONGODB_URL)
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Return the claims of a valid, unrevoked access token.
+
+    A token is verified (signature, expiry) the first time this worker sees
+    it; its claims are then served from the `TokenCache` until it expires.
+
+    Raises:
+        JWTError: If the token is invalid, expired or revoked.
+    """
+    cache = get_token_cache()
+    digest = token_digest(token)
+    payload = cache.get(digest) if cache is not None else None
+    if payload is None:
+        settings = get_Settings()
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM or "HS256"])
+        if cache is not None:
+            cache.put(digest, payload)
+    if cache is not None and cache.is_revoked(digest, payload):
+        raise JWTError("Token revoked")
+    return payload
+
+def get_db_client(request: Request):
+    """Dependency returning the database of the application container (shared pool)."""
+    return request.app.db_client
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -36,7 +57,7 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
@@ -45,6 +66,6 @@ async def get_current_user(
 
     user_model = await UserModel.create_instance(db_client)
     user = await user_model.get_user_by_id(user_id)
-    if not user:
+    if not user or user.accountStatus != AccountStatus.ACTIVE:
         raise credentials_exception
     return user
@@ -12,7 +12,6 @@ base_router = APIRouter(
 
 @base_router.get("/")
 async def welcome(app_setting: Settings = Depends(get_Settings)):
-    app_setting = get_Settings()
     app_name = app_setting.APP_NAME
     app_version = app_setting.APP_VERSION
     return {
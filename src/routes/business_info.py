@@ -1,8 +1,10 @@
-from fastapi import APIRouter, HTTPException, status, Request, Depends, Body
+from fastapi import APIRouter, HTTPException, status, Request, Depends, Body, Query
 from fastapi.responses import JSONResponse
 from typing import Optional, Dict
+from pymongo.errors import DuplicateKeyError
 from src.models.BuisnessInfoModel import BusinessInfoModel
 from src.models.db_schemas.BuisnessInfo import BuisnessInfo
+from src.models.schemas.BusinessInfoSchemas import BusinessSearchResponse
 from src.models.enums.ResponseSignal import ResponseSignal
 from src.helpers.encryption import EncryptionService
 
@@ -80,19 +82,22 @@ async def create_business_info(
 
     Raises:
         HTTPException: If business info already exists (400).
+        HTTPException: If the Facebook Page is linked to another business (409).
     """
-    if await model.exists_for_user(str(business_info.user_id)):
+    if business_info.facebook_page_access_token:
+        business_info.facebook_page_access_token = EncryptionService.encrypt(business_info.facebook_page_access_token)
+
+    try:
+        inserted_id = await model.create_business_info(business_info)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=ResponseSignal.FACEBOOK_PAGE_ALREADY_LINKED.value)
+    if inserted_id is None:
          return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={
                 "signal": ResponseSignal.BUSINESS_INFO_ALREADY_EXISTS.value
             }
         )
-
-    if business_info.facebook_page_access_token:
-        business_info.facebook_page_access_token = EncryptionService.encrypt(business_info.facebook_page_access_token)
-
-    inserted_id = await model.create_business_info(business_info)
     
     return JSONResponse(
         status_code=status.HTTP_201_CREATED,
@@ -121,10 +126,10 @@ async def update_business_info(
         model (BusinessInfoModel): The database model dependency.
 
     Returns:
-        JSONResponse: A response containing the success signal.
+        JSONResponse: The success signal; 201 with the new ID when the user had no business info yet.
 
     Raises:
-        HTTPException: If Business Info is not found (404).
+        HTTPException: If the Facebook Page is linked to another business (409).
     """
     # Ensure the body matches the path user_id for consistency
     business_info.user_id = user_id
@@ -132,13 +137,17 @@ async def update_business_info(
     if business_info.facebook_page_access_token:
         business_info.facebook_page_access_token = EncryptionService.encrypt(business_info.facebook_page_access_token)
     
-    result = await model.replace_business_info(user_id, business_info)
+    try:
+        result = await model.replace_business_info(user_id, business_info)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=ResponseSignal.FACEBOOK_PAGE_ALREADY_LINKED.value)
     
-    if result["matched_count"] == 0:
+    if result["upserted_id"] is not None:
          return JSONResponse(
-            status_code=status.HTTP_404_NOT_FOUND,
+            status_code=status.HTTP_201_CREATED,
             content={
-                "signal": ResponseSignal.BUSINESS_INFO_NOT_FOUND.value
+                "signal": ResponseSignal.BUSINESS_INFO_CREATED.value,
+                "id": str(result["upserted_id"])
             }
         )
          
@@ -176,21 +185,20 @@ async def update_facebook_token(
     Raises:
         HTTPException: If Business Info is not found (404).
     """
-    if not await model.exists_for_user(user_id):
-        return JSONResponse(
-            status_code=status.HTTP_404_NOT_FOUND,
-            content={
-                "signal": ResponseSignal.BUSINESS_INFO_NOT_FOUND.value
-            }
-        )
-        
-    await model.update_business_info(
+    result = await model.update_business_info(
         user_id,
         {
             "facebook_page_id": page_id,
             "facebook_page_access_token": EncryptionService.encrypt(token)
         }
     )
+    if result["matched_count"] == 0:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.BUSINESS_INFO_NOT_FOUND.value
+            }
+        )
     
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -198,3 +206,72 @@ async def update_facebook_token(
             "signal": ResponseSignal.FACEBOOK_CREDENTIALS_UPDATED.value
         }
     )
+
+
+@business_info_router.get(
+    "/search/keywords",
+    response_model=BusinessSearchResponse,
+    status_code=status.HTTP_200_OK
+)
+async def search_business_keywords(
+    keyword: str = Query(..., min_length=1, max_length=100),
+    prefix: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    model: BusinessInfoModel = Depends(get_business_model)
+):
+    """
+    Find businesses by keyword (case-insensitive), or by keyword prefix.
+
+    Args:
+        keyword (str): Keyword, or its beginning with `prefix=true`.
+        prefix (bool): Match keywords starting with `keyword`.
+        cursor (Optional[str]): `next_cursor` of the previous page.
+        limit (int): Page size (1-100).
+        model (BusinessInfoModel): The database model dependency.
+
+    Returns:
+        BusinessSearchResponse: The page of businesses and the cursor of the next one (null on the last page).
+
+    Raises:
+        HTTPException: If the cursor is invalid (400).
+    """
+    try:
+        items, next_cursor = await model.search_keywords(keyword, prefix=prefix, after=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ResponseSignal.INVALID_CURSOR.value)
+    return BusinessSearchResponse(items=items, next_cursor=next_cursor)
+
+
+@business_info_router.get(
+    "/search",
+    response_model=BusinessSearchResponse,
+    status_code=status.HTTP_200_OK
+)
+async def search_business_text(
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    model: BusinessInfoModel = Depends(get_business_model)
+):
+    """
+    Full-text search over business names, keywords and descriptions, most
+    relevant first.
+
+    Args:
+        q (str): Search terms.
+        cursor (Optional[str]): `next_cursor` of the previous page.
+        limit (int): Page size (1-100).
+        model (BusinessInfoModel): The database model dependency.
+
+    Returns:
+        BusinessSearchResponse: The page of businesses (with their relevance score) and the next cursor.
+
+    Raises:
+        HTTPException: If the cursor is invalid (400).
+    """
+    try:
+        items, next_cursor = await model.search_text(q, after=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ResponseSignal.INVALID_CURSOR.value)
+    return BusinessSearchResponse(items=items, next_cursor=next_cursor)
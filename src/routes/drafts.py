@@ -1,8 +1,14 @@
+import json
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Path
-from typing import List
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List
 from datetime import datetime
 from bson import ObjectId
 
+from src.agents.GeneratorAgent import GeneratorAgent
+from src.helpers.config import get_Settings, Settings
+from src.helpers.jobs import Job, job_handler
+from src.models.BuisnessInfoModel import BusinessInfoModel
 from src.models.db_schemas.Post import Post
 from src.models.PostModel import PostModel
 from src.models.enums.PostEnums import PostStatus
@@ -11,8 +17,10 @@ from src.models.schemas.DraftSChemas import (
     EditPostRequest,
     EditPostResponse,
     ApproveDraftResponse,
-    RejectDraftResponse
+    RejectDraftResponse,
+    GenerateDraftsRequest
 )
+from src.models.schemas.JobSchemas import JobResponse
 from ..models.enums.ResponseSignal import ResponseSignal
 
 
@@ -42,6 +50,40 @@ async def get_post_model(request: Request) -> PostModel:
     return await PostModel.create_instance(db_client)
 
 
+async def check_generation_request(req: GenerateDraftsRequest, request: Request) -> GenerateDraftsRequest:
+    """
+    Check a draft generation request.
+
+    Raises:
+        HTTPException(400): If the user ID is malformed or the LLM provider is not configured.
+        HTTPException(404): If the user has no business info to generate from.
+    """
+    if not ObjectId.is_valid(req.user_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ResponseSignal.INVALID_USER_ID.value)
+
+    llm = request.app.container.llm_client
+    if req.provider and req.provider not in llm.providers:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ResponseSignal.LLM_PROVIDER_NOT_CONFIGURED.value)
+
+    business_model = await BusinessInfoModel.create_instance(request.app.db_client)
+    if await business_model.get_by_user_id(req.user_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=ResponseSignal.BUSINESS_INFO_NOT_FOUND.value)
+    return req
+
+
+async def get_generator_agent(
+    request: Request,
+    req: GenerateDraftsRequest = Depends(check_generation_request),
+    settings: Settings = Depends(get_Settings)
+) -> GeneratorAgent:
+    """
+    Return the `GeneratorAgent` running a checked draft generation request.
+    """
+    return GeneratorAgent(
+        request.app.container.llm_client, concurrency=settings.DRAFT_GENERATION_CONCURRENCY, provider=req.provider
+    )
+
+
 # -----------------------------------
 # Draft Management Endpoints
 # -----------------------------------
@@ -53,13 +95,17 @@ async def get_post_model(request: Request) -> PostModel:
 )
 async def create_draft(
     req: CreatePostRequest,
+    request: Request,
     post_model: PostModel = Depends(get_post_model)
 ) -> Post:
     """
-    Create a new draft post.
+    Create a new draft post. A draft nearly identical to a recent draft or
+    accepted post of the user is still created, with `duplicateOf` and
+    `similarity` set.
 
     Args:
         req (CreatePostRequest): Request body containing `title`, `content`, and `user_id`.
+        request (Request): The incoming request, used to reach the similarity index.
         post_model (PostModel): The database model dependency.
 
     Returns:
@@ -78,8 +124,18 @@ async def create_draft(
             comments=[],
             user_id= ObjectId(req.user_id)
         )
+        similarity = request.app.container.similarity_index
+        if similarity is not None:
+            seen = await similarity.user_index(post.user_id, post_model)
+            duplicate_of, score = similarity.check(seen, similarity.vector(post.title, post.content))
+            if duplicate_of is not None:
+                post.duplicateOf = duplicate_of
+                post.similarity = round(score, 3)
+
         res = await post_model.create_post(post)
         post.id = str(res)
+        if similarity is not None:
+            similarity.update(post.user_id, post.id, post.title, post.content)
         return post
 
     except ValueError as e:
@@ -89,6 +145,102 @@ async def create_draft(
         )
 
 
+@draft_router.post(
+    "/generate",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def generate_drafts(
+    request: Request,
+    req: GenerateDraftsRequest = Depends(check_generation_request)
+) -> JobResponse:
+    """
+    Generate drafts for the upcoming posts of a user's schedule from their
+    business info, as a background job. The drafts are stored with status
+    DRAFT as they are generated.
+
+    Args:
+        req (GenerateDraftsRequest): The user and the number of drafts.
+        request (Request): The incoming request, used to reach the job runner.
+
+    Returns:
+        JobResponse: The pending job; poll `GET /drafts/generate/{job_id}` for its progress.
+    """
+    job = await request.app.container.jobs.submit("draft_generation", req.model_dump(exclude_none=True))
+    return JobResponse(**job.to_dict())
+
+
+@job_handler("draft_generation", GenerateDraftsRequest)
+async def run_draft_generation_job(container, job: Job, req: GenerateDraftsRequest) -> Dict[str, Any]:
+    """Job body of `POST /drafts/generate`."""
+    agent = GeneratorAgent(
+        container.llm_client, concurrency=get_Settings().DRAFT_GENERATION_CONCURRENCY, provider=req.provider
+    )
+    return await agent.run(container.db_client, req.user_id, req.count, job)
+
+
+@draft_router.post(
+    "/generate/stream",
+    status_code=status.HTTP_200_OK
+)
+async def generate_drafts_stream(
+    req: GenerateDraftsRequest,
+    request: Request,
+    agent: GeneratorAgent = Depends(get_generator_agent),
+    post_model: PostModel = Depends(get_post_model)
+) -> StreamingResponse:
+    """
+    Generate drafts like `POST /drafts/generate`, streaming them back as
+    Server-Sent Events while they are stored: one `draft` event per stored
+    draft, then a `done` event with the counts. Disconnecting stops the
+    generation (drafts already sent stay stored).
+
+    Returns:
+        StreamingResponse: A `text/event-stream` response.
+    """
+    business_info, slots = await agent.load_inputs(request.app.db_client, req.user_id)
+
+    async def events():
+        async for stored in agent.generate_and_store(post_model, business_info, slots, req.count, batch_size=1):
+            for post in stored:
+                yield f"id: {post.id}\nevent: draft\ndata: {post.model_dump_json(by_alias=True)}\n\n".encode()
+        yield f"event: done\ndata: {json.dumps(agent.stats)}\n\n".encode()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@draft_router.get(
+    "/generate/{job_id}",
+    response_model=JobResponse,
+    status_code=status.HTTP_200_OK
+)
+async def get_generation_status(job_id: str, request: Request) -> JobResponse:
+    """
+    Return the status and progress of a draft generation job.
+
+    Args:
+        job_id (str): ID returned by `POST /drafts/generate`.
+        request (Request): The incoming request, used to reach the job runner.
+
+    Returns:
+        JobResponse: Status, drafts stored so far and, once finished, their IDs.
+
+    Raises:
+        HTTPException(404): If the job is unknown or expired.
+    """
+    job = await request.app.container.jobs.get(job_id)
+    if job is None or job.kind != "draft_generation":
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ResponseSignal.JOB_NOT_FOUND.value
+        )
+    return JobResponse(**job.to_dict())
+
+
 @draft_router.get(
     "/users/{user_id}/{limit}/{skip}",
     response_model=List[Post],
@@ -244,6 +396,7 @@ async def get_one_draft(
 async def edit_draft(
     draft_id: str,
     req: EditPostRequest,
+    request: Request,
     post_model: PostModel = Depends(get_post_model)
 ) -> EditPostResponse:
     """
@@ -265,6 +418,9 @@ async def edit_draft(
         if not updated_post:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=ResponseSignal.DRAFT_NOT_FOUND.value)
 
+        similarity = request.app.container.similarity_index
+        if similarity is not None:
+            similarity.update(updated_post.user_id, str(updated_post.id), updated_post.title, updated_post.content)
         return EditPostResponse(id=str(updated_post.id), title=updated_post.title, content=updated_post.content)
     except Exception as e:
         raise HTTPException(
@@ -315,6 +471,7 @@ async def approve_draft(
 )
 async def reject_draft(
     draft_id: str,
+    request: Request,
     post_model: PostModel = Depends(get_post_model)
 ) -> RejectDraftResponse:
     """
@@ -334,6 +491,9 @@ async def reject_draft(
         post = await post_model.reject_draft_by_id(draft_id)
         if not post:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=ResponseSignal.DRAFT_NOT_FOUND.value)
+        if request.app.container.similarity_index is not None:
+            # rejected drafts no longer count as duplicates
+            request.app.container.similarity_index.discard([draft_id])
         return RejectDraftResponse(id=str(draft_id), status=PostStatus.REJECTED)
     
     except Exception as e:
@@ -1,7 +1,6 @@
 # facebook_routes.py
-from fastapi import APIRouter, HTTPException, status, Path, Request, Body, Depends
-from typing import List, Dict, Any
-import requests
+from fastapi import APIRouter, HTTPException, status, Path, Request, Body, Depends, Header
+from typing import List, Dict, Any, Optional
 from ..models.BuisnessInfoModel import BusinessInfoModel
 from ..helpers.facebook_auth import FacebookAuthService
 from ..helpers.encryption import EncryptionService
@@ -13,14 +12,13 @@ from ..models.schemas.postSchams import (
 )
 from ..models.schemas.InteractionsResponse import InteractionResponse
 from src.controllers.facebook import FacebookController
-from ..helpers.config import get_Settings
+from ..helpers.graph_client import get_graph_client
+from ..helpers.rate_limit import GraphPriority
 from src.models.schemas.facebookSchemas import (
     ReplyMessageRequest,
     ReplyCommentRequest,
 )
 
-setting_object = get_Settings()
-
 facebook_router = APIRouter(
     prefix="/facebook",
     tags=["Facebook"]
@@ -84,7 +82,9 @@ async def exchange_token(
     """
     Exchange a short-lived token for a long-lived one, encrypt it, and store it.
     """
-    long_lived_token = FacebookAuthService.exchange_token(short_lived_token)
+    long_lived_token = await request.app.container.run_blocking(
+        FacebookAuthService.exchange_token, short_lived_token
+    )
     encrypted_token = EncryptionService.encrypt(long_lived_token)
     
     # Store in DB linked to USER
@@ -122,6 +122,7 @@ async def upload_post(
     request: Request,
     page_id: str, 
     post: PostUploadSchema,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ) -> Dict[str, Any]:
     """
     Upload a post (text, image, or video) to a Facebook Page.
@@ -129,6 +130,7 @@ async def upload_post(
     Args:
         page_id (str): ID of the Facebook Page.
         post (PostUploadSchema): Pydantic model containing post details.
+        idempotency_key (Optional[str]): Client key making retried uploads publish only once.
 
     Returns:
         Dict[str, Any]: Facebook Graph API response (post ID or error message).
@@ -145,20 +147,23 @@ async def upload_post(
     # Determine post type
     if post.image_url:
         # Upload image post
-        url = f"https://graph.facebook.com/v23.0/{page_id}/photos"
+        path = f"{page_id}/photos"
         payload["url"] = post.image_url
 
     elif post.video_url:
         # Upload video post
-        url = f"https://graph.facebook.com/v23.0/{page_id}/videos"
+        path = f"{page_id}/videos"
         payload["file_url"] = post.video_url
 
     else:
         # Upload text-only post
-        url = f"https://graph.facebook.com/v23.0/{page_id}/feed"
+        path = f"{page_id}/feed"
 
     # Send request
-    response = requests.post(url, data=payload)
+    response = await get_graph_client().post(
+        path, data=payload, priority=GraphPriority.HIGH,
+        idempotency_key=idempotency_key and f"{page_id}:post:{idempotency_key}",
+    )
 
     # Handle possible API errors
     result = handle_facebook_error(response)
@@ -185,13 +190,12 @@ async def get_page_info(request: Request, page_id: str):
     """
     page_access_token = await get_token_from_db(page_id, request.app.db_client)
 
-    url = f"https://graph.facebook.com/v23.0/{page_id}"
     params = {
         "fields": "id,name,about,description,category,category_list,website",
         "access_token": page_access_token
     }
 
-    response = requests.get(url, params=params)
+    response = await get_graph_client().get(page_id, params=params, cache=True)
     result = handle_facebook_error(response)
     return result
 
@@ -207,15 +211,13 @@ async def update_post(request: Request, page_id: str, post_id: str, message: str
     
     page_access_token = await get_token_from_db(page_id, request.app.db_client)
 
-    url = f"https://graph.facebook.com/v23.0/{post_id}"
-
     # Facebook allows ONLY the 'message' field to be updated
     payload = {
         "message": message,
         "access_token": page_access_token,
     }
 
-    response = requests.post(url, data=payload)
+    response = await get_graph_client().post(post_id, data=payload, priority=GraphPriority.HIGH)
     result = handle_facebook_error(response)
 
     return {
@@ -245,12 +247,11 @@ async def delete_post(request: Request, page_id: str, post_id: str):
     if "_" not in post_id:
         post_id = f"{page_id}_{post_id}"
 
-    url = f"https://graph.facebook.com/v23.0/{post_id}"
     params = {
         "access_token": page_access_token
     }
 
-    response = requests.delete(url, params=params)
+    response = await get_graph_client().delete(post_id, params=params, priority=GraphPriority.HIGH)
     result = handle_facebook_error(response)
 
     return {
@@ -263,7 +264,13 @@ async def delete_post(request: Request, page_id: str, post_id: str):
     "/pages/{page_id}/messages/{psid}/reply",
     status_code=status.HTTP_201_CREATED
 )
-async def reply_for_message(req: Request, page_id: str, psid: str, request: ReplyMessageRequest):
+async def reply_for_message(
+    req: Request,
+    page_id: str,
+    psid: str,
+    request: ReplyMessageRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
     """
     Send a reply message to a user through the Facebook Messenger Send API.
 
@@ -271,6 +278,7 @@ async def reply_for_message(req: Request, page_id: str, psid: str, request: Repl
         page_id (str): The Facebook Page ID.
         psid (str): The Page-scoped user ID (PSID) of the recipient.
         request (ReplyMessageRequest): Message content, and type.
+        idempotency_key (Optional[str]): Client key making retried replies send only once.
 
     Returns:
         Dict[str, Any]: Facebook Send API response.
@@ -287,6 +295,7 @@ async def reply_for_message(req: Request, page_id: str, psid: str, request: Repl
         page_id,
         token,
         request.message_type,
+        idempotency_key=idempotency_key,
     )
     return result
 
@@ -295,13 +304,20 @@ async def reply_for_message(req: Request, page_id: str, psid: str, request: Repl
     "/pages/{page_id}/comments/{comment_id}/reply",
     status_code=status.HTTP_201_CREATED
 )
-async def reply_for_comment(req: Request, page_id: str, comment_id: str, request: ReplyCommentRequest):
+async def reply_for_comment(
+    req: Request,
+    page_id: str,
+    comment_id: str,
+    request: ReplyCommentRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
     """
     Reply to a specific comment on a Facebook post.
 
     Args:
         comment_id (str): ID of the comment to reply to.
         request (ReplyCommentRequest): Pydantic model with reply text.
+        idempotency_key (Optional[str]): Client key making retried replies post only once.
 
     Returns:
         Dict[str, Any]: Facebook Graph API response.
@@ -314,7 +330,7 @@ async def reply_for_comment(req: Request, page_id: str, comment_id: str, request
         token = await get_token_from_db(page_id, req.app.db_client)
 
     result = await FacebookController.reply_for_comment(
-        comment_id, request.reply, token
+        comment_id, request.reply, token, idempotency_key=idempotency_key
     )
     return result
 
@@ -339,14 +355,12 @@ async def get_chat_history(request: Request, page_id: str, chat_id: str):
     """
     page_access_token = await get_token_from_db(page_id, request.app.db_client)
 
-    GRAPH_API_VERSION = setting_object.GRAPH_API_VERSION
-    url = f"https://graph.facebook.com/{GRAPH_API_VERSION}/{chat_id}/messages"
     params = {
         "fields": "message,from,to,created_time",
         "access_token": page_access_token
     }
 
-    response = requests.get(url, params=params)
+    response = await get_graph_client().get(f"{chat_id}/messages", params=params, cache=True)
     data = handle_facebook_error(response)
 
     messages = [
@@ -389,7 +403,7 @@ async def fetch_page_messages(
     """
     access_token = await get_token_from_db(page_id, request.app.db_client)
 
-    result = await FacebookController.fetch_page_messages(page_id, access_token)
+    result = await FacebookController.fetch_page_messages(page_id, access_token, cache=True)
     return result
 
 
@@ -412,5 +426,5 @@ async def fetch_page_feed_interactions(request: Request, page_id: str):
     """
     access_token = await get_token_from_db(page_id, request.app.db_client)
 
-    result = await FacebookController.fetch_page_feed_interactions(page_id, access_token)
+    result = await FacebookController.fetch_page_feed_interactions(page_id, access_token, cache=True)
     return result
\ No newline at end of file
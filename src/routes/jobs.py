@@ -0,0 +1,70 @@
+from typing import Optional
+from fastapi import APIRouter, status, Depends, HTTPException, Header, Request
+from pydantic import ValidationError
+from src.helpers.config import get_Settings, Settings
+from src.helpers.jobs import get_job_kind
+from src.models.enums.ResponseSignal import ResponseSignal
+from src.models.schemas.JobSchemas import JobRequest, JobResponse
+from src.routes.admin import require_admin_key
+
+jobs_router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@jobs_router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(
+    req: JobRequest,
+    request: Request,
+    admin_key: Optional[str] = Header(None, alias="X-Admin-Key"),
+    settings: Settings = Depends(get_Settings),
+) -> JobResponse:
+    """
+    Queue a background job of any kind (the dedicated endpoints, e.g.
+    `POST /drafts/generate`, check more upfront). The job is stored and
+    run by the next free worker; a job identical to one still pending or
+    running is not queued again, the active job is returned instead.
+
+    Returns:
+        JobResponse: The pending job; poll `GET /jobs/{job_id}` for its progress.
+
+    Raises:
+        HTTPException: 400 if the kind is unknown, 403 without the admin key
+        for admin jobs, 422 if the parameters are invalid for the kind.
+    """
+    kind = get_job_kind(req.kind)
+    if kind is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ResponseSignal.UNKNOWN_JOB_KIND.value)
+    if kind.admin:
+        await require_admin_key(admin_key, settings)
+
+    params = req.params
+    if kind.params_model is not None:
+        try:
+            params = kind.params_model(**req.params).model_dump(mode="json", exclude_none=True)
+        except ValidationError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=[{"loc": err["loc"], "msg": err["msg"]} for err in e.errors()])
+
+    job = await request.app.container.jobs.submit(req.kind, params)
+    return JobResponse(**job.to_dict())
+
+
+@jobs_router.get("/{job_id}", response_model=JobResponse, status_code=status.HTTP_200_OK)
+async def get_job(
+    job_id: str,
+    request: Request,
+    admin_key: Optional[str] = Header(None, alias="X-Admin-Key"),
+    settings: Settings = Depends(get_Settings),
+) -> JobResponse:
+    """
+    Return the status, progress and, once finished, the result of a job,
+    whichever worker runs it.
+
+    Raises:
+        HTTPException: 404 if the job is unknown or expired, 403 without the admin key for admin jobs.
+    """
+    job = await request.app.container.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=ResponseSignal.JOB_NOT_FOUND.value)
+    kind = get_job_kind(job.kind)
+    if kind is None or kind.admin:
+        await require_admin_key(admin_key, settings)
+    return JobResponse(**job.to_dict())
@@ -1,10 +1,21 @@
-from fastapi import APIRouter, status, Request, Depends, HTTPException, Query
-from typing import List
+from datetime import datetime
+from bson import ObjectId
+from fastapi import APIRouter, status, Request, Depends, HTTPException, Query, Header
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List, Optional
+from src.controllers.notification_broadcast import broadcast_notifications
+from src.helpers.jobs import Job, job_handler
 from src.models.NotificationModel import NotificationModel
+from src.models.schemas.JobSchemas import JobResponse
+from src.routes.admin import require_admin_key
 from src.models.db_schemas.Notification import Notification
 from src.models.enums.ResponseSignal import ResponseSignal
 from src.models.schemas.NotificationSchemas import (
     MarkReadResponse,
+    MarkManySeenRequest,
+    BroadcastRequest,
+    BulkMarkSeenResponse,
+    UnreadCountResponse,
 )
 
 notification_route = APIRouter(prefix="/notifications", tags=["Notification"])
@@ -77,6 +88,179 @@ async def get_all_user_notification(
         )
 
 
+@notification_route.get(
+    "/users/{user_id}/since",
+    status_code=status.HTTP_200_OK,
+    response_model=List[Notification],
+)
+async def get_user_notifications_since(
+    user_id: str,
+    since: datetime = Query(..., description="Only notifications created after this time are returned"),
+    limit: int = Query(50, ge=1, le=500),
+    notification_model: NotificationModel = Depends(get_notification_model),
+) -> List[Notification]:
+    """
+    Retrieve the notifications of a user created after a given time, newest first.
+
+    Clients polling for new notifications pass the `createdAt` of the newest
+    notification they have; an empty list means nothing new.
+
+    Args:
+        user_id (str): The MongoDB ObjectId of the user.
+        since (datetime): Lower bound (exclusive) of `createdAt`.
+        limit (int): Maximum number of notifications to return.
+        notification_model (NotificationModel): Dependency-injected model for database operations.
+
+    Returns:
+        List[Notification]: The new notifications.
+    """
+    return await notification_model.get_user_notifications_since(user_id, since, limit=limit)
+
+
+@notification_route.get(
+    "/users/{user_id}/unread_count",
+    status_code=status.HTTP_200_OK,
+    response_model=UnreadCountResponse,
+)
+async def get_unread_count(
+    user_id: str,
+    notification_model: NotificationModel = Depends(get_notification_model),
+) -> UnreadCountResponse:
+    """
+    Return the number of unseen notifications of a user (cached per worker).
+
+    Args:
+        user_id (str): The MongoDB ObjectId of the user.
+        notification_model (NotificationModel): Dependency-injected model for database operations.
+
+    Returns:
+        UnreadCountResponse: The unread count.
+    """
+    return UnreadCountResponse(user_id=user_id, unread_count=await notification_model.count_unread(user_id))
+
+
+@notification_route.put(
+    "/users/{user_id}/mark_all_seen/",
+    status_code=status.HTTP_200_OK,
+    response_model=BulkMarkSeenResponse,
+)
+async def mark_all_seen(
+    user_id: str,
+    notification_model: NotificationModel = Depends(get_notification_model),
+) -> BulkMarkSeenResponse:
+    """
+    Mark every notification of a user as seen with a single update.
+
+    Args:
+        user_id (str): The MongoDB ObjectId of the user.
+        notification_model (NotificationModel): Dependency-injected model for database operations.
+
+    Returns:
+        BulkMarkSeenResponse: Matched and modified counts and the remaining unread count.
+
+    Raises:
+        HTTPException(500): If the update fails.
+    """
+    try:
+        result = await notification_model.mark_all_as_seen(user_id)
+        return BulkMarkSeenResponse(
+            user_id=user_id,
+            matched_count=result["matched_count"],
+            modified_count=result["modified_count"],
+            unread_count=await notification_model.count_unread(user_id),
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ResponseSignal.FAILED_TO_MARK_AS_READ.value
+        )
+
+
+@notification_route.put(
+    "/users/{user_id}/mark_seen/",
+    status_code=status.HTTP_200_OK,
+    response_model=BulkMarkSeenResponse,
+)
+async def mark_many_seen(
+    user_id: str,
+    req: MarkManySeenRequest,
+    notification_model: NotificationModel = Depends(get_notification_model),
+) -> BulkMarkSeenResponse:
+    """
+    Mark several notifications of a user as seen with a single update.
+    Notifications belonging to other users are not modified.
+
+    Args:
+        user_id (str): The MongoDB ObjectId of the user.
+        req (MarkManySeenRequest): IDs of the notifications to mark (up to 500).
+        notification_model (NotificationModel): Dependency-injected model for database operations.
+
+    Returns:
+        BulkMarkSeenResponse: Matched and modified counts and the remaining unread count.
+
+    Raises:
+        HTTPException(400): If a notification ID is malformed.
+        HTTPException(500): If the update fails.
+    """
+    if not all(ObjectId.is_valid(notif_id) for notif_id in req.notification_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ResponseSignal.INVALID_NOTIFICATION_ID.value
+        )
+
+    try:
+        result = await notification_model.mark_many_as_seen(user_id, req.notification_ids)
+        return BulkMarkSeenResponse(
+            user_id=user_id,
+            matched_count=result["matched_count"],
+            modified_count=result["modified_count"],
+            unread_count=await notification_model.count_unread(user_id),
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ResponseSignal.FAILED_TO_MARK_AS_READ.value
+        )
+
+
+@notification_route.get("/users/{user_id}/stream")
+async def stream_user_notifications(
+    user_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    notification_model: NotificationModel = Depends(get_notification_model),
+) -> StreamingResponse:
+    """
+    Stream new notifications of a user as Server-Sent Events.
+
+    Each notification is sent as a `notification` event whose ID is the
+    notification ID; browsers (`EventSource`) reconnect automatically and send
+    the last ID in the `Last-Event-ID` header, in which case the notifications
+    missed in between are sent first. Comment frames keep idle connections open.
+
+    Args:
+        user_id (str): The MongoDB ObjectId of the user.
+        request (Request): The incoming request, used to reach the notification hub.
+        last_event_id (Optional[str]): ID of the last notification the client received.
+        notification_model (NotificationModel): Dependency-injected model for database operations.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` response open until the client disconnects.
+    """
+    backlog = []
+    if last_event_id and ObjectId.is_valid(last_event_id):
+        backlog = await notification_model.get_user_notifications_after(user_id, last_event_id)
+
+    hub = request.app.container.notification_hub
+    return StreamingResponse(
+        hub.stream(user_id, backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @notification_route.put(
     "/{notification_id}/mark_seen/",
     response_model=MarkReadResponse,
@@ -156,3 +340,69 @@ async def send_notification(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail= f"Failed to send notification: {str(e)}",
         )
+
+
+@notification_route.post(
+    "/broadcast",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_admin_key)],
+)
+async def broadcast_notification(req: BroadcastRequest, request: Request) -> JobResponse:
+    """
+    Send one notification to many users (all users, users of a business field,
+    or an explicit list) as a background job. Requires the admin key.
+
+    Args:
+        req (BroadcastRequest): Title, content and target of the notification.
+        request (Request): The incoming request, used to reach the job runner.
+
+    Returns:
+        JobResponse: The pending job; poll `GET /notifications/broadcast/{job_id}` for its progress.
+    """
+    if req.target.user_ids and not all(ObjectId.is_valid(user_id) for user_id in req.target.user_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ResponseSignal.INVALID_USER_ID.value
+        )
+
+    job = await request.app.container.jobs.submit(
+        "notification_broadcast", req.model_dump(mode="json", exclude_none=True)
+    )
+    return JobResponse(**job.to_dict())
+
+
+# a broadcast interrupted by a crash is not sent again (recipients would get it twice)
+@job_handler("notification_broadcast", BroadcastRequest, admin=True, max_attempts=1)
+async def run_broadcast_job(container, job: Job, req: BroadcastRequest) -> Dict[str, Any]:
+    """Job body of `POST /notifications/broadcast`."""
+    return await broadcast_notifications(container.db_client, req, job)
+
+
+@notification_route.get(
+    "/broadcast/{job_id}",
+    response_model=JobResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_admin_key)],
+)
+async def get_broadcast_status(job_id: str, request: Request) -> JobResponse:
+    """
+    Return the status and progress of a broadcast job.
+
+    Args:
+        job_id (str): ID returned by `POST /notifications/broadcast`.
+        request (Request): The incoming request, used to reach the job runner.
+
+    Returns:
+        JobResponse: Status, processed/total counts and, once finished, the result.
+
+    Raises:
+        HTTPException(404): If the job is unknown or expired.
+    """
+    job = await request.app.container.jobs.get(job_id)
+    if job is None or job.kind != "notification_broadcast":
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ResponseSignal.JOB_NOT_FOUND.value
+        )
+    return JobResponse(**job.to_dict())
@@ -1,6 +1,11 @@
-from fastapi import APIRouter, status, Request, Depends, HTTPException
+from fastapi import APIRouter, status, Request, Depends, HTTPException, Query
+from datetime import datetime, timedelta, timezone
 from src.models.db_schemas.Schedule import Schedule
+from src.models.db_schemas.PostingHistogram import PostingHistogram
 from src.models.ScheduleModel import ScheduleModel
+from src.models.PostingHistogramModel import PostingHistogramModel
+from src.controllers.facebook import FacebookController
+from src.routes.facebook import get_token_from_db
 from fastapi.encoders import jsonable_encoder
 
 schedule_router = APIRouter(prefix="/schedule", tags=["Schedule"])
@@ -11,6 +16,16 @@ async def get_schedule_model(request: Request) -> ScheduleModel:
     return await ScheduleModel.create_instance(db_client)
 
 
+async def get_posting_histogram_model(request: Request) -> PostingHistogramModel:
+    """Dependency to get a PostingHistogramModel instance."""
+    db_client = request.app.db_client
+    return await PostingHistogramModel.create_instance(db_client)
+
+
+# Cached histograms younger than this are served without asking the Graph API for new activity
+BEST_TIMES_REFRESH_INTERVAL = timedelta(hours=1)
+
+
 @schedule_router.get("/users/{user_id}", status_code=status.HTTP_200_OK, response_model=Schedule)
 async def get_schedule(user_id: str, schedule_model: ScheduleModel = Depends(get_schedule_model)) -> Schedule:
     """
@@ -66,4 +81,52 @@ async def edit_schedule(
     new_doc = new_schedule.model_dump(by_alias=True, exclude_unset=True)
     new_doc["_id"] = str(result["_id"])
 
-    return new_doc
\ No newline at end of file
+    return new_doc
+
+
+@schedule_router.get("/pages/{page_id}/best-times", status_code=status.HTTP_200_OK)
+async def get_best_posting_times(
+    request: Request,
+    page_id: str,
+    limit: int = Query(5, ge=1, le=168, description="Number of slots to return."),
+    refresh: bool = Query(False, description="Fetch new activity even if the cached histograms are fresh."),
+    histogram_model: PostingHistogramModel = Depends(get_posting_histogram_model)
+):
+    """
+    Rank the weekday/hour slots (UTC) where the page audience is most active.
+
+    The weekday x hour histograms are cached per page and only the posts and
+    messages published since the last refresh are fetched and binned. Each
+    slot carries its `next_occurrence`, usable as a `ScheduledPost.date`.
+
+    Args:
+        page_id (str): Facebook Page ID.
+        limit (int): Number of slots to return.
+        refresh (bool): Bypass the cache freshness window.
+    Returns:
+        dict: The page ID, when the histograms were last updated and the ranked slots.
+    """
+    import numpy as np
+    from src.controllers import posting_times
+
+    histogram = await histogram_model.get_by_page_id(page_id) or PostingHistogram(page_id=page_id)
+
+    updated_at = posting_times.to_epoch(histogram.updatedAt)
+    stale = histogram.id is None or refresh or \
+        updated_at < posting_times.to_epoch(datetime.now(timezone.utc) - BEST_TIMES_REFRESH_INTERVAL)
+
+    if stale:
+        access_token = await get_token_from_db(page_id, request.app.db_client)
+        histogram = await FacebookController.update_posting_histogram(histogram, access_token)
+        await histogram_model.save(histogram)
+
+    return {
+        "page_id": page_id,
+        "updatedAt": histogram.updatedAt,
+        "slots": posting_times.rank_slots(
+            np.asarray(histogram.engagement),
+            np.asarray(histogram.posts),
+            np.asarray(histogram.messages),
+            limit=limit,
+        ),
+    }
@@ -1,5 +1,5 @@
-from fastapi import APIRouter,  Request
-from src.helpers.config import get_Settings
+from fastapi import APIRouter,  Request, Depends
+from src.helpers.config import get_Settings, Settings
 
 
 webhook_router = APIRouter(
@@ -7,9 +7,8 @@ webhook_router = APIRouter(
     tags=["webhook"]
 )
 
-settings = get_Settings()
 @webhook_router.get("/")
-async def verify_webhook(request: Request):
+async def verify_webhook(request: Request, settings: Settings = Depends(get_Settings)):
     mode = request.query_params.get("hub.mode")
     token = request.query_params.get("hub.verify_token")
     challenge = request.query_params.get("hub.challenge")
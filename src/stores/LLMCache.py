@@ -0,0 +1,225 @@
+"""
+Content-addressed cache of LLM responses.
+
+A generation is identified by what determines its output: the provider and
+model, the prompt template (name and version), the normalized inputs
+rendered into it and the sampling parameters. The SHA-256 of their
+canonical JSON is the cache key, so re-running an analysis whose inputs did
+not change returns the stored response at once and without spending tokens,
+while changing any input, the model or the template version misses.
+
+Responses are kept in memory (LRU, per worker) and in a MongoDB collection
+shared by the workers, where a TTL index removes them after `ttl` seconds.
+"""
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import unicodedata
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from bson import ObjectId
+from pydantic import BaseModel
+from pymongo.errors import PyMongoError
+from src.models.db_schemas.LLMCacheEntry import LLMCacheEntry
+from src.stores.LLMs import LLMResult, Messages
+
+logger = logging.getLogger("llm")
+
+
+@dataclasses.dataclass(frozen=True)
+class PromptTemplate:
+    """
+    A versioned prompt. Bump `version` whenever the wording changes, so the
+    responses cached for the previous wording are no longer served.
+
+    `system` and `user` are `str.format` templates filled with the inputs.
+    """
+    name: str
+    version: str
+    system: str
+    user: str
+
+    def render(self, inputs: Dict[str, Any]) -> Messages:
+        return [
+            {"role": "system", "content": self.system.format(**inputs)},
+            {"role": "user", "content": self.user.format(**inputs)},
+        ]
+
+
+def normalize_inputs(value: Any) -> Any:
+    """
+    Canonical form of template inputs: pydantic models as dicts (unset and
+    None fields dropped), text NFC-normalized and stripped, sets sorted,
+    dates, ObjectIds and enums as strings, floats rounded to 6 digits.
+    """
+    if isinstance(value, BaseModel):
+        value = value.model_dump(exclude_none=True, exclude_unset=True)
+    if isinstance(value, dict):
+        return {str(k): normalize_inputs(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [normalize_inputs(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((normalize_inputs(v) for v in value), key=repr)
+    if isinstance(value, Enum):
+        return normalize_inputs(value.value)
+    if isinstance(value, str):
+        return unicodedata.normalize("NFC", value).strip()
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+
+def cache_key(provider: str, model: str, template: PromptTemplate, inputs: Dict[str, Any], **params: Any) -> str:
+    """SHA-256 of the canonical JSON of everything determining a generation."""
+    payload = {
+        "provider": provider,
+        "model": model,
+        "template": [template.name, template.version],
+        "inputs": normalize_inputs(inputs),
+        "params": normalize_inputs(params),
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-level cache of `LLMResult`s by `cache_key`.
+
+    Lookups try the in-memory LRU, then the collection (when one is given);
+    a response found there is kept in memory too. Concurrent misses for the
+    same key share one generation (single-flight). Collection failures are
+    logged and treated as misses: the cache never fails a generation.
+
+    Args:
+        collection: Motor collection persisting the responses (None: memory only).
+        max_entries (int): Responses kept in memory.
+        ttl (float): Seconds a response is served.
+    """
+
+    def __init__(self, collection=None, max_entries: int = 2048, ttl: float = 7 * 86400):
+        self.collection = collection
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (LLMResult, expires at)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._indexes_ready = False
+        self.stats = {
+            "memory_hits": 0, "store_hits": 0, "misses": 0, "coalesced": 0,
+            "tokens_saved": 0, "seconds_saved": 0.0,
+        }
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.stats["memory_hits"] + self.stats["store_hits"] + self.stats["coalesced"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def _remember(self, key: str, result: LLMResult, expires_at: datetime) -> None:
+        self._entries[key] = (result, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _saved(self, result: LLMResult) -> LLMResult:
+        self.stats["tokens_saved"] += result.prompt_tokens + result.completion_tokens
+        self.stats["seconds_saved"] += result.latency
+        return result
+
+    async def get(self, key: str) -> Optional[LLMResult]:
+        """Cached response of a key, or None."""
+        now = datetime.now(timezone.utc)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self._entries.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self._saved(entry[0])
+            del self._entries[key]
+
+        if self.collection is not None:
+            try:
+                doc = await self.collection.find_one({"_id": key, "expiresAt": {"$gt": now}})
+            except PyMongoError as e:
+                logger.warning("LLM cache lookup failed: %r", e)
+                doc = None
+            if doc is not None:
+                result = LLMResult(**doc["result"])
+                self._remember(key, result, doc["expiresAt"].replace(tzinfo=timezone.utc))
+                self.stats["store_hits"] += 1
+                return self._saved(result)
+        return None
+
+    async def put(self, key: str, result: LLMResult) -> None:
+        """Store a response for `ttl` seconds."""
+        entry = LLMCacheEntry(
+            key=key, result=dataclasses.asdict(result),
+            expiresAt=datetime.now(timezone.utc) + timedelta(seconds=self.ttl),
+        )
+        self._remember(key, result, entry.expiresAt)
+        if self.collection is None:
+            return
+        try:
+            await self._ensure_indexes()
+            await self.collection.replace_one({"_id": key}, entry.model_dump(by_alias=True), upsert=True)
+        except PyMongoError as e:
+            logger.warning("LLM cache write failed: %r", e)
+
+    async def _ensure_indexes(self) -> None:
+        if self._indexes_ready:
+            return
+        for index in LLMCacheEntry.get_indexes():
+            await self.collection.create_index(index["key"], name=index["name"], **index.get("options", {}))
+        self._indexes_ready = True
+
+    async def get_or_generate(self, key: str, generate) -> LLMResult:
+        """
+        Return the cached response of `key`, or run `generate()` (a coroutine
+        function returning an `LLMResult`) once and cache its result.
+        """
+        result = await self.get(key)
+        if result is not None:
+            return result
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            try:
+                return self._saved(await asyncio.shield(inflight))
+            except asyncio.CancelledError:
+                if not inflight.cancelled():  # this caller was cancelled
+                    raise
+                # the generating caller was cancelled: generate here instead
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await generate()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: no warning when nobody else waited
+            raise
+        else:
+            future.set_result(result)
+            await self.put(key, result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def invalidate(self, keys: Optional[List[str]] = None) -> None:
+        """Forget some keys (or all of them) in memory; stored responses expire with their TTL."""
+        if keys is None:
+            self._entries.clear()
+        for key in keys or []:
+            self._entries.pop(key, None)
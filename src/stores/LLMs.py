@@ -1 +1,426 @@
-#here all LLMs scripts
\ No newline at end of file
+"""
+Async access to the language models used by the agents.
+
+Every provider (OpenAI, Hugging Face Inference, local stub) implements
+`LLMProvider._complete` / `_stream`; the base class adds what the agents
+rely on whatever the backend:
+    - a concurrency semaphore per provider, so a burst of generations waits
+      in the worker instead of overloading the provider (or its rate limits);
+    - token-budget accounting (`TokenBudget`): tokens per minute, waited
+      for, and an optional daily cap, refused with `LLMBudgetExceededError`;
+    - a timeout on every call, and between two chunks of a stream;
+    - streaming of the generated text chunk by chunk.
+
+`LLMClient` holds the configured providers and routes each call to the
+requested one (the default provider otherwise); `generate` renders a
+versioned prompt template and serves repeated generations from the
+response cache (see `LLMCache`). It is built once per worker
+by the application container (`build_llm_client`) and reached with
+`get_llm_client`.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+from src.helpers.config import get_Settings, Settings
+
+Messages = List[Dict[str, str]]  # OpenAI chat format: [{"role": "user", "content": "..."}]
+
+
+class LLMError(Exception):
+    """A provider call failed (after the retries of the provider's SDK)."""
+
+
+class LLMTimeoutError(LLMError):
+    """A call (or the gap between two streamed chunks) exceeded the provider timeout."""
+
+
+class LLMBudgetExceededError(LLMError):
+    """The daily token budget of the provider is used up."""
+
+
+@dataclass
+class LLMResult:
+    text: str
+    provider: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    finish_reason: Optional[str] = None
+    latency: float = 0.0
+
+
+@dataclass
+class LLMChunk:
+    """A piece of a streamed completion; the last chunk of a provider may carry the token usage."""
+    text: str
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English), used before the provider reports usage."""
+    return max(1, len(text) // 4)
+
+
+def estimate_prompt_tokens(messages: Messages) -> int:
+    return sum(estimate_tokens(message.get("content") or "") + 4 for message in messages)
+
+
+class TokenBudget:
+    """
+    Token accounting of one provider.
+
+    Before a call, the prompt estimate plus `max_tokens` is reserved; once the
+    provider reported the usage, the reservation is replaced by the actual
+    count. When the current minute is full, `reserve` waits for the next one;
+    when the day is, it raises `LLMBudgetExceededError`.
+
+    Args:
+        tokens_per_minute (Optional[int]): Tokens per minute (None: unlimited).
+        tokens_per_day (Optional[int]): Tokens per UTC day (None: unlimited).
+    """
+
+    def __init__(self, tokens_per_minute: Optional[int] = None, tokens_per_day: Optional[int] = None):
+        self.tokens_per_minute = tokens_per_minute
+        self.tokens_per_day = tokens_per_day
+        self._minute = self._day = -1
+        self.minute_used = self.day_used = 0
+        self.total_used = 0
+        self._lock = asyncio.Lock()
+
+    def _roll(self) -> None:
+        now = time.time()
+        minute, day = int(now // 60), int(now // 86400)
+        if minute != self._minute:
+            self._minute, self.minute_used = minute, 0
+        if day != self._day:
+            self._day, self.day_used = day, 0
+
+    async def reserve(self, tokens: int) -> int:
+        """Wait until `tokens` fit in the budget and reserve them; returns the reserved amount."""
+        async with self._lock:  # callers are served in order while the minute is full
+            while True:
+                self._roll()
+                if self.tokens_per_day is not None and self.day_used + tokens > self.tokens_per_day:
+                    raise LLMBudgetExceededError(
+                        f"Daily token budget used up ({self.day_used}/{self.tokens_per_day})"
+                    )
+                if (
+                    self.tokens_per_minute is None
+                    or self.minute_used == 0  # a call larger than the limit still runs, alone
+                    or self.minute_used + tokens <= self.tokens_per_minute
+                ):
+                    self.minute_used += tokens
+                    self.day_used += tokens
+                    return tokens
+                await asyncio.sleep(60 - time.time() % 60)
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Replace a reservation by the tokens actually used (0 if the call failed)."""
+        self._roll()
+        self.minute_used = max(0, self.minute_used - reserved + used)
+        self.day_used = max(0, self.day_used - reserved + used)
+        self.total_used += used
+
+
+class LLMProvider:
+    """
+    Base class of the LLM providers.
+
+    Subclasses implement `_complete` and `_stream` (an async generator of
+    `LLMChunk`) and, when they hold connections, `aclose`.
+
+    Args:
+        model (str): Model used when the call does not name one.
+        max_concurrency (int): Calls in flight at once; the others wait.
+        timeout (float): Seconds a call (or the gap between two streamed chunks) may take.
+        budget (Optional[TokenBudget]): Token budget, unlimited by default.
+    """
+
+    name = "base"
+
+    def __init__(self, model: str, max_concurrency: int = 8, timeout: float = 60.0, budget: Optional[TokenBudget] = None):
+        self.model = model
+        self.timeout = timeout
+        self.budget = budget or TokenBudget()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.stats = {
+            "calls": 0, "in_flight": 0, "timeouts": 0, "errors": 0,
+            "prompt_tokens": 0, "completion_tokens": 0,
+        }
+
+    async def _complete(self, messages: Messages, model: str, max_tokens: int, temperature: float, **kwargs) -> LLMResult:
+        raise NotImplementedError
+
+    def _stream(self, messages: Messages, model: str, max_tokens: int, temperature: float, **kwargs) -> AsyncIterator[LLMChunk]:
+        raise NotImplementedError
+
+    def _record(self, prompt_tokens: int, completion_tokens: int) -> None:
+        self.stats["prompt_tokens"] += prompt_tokens
+        self.stats["completion_tokens"] += completion_tokens
+
+    async def complete(
+        self,
+        messages: Messages,
+        max_tokens: int = 512,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        **kwargs: Any,
+    ) -> LLMResult:
+        """
+        Generate a chat completion.
+
+        Args:
+            messages (Messages): Conversation in the OpenAI chat format.
+            max_tokens (int): Maximum tokens generated.
+            temperature (float): Sampling temperature.
+            model (Optional[str]): Model, defaults to the provider's.
+            **kwargs: Provider-specific options.
+
+        Returns:
+            LLMResult: The generated text and the token usage.
+
+        Raises:
+            LLMTimeoutError: If the call exceeded the timeout.
+            LLMBudgetExceededError: If the daily token budget is used up.
+            LLMError: If the provider failed.
+        """
+        reserved = await self.budget.reserve(estimate_prompt_tokens(messages) + max_tokens)
+        used = 0
+        async with self._semaphore:
+            self.stats["calls"] += 1
+            self.stats["in_flight"] += 1
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(
+                    self._complete(messages, model or self.model, max_tokens, temperature, **kwargs), self.timeout
+                )
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                raise LLMTimeoutError(f"{self.name} call timed out after {self.timeout:g}s")
+            except LLMError:
+                self.stats["errors"] += 1
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                raise LLMError(f"{self.name} call failed: {e}") from e
+            else:
+                result.latency = time.perf_counter() - started
+                used = result.prompt_tokens + result.completion_tokens
+                self._record(result.prompt_tokens, result.completion_tokens)
+                return result
+            finally:
+                self.stats["in_flight"] -= 1
+                self.budget.settle(reserved, used)
+
+    async def stream(
+        self,
+        messages: Messages,
+        max_tokens: int = 512,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        """
+        Generate a chat completion, yielding the text as it is produced.
+
+        The concurrency slot is held until the stream is exhausted or closed:
+        a consumer that may stop early should iterate it inside
+        `contextlib.aclosing`. Same arguments and errors as `complete`.
+        """
+        reserved = await self.budget.reserve(estimate_prompt_tokens(messages) + max_tokens)
+        prompt_tokens = completion_tokens = None
+        generated = 0
+        async with self._semaphore:
+            self.stats["calls"] += 1
+            self.stats["in_flight"] += 1
+            chunks = self._stream(messages, model or self.model, max_tokens, temperature, **kwargs)
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), self.timeout)
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        self.stats["timeouts"] += 1
+                        raise LLMTimeoutError(f"{self.name} stream stalled for {self.timeout:g}s")
+                    except LLMError:
+                        self.stats["errors"] += 1
+                        raise
+                    except Exception as e:
+                        self.stats["errors"] += 1
+                        raise LLMError(f"{self.name} stream failed: {e}") from e
+                    if chunk.prompt_tokens is not None:
+                        prompt_tokens, completion_tokens = chunk.prompt_tokens, chunk.completion_tokens
+                    if chunk.text:
+                        generated += len(chunk.text)
+                        yield chunk.text
+            finally:
+                await chunks.aclose()
+                self.stats["in_flight"] -= 1
+                if prompt_tokens is None:  # provider did not report usage: estimate it
+                    prompt_tokens = estimate_prompt_tokens(messages)
+                    completion_tokens = max(1, generated // 4) if generated else 0
+                self._record(prompt_tokens, completion_tokens or 0)
+                self.budget.settle(reserved, prompt_tokens + (completion_tokens or 0))
+
+    async def aclose(self) -> None:
+        """Release the provider's connections."""
+
+
+class LLMClient:
+    """
+    The configured providers of a worker, by name.
+
+    Args:
+        providers (Dict[str, LLMProvider]): Providers by name.
+        default (str): Provider used when a call does not name one.
+        cache (Optional[LLMResponseCache]): Response cache used by `generate` (None: no caching).
+    """
+
+    def __init__(self, providers: Dict[str, LLMProvider], default: str, cache=None):
+        if default not in providers:
+            raise ValueError(f"Unknown default LLM provider: {default}")
+        self.providers = providers
+        self.default = default
+        self.cache = cache
+
+    def provider(self, name: Optional[str] = None) -> LLMProvider:
+        try:
+            return self.providers[name or self.default]
+        except KeyError:
+            raise LLMError(f"LLM provider not configured: {name}") from None
+
+    async def complete(self, messages: Messages, provider: Optional[str] = None, **kwargs: Any) -> LLMResult:
+        """`LLMProvider.complete` on the given (or default) provider."""
+        return await self.provider(provider).complete(messages, **kwargs)
+
+    def stream(self, messages: Messages, provider: Optional[str] = None, **kwargs: Any) -> AsyncIterator[str]:
+        """`LLMProvider.stream` on the given (or default) provider."""
+        return self.provider(provider).stream(messages, **kwargs)
+
+    async def generate(
+        self,
+        template,
+        inputs: Dict[str, Any],
+        provider: Optional[str] = None,
+        max_tokens: int = 512,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        use_cache: bool = True,
+        bypass_cache: bool = False,
+    ) -> LLMResult:
+        """
+        Complete a prompt template filled with `inputs`, returning the cached
+        response when the same template version, inputs, model and parameters
+        were already generated.
+
+        Args:
+            template (PromptTemplate): The prompt.
+            inputs (Dict[str, Any]): Values of the template fields.
+            provider (Optional[str]): Provider name, defaults to the default provider.
+            max_tokens (int): Maximum tokens generated.
+            temperature (float): Sampling temperature.
+            model (Optional[str]): Model, defaults to the provider's.
+            use_cache (bool): False forces a new generation (which then replaces the cached one).
+            bypass_cache (bool): True neither reads nor writes the cache (sampled
+                generations that must differ from one call to the next).
+
+        Returns:
+            LLMResult: The generated (or cached) response.
+        """
+        from src.stores.LLMCache import cache_key
+
+        llm = self.provider(provider)
+        model = model or llm.model
+
+        async def call() -> LLMResult:
+            return await llm.complete(template.render(inputs), max_tokens=max_tokens, temperature=temperature, model=model)
+
+        if self.cache is None or bypass_cache:
+            return await call()
+        key = cache_key(llm.name, model, template, inputs, max_tokens=max_tokens, temperature=temperature)
+        if not use_cache:
+            result = await call()
+            await self.cache.put(key, result)
+            return result
+        return await self.cache.get_or_generate(key, call)
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(p.aclose() for p in self.providers.values()), return_exceptions=True)
+
+
+def build_llm_client(settings: Settings, cache_collection=None) -> LLMClient:
+    """
+    Create the LLMClient of the settings: OpenAI when OPENAI_API_KEY is set,
+    Hugging Face when HF_API_TOKEN is set, the stub provider only when it is
+    the LLM_PROVIDER, and the response cache (persisted to `cache_collection`
+    when given) unless LLM_CACHE_TTL_SECONDS is 0.
+
+    Raises:
+        ValueError: If LLM_PROVIDER is unknown or lacks its credentials, so
+        the worker fails at startup instead of answering with the stub.
+    """
+    from src.stores.LLMCache import LLMResponseCache
+    from src.stores.providers.stub_provider import StubProvider
+
+    def options():
+        return {
+            "max_concurrency": settings.LLM_MAX_CONCURRENCY,
+            "timeout": settings.LLM_TIMEOUT_SECONDS,
+            "budget": TokenBudget(settings.LLM_TOKENS_PER_MINUTE, settings.LLM_TOKENS_PER_DAY),
+        }
+
+    default = settings.LLM_PROVIDER
+    providers: Dict[str, LLMProvider] = {}
+    if default == StubProvider.name:
+        providers[StubProvider.name] = StubProvider(**options())
+    if settings.OPENAI_API_KEY:
+        from src.stores.providers.openai_provider import OpenAIProvider
+        providers["openai"] = OpenAIProvider(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            model=settings.OPENAI_MODEL,
+            max_retries=settings.LLM_MAX_RETRIES,
+            **options(),
+        )
+    if settings.HF_API_TOKEN:
+        from src.stores.providers.hf_provider import HuggingFaceProvider
+        providers["huggingface"] = HuggingFaceProvider(
+            token=settings.HF_API_TOKEN,
+            model=settings.HF_MODEL,
+            **options(),
+        )
+
+    if default not in providers:
+        credentials = {"openai": "OPENAI_API_KEY", "huggingface": "HF_API_TOKEN"}
+        if default in credentials:
+            raise ValueError(f"LLM_PROVIDER is {default!r} but {credentials[default]} is not set")
+        raise ValueError(f"Unknown LLM_PROVIDER: {default!r} (stub, openai or huggingface)")
+    cache = None
+    if settings.LLM_CACHE_TTL_SECONDS:
+        cache = LLMResponseCache(
+            cache_collection, max_entries=settings.LLM_CACHE_MAX_ENTRIES, ttl=settings.LLM_CACHE_TTL_SECONDS
+        )
+    return LLMClient(providers, default, cache)
+
+
+_llm_client: Optional[LLMClient] = None
+
+
+def get_llm_client() -> LLMClient:
+    """
+    Return the process-wide LLMClient: the one owned by the application
+    container, or one created on first use outside the app (scripts, benchmarks).
+    """
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = build_llm_client(get_Settings())
+    return _llm_client
+
+
+def set_llm_client(client: Optional[LLMClient]) -> None:
+    """Replace the process-wide LLMClient (e.g. with one using only the stub provider)."""
+    global _llm_client
+    _llm_client = client
@@ -0,0 +1,59 @@
+from typing import AsyncIterator
+from src.stores.LLMs import LLMChunk, LLMError, LLMProvider, LLMResult, Messages
+
+
+class HuggingFaceProvider(LLMProvider):
+    """
+    Chat completions through Hugging Face Inference Providers, with one
+    `AsyncInferenceClient` (and its connection pool) reused by all calls.
+
+    Args:
+        token (str): Hugging Face access token.
+        model (str): Default model ID on the Hub.
+        **kwargs: `LLMProvider` options (max_concurrency, timeout, budget).
+    """
+
+    name = "huggingface"
+
+    def __init__(self, token: str, model: str = "meta-llama/Llama-3.1-8B-Instruct", **kwargs):
+        super().__init__(model, **kwargs)
+        from huggingface_hub import AsyncInferenceClient
+
+        self._client = AsyncInferenceClient(token=token, timeout=self.timeout)
+
+    async def _complete(self, messages: Messages, model: str, max_tokens: int, temperature: float, **kwargs) -> LLMResult:
+        from huggingface_hub.errors import InferenceTimeoutError, HfHubHTTPError
+
+        try:
+            response = await self._client.chat_completion(
+                messages, model=model, max_tokens=max_tokens, temperature=temperature, **kwargs
+            )
+        except (InferenceTimeoutError, HfHubHTTPError) as e:
+            raise LLMError(f"huggingface: {e}") from e
+        choice = response.choices[0]
+        usage = response.usage
+        return LLMResult(
+            text=choice.message.content or "",
+            provider=self.name,
+            model=response.model or model,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            finish_reason=choice.finish_reason,
+        )
+
+    async def _stream(self, messages: Messages, model: str, max_tokens: int, temperature: float, **kwargs) -> AsyncIterator[LLMChunk]:
+        from huggingface_hub.errors import InferenceTimeoutError, HfHubHTTPError
+
+        try:
+            stream = await self._client.chat_completion(
+                messages, model=model, max_tokens=max_tokens, temperature=temperature, stream=True, **kwargs
+            )
+            async for chunk in stream:
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    yield LLMChunk(text)
+        except (InferenceTimeoutError, HfHubHTTPError) as e:
+            raise LLMError(f"huggingface: {e}") from e
+
+    async def aclose(self) -> None:
+        await self._client.close()
@@ -0,0 +1,74 @@
+from typing import AsyncIterator, Optional
+import httpx
+from src.stores.LLMs import LLMChunk, LLMError, LLMProvider, LLMResult, Messages
+
+
+class OpenAIProvider(LLMProvider):
+    """
+    OpenAI chat completions (or any OpenAI-compatible endpoint through
+    `base_url`), with one pooled `httpx.AsyncClient` shared by all calls.
+
+    The SDK retries connection errors, 429 and 5xx responses itself
+    (`max_retries`); failures left after that surface as `LLMError`.
+
+    Args:
+        api_key (str): API key.
+        model (str): Default model.
+        base_url (Optional[str]): OpenAI-compatible API root (None: api.openai.com).
+        max_retries (int): Retries of the SDK per call.
+        **kwargs: `LLMProvider` options (max_concurrency, timeout, budget).
+    """
+
+    name = "openai"
+
+    def __init__(self, api_key: str, model: str = "gpt-4o-mini", base_url: Optional[str] = None, max_retries: int = 2, **kwargs):
+        super().__init__(model, **kwargs)
+        from openai import AsyncOpenAI
+
+        self._http = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        self._client = AsyncOpenAI(
+            api_key=api_key, base_url=base_url, max_retries=max_retries, timeout=self.timeout, http_client=self._http
+        )
+
+    async def _complete(self, messages: Messages, model: str, max_tokens: int, temperature: float, **kwargs) -> LLMResult:
+        import openai
+
+        try:
+            response = await self._client.chat.completions.create(
+                model=model, messages=messages, max_tokens=max_tokens, temperature=temperature, **kwargs
+            )
+        except openai.OpenAIError as e:
+            raise LLMError(f"openai: {e}") from e
+        choice = response.choices[0]
+        usage = response.usage
+        return LLMResult(
+            text=choice.message.content or "",
+            provider=self.name,
+            model=response.model,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            finish_reason=choice.finish_reason,
+        )
+
+    async def _stream(self, messages: Messages, model: str, max_tokens: int, temperature: float, **kwargs) -> AsyncIterator[LLMChunk]:
+        import openai
+
+        try:
+            stream = await self._client.chat.completions.create(
+                model=model, messages=messages, max_tokens=max_tokens, temperature=temperature,
+                stream=True, stream_options={"include_usage": True}, **kwargs
+            )
+            async for chunk in stream:
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if chunk.usage is not None:
+                    yield LLMChunk(text or "", chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+                elif text:
+                    yield LLMChunk(text)
+        except openai.OpenAIError as e:
+            raise LLMError(f"openai: {e}") from e
+
+    async def aclose(self) -> None:
+        await self._client.close()
@@ -0,0 +1,85 @@
+import asyncio
+import hashlib
+import itertools
+import random
+from typing import AsyncIterator, Callable, Optional
+from src.stores.LLMs import LLMChunk, LLMProvider, LLMResult, Messages, estimate_prompt_tokens
+
+VOCABULARY = (
+    "our new collection is here discover fresh ideas for your week with the team "
+    "limited offer share your favourite moments today thanks to our community "
+    "behind the scenes quality service local friendly join us this weekend"
+).split()
+
+
+class StubProvider(LLMProvider):
+    """
+    Deterministic local provider for tests, benchmarks and offline
+    development: no network, no key.
+
+    By default the reply is made of words drawn from a small vocabulary with
+    a generator seeded by the prompt hash: at temperature 0 the same prompt
+    gives the same text, above it the call number is part of the seed, so
+    repeated calls are sampled anew as with a remote model. A `responder`
+    replaces it, e.g. to return JSON in the format an agent expects.
+
+    Latency is simulated with `asyncio.sleep`: `first_token_latency` before the
+    first token, then `token_latency` per token, so concurrency limits and
+    streaming behave as with a remote model.
+
+    Args:
+        model (str): Name reported in the results.
+        reply_tokens (Optional[int]): Length of the default replies (defaults to `max_tokens`).
+        first_token_latency (float): Seconds before the first token.
+        token_latency (float): Seconds per generated token.
+        responder (Optional[Callable[[Messages], str]]): Builds the reply text from the messages.
+        **kwargs: `LLMProvider` options (max_concurrency, timeout, budget).
+    """
+
+    name = "stub"
+
+    def __init__(
+        self,
+        model: str = "stub-1",
+        reply_tokens: Optional[int] = 64,
+        first_token_latency: float = 0.0,
+        token_latency: float = 0.0,
+        responder: Optional[Callable[[Messages], str]] = None,
+        **kwargs,
+    ):
+        super().__init__(model, **kwargs)
+        self.reply_tokens = reply_tokens
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.responder = responder
+        self._calls = itertools.count()
+
+    def _words(self, messages: Messages, model: str, max_tokens: int, temperature: float):
+        if self.responder is not None:
+            return self.responder(messages).split(" ")
+        sample = next(self._calls) if temperature > 0 else None
+        seed = hashlib.sha256(repr((model, messages, sample)).encode()).digest()
+        rng = random.Random(seed)
+        count = min(max_tokens, self.reply_tokens or max_tokens)
+        return [rng.choice(VOCABULARY) for _ in range(count)]
+
+    async def _complete(self, messages: Messages, model: str, max_tokens: int, temperature: float, **kwargs) -> LLMResult:
+        words = self._words(messages, model, max_tokens, temperature)
+        await asyncio.sleep(self.first_token_latency + self.token_latency * len(words))
+        return LLMResult(
+            text=" ".join(words),
+            provider=self.name,
+            model=model,
+            prompt_tokens=estimate_prompt_tokens(messages),
+            completion_tokens=len(words),
+            finish_reason="length" if len(words) >= max_tokens else "stop",
+        )
+
+    async def _stream(self, messages: Messages, model: str, max_tokens: int, temperature: float, **kwargs) -> AsyncIterator[LLMChunk]:
+        words = self._words(messages, model, max_tokens, temperature)
+        await asyncio.sleep(self.first_token_latency)
+        for i, word in enumerate(words):
+            if self.token_latency:
+                await asyncio.sleep(self.token_latency)
+            yield LLMChunk(word if i == 0 else " " + word)
+        yield LLMChunk("", prompt_tokens=estimate_prompt_tokens(messages), completion_tokens=len(words))